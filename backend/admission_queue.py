@@ -0,0 +1,386 @@
+"""
+Module de file d'attente d'admission des lancements de Mini Shell
+Quand la capacité est atteinte, les demandes reçoivent un ticket et sont admises dans l'ordre
+d'arrivée à mesure que des containers sont arrêtés ou expirent. Avec plusieurs workers, les places
+réservées et l'état des tickets sont partagés par le coordinateur des workers
+"""
+
+import asyncio
+import collections
+import concurrent.futures
+import itertools
+import logging
+import time
+import uuid
+from typing import Awaitable, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# États d'un ticket
+QUEUED = "queued"
+ADMITTED = "admitted"
+EXPIRED = "expired"
+
+
+class Ticket:
+    """Place d'une demande de lancement dans la file d'attente"""
+
+    def __init__(self, key: str):
+        """
+        Initialise le ticket
+
+        Args:
+            key (str): Nom du container demandé
+        """
+        self.id = uuid.uuid4().hex[:16]
+        self.key = key
+        self.state = QUEUED
+        self.position = 0
+        self.estimated_wait: Optional[float] = None
+        self.enqueued_at = time.monotonic()
+        self.admitted_at: Optional[float] = None
+        self.launched = False
+        self.seen_at = self.enqueued_at
+        self.changed = asyncio.Event()
+
+    @property
+    def admitted(self) -> bool:
+        """Indique si le lancement peut avoir lieu"""
+        return self.state == ADMITTED
+
+    def to_dict(self) -> Dict:
+        """Retourne l'état du ticket"""
+        return {
+            "ticket_id": self.id,
+            "container_name": self.key,
+            "state": self.state,
+            "position": self.position,
+            "estimated_wait": self.estimated_wait,
+            "waited": (self.admitted_at or time.monotonic()) - self.enqueued_at,
+        }
+
+
+class AdmissionQueue:
+    """Classe de file d'attente FIFO bornant le nombre de lancements simultanés"""
+
+    def __init__(self,
+                 capacity: int,
+                 count_running: Callable[[], Awaitable[int]],
+                 estimate_wait: Optional[Callable[[int], Optional[float]]] = None,
+                 is_counted: Optional[Callable[[str], bool]] = None,
+                 ticket_ttl: float = 60.0,
+                 claim_timeout: float = 30.0,
+                 recheck_interval: float = 5.0,
+                 max_samples: int = 1000,
+                 shared=None,
+                 observe_wait: Optional[Callable[[float], None]] = None):
+        """
+        Initialise la file d'attente
+
+        Args:
+            capacity (int): Nombre maximum de containers en cours d'exécution
+            count_running (Callable[[], Awaitable[int]]): Compte les containers en cours d'exécution
+            estimate_wait (Callable[[int], Optional[float]], optional): Estime l'attente d'une position
+            is_counted (Callable[[str], bool], optional): Indique si count_running compte déjà le container
+                lancé sous ce nom (sans cette fonction, une place est libérée dès la fin du lancement)
+            ticket_ttl (float): Délai après lequel un ticket en attente non consulté est abandonné
+            claim_timeout (float): Délai laissé à un ticket admis pour lancer son container
+            recheck_interval (float): Intervalle de vérification de la capacité sans notification
+            max_samples (int): Nombre de temps d'attente conservés pour les percentiles
+            shared (WorkerCoordinator, optional): Coordinateur des workers (places réservées et tickets partagés)
+            observe_wait (Callable[[float], None], optional): Reçoit le temps d'attente de chaque ticket admis
+        """
+        self.capacity = capacity
+        self.count_running = count_running
+        self.is_counted = is_counted
+        self.estimate_wait = estimate_wait
+        self.ticket_ttl = ticket_ttl
+        self.claim_timeout = claim_timeout
+        self.recheck_interval = recheck_interval
+        self.shared = shared
+        self.observe_wait = observe_wait
+
+        self._queue: Deque[Ticket] = collections.deque()
+        self._tickets: Dict[str, Ticket] = {}
+        self._by_key: Dict[str, Ticket] = {}
+        self._reserved: Dict[str, Ticket] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._decision: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self._waits: Deque[float] = collections.deque(maxlen=max_samples)
+        # Appels au coordinateur (transactions SQLite bloquantes): hors de la boucle, dans l'ordre d'émission
+        self._shared_calls = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="admission-shared")
+
+        self.enqueued = 0
+        self.admitted = 0
+        self.expired = 0
+
+    async def enter(self, key: str) -> Ticket:
+        """
+        Demande l'admission d'un lancement
+
+        Un ticket déjà attribué à ce nom de container est réutilisé: un client qui relance
+        sa demande conserve sa place, et un ticket admis autorise le lancement.
+
+        Args:
+            key (str): Nom du container demandé
+
+        Returns:
+            Ticket: Ticket admis immédiatement ou placé dans la file
+        """
+        self._ensure_dispatcher()
+        ticket = self._by_key.get(key)
+        if ticket is not None:
+            ticket.seen_at = time.monotonic()
+            return ticket
+
+        ticket = Ticket(key)
+        self._tickets[ticket.id] = ticket
+        self._by_key[key] = ticket
+        # Le comptage et la réservation sont indivisibles: deux demandes ne peuvent prendre la même place
+        async with self._decision:
+            admit = not self._queue and await self._reserve(ticket)
+            if admit:
+                self._admit(ticket)
+        if not admit:
+            self._queue.append(ticket)
+            self.enqueued += 1
+            self._refresh_positions()
+            logger.info(f"Lancement de {key} placé en file d'attente (position {ticket.position})")
+        return ticket
+
+    def complete(self, key: str, launched: bool = True):
+        """
+        Termine le lancement d'un ticket admis
+
+        Après un lancement réussi, la place reste réservée jusqu'à ce que count_running compte
+        le nouveau container (l'index des containers suit les événements du démon avec retard):
+        sans cela, le ticket suivant pourrait être admis au-delà de la capacité.
+
+        Args:
+            key (str): Nom du container
+            launched (bool): False si le lancement a échoué, la place redevenant disponible
+        """
+        ticket = self._reserved.get(key)
+        if ticket is not None:
+            self._forget(ticket)
+            if launched and self.is_counted is not None and not self.is_counted(key):
+                ticket.launched = True
+                return
+            del self._reserved[key]
+            if not launched:
+                self.release()
+        if self.shared is not None:
+            self._post_shared("unreserve", key)
+
+    def get(self, ticket_id: str) -> Optional[Ticket]:
+        """Retourne un ticket par son identifiant et note que son client est toujours là"""
+        ticket = self._tickets.get(ticket_id)
+        if ticket is not None:
+            ticket.seen_at = time.monotonic()
+        return ticket
+
+    async def remote(self, ticket_id: str, timeout: float = 0) -> Optional[Dict]:
+        """
+        Consulte un ticket attribué par un autre worker, en attendant au plus timeout secondes un changement
+
+        Args:
+            ticket_id (str): Identifiant du ticket
+            timeout (float): Délai maximum d'attente en secondes (0 pour une simple consultation)
+
+        Returns:
+            Dict ou None: Dernier état publié du ticket (None si inconnu ou sans coordinateur)
+        """
+        if self.shared is None:
+            return None
+        current = await self._call_shared("ticket", ticket_id)
+        deadline = time.monotonic() + timeout
+        while current is not None and current["state"] == QUEUED and time.monotonic() < deadline:
+            await asyncio.sleep(min(0.5, max(0.0, deadline - time.monotonic())))
+            latest = await self._call_shared("ticket", ticket_id)
+            if latest is None or latest["state"] != current["state"] or latest["position"] != current["position"]:
+                return latest or dict(current, state=EXPIRED)
+        return current
+
+    def ticket_for(self, key: str) -> Optional[Ticket]:
+        """Retourne le ticket attribué à un nom de container"""
+        return self._by_key.get(key)
+
+    async def wait(self, ticket: Ticket, timeout: float) -> Ticket:
+        """
+        Attend un changement de position ou l'admission d'un ticket (long polling)
+
+        Args:
+            ticket (Ticket): Ticket suivi
+            timeout (float): Délai maximum d'attente en secondes
+
+        Returns:
+            Ticket: Ticket mis à jour
+        """
+        if ticket.state == QUEUED:
+            ticket.changed.clear()
+            try:
+                await asyncio.wait_for(ticket.changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        ticket.seen_at = time.monotonic()
+        return ticket
+
+    def release(self):
+        """Signale qu'une place a pu se libérer (appelable depuis n'importe quel thread)"""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def stats(self) -> Dict:
+        """Retourne la profondeur de la file et les percentiles des temps d'attente"""
+        waits = sorted(self._waits)
+        return {
+            "capacity": self.capacity,
+            "depth": len(self._queue),
+            "reserved": len(self._reserved) if self.shared is None else self.shared.reservations(),
+            "enqueued": self.enqueued,
+            "admitted": self.admitted,
+            "expired": self.expired,
+            "wait_p50": self._percentile(waits, 0.50),
+            "wait_p90": self._percentile(waits, 0.90),
+            "wait_p99": self._percentile(waits, 0.99),
+        }
+
+    @staticmethod
+    def _percentile(values: List[float], fraction: float) -> Optional[float]:
+        """Percentile d'une liste triée (None si vide)"""
+        if not values:
+            return None
+        return values[min(len(values) - 1, int(fraction * len(values)))]
+
+    def _ensure_dispatcher(self):
+        """Démarre la tâche d'admission dans la boucle asyncio courante"""
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            self._decision = asyncio.Lock()
+            self._task = loop.create_task(self._dispatch())
+
+    def _settle(self):
+        """Libère les places des lancements terminés dont le container est désormais compté"""
+        settled = [key for key, ticket in self._reserved.items() if ticket.launched and self.is_counted(key)]
+        for key in settled:
+            del self._reserved[key]
+            if self.shared is not None:
+                self._post_shared("unreserve", key)
+
+    async def _reserve(self, ticket: Ticket) -> bool:
+        """Réserve une place libre pour un ticket (dans le registre partagé s'il y a plusieurs workers)"""
+        self._settle()
+        try:
+            running = await self.count_running()
+        except Exception as e:
+            logger.error(f"Erreur lors du comptage des conteneurs en cours d'exécution: {e}")
+            running = 0
+        if self.shared is not None:
+            return await self._call_shared("reserve", ticket.key, self.capacity - running, self.claim_timeout)
+        return self.capacity - running - len(self._reserved) > 0
+
+    async def _dispatch(self):
+        """Admet les tickets en tête de file quand des places se libèrent"""
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.recheck_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                self._settle()
+                await self._expire_stale()
+                if self._queue:
+                    async with self._decision:
+                        while self._queue and await self._reserve(self._queue[0]):
+                            self._admit(self._queue.popleft())
+                    self._refresh_positions()
+            except Exception as e:
+                logger.error(f"Erreur lors de l'admission des lancements en attente: {e}")
+
+    def _admit(self, ticket: Ticket):
+        """Admet un ticket et lui réserve une place jusqu'au lancement"""
+        ticket.state = ADMITTED
+        ticket.position = 0
+        ticket.estimated_wait = 0.0
+        ticket.admitted_at = time.monotonic()
+        self._reserved[ticket.key] = ticket
+        waited = ticket.admitted_at - ticket.enqueued_at
+        self._waits.append(waited)
+        if self.observe_wait is not None:
+            self.observe_wait(waited)
+        self.admitted += 1
+        ticket.changed.set()
+        self._publish(ticket)
+
+    async def _expire_stale(self):
+        """Abandonne les tickets dont le client est parti ou n'a pas lancé son container à temps"""
+        now = time.monotonic()
+        if self.shared is not None:
+            # Un ticket suivi par l'intermédiaire d'un autre worker reste actif
+            for ticket in list(self._queue):
+                seen = await self._call_shared("ticket_seen", ticket.id)
+                if seen is not None:
+                    ticket.seen_at = max(ticket.seen_at, now - max(0.0, time.time() - seen))
+        stale = [t for t in self._queue if now - t.seen_at > self.ticket_ttl]
+        stale += [t for t in self._reserved.values() if now - t.admitted_at > self.claim_timeout]
+        for ticket in stale:
+            if ticket.launched:
+                # Container lancé mais jamais compté (arrêté aussitôt, moteur injoignable): place libérée
+                self._reserved.pop(ticket.key, None)
+                if self.shared is not None:
+                    self._post_shared("unreserve", ticket.key)
+                continue
+            if ticket.state == QUEUED:
+                self._queue.remove(ticket)
+            else:
+                self._reserved.pop(ticket.key, None)
+                if self.shared is not None:
+                    self._post_shared("unreserve", ticket.key)
+            ticket.state = EXPIRED
+            ticket.changed.set()
+            self._forget(ticket)
+            self.expired += 1
+
+    def _forget(self, ticket: Ticket):
+        """Retire un ticket des index"""
+        self._tickets.pop(ticket.id, None)
+        if self._by_key.get(ticket.key) is ticket:
+            del self._by_key[ticket.key]
+        if self.shared is not None:
+            self._post_shared("drop_ticket", ticket.id)
+
+    def _refresh_positions(self):
+        """Met à jour la position et l'attente estimée des tickets en file"""
+        for position, ticket in zip(itertools.count(1), self._queue):
+            moved = ticket.position != position
+            if moved:
+                ticket.position = position
+                ticket.changed.set()
+            ticket.estimated_wait = self.estimate_wait(position) if self.estimate_wait else None
+            if moved:
+                self._publish(ticket)
+
+    def _publish(self, ticket: Ticket):
+        """Rend l'état d'un ticket consultable par les autres workers"""
+        if self.shared is not None:
+            self._post_shared("publish_ticket", ticket.to_dict())
+
+    async def _call_shared(self, method: str, *args):
+        """Appelle une méthode du coordinateur dans son thread et attend son résultat"""
+        return await asyncio.get_running_loop().run_in_executor(self._shared_calls, getattr(self.shared, method), *args)
+
+    def _post_shared(self, method: str, *args):
+        """Écrit dans le registre partagé sans attendre (après les appels déjà émis)"""
+        self._shared_calls.submit(self._write_shared, method, *args)
+
+    def _write_shared(self, method: str, *args):
+        """Exécute une écriture différée dans le registre partagé (thread du coordinateur)"""
+        try:
+            getattr(self.shared, method)(*args)
+        except Exception as e:
+            logger.error(f"Erreur lors de la mise à jour du registre d'admission partagé ({method}): {e}")
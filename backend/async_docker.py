@@ -0,0 +1,421 @@
+"""
+Client asyncio pour l'API Docker Engine
+Ce module dialogue en HTTP/1.1 avec le démon Docker sur son socket unix, avec un pool de
+connexions persistantes, un délai maximum par appel et une annulation propre des requêtes
+"""
+
+import asyncio
+import json
+import logging
+import os
+import struct
+import time
+from http.client import responses
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote, urlencode
+
+import docker
+import requests
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET = "/var/run/docker.sock"
+
+
+def socket_path_from_env() -> str:
+    """Retourne le chemin du socket Docker à partir de DOCKER_HOST (unix:// uniquement)"""
+    host = os.getenv("DOCKER_HOST", "")
+    if host.startswith("unix://"):
+        return host[len("unix://"):]
+    return DEFAULT_SOCKET
+
+
+def demultiplex(data: bytes) -> bytes:
+    """
+    Extrait les données d'un flux multiplexé Docker (stdout/stderr sans TTY)
+
+    Args:
+        data (bytes): Flux composé de trames [type, 0, 0, 0, taille (4 octets)] + contenu
+
+    Returns:
+        bytes: Contenu concaténé des trames
+    """
+    chunks = []
+    offset = 0
+    while offset + 8 <= len(data):
+        if data[offset] > 2 or data[offset + 1:offset + 4] != b"\x00\x00\x00":
+            # Container avec TTY: flux brut, non multiplexé
+            return data
+        size = struct.unpack_from(">L", data, offset + 4)[0]
+        chunks.append(data[offset + 8:offset + 8 + size])
+        offset += 8 + size
+    return b"".join(chunks) if chunks or not data else data
+
+
+class _Connection:
+    """Connexion HTTP persistante sur le socket unix"""
+
+    __slots__ = ("reader", "writer")
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    def close(self):
+        try:
+            self.writer.close()
+        except RuntimeError:
+            # Boucle asyncio d'origine déjà fermée
+            pass
+
+
+class AsyncDockerClient:
+    """Classe cliente asynchrone de l'API Docker Engine sur socket unix"""
+
+    def __init__(self,
+                 socket_path: Optional[str] = None,
+                 pool_size: int = 16,
+                 timeout: float = 10.0,
+                 api_version: str = "v1.41",
+                 on_request: Optional[Callable[[str, str, int, float], None]] = None):
+        """
+        Initialise le client (les connexions sont ouvertes à la demande)
+
+        Args:
+            socket_path (str, optional): Chemin du socket Docker (DOCKER_HOST par défaut)
+            pool_size (int): Nombre maximum de connexions simultanées
+            timeout (float): Délai maximum par appel en secondes
+            api_version (str): Version de l'API Docker utilisée dans les URL
+            on_request (Callable[[str, str, int, float], None], optional): Appelé après chaque requête
+                avec (méthode, chemin, code HTTP ou 0 en cas d'échec, durée en secondes)
+        """
+        self.socket_path = socket_path or socket_path_from_env()
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.api_version = api_version
+        self.on_request = on_request
+        self._idle: List[_Connection] = []
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _ensure_loop(self):
+        """Réinitialise le pool si le client est utilisé depuis une nouvelle boucle asyncio"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            for connection in self._idle:
+                connection.close()
+            self._idle = []
+            self._semaphore = asyncio.Semaphore(self.pool_size)
+            self._loop = loop
+
+    async def close(self):
+        """Ferme toutes les connexions inactives du pool"""
+        for connection in self._idle:
+            connection.close()
+        self._idle = []
+
+    def stats(self) -> Dict:
+        """Retourne l'occupation du pool de connexions"""
+        in_use = self.pool_size - self._semaphore._value if self._semaphore else 0
+        return {"pool_size": self.pool_size, "idle": len(self._idle), "in_use": in_use}
+
+    async def request(self,
+                      method: str,
+                      path: str,
+                      params: Optional[Dict] = None,
+                      body: Optional[Dict] = None,
+                      timeout: Optional[float] = None) -> Tuple[int, bytes]:
+        """
+        Exécute une requête sur l'API Docker
+
+        Args:
+            method (str): Méthode HTTP
+            path (str): Chemin de l'API, sans préfixe de version (ex: /containers/json)
+            params (Dict, optional): Paramètres de la query string
+            body (Dict, optional): Corps JSON
+            timeout (float, optional): Délai maximum de cet appel (timeout du client par défaut)
+
+        Returns:
+            Tuple[int, bytes]: (code HTTP, corps de la réponse)
+
+        Raises:
+            docker.errors.NotFound: Si la ressource n'existe pas (404)
+            docker.errors.APIError: Pour toute autre erreur renvoyée par le démon
+        """
+        self._ensure_loop()
+        started = time.perf_counter()
+        status = 0
+        try:
+            status, data = await self._request(method, path, params, body, timeout)
+        finally:
+            if self.on_request:
+                self.on_request(method, path, status, time.perf_counter() - started)
+        if status >= 400:
+            raise self._api_error(method, path, status, data)
+        return status, data
+
+    async def _request(self,
+                       method: str,
+                       path: str,
+                       params: Optional[Dict],
+                       body: Optional[Dict],
+                       timeout: Optional[float]) -> Tuple[int, bytes]:
+        """Envoie une requête sur une connexion du pool et retourne (code HTTP, corps)"""
+        query = f"?{urlencode(params)}" if params else ""
+        payload = json.dumps(body).encode() if body is not None else b""
+        head = (
+            f"{method} /{self.api_version}{path}{query} HTTP/1.1\r\n"
+            f"Host: docker\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n\r\n"
+        ).encode()
+
+        async with self._semaphore:
+            while True:
+                connection, reused = await self._acquire()
+                try:
+                    status, data, keep_alive = await asyncio.wait_for(
+                        self._exchange(connection, head + payload), timeout or self.timeout
+                    )
+                    break
+                except ConnectionError:
+                    # Connexion persistante fermée par le démon entre deux requêtes: réessayer
+                    connection.close()
+                    if not reused:
+                        raise
+                except BaseException:
+                    # Annulation ou délai dépassé: l'état de la connexion est inconnu
+                    connection.close()
+                    raise
+            if keep_alive:
+                self._idle.append(connection)
+            else:
+                connection.close()
+        return status, data
+
+    async def _acquire(self) -> Tuple[_Connection, bool]:
+        """Réutilise une connexion inactive ou en ouvre une nouvelle (connexion, réutilisée)"""
+        while self._idle:
+            connection = self._idle.pop()
+            if not connection.writer.is_closing() and not connection.reader.at_eof():
+                return connection, True
+            connection.close()
+        reader, writer = await asyncio.open_unix_connection(self.socket_path)
+        return _Connection(reader, writer), False
+
+    async def _exchange(self, connection: _Connection, request: bytes) -> Tuple[int, bytes, bool]:
+        """Envoie la requête et lit la réponse complète (Content-Length ou chunked)"""
+        connection.writer.write(request)
+        await connection.writer.drain()
+
+        status_line = await connection.reader.readline()
+        if not status_line:
+            raise ConnectionError("Connexion fermée par le démon Docker")
+        status = int(status_line.split()[1])
+
+        headers = {}
+        while True:
+            line = await connection.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            parts = []
+            while True:
+                size = int((await connection.reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await connection.reader.readline()
+                    break
+                parts.append(await connection.reader.readexactly(size))
+                await connection.reader.readline()
+            data = b"".join(parts)
+        elif "content-length" in headers:
+            data = await connection.reader.readexactly(int(headers["content-length"]))
+        elif status in (204, 304):
+            data = b""
+        else:
+            data = await connection.reader.read()
+            return status, data, False
+
+        keep_alive = headers.get("connection", "").lower() != "close"
+        return status, data, keep_alive
+
+    @staticmethod
+    def _error_message(data: bytes) -> str:
+        """Extrait le message d'erreur d'une réponse Docker"""
+        try:
+            return json.loads(data).get("message", "")
+        except (ValueError, AttributeError):
+            return data.decode("utf-8", errors="replace")
+
+    @classmethod
+    def _api_error(cls, method: str, path: str, status: int, data: bytes) -> docker.errors.APIError:
+        """
+        Construit l'erreur d'une réponse en échec, avec son code HTTP comme le client docker synchrone
+
+        Args:
+            method (str): Méthode HTTP de la requête
+            path (str): Chemin de la requête
+            status (int): Code HTTP de la réponse
+            data (bytes): Corps de la réponse
+
+        Returns:
+            docker.errors.APIError: NotFound pour un 404, APIError sinon (status_code renseigné)
+        """
+        response = requests.Response()
+        response.status_code = status
+        response.reason = responses.get(status, "")
+        response.url = f"{method} {path}"
+        error = docker.errors.NotFound if status == 404 else docker.errors.APIError
+        return error(f"{status} {response.reason}", response=response, explanation=cls._error_message(data))
+
+    async def _json(self, method: str, path: str, **kwargs):
+        """Exécute une requête et décode la réponse JSON"""
+        _, data = await self.request(method, path, **kwargs)
+        return json.loads(data) if data else None
+
+    async def ping(self) -> bool:
+        """Vérifie que le démon répond"""
+        _, data = await self.request("GET", "/_ping")
+        return data == b"OK"
+
+    async def containers(self, all_containers: bool = False, filters: Optional[Dict] = None) -> List[Dict]:
+        """Liste les containers (résumés de /containers/json)"""
+        params = {"all": "1" if all_containers else "0"}
+        if filters:
+            params["filters"] = json.dumps(filters)
+        return await self._json("GET", "/containers/json", params=params)
+
+    async def inspect_container(self, container_id_or_name: str) -> Dict:
+        """Retourne les attributs complets d'un container"""
+        return await self._json("GET", f"/containers/{quote(container_id_or_name)}/json")
+
+    async def inspect_image(self, image_name: str) -> Dict:
+        """Retourne les attributs complets d'une image"""
+        return await self._json("GET", f"/images/{quote(image_name, safe='')}/json")
+
+    async def pull(self, image_name: str, timeout: float = 300.0):
+        """Télécharge une image depuis le registre"""
+        name, _, tag = image_name.partition(":")
+        await self.request("POST", "/images/create",
+                           params={"fromImage": name, "tag": tag or "latest"}, timeout=timeout)
+
+    async def images(self) -> List[Dict]:
+        """Liste les images (résumés de /images/json)"""
+        return await self._json("GET", "/images/json")
+
+    async def create_container(self, config: Dict, name: Optional[str] = None) -> str:
+        """Crée un container et retourne son ID"""
+        params = {"name": name} if name else None
+        result = await self._json("POST", "/containers/create", params=params, body=config)
+        return result["Id"]
+
+    async def start(self, container_id: str):
+        """Démarre un container (304 si déjà démarré)"""
+        await self.request("POST", f"/containers/{quote(container_id)}/start")
+
+    async def stop(self, container_id: str, timeout: int = 10):
+        """Arrête un container, le délai d'appel couvrant l'arrêt gracieux"""
+        await self.request("POST", f"/containers/{quote(container_id)}/stop",
+                           params={"t": timeout}, timeout=self.timeout + timeout)
+
+    async def remove(self, container_id: str, force: bool = False):
+        """Supprime un container"""
+        await self.request("DELETE", f"/containers/{quote(container_id)}",
+                           params={"force": "1" if force else "0"})
+
+    async def rename(self, container_id: str, name: str):
+        """Renomme un container"""
+        await self.request("POST", f"/containers/{quote(container_id)}/rename", params={"name": name})
+
+    async def logs(self,
+                   container_id: str,
+                   tail: Optional[int] = None,
+                   since: Optional[float] = None,
+                   timestamps: bool = False,
+                   demux: bool = True) -> bytes:
+        """Récupère les logs (stdout et stderr) d'un container, démultiplexés sauf si demux=False"""
+        params = {"stdout": "1", "stderr": "1", "timestamps": "1" if timestamps else "0"}
+        if since is not None:
+            params["since"] = f"{since:.9f}"
+        else:
+            params["tail"] = str(tail) if tail is not None else "all"
+        _, data = await self.request("GET", f"/containers/{quote(container_id)}/logs", params=params)
+        return demultiplex(data) if demux else data
+
+    async def exec_create(self, container_id: str, cmd: List[str], tty: bool = True,
+                          environment: Optional[Dict[str, str]] = None) -> str:
+        """Crée une commande exec interactive (stdin, stdout et stderr attachés) et retourne son ID"""
+        config = {
+            "AttachStdin": True,
+            "AttachStdout": True,
+            "AttachStderr": True,
+            "Tty": tty,
+            "Cmd": cmd,
+        }
+        if environment:
+            config["Env"] = [f"{key}={value}" for key, value in environment.items()]
+        result = await self._json("POST", f"/containers/{quote(container_id)}/exec", body=config)
+        return result["Id"]
+
+    async def exec_resize(self, exec_id: str, height: int, width: int):
+        """Redimensionne le TTY d'une commande exec"""
+        await self.request("POST", f"/exec/{quote(exec_id)}/resize", params={"h": height, "w": width})
+
+    async def exec_inspect(self, exec_id: str) -> Dict:
+        """Retourne l'état d'une commande exec (Running, ExitCode)"""
+        return await self._json("GET", f"/exec/{quote(exec_id)}/json")
+
+    async def exec_attach(self, exec_id: str, tty: bool = True) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """
+        Démarre une commande exec et détourne la connexion pour relayer les octets bruts
+
+        La connexion est dédiée (hors pool): après la réponse du démon, elle transporte stdin
+        dans un sens et la sortie du TTY dans l'autre, sans encapsulation HTTP.
+
+        Args:
+            exec_id (str): ID de la commande exec
+            tty (bool): True si l'exec a un TTY (sortie brute, non multiplexée)
+
+        Returns:
+            Tuple[asyncio.StreamReader, asyncio.StreamWriter]: Flux de sortie et d'entrée de la commande
+
+        Raises:
+            docker.errors.NotFound: Si la commande exec n'existe pas
+            docker.errors.APIError: Si le démon refuse le démarrage
+        """
+        payload = json.dumps({"Detach": False, "Tty": tty}).encode()
+        head = (
+            f"POST /{self.api_version}/exec/{quote(exec_id)}/start HTTP/1.1\r\n"
+            f"Host: docker\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Connection: Upgrade\r\n"
+            f"Upgrade: tcp\r\n"
+            f"Content-Length: {len(payload)}\r\n\r\n"
+        ).encode()
+
+        reader, writer = await asyncio.wait_for(asyncio.open_unix_connection(self.socket_path), self.timeout)
+        try:
+            writer.write(head + payload)
+            await writer.drain()
+            status_line = await asyncio.wait_for(reader.readline(), self.timeout)
+            if not status_line:
+                raise ConnectionError("Connexion fermée par le démon Docker")
+            status = int(status_line.split()[1])
+            headers = {}
+            while True:
+                line = await asyncio.wait_for(reader.readline(), self.timeout)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            if status >= 400:
+                length = int(headers.get("content-length", "0"))
+                data = await reader.readexactly(length) if length else b""
+                raise self._api_error("POST", f"/exec/{exec_id}/start", status, data)
+        except BaseException:
+            writer.close()
+            raise
+        return reader, writer
@@ -0,0 +1,136 @@
+"""
+Latence des appels au démon: client asyncio contre SDK Docker dans le pool de threads
+Le moteur simulé tourne dans un processus séparé (sans partager le GIL avec la mesure). Pour chaque
+chemin, concurrency appels simultanés à GET /containers/{id}/json sont répétés jusqu'à requests appels:
+- "threadpool": SDK Docker synchrone via run_in_threadpool, comme les anciennes routes def
+- "async": AsyncDockerClient dans la boucle asyncio, comme les routes async
+Les latences p50/p95/p99 de chaque chemin sont écrites en JSON
+
+Utilisation (depuis backend/):
+    python -m bench.client_latency --requests 2000 --concurrency 100 --output client.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import docker
+from starlette.concurrency import run_in_threadpool
+
+from async_docker import AsyncDockerClient
+from bench.loadtest import percentile
+
+
+def start_engine_process(socket_path: str, latency: str, jitter: float) -> subprocess.Popen:
+    """Démarre le moteur simulé dans un processus séparé et attend son socket"""
+    command = [sys.executable, "-m", "bench.fake_docker", "--socket", socket_path, "--jitter", str(jitter)]
+    if latency:
+        command += ["--latency", latency]
+    process = subprocess.Popen(command, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + 10
+    while not os.path.exists(socket_path):
+        if process.poll() is not None or time.monotonic() > deadline:
+            process.kill()
+            raise RuntimeError("Le moteur simulé n'a pas démarré")
+        time.sleep(0.05)
+    return process
+
+
+async def _measure(call, requests: int, concurrency: int) -> List[float]:
+    """Latences (secondes) de requests appels, au plus concurrency à la fois"""
+    latencies: List[float] = []
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            started = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return sorted(latencies)
+
+
+def _summary(latencies: List[float], elapsed: float) -> Dict:
+    return {
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+async def compare(socket_path: str, requests: int, concurrency: int, pool_size: int) -> Dict:
+    """
+    Mesure les deux chemins sur le même container
+
+    Args:
+        socket_path (str): Socket du moteur simulé
+        requests (int): Appels mesurés par chemin
+        concurrency (int): Appels simultanés
+        pool_size (int): Connexions du client asyncio (DOCKER_ASYNC_POOL_SIZE)
+
+    Returns:
+        Dict: Latences de chaque chemin et rapport des p99 (async / threadpool)
+    """
+    client = docker.DockerClient(base_url=f"unix://{socket_path}", version="1.41")
+    aclient = AsyncDockerClient(socket_path, pool_size=pool_size)
+    container = client.containers.create("mishu_minishell:latest", name="latency")
+    container.start()
+
+    paths = {
+        "threadpool": lambda: run_in_threadpool(client.api.inspect_container, container.id),
+        "async": lambda: aclient.inspect_container(container.id),
+    }
+    report = {}
+    try:
+        for name, call in paths.items():
+            # Préchauffage (connexions et threads), puis mesure
+            await _measure(call, concurrency, concurrency)
+            started = time.perf_counter()
+            latencies = await _measure(call, requests, concurrency)
+            report[name] = _summary(latencies, time.perf_counter() - started)
+    finally:
+        await aclient.close()
+        client.close()
+    report["p99_ratio"] = round(report["async"]["p99_ms"] / report["threadpool"]["p99_ms"], 3)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latence du client Docker asyncio et du SDK dans le pool de threads")
+    parser.add_argument("--requests", type=int, default=2000, help="Appels mesurés par chemin")
+    parser.add_argument("--concurrency", type=int, default=100, help="Appels simultanés")
+    parser.add_argument("--pool-size", type=int, default=32, help="Connexions du client asyncio")
+    parser.add_argument("--latency", default="", help="Latences du moteur simulé, ex: inspect=0.005")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Variation relative des latences")
+    parser.add_argument("--output", default="-", help="Fichier de résultats JSON ('-' pour stdout)")
+    args = parser.parse_args()
+
+    socket_path = os.path.join(tempfile.mkdtemp(prefix="mishu-bench-"), "docker.sock")
+    engine = start_engine_process(socket_path, args.latency, args.jitter)
+    try:
+        report = asyncio.run(compare(socket_path, args.requests, args.concurrency, args.pool_size))
+    finally:
+        engine.terminate()
+        engine.wait(timeout=5)
+
+    output = json.dumps(dict(report, config=vars(args)), indent=2, ensure_ascii=False)
+    if args.output == "-":
+        print(output)
+    else:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+        print(f"Résultats écrits dans {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,643 @@
+"""
+Moteur Docker simulé pour les mesures de performance
+Sert, sur un socket unix, le sous-ensemble de l'API Docker Engine utilisé par le backend (containers,
+images, logs, statistiques, exec, événements) avec des latences configurables, sans démon ni container réel
+
+Utilisation autonome:
+    python -m bench.fake_docker --socket /tmp/fake-docker.sock --latency create=0.05,start=0.1
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import struct
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+# Latences par défaut de chaque opération (secondes)
+DEFAULT_LATENCIES = {
+    "ping": 0.0005,
+    "info": 0.002,
+    "list": 0.005,
+    "inspect": 0.002,
+    "images": 0.003,
+    "create": 0.05,
+    "start": 0.1,
+    "stop": 0.2,
+    "remove": 0.03,
+    "rename": 0.005,
+    "pause": 0.01,
+    "logs": 0.003,
+    "stats": 0.003,
+    "exec": 0.005,
+}
+
+# Image disponible par défaut (image des Mini Shell)
+DEFAULT_IMAGES = ("mishu_minishell:latest",)
+
+# Lignes produites en boucle par un container simulé
+LOG_SCRIPT = ("$ ls", "Makefile  minishell  src", "$ echo bonjour", "bonjour", "$ cat absent",
+              "cat: absent: erreur, fichier introuvable", "$ make", "Compilation réussie")
+
+REASONS = {101: "UPGRADED", 200: "OK", 201: "Created", 204: "No Content", 304: "Not Modified",
+           404: "Not Found", 409: "Conflict", 500: "Internal Server Error"}
+
+
+def parse_latencies(value: Optional[str]) -> Dict[str, float]:
+    """
+    Lit les latences "opération=secondes,..." et complète avec les valeurs par défaut
+
+    Args:
+        value (str, optional): Latences à surcharger, par exemple "create=0.08,start=0.02"
+
+    Returns:
+        Dict[str, float]: Latence de chaque opération
+    """
+    latencies = dict(DEFAULT_LATENCIES)
+    for item in filter(None, (part.strip() for part in (value or "").split(','))):
+        name, _, seconds = item.partition('=')
+        latencies[name.strip()] = float(seconds)
+    return latencies
+
+
+def _iso(timestamp: float) -> str:
+    """Horodatage RFC 3339 avec nanosecondes, comme le démon Docker"""
+    moment = datetime.fromtimestamp(timestamp, tz=timezone.utc)
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.") + f"{int(timestamp % 1 * 1e9):09d}Z"
+
+
+class FakeContainer:
+    """Container simulé"""
+
+    def __init__(self, name: str, config: Dict):
+        self.id = uuid.uuid4().hex + uuid.uuid4().hex
+        self.name = name
+        self.config = config
+        self.created = time.time()
+        self.status = "created"
+        self.started_at: Optional[float] = None
+        self.stopped_at: Optional[float] = None
+        self._usage = {"cpu": 0, "rx": 0, "tx": 0, "read": 0, "write": 0}
+        self._precpu: Dict = {}
+
+    @property
+    def labels(self) -> Dict[str, str]:
+        return self.config.get("Labels") or {}
+
+    def summary(self) -> Dict:
+        """Résumé renvoyé par /containers/json"""
+        return {
+            "Id": self.id,
+            "Names": [f"/{self.name}"],
+            "Image": self.config.get("Image"),
+            "ImageID": "sha256:" + "0" * 64,
+            "State": self.status,
+            "Status": self.status,
+            "Created": int(self.created),
+            "Labels": self.labels,
+        }
+
+    def inspect(self) -> Dict:
+        """Détail renvoyé par /containers/{id}/json"""
+        return {
+            "Id": self.id,
+            "Name": f"/{self.name}",
+            "Created": _iso(self.created),
+            "Image": "sha256:" + "0" * 64,
+            "State": {
+                "Status": self.status,
+                "Running": self.status == "running",
+                "StartedAt": _iso(self.started_at or 0),
+                "FinishedAt": _iso(self.stopped_at or 0),
+            },
+            "Config": {
+                "Image": self.config.get("Image"),
+                "Labels": self.labels,
+                "Cmd": self.config.get("Cmd") or ["./minishell"],
+                "Entrypoint": self.config.get("Entrypoint"),
+                "Env": self.config.get("Env") or [],
+                "Tty": bool(self.config.get("Tty")),
+            },
+            "HostConfig": self.config.get("HostConfig") or {},
+            "NetworkSettings": {"Ports": {}},
+        }
+
+    def stats_sample(self) -> Dict:
+        """Échantillon de /containers/{id}/stats: consommation aléatoire, compteurs cumulés croissants"""
+        usage = self._usage
+        usage["cpu"] += int(random.uniform(0.01, 0.3) * 1e9)
+        for key, amount in (("rx", 2048), ("tx", 1024), ("read", 4096), ("write", 8192)):
+            usage[key] += random.randint(0, amount)
+        cpu_stats = {"cpu_usage": {"total_usage": usage["cpu"]},
+                     "system_cpu_usage": int(time.time() * 2e9), "online_cpus": 2}
+        sample = {
+            "read": _iso(time.time()),
+            "pids_stats": {"current": random.randint(1, 8)},
+            "cpu_stats": cpu_stats,
+            "precpu_stats": self._precpu,
+            "memory_stats": {"usage": random.randint(8, 64) << 20, "limit": 256 << 20,
+                             "stats": {"inactive_file": 1 << 20}},
+            "networks": {"eth0": {"rx_bytes": usage["rx"], "tx_bytes": usage["tx"]}},
+            "blkio_stats": {"io_service_bytes_recursive": [
+                {"major": 8, "minor": 0, "op": "read", "value": usage["read"]},
+                {"major": 8, "minor": 0, "op": "write", "value": usage["write"]},
+            ]},
+        }
+        self._precpu = cpu_stats
+        return sample
+
+    def log_lines(self, interval: float, limit: int) -> List[Tuple[float, str]]:
+        """Lignes produites depuis le démarrage, une toutes les interval secondes (au plus limit)"""
+        if self.started_at is None:
+            return []
+        end = self.stopped_at or time.time()
+        count = min(limit, int((end - self.started_at) / interval))
+        return [(self.started_at + (i + 1) * interval, LOG_SCRIPT[i % len(LOG_SCRIPT)]) for i in range(count)]
+
+
+class FakeDockerEngine:
+    """Serveur HTTP minimal imitant l'API Docker Engine sur un socket unix"""
+
+    def __init__(self,
+                 socket_path: str,
+                 latencies: Optional[Dict[str, float]] = None,
+                 jitter: float = 0.2,
+                 log_interval: float = 1.0,
+                 max_log_lines: int = 5000,
+                 stats_interval: float = 1.0,
+                 images=DEFAULT_IMAGES):
+        """
+        Initialise le moteur simulé
+
+        Args:
+            socket_path (str): Chemin du socket unix à servir
+            latencies (Dict[str, float], optional): Latence de chaque opération (voir DEFAULT_LATENCIES)
+            jitter (float): Variation aléatoire relative des latences (0.2 = ±20 %)
+            log_interval (float): Intervalle entre deux lignes de log d'un container en secondes
+            max_log_lines (int): Nombre maximum de lignes conservées par container
+            stats_interval (float): Intervalle entre deux échantillons de statistiques en secondes
+            images: Tags des images présentes
+        """
+        self.socket_path = socket_path
+        self.latencies = dict(DEFAULT_LATENCIES, **(latencies or {}))
+        self.jitter = jitter
+        self.log_interval = log_interval
+        self.max_log_lines = max_log_lines
+        self.stats_interval = stats_interval
+        self.images = {tag: "sha256:" + uuid.uuid5(uuid.NAMESPACE_DNS, tag).hex * 2 for tag in images}
+        self.containers: Dict[str, FakeContainer] = {}
+        self.execs: Dict[str, Dict] = {}
+        self._events: List[asyncio.Queue] = []
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._clients: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+
+        self.requests: Dict[str, int] = {}
+        self.connections = 0
+
+    async def start(self):
+        """Ouvre le socket et commence à servir"""
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self._server = await asyncio.start_unix_server(self._serve, self.socket_path)
+
+    async def stop(self):
+        """Ferme le socket et les connexions en cours"""
+        if self._server is not None:
+            self._server.close()
+        for writer in self._clients.values():
+            writer.close()
+        for queue in self._events:
+            queue.put_nowait(None)
+        if self._clients:
+            await asyncio.wait(list(self._clients), timeout=2)
+
+    def stats(self) -> Dict:
+        """Retourne le nombre de requêtes par opération et l'état des containers"""
+        states: Dict[str, int] = {}
+        for container in self.containers.values():
+            states[container.status] = states.get(container.status, 0) + 1
+        return {"requests": dict(self.requests), "connections": self.connections, "containers": states}
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Traite les requêtes d'une connexion (keep-alive)"""
+        self.connections += 1
+        task = asyncio.current_task()
+        self._clients[task] = writer
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    return
+                method, target, _ = request_line.decode().split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode().partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0) or 0))
+
+                url = urlsplit(target)
+                path = unquote(url.path)
+                if path.startswith("/v1.") or path.startswith("/v2."):
+                    path = "/" + path.split("/", 2)[2]
+                query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                parts = path.strip('/').split('/')
+                if parts[0] == "exec" and len(parts) == 3 and parts[2] == "start":
+                    # La connexion est détournée pour le TTY de la commande
+                    await self._exec_start(parts[1], reader, writer)
+                    return
+                if not await self._dispatch(method, path, query, body, writer):
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._clients.pop(task, None)
+            writer.close()
+
+    async def _delay(self, operation: str):
+        """Attend la latence configurée de l'opération"""
+        self.requests[operation] = self.requests.get(operation, 0) + 1
+        latency = self.latencies.get(operation, 0.0)
+        if latency > 0:
+            await asyncio.sleep(latency * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+    def _respond(self, writer: asyncio.StreamWriter, status: int, payload=None):
+        """Envoie une réponse complète (JSON, texte ou octets)"""
+        if isinstance(payload, (dict, list)):
+            body, content_type = json.dumps(payload).encode(), "application/json"
+        elif isinstance(payload, bytes):
+            body, content_type = payload, "application/vnd.docker.raw-stream"
+        else:
+            body, content_type = (payload or "").encode(), "text/plain"
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS.get(status, 'OK')}\r\nApi-Version: 1.41\r\n"
+            f"Content-Type: {content_type}\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+
+    def _find(self, key: str) -> Optional[FakeContainer]:
+        """Retrouve un container par ID, préfixe d'ID ou nom"""
+        key = key.lstrip('/')
+        container = self.containers.get(key)
+        if container is not None:
+            return container
+        for container in self.containers.values():
+            if container.name == key or container.id.startswith(key):
+                return container
+        return None
+
+    def _emit(self, container: FakeContainer, action: str):
+        """Publie un événement de container aux clients de /events"""
+        event = {
+            "Type": "container", "Action": action, "status": action, "id": container.id,
+            "Actor": {"ID": container.id, "Attributes": {"name": container.name, **container.labels}},
+            "time": int(time.time()), "timeNano": time.time_ns(),
+        }
+        for queue in self._events:
+            queue.put_nowait(event)
+
+    def _matches(self, container: FakeContainer, filters: Dict) -> bool:
+        """Applique les filtres label, status, id et name de /containers/json"""
+        for label in filters.get("label", []):
+            key, _, value = label.partition('=')
+            if key not in container.labels or (value and container.labels[key] != value):
+                return False
+        if filters.get("status") and container.status not in filters["status"]:
+            return False
+        if filters.get("id") and not any(container.id.startswith(i) for i in filters["id"]):
+            return False
+        if filters.get("name") and not any(n in container.name for n in filters["name"]):
+            return False
+        return True
+
+    async def _dispatch(self, method: str, path: str, query: Dict[str, str], body: bytes,
+                        writer: asyncio.StreamWriter) -> bool:
+        """Traite une requête; retourne False si la connexion doit être fermée"""
+        parts = path.strip('/').split('/')
+
+        if path == "/_ping":
+            await self._delay("ping")
+            self._respond(writer, 200, "OK")
+        elif path == "/version":
+            self._respond(writer, 200, {"ApiVersion": "1.41", "MinAPIVersion": "1.12", "Version": "fake"})
+        elif path == "/info":
+            await self._delay("info")
+            running = sum(1 for c in self.containers.values() if c.status == "running")
+            self._respond(writer, 200, {"NCPU": os.cpu_count() or 1, "MemTotal": 16 << 30,
+                                        "Containers": len(self.containers), "ContainersRunning": running})
+        elif path == "/events":
+            await self._stream_events(writer)
+            return False
+        elif path == "/images/json":
+            await self._delay("images")
+            self._respond(writer, 200, [
+                {"Id": image_id, "RepoTags": [tag], "Size": 80 << 20, "Created": 0}
+                for tag, image_id in self.images.items()
+            ])
+        elif parts[0] == "images" and len(parts) >= 2 and parts[-1] == "json":
+            await self._delay("inspect")
+            tag = "/".join(parts[1:-1])
+            tag = tag if ':' in tag else f"{tag}:latest"
+            if tag in self.images:
+                self._respond(writer, 200, {"Id": self.images[tag], "RepoTags": [tag], "Size": 80 << 20,
+                                            "Created": _iso(0), "Config": {"Labels": {}}})
+            else:
+                self._respond(writer, 404, {"message": f"No such image: {tag}"})
+        elif path == "/containers/json":
+            await self._delay("list")
+            filters = json.loads(query.get("filters", "{}") or "{}")
+            filters = {k: list(v) if isinstance(v, (list, dict)) else [v] for k, v in filters.items()}
+            show_all = query.get("all") in ("1", "true", "True")
+            self._respond(writer, 200, [
+                c.summary() for c in self.containers.values()
+                if (show_all or c.status in ("running", "paused")) and self._matches(c, filters)
+            ])
+        elif path == "/containers/prune":
+            await self._prune(query, writer)
+        elif path == "/containers/create":
+            await self._create(query, body, writer)
+        elif parts[0] == "containers" and len(parts) == 3 and parts[2] == "exec":
+            await self._exec_create(parts[1], body, writer)
+        elif parts[0] == "containers" and len(parts) >= 2:
+            return await self._container_action(method, parts, query, writer)
+        elif parts[0] == "exec" and len(parts) == 3 and parts[1] in self.execs:
+            await self._delay("exec")
+            process = self.execs[parts[1]]
+            if parts[2] == "resize":
+                process["Size"] = (int(query.get("h", 0)), int(query.get("w", 0)))
+                self._respond(writer, 201)
+            else:
+                self._respond(writer, 200, {key: process[key] for key in ("ID", "ContainerID", "Running",
+                                                                        "ExitCode", "ProcessConfig")})
+        elif parts[0] == "exec":
+            self._respond(writer, 404, {"message": f"No such exec instance: {parts[1] if len(parts) > 1 else ''}"})
+        else:
+            self._respond(writer, 500, {"message": f"{method} {path} non pris en charge par le moteur simulé"})
+        await writer.drain()
+        return True
+
+    async def _create(self, query: Dict[str, str], body: bytes, writer: asyncio.StreamWriter):
+        """POST /containers/create"""
+        await self._delay("create")
+        config = json.loads(body or b"{}")
+        image = config.get("Image", "")
+        if (image if ':' in image else f"{image}:latest") not in self.images:
+            self._respond(writer, 404, {"message": f"No such image: {image}"})
+            return
+        name = query.get("name") or None
+        if name and self._find(name) is not None and self._find(name).name == name:
+            self._respond(writer, 409, {"message": f"Conflict. The container name \"/{name}\" is already in use"})
+            return
+        container = FakeContainer(name or "", config)
+        container.name = name or container.id[:12]
+        self.containers[container.id] = container
+        self._emit(container, "create")
+        self._respond(writer, 201, {"Id": container.id, "Warnings": []})
+
+    async def _exec_create(self, key: str, body: bytes, writer: asyncio.StreamWriter):
+        """POST /containers/{id}/exec: commande exec d'un container en cours d'exécution"""
+        await self._delay("exec")
+        container = self._find(key)
+        if container is None:
+            self._respond(writer, 404, {"message": f"No such container: {key}"})
+            return
+        if container.status != "running":
+            self._respond(writer, 409, {"message": f"Container {container.id} is not running"})
+            return
+        config = json.loads(body or b"{}")
+        exec_id = uuid.uuid4().hex + uuid.uuid4().hex
+        self.execs[exec_id] = {
+            "ID": exec_id, "ContainerID": container.id, "Running": False, "ExitCode": None,
+            "ProcessConfig": {"entrypoint": (config.get("Cmd") or ["sh"])[0], "tty": bool(config.get("Tty"))},
+            "Size": None,
+        }
+        self._respond(writer, 201, {"Id": exec_id})
+
+    async def _exec_start(self, exec_id: str, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        POST /exec/{id}/start: répond 101 puis simule un shell sur la connexion détournée
+
+        Le TTY renvoie l'écho des frappes; une ligne "echo ..." affiche son argument, "exit" termine
+        la commande (code 0) et ferme la connexion, toute autre commande est introuvable (code 127)
+        """
+        await self._delay("exec")
+        process = self.execs.get(exec_id)
+        if process is None:
+            self._respond(writer, 404, {"message": f"No such exec instance: {exec_id}"})
+            await writer.drain()
+            return
+        writer.write(b"HTTP/1.1 101 UPGRADED\r\nContent-Type: application/vnd.docker.raw-stream\r\n"
+                     b"Connection: Upgrade\r\nUpgrade: tcp\r\n\r\n$ ")
+        await writer.drain()
+        process["Running"] = True
+        line = b""
+        try:
+            while True:
+                data = await reader.read(4096)
+                if not data:
+                    return
+                writer.write(data.replace(b"\r", b"\r\n"))
+                line += data.replace(b"\n", b"\r")
+                while b"\r" in line:
+                    command, _, line = line.partition(b"\r")
+                    command = command.decode(errors="replace").strip()
+                    if command == "exit":
+                        process["ExitCode"] = 0
+                        await writer.drain()
+                        return
+                    if command.startswith("echo"):
+                        writer.write(command[5:].encode() + b"\r\n")
+                    elif command:
+                        writer.write(f"minishell: {command}: command not found\r\n".encode())
+                        process["ExitCode"] = 127
+                    writer.write(b"$ ")
+                await writer.drain()
+        finally:
+            process["Running"] = False
+
+    async def _prune(self, query: Dict[str, str], writer: asyncio.StreamWriter):
+        """POST /containers/prune: supprime les containers arrêtés (filtres label et until)"""
+        await self._delay("remove")
+        filters = json.loads(query.get("filters", "{}") or "{}")
+        labels = filters.get("label", [])
+        labels = list(labels) if isinstance(labels, (list, dict)) else [labels]
+        until = filters.get("until")
+        until = until[0] if isinstance(until, list) else until
+        if until:
+            until = time.time() - float(until[:-1]) if until.endswith("s") else float(until)
+        deleted = []
+        for container in list(self.containers.values()):
+            if container.status in ("running", "paused") or not self._matches(container, {"label": labels}):
+                continue
+            if until and container.created > until:
+                continue
+            del self.containers[container.id]
+            self._emit(container, "destroy")
+            deleted.append(container.id)
+        self._respond(writer, 200, {"ContainersDeleted": deleted, "SpaceReclaimed": 4096 * len(deleted)})
+
+    async def _container_action(self, method: str, parts: List[str], query: Dict[str, str],
+                                writer: asyncio.StreamWriter) -> bool:
+        """Opérations sur un container: inspect, start, stop, kill, rename, logs, suppression"""
+        action = parts[2] if len(parts) > 2 else None
+        container = self._find(parts[1])
+        if container is None:
+            await self._delay("inspect")
+            self._respond(writer, 404, {"message": f"No such container: {parts[1]}"})
+            await writer.drain()
+            return True
+
+        if action == "json":
+            await self._delay("inspect")
+            self._respond(writer, 200, container.inspect())
+        elif action == "start":
+            await self._delay("start")
+            if container.status == "running":
+                self._respond(writer, 304)
+            else:
+                container.status, container.started_at, container.stopped_at = "running", time.time(), None
+                self._emit(container, "start")
+                self._respond(writer, 204)
+        elif action in ("pause", "unpause"):
+            await self._delay("pause")
+            expected = "running" if action == "pause" else "paused"
+            if container.status != expected:
+                self._respond(writer, 409, {"message": f"Container {container.id} is not {expected}"})
+            else:
+                container.status = "paused" if action == "pause" else "running"
+                self._emit(container, action)
+                self._respond(writer, 204)
+        elif action in ("stop", "kill"):
+            await self._delay("stop")
+            if container.status not in ("running", "paused"):
+                self._respond(writer, 304)
+            else:
+                container.status, container.stopped_at = "exited", time.time()
+                self._emit(container, "die")
+                self._emit(container, action)
+                self._respond(writer, 204)
+        elif action == "rename":
+            await self._delay("rename")
+            name = query.get("name", "")
+            if self._find(name) is not None and self._find(name).name == name:
+                self._respond(writer, 409, {"message": f"Conflict. The name \"/{name}\" is already in use"})
+            else:
+                container.name = name
+                self._emit(container, "rename")
+                self._respond(writer, 204)
+        elif action == "logs":
+            await self._delay("logs")
+            if query.get("follow") in ("1", "true"):
+                await self._follow_logs(container, query, writer)
+                return False
+            self._respond(writer, 200, self._log_frames(container, query))
+        elif action == "stats":
+            await self._delay("stats")
+            if query.get("stream", "1") in ("1", "true", "True"):
+                await self._stream_stats(container, writer)
+                return False
+            self._respond(writer, 200, container.stats_sample())
+        elif action is None and method == "DELETE":
+            await self._delay("remove")
+            if container.status in ("running", "paused") and query.get("force") not in ("1", "true", "True"):
+                self._respond(writer, 409, {"message": "You cannot remove a running container. Stop it first"})
+            else:
+                if container.status == "running":
+                    container.status = "exited"
+                    self._emit(container, "die")
+                del self.containers[container.id]
+                self._emit(container, "destroy")
+                self._respond(writer, 204)
+        else:
+            self._respond(writer, 500, {"message": f"Action {action} non prise en charge par le moteur simulé"})
+        await writer.drain()
+        return True
+
+    def _log_frames(self, container: FakeContainer, query: Dict[str, str], since_index: int = 0,
+                    until_index: Optional[int] = None) -> bytes:
+        """Logs en trames multiplexées (stderr pour les lignes d'erreur), filtrés par since et tail"""
+        lines = container.log_lines(self.log_interval, self.max_log_lines)[since_index:until_index]
+        if query.get("since"):
+            since = float(query["since"])
+            lines = [(ts, text) for ts, text in lines if ts >= since]
+        tail = query.get("tail", "all")
+        if tail != "all":
+            lines = lines[-int(tail):] if int(tail) > 0 else []
+        timestamps = query.get("timestamps") in ("1", "true", "True")
+        frames = []
+        for ts, text in lines:
+            payload = (f"{_iso(ts)} {text}\n" if timestamps else f"{text}\n").encode()
+            stream = 2 if "erreur" in text else 1
+            frames.append(struct.pack(">BxxxL", stream, len(payload)) + payload)
+        return b"".join(frames)
+
+    async def _follow_logs(self, container: FakeContainer, query: Dict[str, str], writer: asyncio.StreamWriter):
+        """Flux continu des logs (sans longueur ni découpage HTTP, comme le démon)"""
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/vnd.docker.raw-stream\r\n\r\n")
+        # Nombre de lignes relevé avant l'envoi: une ligne produite entre-temps part au tour suivant
+        sent = len(container.log_lines(self.log_interval, self.max_log_lines))
+        writer.write(self._log_frames(container, query, until_index=sent))
+        while container.status == "running" and not writer.is_closing():
+            await asyncio.sleep(self.log_interval)
+            produced = len(container.log_lines(self.log_interval, self.max_log_lines))
+            writer.write(self._log_frames(container, {"timestamps": query.get("timestamps")}, sent, produced))
+            sent = produced
+            await writer.drain()
+
+    async def _stream_stats(self, container: FakeContainer, writer: asyncio.StreamWriter):
+        """Flux des statistiques: un objet JSON par morceau HTTP tant que le container s'exécute"""
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nTransfer-Encoding: chunked\r\n\r\n")
+        while container.status in ("running", "paused") and not writer.is_closing():
+            data = json.dumps(container.stats_sample()).encode() + b"\n"
+            writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            await writer.drain()
+            await asyncio.sleep(self.stats_interval)
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    async def _stream_events(self, writer: asyncio.StreamWriter):
+        """GET /events: un objet JSON par morceau HTTP, jusqu'à la fermeture de la connexion"""
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nTransfer-Encoding: chunked\r\n\r\n")
+        await writer.drain()
+        queue: asyncio.Queue = asyncio.Queue()
+        self._events.append(queue)
+        try:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    break
+                data = json.dumps(event).encode() + b"\n"
+                writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                await writer.drain()
+        finally:
+            self._events.remove(queue)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Moteur Docker simulé pour les mesures de performance")
+    parser.add_argument("--socket", default="/tmp/fake-docker.sock", help="Chemin du socket unix")
+    parser.add_argument("--latency", help="Latences par opération, ex: create=0.05,start=0.1")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Variation relative des latences")
+    parser.add_argument("--log-interval", type=float, default=1.0, help="Secondes entre deux lignes de log")
+    args = parser.parse_args()
+
+    async def run():
+        engine = FakeDockerEngine(args.socket, parse_latencies(args.latency), args.jitter, args.log_interval)
+        await engine.start()
+        print(f"Moteur Docker simulé sur unix://{args.socket}")
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""
+Test de charge du backend contre le moteur Docker simulé
+Lance main.app (uvicorn) sur un moteur simulé, puis simule N sessions: chargement de la page, lancement
+d'un Mini Shell (avec attente dans la file si la capacité est atteinte), lecture des logs toutes les
+2 secondes et expiration. Le débit et les latences p50/p95/p99 par point de terminaison sont écrits en JSON
+
+Utilisation (depuis backend/):
+    python -m bench.loadtest --sessions 50 --duration 60 --auto-stop 30 --output bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+
+import requests
+
+from bench.fake_docker import FakeDockerEngine, parse_latencies
+
+ADMIN_AUTH = (os.getenv("ADMIN_USERNAME", "admin"), os.getenv("ADMIN_PASSWORD", "adminpassword"))
+API_KEY = os.getenv("API_KEY", "your-secret-api-key")
+
+
+def percentile(values: List[float], rank: float) -> float:
+    """
+    Percentile au rang le plus proche d'une liste de valeurs
+
+    Args:
+        values (List[float]): Valeurs triées
+        rank (float): Rang entre 0 et 100
+
+    Returns:
+        float: Valeur du percentile (0 si la liste est vide)
+    """
+    if not values:
+        return 0.0
+    index = max(0, min(len(values) - 1, int(round(rank / 100 * len(values) + 0.5)) - 1))
+    return values[index]
+
+
+class Recorder:
+    """Classe collectant les latences par point de terminaison"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, List[float]] = {}
+        self._errors: Dict[str, int] = {}
+
+    def record(self, endpoint: str, seconds: float, ok: bool):
+        with self._lock:
+            self._latencies.setdefault(endpoint, []).append(seconds)
+            if not ok:
+                self._errors[endpoint] = self._errors.get(endpoint, 0) + 1
+
+    def report(self, elapsed: float) -> Dict:
+        """Nombre d'appels, erreurs, débit et percentiles (ms) par point de terminaison"""
+        with self._lock:
+            latencies = {endpoint: sorted(values) for endpoint, values in self._latencies.items()}
+            errors = dict(self._errors)
+        report = {}
+        for endpoint, values in sorted(latencies.items()):
+            report[endpoint] = {
+                "count": len(values),
+                "errors": errors.get(endpoint, 0),
+                "rps": round(len(values) / elapsed, 3) if elapsed else 0.0,
+                "p50_ms": round(percentile(values, 50) * 1000, 3),
+                "p95_ms": round(percentile(values, 95) * 1000, 3),
+                "p99_ms": round(percentile(values, 99) * 1000, 3),
+                "max_ms": round(values[-1] * 1000, 3),
+            }
+        return report
+
+
+class Session:
+    """Session simulée d'un utilisateur de la page Mini Shell"""
+
+    def __init__(self, index: int, base_url: str, recorder: Recorder, args: argparse.Namespace,
+                 stop_event: threading.Event):
+        self.session_id = f"bench{index}"
+        self.base_url = base_url
+        self.recorder = recorder
+        self.args = args
+        self.stop_event = stop_event
+        self.http = requests.Session()
+        self.http.auth = ADMIN_AUTH
+        self.http.headers["X-API-Key"] = API_KEY
+        self.http.headers["X-Session-Id"] = self.session_id
+        self.container_id: Optional[str] = None
+        self.queued = False
+        self.failed = False
+
+    def call(self, method: str, endpoint: str, path: str, **kwargs) -> Optional[Dict]:
+        """Effectue une requête et enregistre sa latence sous le nom générique du point de terminaison"""
+        started = time.perf_counter()
+        try:
+            response = self.http.request(method, self.base_url + path, timeout=60, **kwargs)
+            body = response.json()
+            # Une mise en file d'attente n'est pas une erreur: c'est la réponse attendue à pleine capacité
+            ok = response.status_code < 400 and (body.get("success", True) or bool((body.get("data") or {}).get("queued")))
+        except (requests.RequestException, ValueError):
+            body, ok = None, False
+        self.recorder.record(f"{method} {endpoint}", time.perf_counter() - started, ok)
+        return body
+
+    def run(self):
+        """Chargement de la page, lancement du Mini Shell puis lecture des logs jusqu'à la fin de la session"""
+        self.call("GET", "/containers", "/containers")
+        self.call("GET", "/images", "/images")
+        self.call("GET", "/mini-shell/profiles", "/mini-shell/profiles")
+
+        deadline = time.monotonic() + self.args.duration
+        while self.container_id is None and time.monotonic() < deadline and not self.stop_event.is_set():
+            body = self.call("POST", "/mini-shell/run", "/mini-shell/run", json={"session_id": self.session_id})
+            data = (body or {}).get("data") or {}
+            if body and body.get("success"):
+                self.container_id = data.get("container_id")
+            elif data.get("queued"):
+                # Capacité atteinte: suivre le ticket (long polling) puis relancer la demande une fois admis
+                self.queued = True
+                self.call("GET", "/mini-shell/queue/{ticket_id}", f"/mini-shell/queue/{data['ticket_id']}",
+                          params={"wait": min(10.0, max(0.0, deadline - time.monotonic()))})
+            else:
+                self.failed = True
+                return
+
+        cursor = None
+        next_listing = time.monotonic() + self.args.list_interval
+        while self.container_id and time.monotonic() < deadline and not self.stop_event.is_set():
+            params = {"tail": 100} if cursor is None else {"cursor": cursor}
+            body = self.call("GET", "/containers/{container_id}/logs", f"/containers/{self.container_id}/logs",
+                             params=params)
+            if body and body.get("success") and body.get("data"):
+                cursor = body["data"].get("cursor", cursor)
+            if time.monotonic() >= next_listing:
+                self.call("GET", "/containers", "/containers")
+                next_listing += self.args.list_interval
+            self.stop_event.wait(self.args.poll_interval)
+        # La session s'arrête sans libérer le container: l'expiration automatique s'en charge
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_engine(socket_path: str, args: argparse.Namespace):
+    """Démarre le moteur simulé dans sa propre boucle asyncio (thread dédié)"""
+    loop = asyncio.new_event_loop()
+    engine = FakeDockerEngine(socket_path, parse_latencies(args.latency), args.jitter, args.log_interval)
+    ready = threading.Event()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(engine.start())
+        ready.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=run, name="fake-docker", daemon=True)
+    thread.start()
+    ready.wait()
+    return engine, loop, thread
+
+
+def data_env(root: str) -> Dict[str, str]:
+    """
+    Chemins de données du backend dans un répertoire temporaire
+
+    Sans eux, main écrirait dans backend/data et réconcilierait le vrai registre des sessions
+    avec le moteur simulé
+
+    Args:
+        root (str): Répertoire temporaire du banc d'essai
+
+    Returns:
+        Dict[str, str]: Variables d'environnement à définir avant d'importer main
+    """
+    return {
+        "MINISHELL_SESSION_DB": os.path.join(root, "sessions.db"),
+        "MINISHELL_LOG_ARCHIVE": os.path.join(root, "logs"),
+        "WORKER_COORDINATION_DB": os.path.join(root, "workers.db"),
+    }
+
+
+def _start_backend(port: int):
+    """Importe main (avec l'environnement déjà configuré) et démarre uvicorn dans un thread"""
+    import uvicorn
+    import main
+
+    server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, name="uvicorn", daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError("Le backend n'a pas démarré")
+        time.sleep(0.05)
+    return server, thread
+
+
+def run(args: argparse.Namespace) -> Dict:
+    """Exécute le scénario et retourne le rapport"""
+    socket_path = os.path.join(tempfile.mkdtemp(prefix="mishu-bench-"), "docker.sock")
+    engine, loop, loop_thread = _start_engine(socket_path, args)
+
+    # Configuration lue par docker_control à l'import
+    os.environ.update({
+        "DOCKER_HOST": f"unix://{socket_path}",
+        "MINISHELL_PREBUILD": "0",
+        "MINISHELL_AUTO_STOP": str(args.auto_stop),
+        "MINISHELL_MAX_RUNNING": str(args.max_running),
+        "MINISHELL_POOL_SIZE": str(args.pool_size),
+        "MINISHELL_PAUSE_AFTER": str(args.pause_after),
+        "RATE_LIMITS": args.rate_limits,
+        **data_env(os.path.dirname(socket_path)),
+    })
+    port = _free_port()
+    server, server_thread = _start_backend(port)
+    base_url = f"http://127.0.0.1:{port}"
+
+    recorder = Recorder()
+    stop_event = threading.Event()
+    sessions = [Session(i, base_url, recorder, args, stop_event) for i in range(args.sessions)]
+    threads = []
+    started = time.monotonic()
+    try:
+        for i, session in enumerate(sessions):
+            thread = threading.Thread(target=session.run, name=session.session_id, daemon=True)
+            thread.start()
+            threads.append(thread)
+            if args.ramp and i < len(sessions) - 1:
+                time.sleep(args.ramp / len(sessions))
+        for thread in threads:
+            thread.join()
+        load_elapsed = time.monotonic() - started
+
+        # Laisser l'expiration automatique arrêter les containers encore actifs
+        launched = {s.container_id for s in sessions if s.container_id}
+        expiry_deadline = time.monotonic() + args.auto_stop + args.expiry_grace
+        while time.monotonic() < expiry_deadline:
+            containers = dict(engine.containers)
+            if not any(cid in containers and containers[cid].status == "running" for cid in launched):
+                break
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        stop_event.set()
+        load_elapsed = time.monotonic() - started
+    finally:
+        server.should_exit = True
+        server_thread.join(timeout=10)
+        asyncio.run_coroutine_threadsafe(engine.stop(), loop).result(timeout=5)
+        loop.call_soon_threadsafe(loop.stop)
+        loop_thread.join(timeout=5)
+        loop.close()
+
+    containers = dict(engine.containers)
+    endpoints = recorder.report(load_elapsed)
+    return {
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "duration_s": round(load_elapsed, 3),
+        "requests": sum(e["count"] for e in endpoints.values()),
+        "throughput_rps": round(sum(e["count"] for e in endpoints.values()) / load_elapsed, 3),
+        "endpoints": endpoints,
+        "sessions": {
+            "total": len(sessions),
+            "launched": len(launched),
+            "queued": sum(1 for s in sessions if s.queued),
+            "failed": sum(1 for s in sessions if s.failed),
+            "expired": sum(1 for cid in launched if cid not in containers or containers[cid].status != "running"),
+        },
+        "engine": engine.stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de charge du backend Mishu contre un moteur Docker simulé")
+    parser.add_argument("--sessions", type=int, default=20, help="Nombre de sessions simulées")
+    parser.add_argument("--ramp", type=float, default=10.0, help="Durée de montée en charge en secondes")
+    parser.add_argument("--duration", type=float, default=60.0, help="Durée d'une session en secondes")
+    parser.add_argument("--poll-interval", type=float, default=2.0, help="Intervalle de lecture des logs")
+    parser.add_argument("--list-interval", type=float, default=10.0, help="Intervalle de rafraîchissement de la liste")
+    parser.add_argument("--auto-stop", type=int, default=30, help="Durée de vie des Mini Shell (MINISHELL_AUTO_STOP)")
+    parser.add_argument("--expiry-grace", type=float, default=10.0, help="Marge d'attente de l'expiration")
+    parser.add_argument("--max-running", type=int, default=10, help="Capacité (MINISHELL_MAX_RUNNING)")
+    parser.add_argument("--pool-size", type=int, default=2, help="Containers pré-démarrés (MINISHELL_POOL_SIZE)")
+    parser.add_argument("--pause-after", type=int, default=0,
+                        help="Mise en pause après inactivité (MINISHELL_PAUSE_AFTER, 0 = désactivée)")
+    parser.add_argument("--rate-limits", default="",
+                        help="Budgets de limitation du débit (RATE_LIMITS, vide = désactivée)")
+    parser.add_argument("--latency", help="Latences du moteur simulé, ex: create=0.05,start=0.1")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Variation relative des latences")
+    parser.add_argument("--log-interval", type=float, default=0.5, help="Secondes entre deux lignes de log")
+    parser.add_argument("--output", default="bench-results.json", help="Fichier de résultats JSON ('-' pour stdout)")
+    args = parser.parse_args()
+
+    report = run(args)
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output == "-":
+        print(output)
+    else:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+        print(f"Résultats écrits dans {args.output} ({report['requests']} requêtes, "
+              f"{report['throughput_rps']} req/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Mesure du coût des réponses des routes de lecture fréquentes
+Pour chaque mode (réponses par défaut puis FAST_RESPONSES), un processus dédié lance quelques Mini Shell
+sur le moteur simulé puis appelle directement l'application ASGI (sans réseau ni cache de réponses):
+le temps processeur de la boucle asyncio, le temps écoulé et la taille transmise sont relevés par requête
+pour /containers et /containers/{id}/logs
+
+Utilisation (depuis backend/):
+    python -m bench.responses --requests 500 --tail 1000 --output responses.json
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from bench.loadtest import ADMIN_AUTH, API_KEY, _start_engine, data_env, percentile
+
+MODES = {"default": "false", "fast": "true"}
+
+
+async def call(app, method: str, path: str, params: Optional[Dict] = None,
+               headers: Optional[Dict[str, str]] = None, body: bytes = b"") -> Tuple[int, Dict[str, str], bytes]:
+    """
+    Appelle l'application ASGI comme le ferait le serveur
+
+    Args:
+        app: Application ASGI
+        method (str): Méthode HTTP
+        path (str): Chemin
+        params (Dict, optional): Paramètres de la requête
+        headers (Dict[str, str], optional): En-têtes
+        body (bytes): Corps de la requête
+
+    Returns:
+        Tuple[int, Dict[str, str], bytes]: Code, en-têtes et corps de la réponse
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": urlencode(params or {}).encode(),
+        "headers": [(key.lower().encode(), value.encode()) for key, value in (headers or {}).items()],
+        "client": ("127.0.0.1", 50000),
+        "server": ("127.0.0.1", 8000),
+    }
+    response = {"status": 0, "headers": {}, "body": []}
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = {key.decode(): value.decode() for key, value in message["headers"]}
+        elif message["type"] == "http.response.body":
+            response["body"].append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return response["status"], response["headers"], b"".join(response["body"])
+
+
+async def measure(app, count: int, path: str, params: Dict, headers: Dict[str, str]) -> Dict:
+    """Temps processeur et temps écoulé (µs) par requête, et taille moyenne transmise"""
+    cpu: List[float] = []
+    wall: List[float] = []
+    sizes = 0
+    encodings = set()
+    for _ in range(count):
+        cpu_started, wall_started = time.thread_time(), time.perf_counter()
+        status, response_headers, body = await call(app, "GET", path, params, headers)
+        cpu.append(time.thread_time() - cpu_started)
+        wall.append(time.perf_counter() - wall_started)
+        if status != 200:
+            raise RuntimeError(f"{path}: code {status}")
+        sizes += len(body)
+        encodings.add(response_headers.get("content-encoding", "identity"))
+    cpu.sort()
+    wall.sort()
+    return {
+        "requests": count,
+        "cpu_mean_us": round(sum(cpu) / count * 1e6, 1),
+        "cpu_p50_us": round(percentile(cpu, 50) * 1e6, 1),
+        "cpu_p95_us": round(percentile(cpu, 95) * 1e6, 1),
+        "wall_p50_us": round(percentile(wall, 50) * 1e6, 1),
+        "wall_p95_us": round(percentile(wall, 95) * 1e6, 1),
+        "bytes": sizes // count,
+        "encoding": ",".join(sorted(encodings)),
+    }
+
+
+async def run_mode(args: argparse.Namespace) -> Dict:
+    """Mesure un mode dans le processus courant (l'environnement est déjà configuré)"""
+    import main
+    from fast_json import orjson
+
+    await main.app.router.startup()
+    try:
+        authorization = "Basic " + base64.b64encode(":".join(ADMIN_AUTH).encode()).decode()
+        headers = {"authorization": authorization, "x-api-key": API_KEY, "accept-encoding": "gzip"}
+        launched = []
+        for i in range(args.sessions):
+            _, _, body = await call(
+                main.app, "POST", "/mini-shell/run",
+                headers={"authorization": authorization, "content-type": "application/json"},
+                body=json.dumps({"session_id": f"bench{i}"}).encode()
+            )
+            data = json.loads(body).get("data") or {}
+            if data.get("container_id"):
+                launched.append(data["container_id"])
+        if not launched:
+            raise RuntimeError("Aucun Mini Shell lancé")
+
+        # Attendre que le tampon de logs contienne au moins tail lignes
+        container_id = launched[0]
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            _, _, body = await call(main.app, "GET", f"/containers/{container_id}/logs",
+                                    {"tail": args.tail}, {"x-api-key": API_KEY})
+            lines = (json.loads(body).get("data") or {}).get("logs") or ""
+            if lines.count("\n") + 1 >= args.tail:
+                break
+            await asyncio.sleep(0.2)
+
+        # Préchauffage, puis mesures
+        await measure(main.app, 10, "/containers", {}, headers)
+        await measure(main.app, 10, f"/containers/{container_id}/logs", {"tail": args.tail}, headers)
+        return {
+            "fast_responses": main.FAST_RESPONSES,
+            "serializer": "orjson" if main.FAST_RESPONSES and orjson is not None else "json",
+            "gzip_minimum_size": main.GZIP_MINIMUM_SIZE,
+            "containers": len(launched),
+            "endpoints": {
+                "GET /containers": await measure(main.app, args.requests, "/containers", {}, headers),
+                "GET /containers/{container_id}/logs": await measure(
+                    main.app, args.requests, f"/containers/{container_id}/logs", {"tail": args.tail}, headers
+                ),
+            },
+        }
+    finally:
+        await main.app.router.shutdown()
+
+
+def child(args: argparse.Namespace):
+    """Processus de mesure d'un mode: moteur simulé, configuration puis mesures"""
+    socket_path = os.path.join(tempfile.mkdtemp(prefix="mishu-bench-"), "docker.sock")
+    engine, loop, loop_thread = _start_engine(socket_path, argparse.Namespace(
+        latency=None, jitter=0.0, log_interval=args.log_interval
+    ))
+    os.environ.update({
+        "DOCKER_HOST": f"unix://{socket_path}",
+        "MINISHELL_PREBUILD": "0",
+        "MINISHELL_POOL_SIZE": "0",
+        **data_env(os.path.dirname(socket_path)),
+        "RESPONSE_CACHE_TTL": "0",
+        "RATE_LIMITS": "",
+        "FAST_RESPONSES": MODES[args.mode],
+        "GZIP_MINIMUM_SIZE": str(args.gzip_minimum_size),
+    })
+    try:
+        report = asyncio.run(run_mode(args))
+    finally:
+        asyncio.run_coroutine_threadsafe(engine.stop(), loop).result(timeout=5)
+        loop.call_soon_threadsafe(loop.stop)
+        loop_thread.join(timeout=5)
+        loop.close()
+    print(json.dumps(report))
+
+
+def compare(reports: Dict[str, Dict]) -> Dict:
+    """Rapport CPU par requête du mode rapide sur le mode par défaut, par point de terminaison"""
+    comparison = {}
+    for endpoint, default in reports["default"]["endpoints"].items():
+        fast = reports["fast"]["endpoints"][endpoint]
+        comparison[endpoint] = {
+            "cpu_mean_us": {"default": default["cpu_mean_us"], "fast": fast["cpu_mean_us"]},
+            "cpu_ratio": round(fast["cpu_mean_us"] / default["cpu_mean_us"], 3) if default["cpu_mean_us"] else None,
+        }
+    return comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Coût des réponses de lecture du backend Mishu, par mode")
+    parser.add_argument("--requests", type=int, default=300, help="Requêtes mesurées par point de terminaison")
+    parser.add_argument("--sessions", type=int, default=20, help="Mini Shell lancés (taille de /containers)")
+    parser.add_argument("--tail", type=int, default=1000, help="Lignes de logs demandées")
+    parser.add_argument("--log-interval", type=float, default=0.002, help="Secondes entre deux lignes de log")
+    parser.add_argument("--gzip-minimum-size", type=int, default=1024, help="GZIP_MINIMUM_SIZE (0 = désactivée)")
+    parser.add_argument("--mode", choices=sorted(MODES), help=argparse.SUPPRESS)
+    parser.add_argument("--output", default="-", help="Fichier de résultats JSON ('-' pour stdout)")
+    args = parser.parse_args()
+
+    if args.mode:
+        child(args)
+        return
+
+    reports = {}
+    for mode in MODES:
+        command = [sys.executable, "-m", "bench.responses", "--mode", mode] + [
+            f"--{key.replace('_', '-')}={value}" for key, value in vars(args).items() if key not in ("mode", "output")
+        ]
+        result = subprocess.run(command, stdout=subprocess.PIPE, check=True)
+        reports[mode] = json.loads(result.stdout.decode().strip().splitlines()[-1])
+
+    output = json.dumps({"modes": reports, "comparison": compare(reports)}, indent=2, ensure_ascii=False)
+    if args.output == "-":
+        print(output)
+    else:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+        print(f"Résultats écrits dans {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+"""
+Module de construction des images Docker en tâche de fond
+Chaque construction est un job identifié dont la progression peut être suivie; les demandes
+concurrentes pour un même tag partagent le même job, et une empreinte du contexte de
+construction permet d'éviter de reconstruire une image inchangée
+"""
+
+import asyncio
+import collections
+import concurrent.futures
+import fnmatch
+import hashlib
+import itertools
+import logging
+import os
+import threading
+import time
+import uuid
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+import docker
+
+logger = logging.getLogger(__name__)
+
+# Label posé sur les images construites avec l'empreinte de leur contexte
+CONTEXT_HASH_LABEL = "mishu.context_hash"
+
+# États d'un job de construction
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+SKIPPED = "skipped"
+FAILED = "failed"
+FINISHED_STATES = {SUCCEEDED, SKIPPED, FAILED}
+
+
+def context_hash(path: str, dockerfile: str = 'Dockerfile', buildargs: Optional[Dict[str, str]] = None) -> str:
+    """
+    Calcule l'empreinte SHA-256 d'un contexte de construction
+
+    Args:
+        path (str): Répertoire du contexte
+        dockerfile (str): Nom du Dockerfile
+        buildargs (Dict[str, str], optional): Arguments de construction
+
+    Returns:
+        str: Empreinte hexadécimale (chemins relatifs, contenus, Dockerfile et arguments)
+    """
+    ignored = ['.git']
+    dockerignore = os.path.join(path, '.dockerignore')
+    if os.path.exists(dockerignore):
+        with open(dockerignore) as f:
+            ignored += [
+                line.strip().rstrip('/') for line in f
+                if line.strip() and not line.startswith('#') and not line.startswith('!')
+            ]
+
+    digest = hashlib.sha256()
+    digest.update(f"{dockerfile}\0{sorted((buildargs or {}).items())}\0".encode())
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        relative_root = os.path.relpath(root, path)
+        for name in sorted(files):
+            relative = os.path.normpath(os.path.join(relative_root, name))
+            if any(fnmatch.fnmatch(relative, pattern) or relative.startswith(f"{pattern}/")
+                   for pattern in ignored):
+                continue
+            digest.update(f"{relative}\0".encode())
+            with open(os.path.join(root, name), 'rb') as f:
+                for block in iter(lambda: f.read(65536), b''):
+                    digest.update(block)
+    return digest.hexdigest()
+
+
+class BuildJob:
+    """Construction d'une image, avec sa progression et son résultat"""
+
+    def __init__(self, tag: str, path: str, dockerfile: str, buildargs: Optional[Dict[str, str]],
+                 force: bool, max_lines: int):
+        """
+        Initialise le job
+
+        Args:
+            tag (str): Tag de l'image construite
+            path (str): Répertoire du contexte de construction
+            dockerfile (str): Nom du Dockerfile
+            buildargs (Dict[str, str], optional): Arguments de construction
+            force (bool): Reconstruire même si l'empreinte du contexte est inchangée
+            max_lines (int): Nombre de lignes de progression conservées
+        """
+        self.id = uuid.uuid4().hex[:12]
+        self.tag = tag
+        self.path = path
+        self.dockerfile = dockerfile
+        self.buildargs = buildargs
+        self.force = force
+        self.status = PENDING
+        self.message = ""
+        self.context_hash: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+        self.lines: Deque[str] = collections.deque(maxlen=max_lines)
+        self.total_lines = 0
+        self._cond = threading.Condition()
+        self._waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+
+    @property
+    def done(self) -> bool:
+        """Indique si la construction est terminée (succès, image à jour ou échec)"""
+        return self.status in FINISHED_STATES
+
+    @property
+    def succeeded(self) -> bool:
+        """Indique si l'image est disponible à l'issue du job"""
+        return self.status in (SUCCEEDED, SKIPPED)
+
+    def to_dict(self) -> Dict:
+        """Retourne l'état du job"""
+        return {
+            "id": self.id,
+            "tag": self.tag,
+            "status": self.status,
+            "message": self.message,
+            "context_hash": self.context_hash,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration": (self.finished_at or time.time()) - self.started_at if self.started_at else None,
+            "lines": self.total_lines,
+        }
+
+    def read(self, cursor: int = 0) -> Tuple[List[str], int]:
+        """
+        Lit les lignes de progression postérieures à un curseur
+
+        Args:
+            cursor (int): Nombre de lignes déjà reçues
+
+        Returns:
+            Tuple[List[str], int]: (lignes, prochain curseur)
+        """
+        with self._cond:
+            first = self.total_lines - len(self.lines)
+            start = max(cursor, first) - first
+            return list(itertools.islice(self.lines, start, None)), self.total_lines
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Attend la fin du job depuis un thread (True si terminé)"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.done, timeout)
+
+    async def wait_async(self, cursor: int = 0, timeout: Optional[float] = None) -> Tuple[List[str], int, bool]:
+        """
+        Attend de nouvelles lignes ou la fin du job sans bloquer la boucle asyncio
+
+        Args:
+            cursor (int): Nombre de lignes déjà reçues
+            timeout (float, optional): Délai maximum d'attente en secondes
+
+        Returns:
+            Tuple[List[str], int, bool]: (lignes, prochain curseur, job terminé)
+        """
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._cond:
+            pending = self.total_lines <= cursor and not self.done
+            if pending:
+                self._waiters.add(waiter)
+        if pending:
+            try:
+                await asyncio.wait_for(waiter[1].wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                with self._cond:
+                    self._waiters.discard(waiter)
+        lines, cursor = self.read(cursor)
+        return lines, cursor, self.done and cursor == self.total_lines
+
+    def _emit(self, line: str):
+        """Ajoute une ligne de progression et réveille les clients qui la suivent"""
+        with self._cond:
+            self.lines.append(line)
+            self.total_lines += 1
+            self._notify()
+
+    def _finish(self, status: str, message: str):
+        """Enregistre le résultat du job et réveille tous les clients en attente"""
+        with self._cond:
+            self.status = status
+            self.message = message
+            self.finished_at = time.time()
+            self._notify()
+
+    def _notify(self):
+        """Réveille les attentes synchrones et asynchrones (appelé avec le verrou)"""
+        self._cond.notify_all()
+        for loop, event in self._waiters:
+            loop.call_soon_threadsafe(event.set)
+
+
+class BuildManager:
+    """Classe exécutant les constructions d'images en tâche de fond, une seule à la fois par tag"""
+
+    def __init__(self, client: docker.DockerClient, max_workers: int = 2, history: int = 50,
+                 max_lines: int = 2000):
+        """
+        Initialise le gestionnaire de constructions
+
+        Args:
+            client (docker.DockerClient): Client Docker
+            max_workers (int): Nombre de constructions simultanées
+            history (int): Nombre de jobs terminés conservés pour consultation
+            max_lines (int): Nombre de lignes de progression conservées par job
+        """
+        self.client = client
+        self.history = history
+        self.max_lines = max_lines
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers,
+                                                               thread_name_prefix="image-build")
+        self._jobs: "collections.OrderedDict[str, BuildJob]" = collections.OrderedDict()
+        self._in_flight: Dict[str, BuildJob] = {}
+        self._lock = threading.Lock()
+
+        self.joined = 0
+
+    def submit(self,
+               path: str,
+               tag: str,
+               dockerfile: str = 'Dockerfile',
+               buildargs: Optional[Dict[str, str]] = None,
+               force: bool = False) -> BuildJob:
+        """
+        Lance la construction d'une image, ou rejoint celle déjà en cours pour ce tag
+
+        Args:
+            path (str): Répertoire du contexte de construction
+            tag (str): Tag de l'image
+            dockerfile (str): Nom du Dockerfile
+            buildargs (Dict[str, str], optional): Arguments de construction
+            force (bool): Reconstruire même si l'image est à jour
+
+        Returns:
+            BuildJob: Job de construction (nouveau ou partagé)
+        """
+        with self._lock:
+            job = self._in_flight.get(tag)
+            if job is not None:
+                self.joined += 1
+                logger.info(f"Construction de l'image {tag} déjà en cours (job {job.id}), attente partagée")
+                return job
+
+            job = BuildJob(tag, path, dockerfile, buildargs, force, self.max_lines)
+            self._in_flight[tag] = job
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.history:
+                oldest = next(iter(self._jobs.values()))
+                if not oldest.done:
+                    break
+                self._jobs.popitem(last=False)
+
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[BuildJob]:
+        """Retourne un job par son identifiant"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[Dict]:
+        """Liste les jobs connus, du plus récent au plus ancien"""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return [job.to_dict() for job in reversed(jobs)]
+
+    def stats(self) -> Dict:
+        """Retourne les compteurs de constructions par état"""
+        with self._lock:
+            counts = collections.Counter(job.status for job in self._jobs.values())
+            return {"in_flight": len(self._in_flight), "joined": self.joined, **counts}
+
+    def shutdown(self):
+        """Arrête l'exécuteur sans attendre les constructions en cours"""
+        self._executor.shutdown(wait=False)
+
+    def _run(self, job: BuildJob):
+        """Exécute un job de construction dans un thread de l'exécuteur"""
+        job.status = RUNNING
+        job.started_at = time.time()
+        try:
+            status, message = self._build(job)
+        except Exception as e:
+            status, message = FAILED, f"Erreur lors de la construction de l'image {job.tag}: {e}"
+        finally:
+            with self._lock:
+                self._in_flight.pop(job.tag, None)
+
+        if status == FAILED:
+            logger.error(message)
+        else:
+            logger.info(message)
+        job._finish(status, message)
+
+    def _build(self, job: BuildJob) -> Tuple[str, str]:
+        """Construit l'image si son contexte a changé, en relayant la progression au job"""
+        dockerfile_path = os.path.join(job.path, job.dockerfile)
+        if not os.path.exists(dockerfile_path):
+            return FAILED, f"Le Dockerfile {dockerfile_path} n'existe pas"
+
+        job.context_hash = context_hash(job.path, job.dockerfile, job.buildargs)
+        if not job.force and self._current_hash(job.tag) == job.context_hash:
+            return SKIPPED, f"Image {job.tag} à jour (contexte inchangé), construction ignorée"
+
+        logger.info(f"Construction de l'image {job.tag} à partir de {dockerfile_path} (job {job.id})...")
+        for chunk in self.client.api.build(
+            path=job.path,
+            tag=job.tag,
+            dockerfile=job.dockerfile,
+            buildargs=job.buildargs,
+            labels={CONTEXT_HASH_LABEL: job.context_hash},
+            rm=True,
+            decode=True
+        ):
+            if "error" in chunk:
+                return FAILED, f"Erreur lors de la construction de l'image {job.tag}: {chunk['error'].strip()}"
+            if "stream" in chunk:
+                for line in chunk["stream"].splitlines():
+                    if line.strip():
+                        job._emit(line)
+            elif "status" in chunk:
+                job._emit(" ".join(filter(None, (chunk.get("id"), chunk["status"], chunk.get("progress")))))
+
+        return SUCCEEDED, f"Image {job.tag} construite avec succès"
+
+    def _current_hash(self, tag: str) -> Optional[str]:
+        """Retourne l'empreinte du contexte de l'image existante (None si absente ou inconnue)"""
+        try:
+            labels = self.client.api.inspect_image(tag).get("Config", {}).get("Labels") or {}
+        except docker.errors.NotFound:
+            return None
+        return labels.get(CONTEXT_HASH_LABEL)
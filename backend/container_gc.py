@@ -0,0 +1,122 @@
+"""
+Module de nettoyage périodique des containers Mini Shell arrêtés
+Les containers arrêtés depuis longtemps sont supprimés par un appel prune filtré côté démon (label et
+ancienneté), un par moteur: le backend ne liste ni n'inspecte les containers à supprimer
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ContainerGC:
+    """Classe supprimant périodiquement les containers arrêtés d'un label sur chaque moteur"""
+
+    def __init__(self,
+                 engines: Callable[[], Iterable],
+                 labels: Dict[str, str],
+                 max_age: int,
+                 interval: float,
+                 on_pruned: Optional[Callable[[object, List[str]], None]] = None):
+        """
+        Initialise le nettoyage
+
+        Args:
+            engines (Callable[[], Iterable]): Retourne les moteurs à nettoyer (attributs name et client)
+            labels (Dict[str, str]): Labels des containers concernés
+            max_age (int): Ancienneté minimale (depuis la création) d'un container supprimé, en secondes
+            interval (float): Intervalle entre deux nettoyages en secondes (0 pour désactiver)
+            on_pruned (Callable[[object, List[str]], None], optional): Appelé avec le moteur et les IDs supprimés
+        """
+        self.engines = engines
+        self.labels = labels
+        self.max_age = max_age
+        self.interval = interval
+        self.on_pruned = on_pruned
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        self.runs = 0
+        self.pruned = 0
+        self.space_reclaimed = 0
+        self.last_run: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    def start(self):
+        """Démarre le thread de nettoyage (sans effet si le nettoyage est désactivé)"""
+        if self.interval <= 0 or (self._thread and self._thread.is_alive()):
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="container-gc")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Arrête le thread de nettoyage"""
+        self._stopping.set()
+
+    def collect(self, max_age: Optional[int] = None) -> Dict:
+        """
+        Supprime les containers arrêtés plus anciens que max_age sur chaque moteur
+
+        Args:
+            max_age (int, optional): Ancienneté minimale en secondes (celle du nettoyage périodique par défaut)
+
+        Returns:
+            Dict: IDs supprimés par moteur, espace libéré et erreurs
+        """
+        max_age = self.max_age if max_age is None else max_age
+        filters = {"label": [f"{key}={value}" for key, value in self.labels.items()]}
+        if max_age > 0:
+            filters["until"] = f"{max_age}s"
+
+        deleted: Dict[str, List[str]] = {}
+        errors: Dict[str, str] = {}
+        reclaimed = 0
+        # Un seul nettoyage à la fois (périodique ou demandé par l'API)
+        with self._lock:
+            for engine in self.engines():
+                try:
+                    result = engine.client.containers.prune(filters=filters)
+                except Exception as e:
+                    errors[engine.name] = str(e)
+                    logger.error(f"Erreur lors du nettoyage des containers du moteur {engine.name}: {e}")
+                    continue
+                ids = result.get("ContainersDeleted") or []
+                reclaimed += result.get("SpaceReclaimed") or 0
+                if ids:
+                    deleted[engine.name] = ids
+                    logger.info(f"{len(ids)} containers arrêtés supprimés sur le moteur {engine.name}")
+                    if self.on_pruned:
+                        self.on_pruned(engine, ids)
+
+            self.runs += 1
+            self.pruned += sum(len(ids) for ids in deleted.values())
+            self.space_reclaimed += reclaimed
+            self.last_run = time.time()
+            self.last_error = next(iter(errors.values()), None)
+        return {"deleted": deleted, "space_reclaimed": reclaimed, "errors": errors}
+
+    def stats(self) -> Dict:
+        """Retourne la configuration et les compteurs du nettoyage"""
+        return {
+            "interval": self.interval,
+            "max_age": self.max_age,
+            "runs": self.runs,
+            "pruned": self.pruned,
+            "space_reclaimed": self.space_reclaimed,
+            "last_run": self.last_run,
+            "last_error": self.last_error,
+        }
+
+    def _run(self):
+        """Boucle principale: un nettoyage toutes les interval secondes"""
+        while not self._stopping.wait(self.interval):
+            try:
+                self.collect()
+            except Exception as e:
+                logger.error(f"Erreur lors du nettoyage des containers: {e}")
@@ -0,0 +1,238 @@
+"""
+Module d'index en mémoire des containers et images Docker
+L'index est construit à partir d'un listing complet puis tenu à jour par le flux d'événements Docker
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import docker
+
+logger = logging.getLogger(__name__)
+
+# Actions du flux d'événements qui modifient l'état d'un container ou d'une image
+CONTAINER_ACTIONS = {"create", "start", "restart", "die", "stop", "kill", "pause",
+                     "unpause", "rename", "update", "destroy", "oom"}
+IMAGE_ACTIONS = {"tag", "untag", "delete", "import", "load", "pull"}
+
+
+def _timestamp_to_iso(value) -> str:
+    """Convertit un timestamp Docker (secondes) en date ISO 8601"""
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, tz=timezone.utc).isoformat()
+    return str(value)
+
+
+def container_entry(summary: Dict) -> Dict:
+    """Normalise un résumé de container renvoyé par /containers/json"""
+    names = summary.get("Names") or []
+    return {
+        "id": summary["Id"],
+        "name": names[0].lstrip('/') if names else summary["Id"][:12],
+        "image": summary.get("Image"),
+        "image_id": summary.get("ImageID"),
+        "status": summary.get("State"),
+        "created": _timestamp_to_iso(summary.get("Created")),
+        "labels": summary.get("Labels") or {},
+    }
+
+
+def image_entry(summary: Dict) -> Dict:
+    """Normalise un résumé d'image renvoyé par /images/json"""
+    return {
+        "id": summary["Id"],
+        "tags": [tag for tag in (summary.get("RepoTags") or []) if tag != "<none>:<none>"],
+        "size": summary.get("Size", 0) / (1024 * 1024),  # Taille en MB
+        "created": _timestamp_to_iso(summary.get("Created")),
+    }
+
+
+class ContainerIndex:
+    """Classe maintenant un index des containers et images alimenté par les événements Docker"""
+
+    def __init__(self,
+                 client: docker.DockerClient,
+                 reconnect_delay: float = 2.0,
+                 on_container_event: Optional[Callable[[str, str], None]] = None):
+        """
+        Initialise l'index
+
+        Args:
+            client (docker.DockerClient): Client Docker
+            reconnect_delay (float): Délai en secondes avant de se reconnecter au flux d'événements
+            on_container_event (Callable[[str, str], None], optional): Appelé avec (action, container_id)
+                une fois l'index mis à jour pour un événement de container
+        """
+        self.client = client
+        self.reconnect_delay = reconnect_delay
+        self.on_container_event = on_container_event
+
+        self._containers: Dict[str, Dict] = {}
+        self._names: Dict[str, str] = {}
+        self._images: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stream = None
+
+        self.generation = 0
+        self.resyncs = 0
+        self.events = 0
+        self.synced_at: Optional[float] = None
+        self.connected = False
+
+    @property
+    def ready(self) -> bool:
+        """Indique si l'index peut servir les lectures (synchronisé et connecté au flux)"""
+        return self.connected and self.synced_at is not None
+
+    def start(self):
+        """Démarre le thread de suivi des événements"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="container-index")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Arrête le suivi des événements"""
+        self._stopping.set()
+        self.connected = False
+        if self._stream is not None:
+            try:
+                self._stream.close()
+            except Exception:
+                pass
+
+    def containers(self, all_containers: bool = True, labels: Optional[Dict[str, str]] = None) -> List[Dict]:
+        """
+        Liste les containers indexés
+
+        Args:
+            all_containers (bool): Si True, inclut les containers arrêtés
+            labels (Dict[str, str], optional): Labels que les containers doivent porter
+
+        Returns:
+            List[Dict]: Containers correspondant aux critères
+        """
+        with self._lock:
+            entries = list(self._containers.values())
+        return [
+            entry for entry in entries
+            if (all_containers or entry["status"] == "running")
+            and all(entry["labels"].get(key) == value for key, value in (labels or {}).items())
+        ]
+
+    def get(self, container_id_or_name: str) -> Optional[Dict]:
+        """
+        Recherche un container par ID complet, préfixe d'ID ou nom
+
+        Args:
+            container_id_or_name (str): ID ou nom du container
+
+        Returns:
+            Dict ou None si le container n'est pas indexé
+        """
+        key = container_id_or_name.lstrip('/')
+        with self._lock:
+            entry = self._containers.get(key)
+            if entry:
+                return entry
+            container_id = self._names.get(key)
+            if container_id:
+                return self._containers.get(container_id)
+            if len(key) >= 12:
+                matches = [e for cid, e in self._containers.items() if cid.startswith(key)]
+                if len(matches) == 1:
+                    return matches[0]
+        return None
+
+    def images(self) -> List[Dict]:
+        """Liste les images indexées"""
+        with self._lock:
+            return list(self._images.values())
+
+    def stats(self) -> Dict:
+        """Retourne l'état de l'index (génération, fraîcheur, compteurs)"""
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "generation": self.generation,
+                "containers": len(self._containers),
+                "images": len(self._images),
+                "events": self.events,
+                "resyncs": self.resyncs,
+                "synced_at": self.synced_at,
+                "age": time.time() - self.synced_at if self.synced_at else None,
+            }
+
+    def resync(self):
+        """Reconstruit l'index à partir d'un listing complet des containers et images"""
+        containers = {s["Id"]: container_entry(s) for s in self.client.api.containers(all=True)}
+        images = {s["Id"]: image_entry(s) for s in self.client.api.images()}
+        with self._lock:
+            self._containers = containers
+            self._names = {entry["name"]: cid for cid, entry in containers.items()}
+            self._images = images
+            self.generation += 1
+            self.resyncs += 1
+            self.synced_at = time.time()
+        logger.info(f"Index Docker synchronisé ({len(containers)} containers, {len(images)} images)")
+
+    def _run(self):
+        """Boucle de suivi: ouvre le flux, resynchronise puis applique les événements"""
+        while not self._stopping.is_set():
+            try:
+                # Ouvrir le flux avant le listing pour ne perdre aucun événement intermédiaire
+                self._stream = self.client.events(
+                    decode=True,
+                    filters={"type": ["container", "image"]}
+                )
+                self.resync()
+                self.connected = True
+                for event in self._stream:
+                    self._apply(event)
+            except Exception as e:
+                if not self._stopping.is_set():
+                    logger.error(f"Flux d'événements Docker interrompu: {e}")
+            finally:
+                self.connected = False
+            self._stopping.wait(self.reconnect_delay)
+
+    def _apply(self, event: Dict):
+        """Met à jour l'index à partir d'un événement Docker"""
+        action = (event.get("Action") or event.get("status") or "").split(":")[0]
+        actor_id = (event.get("Actor") or {}).get("ID") or event.get("id")
+        if not actor_id:
+            return
+
+        if event.get("Type") == "container" and action in CONTAINER_ACTIONS:
+            if action == "destroy":
+                summary = None
+            else:
+                found = self.client.api.containers(all=True, filters={"id": actor_id})
+                summary = found[0] if found else None
+            with self._lock:
+                previous = self._containers.pop(actor_id, None)
+                if previous:
+                    self._names.pop(previous["name"], None)
+                if summary:
+                    entry = container_entry(summary)
+                    self._containers[actor_id] = entry
+                    self._names[entry["name"]] = actor_id
+                self.generation += 1
+                self.events += 1
+            if self.on_container_event:
+                self.on_container_event(action, actor_id)
+
+        elif event.get("Type") == "image" and action in IMAGE_ACTIONS:
+            # Un tag peut changer plusieurs images: relister les images (un seul appel)
+            images = {s["Id"]: image_entry(s) for s in self.client.api.images()}
+            with self._lock:
+                self._images = images
+                self.generation += 1
+                self.events += 1
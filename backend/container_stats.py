@@ -0,0 +1,454 @@
+"""
+Module de collecte de la consommation des Mini Shell (processeur, mémoire, processus, entrées/sorties)
+Un seul flux Docker de statistiques est suivi par container. Chaque échantillon est ajouté en O(1) à des
+anneaux de taille fixe à plusieurs résolutions (par défaut 1 s, 10 s et 1 min): une série stockée en colonnes
+(sommes et nombre d'échantillons par intervalle) par container, et une série agrégée, tenue à jour de façon
+incrémentale, égale à la somme des moyennes des containers. La mémoire est bornée par le nombre de
+containers suivis et aucune agrégation n'est recalculée à la lecture
+"""
+
+import collections
+import logging
+import threading
+import time
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Mesures de chaque échantillon (les débits sont en octets par seconde)
+METRICS = (
+    "cpu_percent",
+    "memory_bytes",
+    "memory_percent",
+    "pids",
+    "net_rx_bps",
+    "net_tx_bps",
+    "block_read_bps",
+    "block_write_bps",
+)
+
+
+def parse_resolutions(value: Optional[str]) -> List[Tuple[int, int]]:
+    """
+    Lit les résolutions "pas:intervalles,..."
+
+    Args:
+        value (str, optional): Résolutions, par exemple "1:300,10:360,60:360" (5 min à la seconde, 1 h par
+            intervalles de 10 s, 6 h à la minute)
+
+    Returns:
+        List[Tuple[int, int]]: (pas en secondes, nombre d'intervalles conservés), du plus fin au plus grossier
+
+    Raises:
+        ValueError: Si une résolution est mal formée
+    """
+    resolutions = []
+    for item in filter(None, (part.strip() for part in (value or "").split(','))):
+        step, _, slots = item.partition(':')
+        try:
+            resolutions.append((int(step), int(slots)))
+        except ValueError:
+            raise ValueError(f"Résolution invalide: {item} (attendu pas:intervalles)")
+        if resolutions[-1][0] <= 0 or resolutions[-1][1] <= 0:
+            raise ValueError(f"Résolution invalide: {item} (pas et intervalles doivent être positifs)")
+    return sorted(resolutions)
+
+
+def _io_totals(sample: Dict) -> Tuple[int, int, int, int]:
+    """Compteurs cumulés d'un échantillon: octets reçus, envoyés, lus et écrits"""
+    networks = (sample.get("networks") or {}).values()
+    rx = sum(network.get("rx_bytes", 0) for network in networks)
+    tx = sum(network.get("tx_bytes", 0) for network in networks)
+    read = write = 0
+    for entry in (sample.get("blkio_stats") or {}).get("io_service_bytes_recursive") or []:
+        op = (entry.get("op") or "").lower()
+        if op == "read":
+            read += entry.get("value", 0)
+        elif op == "write":
+            write += entry.get("value", 0)
+    return rx, tx, read, write
+
+
+def sample_values(sample: Dict,
+                  timestamp: float,
+                  previous: Optional[Tuple[float, Tuple[int, int, int, int]]]
+                  ) -> Tuple[Tuple[float, ...], Tuple[int, int, int, int]]:
+    """
+    Calcule les mesures d'un échantillon du flux Docker, comme docker stats
+
+    Args:
+        sample (Dict): Échantillon décodé
+        timestamp (float): Heure de réception (horloge locale, commune à tous les moteurs)
+        previous (Tuple, optional): Heure et compteurs cumulés de l'échantillon précédent (débits)
+
+    Returns:
+        Tuple: (valeurs dans l'ordre de METRICS, compteurs cumulés)
+    """
+    cpu = sample.get("cpu_stats") or {}
+    precpu = sample.get("precpu_stats") or {}
+    usage = cpu.get("cpu_usage") or {}
+    cpu_delta = usage.get("total_usage", 0) - (precpu.get("cpu_usage") or {}).get("total_usage", 0)
+    system_delta = cpu.get("system_cpu_usage", 0) - precpu.get("system_cpu_usage", 0)
+    online_cpus = cpu.get("online_cpus") or len(usage.get("percpu_usage") or []) or 1
+    cpu_percent = 0.0
+    # Premier échantillon: pas de mesure précédente du processeur
+    if precpu.get("system_cpu_usage") and system_delta > 0 and cpu_delta >= 0:
+        cpu_percent = cpu_delta / system_delta * online_cpus * 100.0
+
+    memory = sample.get("memory_stats") or {}
+    details = memory.get("stats") or {}
+    # Mémoire utilisée hors cache de fichiers (cgroup v2 puis v1)
+    cache = details.get("inactive_file", details.get("total_inactive_file", 0))
+    memory_bytes = max(0, memory.get("usage", 0) - cache)
+    memory_percent = memory_bytes / memory["limit"] * 100.0 if memory.get("limit") else 0.0
+
+    totals = _io_totals(sample)
+    rates = (0.0, 0.0, 0.0, 0.0)
+    if previous is not None and timestamp > previous[0]:
+        elapsed = timestamp - previous[0]
+        # Un compteur qui diminue (redémarrage) ne produit pas de débit négatif
+        rates = tuple(max(0, current - before) / elapsed for current, before in zip(totals, previous[1]))
+
+    pids = float((sample.get("pids_stats") or {}).get("current", 0))
+    return (cpu_percent, float(memory_bytes), memory_percent, pids) + rates, totals
+
+
+class _Ring:
+    """Série d'une résolution en anneau: numéro, nombre d'échantillons et sommes de chaque intervalle"""
+
+    __slots__ = ("step", "slots", "buckets", "counts", "sums")
+
+    def __init__(self, step: int, slots: int, typecode: str):
+        """
+        Initialise l'anneau
+
+        Args:
+            step (int): Durée d'un intervalle en secondes
+            slots (int): Nombre d'intervalles conservés
+            typecode (str): Type des sommes ("f" pour un container, "d" pour l'agrégat)
+        """
+        self.step = step
+        self.slots = slots
+        self.buckets = array("q", [-1]) * slots
+        self.counts = array("I", [0]) * slots
+        self.sums = array(typecode, [0.0]) * (slots * len(METRICS))
+
+    def claim(self, bucket: int) -> Optional[int]:
+        """Emplacement d'un intervalle, vidé s'il contenait un intervalle plus ancien (None si trop ancien)"""
+        slot = bucket % self.slots
+        current = self.buckets[slot]
+        if current == bucket:
+            return slot
+        if current > bucket:
+            return None
+        self.buckets[slot] = bucket
+        self.counts[slot] = 0
+        start = slot * len(METRICS)
+        self.sums[start:start + len(METRICS)] = array(self.sums.typecode, [0.0]) * len(METRICS)
+        return slot
+
+    def read(self, last_bucket: int, points: int, mean: bool) -> Tuple[List[int], Dict[str, List[Optional[float]]]]:
+        """
+        Lit les points intervalles se terminant à last_bucket (None pour un intervalle sans échantillon)
+
+        Args:
+            last_bucket (int): Numéro du dernier intervalle
+            points (int): Nombre d'intervalles (borné par la taille de l'anneau)
+            mean (bool): Diviser les sommes par le nombre d'échantillons
+
+        Returns:
+            Tuple[List[int], Dict[str, List[Optional[float]]]]: (nombre d'échantillons, valeurs par mesure)
+        """
+        width = len(METRICS)
+        buckets = range(last_bucket - min(points, self.slots) + 1, last_bucket + 1)
+        slots = [bucket % self.slots if self.buckets[bucket % self.slots] == bucket else None for bucket in buckets]
+        counts = [self.counts[slot] if slot is not None else 0 for slot in slots]
+        values = {}
+        for position, name in enumerate(METRICS):
+            column = self.sums[position::width]
+            values[name] = [
+                None if slot is None or not count else round(column[slot] / count if mean else column[slot], 3)
+                for slot, count in zip(slots, counts)
+            ]
+        return counts, values
+
+
+class _ContainerSeries:
+    """Séries et dernier échantillon d'un container"""
+
+    def __init__(self, container_id: str, name: str, resolutions: List[Tuple[int, int]]):
+        self.container_id = container_id
+        self.name = name
+        self.rings = [_Ring(step, slots, "f") for step, slots in resolutions]
+        self.running = True
+        self.samples = 0
+        self.last_sample: Optional[float] = None
+        self.latest: Optional[Tuple[float, ...]] = None
+        self.totals: Optional[Tuple[int, int, int, int]] = None
+
+
+class _Follower:
+    """Suivi du flux de statistiques d'un container"""
+
+    def __init__(self, container_id: str):
+        self.container_id = container_id
+        self.thread: Optional[threading.Thread] = None
+        self.stopped = False
+
+
+class StatsCollector:
+    """Classe de collecte des statistiques des Mini Shell en séries temporelles multi-résolutions"""
+
+    def __init__(self,
+                 open_stream: Callable[[str], Iterable[Dict]],
+                 resolutions: List[Tuple[int, int]],
+                 retain: int = 50):
+        """
+        Initialise le collecteur
+
+        Args:
+            open_stream (Callable[[str], Iterable[Dict]]): Ouvre le flux Docker des statistiques décodées
+                d'un container
+            resolutions (List[Tuple[int, int]]): (pas en secondes, nombre d'intervalles) de chaque résolution
+            retain (int): Nombre de containers arrêtés dont les séries sont conservées
+                (les plus anciens sont oubliés)
+        """
+        self.open_stream = open_stream
+        self.resolutions = resolutions
+        self.retain = retain
+        self._series: "collections.OrderedDict[str, _ContainerSeries]" = collections.OrderedDict()
+        self._aggregate = [_Ring(step, slots, "d") for step, slots in resolutions]
+        self._followers: Dict[str, _Follower] = {}
+        self._lock = threading.Lock()
+        self._stopped = False
+
+        self.samples = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.resolutions)
+
+    def start(self):
+        """Accepte de nouveau des containers à suivre (après stop(), au retour du bail de leader)"""
+        with self._lock:
+            self._stopped = False
+
+    def follow(self, container_id: str, name: str):
+        """
+        Suit les statistiques d'un container jusqu'à son arrêt (sans effet s'il est déjà suivi ou après stop())
+
+        Args:
+            container_id (str): ID complet du container
+            name (str): Nom du container
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._stopped or container_id in self._followers:
+                return
+            follower = _Follower(container_id)
+            self._followers[container_id] = follower
+            series = self._series.get(container_id)
+            if series is None:
+                series = _ContainerSeries(container_id, name, self.resolutions)
+                self._series[container_id] = series
+            series.name = name
+            series.running = True
+            # Un container relancé ne produit pas de débit à partir des compteurs de l'exécution précédente
+            series.totals = None
+            self._series.move_to_end(container_id)
+        follower.thread = threading.Thread(
+            target=self._follow, args=(follower, series), name=f"stats-{container_id[:12]}"
+        )
+        follower.thread.daemon = True
+        follower.thread.start()
+
+    def _follow(self, follower: _Follower, series: _ContainerSeries):
+        """Lit le flux Docker des statistiques et ajoute chaque échantillon aux séries"""
+        stream = None
+        try:
+            stream = self.open_stream(follower.container_id)
+            for sample in stream:
+                # Un échantillon par seconde: l'arrêt demandé est pris en compte au suivant
+                if follower.stopped:
+                    break
+                self._add(series, sample)
+        except Exception as e:
+            if not follower.stopped:
+                self.errors += 1
+                logger.error(f"Flux de statistiques du container {follower.container_id} interrompu: {e}")
+        finally:
+            if stream is not None and hasattr(stream, "close"):
+                stream.close()
+
+        with self._lock:
+            if self._followers.get(follower.container_id) is follower:
+                del self._followers[follower.container_id]
+                series.running = False
+            # Séries des containers arrêtés: seules les plus récentes sont conservées
+            stopped = [key for key, item in self._series.items() if not item.running]
+            for key in stopped[:max(0, len(stopped) - self.retain)]:
+                del self._series[key]
+
+    def _add(self, series: _ContainerSeries, sample: Dict):
+        """Ajoute un échantillon à chaque résolution du container et met à jour l'agrégat"""
+        # Un container arrêté renvoie des échantillons vides
+        if not sample.get("cpu_stats") and not sample.get("memory_stats"):
+            return
+        previous = (series.last_sample, series.totals) if series.totals is not None else None
+        timestamp = time.time()
+        values, totals = sample_values(sample, timestamp, previous)
+        width = len(METRICS)
+        with self._lock:
+            for ring, aggregate in zip(series.rings, self._aggregate):
+                bucket = int(timestamp // ring.step)
+                slot = ring.claim(bucket)
+                if slot is None:
+                    continue
+                count = ring.counts[slot]
+                start = slot * width
+                old = ring.sums[start:start + width]
+                for position, value in enumerate(values):
+                    ring.sums[start + position] += value
+                ring.counts[slot] = count + 1
+
+                # L'agrégat est la somme des moyennes des containers: y reporter l'écart de la moyenne
+                aggregate_slot = aggregate.claim(bucket)
+                if aggregate_slot is None:
+                    continue
+                if not count:
+                    aggregate.counts[aggregate_slot] += 1
+                new = ring.sums[start:start + width]
+                aggregate_start = aggregate_slot * width
+                for position in range(width):
+                    before = old[position] / count if count else 0.0
+                    aggregate.sums[aggregate_start + position] += new[position] / (count + 1) - before
+            series.samples += 1
+            series.last_sample = timestamp
+            series.latest = values
+            series.totals = totals
+            self.samples += 1
+
+    def stop(self):
+        """Arrête le suivi de tous les containers (chaque flux se termine à son prochain échantillon)"""
+        with self._lock:
+            self._stopped = True
+            for follower in self._followers.values():
+                follower.stopped = True
+            self._followers.clear()
+            for series in self._series.values():
+                series.running = False
+
+    def _step(self, resolution: Optional[int]) -> int:
+        """Position de la résolution demandée (la plus fine si None)"""
+        if resolution is None:
+            return 0
+        for position, (step, _) in enumerate(self.resolutions):
+            if step == resolution:
+                return position
+        raise ValueError(f"Résolution {resolution} s inconnue (disponibles: "
+                         f"{', '.join(str(step) for step, _ in self.resolutions)})")
+
+    def find(self, container_id_or_name: str) -> Optional[str]:
+        """
+        Retrouve un container suivi (ou arrêté récemment) par ID, préfixe d'au moins 12 caractères ou nom
+
+        Args:
+            container_id_or_name (str): ID ou nom du container
+
+        Returns:
+            Optional[str]: ID complet du container
+        """
+        key = container_id_or_name.lstrip('/')
+        with self._lock:
+            for container_id, series in self._series.items():
+                if container_id == key or series.name == key or (len(key) >= 12 and container_id.startswith(key)):
+                    return container_id
+        return None
+
+    def series(self,
+               container_id: Optional[str] = None,
+               resolution: Optional[int] = None,
+               points: int = 60) -> Optional[Dict]:
+        """
+        Série d'un container (moyennes par intervalle) ou agrégée (somme des moyennes des containers)
+
+        Args:
+            container_id (str, optional): ID complet du container (None pour l'agrégat)
+            resolution (int, optional): Pas en secondes (la résolution la plus fine si None)
+            points (int): Nombre d'intervalles, se terminant à l'intervalle en cours
+
+        Returns:
+            Optional[Dict]: Pas, horodatages, nombre d'échantillons ou de containers et valeurs par mesure,
+                None si le container n'est pas suivi
+
+        Raises:
+            ValueError: Si la résolution n'est pas configurée
+        """
+        position = self._step(resolution)
+        step = self.resolutions[position][0]
+        last_bucket = int(time.time() // step)
+        with self._lock:
+            if container_id is None:
+                counts, values = self._aggregate[position].read(last_bucket, points, mean=False)
+                first = last_bucket - len(counts) + 1
+                return {
+                    "step": step,
+                    "timestamps": [(first + i) * step for i in range(len(counts))],
+                    "containers": counts,
+                    "metrics": values,
+                }
+            series = self._series.get(container_id)
+            if series is None:
+                return None
+            counts, values = series.rings[position].read(last_bucket, points, mean=True)
+        first = last_bucket - len(counts) + 1
+        return {
+            "step": step,
+            "container_id": container_id,
+            "container_name": series.name,
+            "running": series.running,
+            "timestamps": [(first + i) * step for i in range(len(counts))],
+            "samples": counts,
+            "metrics": values,
+        }
+
+    def latest(self) -> List[Dict]:
+        """
+        Dernier échantillon de chaque container suivi ou arrêté récemment
+
+        Returns:
+            List[Dict]: Containers et valeurs, des plus récemment suivis aux plus anciens
+        """
+        with self._lock:
+            return [
+                {
+                    "container_id": series.container_id,
+                    "container_name": series.name,
+                    "running": series.running,
+                    "samples": series.samples,
+                    "last_sample": series.last_sample,
+                    "values": {
+                        name: round(value, 3) for name, value in zip(METRICS, series.latest)
+                    } if series.latest else None,
+                }
+                for series in reversed(self._series.values())
+            ]
+
+    def stats(self) -> Dict:
+        """Retourne les flux suivis, les séries conservées, leur empreinte mémoire et les compteurs"""
+        with self._lock:
+            rings = [ring for series in self._series.values() for ring in series.rings] + self._aggregate
+            return {
+                "resolutions": [f"{slots}x{step}s" for step, slots in self.resolutions],
+                "streams": len(self._followers),
+                "containers": len(self._series),
+                "memory_bytes": sum(
+                    ring.buckets.itemsize * ring.slots + ring.counts.itemsize * ring.slots
+                    + ring.sums.itemsize * len(ring.sums) for ring in rings
+                ),
+                "samples": self.samples,
+                "errors": self.errors,
+            }
@@ -4,9 +4,40 @@ Ce module permet de créer, démarrer, arrêter et supprimer des containers Dock
 """
 
 import docker
+from docker.utils import parse_bytes
 import os
 import logging
+import asyncio
+import functools
+import hmac
+import shlex
+import threading
+import time
 from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from admission_queue import AdmissionQueue
+from async_docker import AsyncDockerClient
+from build_jobs import BuildJob, BuildManager
+from container_gc import ContainerGC
+from container_index import ContainerIndex, container_entry, image_entry
+from container_stats import StatsCollector, parse_resolutions
+from engine_pool import LOCAL_ENGINE, Engine, EnginePool, parse_engines
+from expiry_scheduler import ExpiryScheduler, EXPIRES_AT_LABEL, IDLE_TTL_LABEL
+from idle_freezer import IdleFreezer
+from session_store import EXITED, PAUSED, RUNNING, SessionStore
+from log_archive import LogArchive
+from log_buffer import LogBufferStore
+from log_pipeline import LogRecord
+from log_stream import LogBroadcaster, LogSubscriber
+from metrics import instrument_methods, registry
+from response_cache import ResponseCache
+from resource_profiles import CPUSET_LABEL, PROFILE_LABEL, CpusetPlacer, ResourceProfile, load_profiles, parse_cpuset
+from single_flight import AsyncSingleFlight, SingleFlight
+from stats_relay import LeaderUnavailable, StatsRelay, aquery
+from terminal_bridge import TerminalBridge, TerminalSession, load_secret, sign
+from warm_pool import WarmPool
+from worker_coordination import LockTimeout, WorkerCoordinator
 
 # Configuration du logging
 logging.basicConfig(
@@ -15,17 +46,475 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Image et contexte de construction du Mini Shell
+MINISHELL_IMAGE = "mishu_minishell:latest"
+MINISHELL_PROJECT_PATH = "/home/mishu/mishu/projects/Mini_shell"
+
+# Message affiché tant qu'un Mini Shell n'a produit aucun log
+LOGS_HELP_MESSAGE = "En attente des logs...\n\nVous pouvez interagir avec le Mini Shell en utilisant ces commandes:\n- ls (lister les fichiers)\n- cd (changer de répertoire)\n- echo (afficher un texte)\n- cat (afficher un fichier)\n- exit (quitter le shell)"
+
+# Labels d'appartenance posés sur les containers Mini Shell
+APP_LABEL = "mishu.app"
+MINISHELL_APP = "minishell"
+SESSION_LABEL = "mishu.session"
+
+# Nombre maximum de containers Mini Shell en cours d'exécution (à relever avec des profils de ressources adaptés)
+MINISHELL_MAX_RUNNING = int(os.getenv("MINISHELL_MAX_RUNNING", "10"))
+
+# Profils de ressources: profil par défaut, surcharge JSON des profils et cœurs réservés aux sessions
+MINISHELL_DEFAULT_PROFILE = os.getenv("MINISHELL_DEFAULT_PROFILE", "small")
+MINISHELL_PROFILES = os.getenv("MINISHELL_PROFILES")
+MINISHELL_CPUSET = os.getenv("MINISHELL_CPUSET")
+
+# Durée de vie par défaut d'un container Mini Shell en secondes (10 minutes)
+MINISHELL_AUTO_STOP = int(os.getenv("MINISHELL_AUTO_STOP", "600"))
+
+# Délai d'inactivité avant l'arrêt d'un Mini Shell (0 = durée fixe uniquement)
+MINISHELL_IDLE_TTL = int(os.getenv("MINISHELL_IDLE_TTL", "0"))
+
+# Mise en pause des Mini Shell inactifs: délai sans activité (0 = désactivée) et durée cumulée
+# maximale des pauses, qui remplace la durée de vie pendant qu'un container est en pause
+MINISHELL_PAUSE_AFTER = int(os.getenv("MINISHELL_PAUSE_AFTER", "0"))
+MINISHELL_PAUSED_TTL = int(os.getenv("MINISHELL_PAUSED_TTL", "3600"))
+
+# Suppression périodique des Mini Shell arrêtés: intervalle (0 = désactivée) et ancienneté minimale en secondes
+MINISHELL_GC_INTERVAL = float(os.getenv("MINISHELL_GC_INTERVAL", "300"))
+MINISHELL_GC_MAX_AGE = int(os.getenv("MINISHELL_GC_MAX_AGE", "3600"))
+
+# Nombre d'actions simultanées d'une opération groupée (arrêt ou suppression)
+MINISHELL_BULK_CONCURRENCY = int(os.getenv("MINISHELL_BULK_CONCURRENCY", "8"))
+
+# Registre SQLite des sessions (relatif au dossier du backend)
+MINISHELL_SESSION_DB = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), os.getenv("MINISHELL_SESSION_DB", "data/sessions.db")
+)
+
+# Configuration du pool de containers pré-démarrés
+MINISHELL_POOL_SIZE = int(os.getenv("MINISHELL_POOL_SIZE", "2"))
+MINISHELL_POOL_REFILL_INTERVAL = float(os.getenv("MINISHELL_POOL_REFILL_INTERVAL", "5"))
+MINISHELL_POOL_REFILL_BATCH = int(os.getenv("MINISHELL_POOL_REFILL_BATCH", "1"))
+
+# Construction de l'image Mini Shell au démarrage (ignorée si le contexte est inchangé)
+MINISHELL_PREBUILD = os.getenv("MINISHELL_PREBUILD", "1") == "1"
+
+# Nombre de constructions d'images simultanées
+DOCKER_BUILD_WORKERS = int(os.getenv("DOCKER_BUILD_WORKERS", "2"))
+
+# Configuration du client Docker asynchrone (connexions simultanées, délai par appel)
+DOCKER_ASYNC_POOL_SIZE = int(os.getenv("DOCKER_ASYNC_POOL_SIZE", "32"))
+DOCKER_ASYNC_TIMEOUT = float(os.getenv("DOCKER_ASYNC_TIMEOUT", "10"))
+
+# Terminal interactif: commande lancée (commande de l'image par défaut), terminaux simultanés, inactivité
+MINISHELL_TERMINAL_CMD = os.getenv("MINISHELL_TERMINAL_CMD")
+MINISHELL_TERMINAL_MAX_SESSIONS = int(os.getenv("MINISHELL_TERMINAL_MAX_SESSIONS", "20"))
+MINISHELL_TERMINAL_IDLE_TIMEOUT = float(os.getenv("MINISHELL_TERMINAL_IDLE_TIMEOUT", "300"))
+
+# Clé des jetons de terminal remis au lancement (par défaut, clé aléatoire créée à côté du registre des sessions)
+MINISHELL_TERMINAL_SECRET = os.getenv("MINISHELL_TERMINAL_SECRET")
+
+# Moteurs Docker supplémentaires ("nom=unix:///chemin/docker.sock,..."), MINISHELL_MAX_RUNNING s'appliquant à chacun
+DOCKER_ENGINES = os.getenv("DOCKER_ENGINES")
+DOCKER_ENGINE_CHECK_INTERVAL = float(os.getenv("DOCKER_ENGINE_CHECK_INTERVAL", "10"))
+DOCKER_ENGINE_MAX_FAILURES = int(os.getenv("DOCKER_ENGINE_MAX_FAILURES", "3"))
+
+# Connexion au démon local: délai maximum entre deux tentatives (la connexion n'est pas requise au démarrage)
+DOCKER_CONNECT_RETRY_MAX = float(os.getenv("DOCKER_CONNECT_RETRY_MAX", "30"))
+
+# Nombre de workers uvicorn (variable lue par uvicorn --workers): au-delà de 1, les workers se coordonnent
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+WORKER_COORDINATION_DB = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), os.getenv("WORKER_COORDINATION_DB", "data/workers.db")
+)
+WORKER_LEADER_TTL = float(os.getenv("WORKER_LEADER_TTL", "15"))
+
+# Archive des logs des Mini Shell (relative au dossier du backend): taille des segments, lignes par bloc
+# compressé, délai d'écriture d'un bloc incomplet, conservation en secondes (0 = illimitée), taille maximum d'une page
+MINISHELL_LOG_ARCHIVE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), os.getenv("MINISHELL_LOG_ARCHIVE", "data/logs")
+)
+MINISHELL_LOG_ARCHIVE_SEGMENT_SIZE = parse_bytes(os.getenv("MINISHELL_LOG_ARCHIVE_SEGMENT_SIZE", "4m"))
+MINISHELL_LOG_ARCHIVE_BLOCK_LINES = int(os.getenv("MINISHELL_LOG_ARCHIVE_BLOCK_LINES", "256"))
+MINISHELL_LOG_ARCHIVE_FLUSH_INTERVAL = float(os.getenv("MINISHELL_LOG_ARCHIVE_FLUSH_INTERVAL", "2"))
+MINISHELL_LOG_ARCHIVE_MAX_AGE = float(os.getenv("MINISHELL_LOG_ARCHIVE_MAX_AGE", str(7 * 86400)))
+MINISHELL_LOG_ARCHIVE_MAX_PAGE = int(os.getenv("MINISHELL_LOG_ARCHIVE_MAX_PAGE", "1000"))
+
+# Statistiques de consommation des Mini Shell: résolutions "pas:intervalles" (vide pour désactiver la collecte)
+# et nombre de containers arrêtés dont les séries sont conservées
+MINISHELL_STATS_RESOLUTIONS = os.getenv("MINISHELL_STATS_RESOLUTIONS", "1:300,10:360,60:360")
+MINISHELL_STATS_RETAIN = int(os.getenv("MINISHELL_STATS_RETAIN", "50"))
+
+# Métriques: durée et nombre des appels aux méthodes du gestionnaire et des requêtes au démon Docker
+MANAGER_CALL_SECONDS = registry.histogram(
+    "mishu_docker_manager_call_seconds", "Durée des appels aux méthodes de DockerManager", ["method"]
+)
+MANAGER_CALLS = registry.counter(
+    "mishu_docker_manager_calls_total", "Appels aux méthodes de DockerManager par résultat", ["method", "outcome"]
+)
+DOCKER_API_SECONDS = registry.histogram(
+    "mishu_docker_api_request_seconds", "Durée des requêtes à l'API Docker (status 0: échec de connexion)",
+    ["engine", "method", "endpoint", "status"]
+)
+MINISHELLS_RUNNING = registry.gauge("mishu_minishells_running", "Mini Shell attribués en cours d'exécution")
+MINISHELLS_PAUSED = registry.gauge("mishu_minishells_paused", "Mini Shell mis en pause pour inactivité")
+MINISHELLS_PRUNED = registry.counter(
+    "mishu_minishells_pruned_total", "Mini Shell arrêtés supprimés par le nettoyage périodique", ["engine"]
+)
+MINISHELLS_QUEUED = registry.gauge("mishu_minishells_queued", "Lancements de Mini Shell en file d'attente")
+ADMISSION_WAIT_SECONDS = registry.histogram(
+    "mishu_admission_wait_seconds", "Temps d'attente des lancements de Mini Shell avant admission",
+    buckets=(0.01, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+)
+ADMISSION_CAPACITY = registry.gauge("mishu_admission_capacity", "Nombre maximum de Mini Shell en cours d'exécution")
+WARM_POOL_IDLE = registry.gauge("mishu_warm_pool_idle", "Containers pré-démarrés disponibles")
+EXPIRY_TIMERS = registry.gauge("mishu_expiry_timers", "Arrêts automatiques planifiés")
+TERMINALS_ACTIVE = registry.gauge("mishu_terminals_active", "Terminaux interactifs ouverts")
+LOG_STREAMS = registry.gauge("mishu_log_streams", "Flux de logs Docker suivis")
+STATS_STREAMS = registry.gauge("mishu_stats_streams", "Flux de statistiques Docker suivis")
+ENGINES_HEALTHY = registry.gauge("mishu_engines_healthy", "Moteurs Docker disponibles")
+THREADS = registry.gauge("mishu_threads", "Threads actifs du processus")
+ASYNCIO_TASKS = registry.gauge("mishu_asyncio_tasks", "Tâches asyncio en cours")
+
+# État d'une session après un événement Docker sur son container
+SESSION_EVENT_STATES = {"start": RUNNING, "restart": RUNNING, "unpause": RUNNING, "pause": PAUSED, "die": EXITED}
+
+# Méthodes de DockerManager mesurées (points d'entrée de l'API et étapes d'un lancement)
+INSTRUMENTED_METHODS = (
+    "list_images", "list_containers", "alist_images", "alist_containers",
+    "run_container", "arun_container", "stop_container", "astop_container",
+    "start_container", "astart_container", "remove_container", "aremove_container",
+    "build_image", "abuild_image", "build_mini_shell_image",
+    "read_container_logs", "aread_container_logs", "open_log_stream", "aopen_log_stream", "aopen_terminal",
+    "get_mini_shell_container", "aget_mini_shell_container",
+    "_launch_mini_shell", "_alaunch_mini_shell", "_acreate_mini_shell", "_acreate_remote_mini_shell",
+    "_get_minishell_container", "_aget_minishell_entry", "_fetch_logs", "_afetch_logs",
+    "_pause_container", "_unpause_container", "abulk_action", "collect_garbage",
+)
+
+# Ressources dont le chemin contient un identifiant (remplacé par {id} dans les métriques)
+DOCKER_API_RESOURCES = ("containers", "images", "exec", "networks", "volumes")
+DOCKER_API_COLLECTIONS = ("json", "create", "prune", "load", "search", "build")
+
+# Durée de validité des réponses en cache de /containers et /images (0 pour désactiver le cache)
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "2"))
+
 class DockerManager:
     """Classe pour gérer les opérations Docker"""
     
     def __init__(self):
-        """Initialise le client Docker"""
+        """Initialise le client Docker (sans contacter le démon: la connexion est établie par start())"""
         try:
-            self.client = docker.from_env()
+            # Version de l'API fixée: le client ne contacte pas le démon à la création
+            self.client = docker.from_env(version="1.41")
+            self.aclient = AsyncDockerClient(pool_size=DOCKER_ASYNC_POOL_SIZE, timeout=DOCKER_ASYNC_TIMEOUT)
+            remotes = [
+                Engine.from_socket(name, path, pool_size=DOCKER_ASYNC_POOL_SIZE, timeout=DOCKER_ASYNC_TIMEOUT)
+                for name, path in parse_engines(DOCKER_ENGINES).items()
+            ]
             logger.info("Client Docker initialisé avec succès")
         except Exception as e:
             logger.error(f"Erreur lors de l'initialisation du client Docker: {e}")
             raise
+        
+        # Mesurer les méthodes avant que les composants ci-dessous ne les référencent
+        instrument_methods(self, INSTRUMENTED_METHODS, MANAGER_CALL_SECONDS, MANAGER_CALLS)
+
+        self.profiles = load_profiles(MINISHELL_PROFILES)
+        self.placer = CpusetPlacer(parse_cpuset(MINISHELL_CPUSET) if MINISHELL_CPUSET else None)
+        self.warm_pool = WarmPool(
+            self.client,
+            MINISHELL_IMAGE,
+            size=MINISHELL_POOL_SIZE,
+            refill_interval=MINISHELL_POOL_REFILL_INTERVAL,
+            refill_batch=MINISHELL_POOL_REFILL_BATCH,
+            labels={APP_LABEL: MINISHELL_APP},
+            options_factory=self._pool_run_options
+        )
+        self.engines = EnginePool(
+            Engine(LOCAL_ENGINE, self.client, self.aclient, local=True, placer=self.placer),
+            remotes,
+            MINISHELL_IMAGE,
+            labels={APP_LABEL: MINISHELL_APP},
+            max_running=MINISHELL_MAX_RUNNING,
+            memory_of=self._reserved_memory,
+            interval=DOCKER_ENGINE_CHECK_INTERVAL,
+            max_failures=DOCKER_ENGINE_MAX_FAILURES,
+            on_update=self._on_engines_update,
+            is_session=lambda name: not self.warm_pool.is_pool_container(name)
+        )
+        self.expiry = ExpiryScheduler(self._expire_container)
+        self.freezer = IdleFreezer(self._pause_container, self._unpause_container, MINISHELL_PAUSE_AFTER)
+        self.sessions = SessionStore(MINISHELL_SESSION_DB)
+        self.gc = ContainerGC(
+            lambda: [engine for engine in self.engines.engines.values() if engine.healthy],
+            {APP_LABEL: MINISHELL_APP},
+            max_age=MINISHELL_GC_MAX_AGE,
+            interval=MINISHELL_GC_INTERVAL,
+            on_pruned=self._on_pruned
+        )
+        self.builds = BuildManager(self.client, max_workers=DOCKER_BUILD_WORKERS)
+        self.launches = SingleFlight()
+        self.alaunches = AsyncSingleFlight()
+        self.index = ContainerIndex(self.client, on_container_event=self._on_container_event)
+        self.admission = AdmissionQueue(MINISHELL_MAX_RUNNING, self._acount_running, self._estimate_wait,
+                                        is_counted=self._is_counted, observe_wait=ADMISSION_WAIT_SECONDS.observe)
+        self.log_buffers = LogBufferStore(self._fetch_logs, self._afetch_logs)
+        # Les tampons de logs suivent le flux partagé quand il est ouvert
+        self.log_stream = LogBroadcaster(self._open_log_stream, on_activity=self._on_activity,
+                                         on_lines=self.log_buffers.follow)
+        self.log_archive = LogArchive(
+            MINISHELL_LOG_ARCHIVE,
+            self._open_archive_stream,
+            segment_size=MINISHELL_LOG_ARCHIVE_SEGMENT_SIZE,
+            block_lines=MINISHELL_LOG_ARCHIVE_BLOCK_LINES,
+            flush_interval=MINISHELL_LOG_ARCHIVE_FLUSH_INTERVAL,
+            max_age=MINISHELL_LOG_ARCHIVE_MAX_AGE,
+            on_activity=self._on_activity
+        )
+        self.resource_stats = StatsCollector(
+            self._open_stats_stream,
+            parse_resolutions(MINISHELL_STATS_RESOLUTIONS),
+            retain=MINISHELL_STATS_RETAIN
+        )
+        self.terminal_secret = (
+            MINISHELL_TERMINAL_SECRET.encode() if MINISHELL_TERMINAL_SECRET
+            else load_secret(os.path.join(os.path.dirname(MINISHELL_SESSION_DB), "terminal.key"))
+        )
+        self.terminals = TerminalBridge(
+            max_sessions=MINISHELL_TERMINAL_MAX_SESSIONS,
+            idle_timeout=MINISHELL_TERMINAL_IDLE_TIMEOUT,
+            on_input=self._on_terminal_input
+        )
+        self.responses = ResponseCache(RESPONSE_CACHE_TTL)
+        for engine in self.engines.engines.values():
+            self._instrument_engine(engine)
+        
+        # Plusieurs workers: tâches de fond confiées au leader, verrous et places partagés
+        self.coordinator: Optional[WorkerCoordinator] = None
+        if WEB_CONCURRENCY > 1:
+            self.coordinator = WorkerCoordinator(
+                WORKER_COORDINATION_DB,
+                lease_ttl=WORKER_LEADER_TTL,
+                on_elected=self._start_leader_tasks,
+                on_demoted=self._stop_leader_tasks,
+                on_tick=self._sync_workers
+            )
+            self.admission.shared = self.coordinator
+        # Les statistiques, collectées par le leader seul, lui sont demandées par les autres workers
+        self.stats_relay: Optional[StatsRelay] = None
+        if self.coordinator is not None:
+            self.stats_relay = StatsRelay(
+                os.path.join(os.path.dirname(WORKER_COORDINATION_DB), f"stats-{self.coordinator.worker_id}.sock"),
+                self.read_container_stats
+            )
+        self._activity_synced = time.time()
+        
+        # État de la connexion au démon local (sondes de disponibilité)
+        self.connected = False
+        self.connect_attempts = 0
+        self.connect_error: Optional[str] = None
+        self.started_at = time.time()
+        self._stopping = threading.Event()
+        self._connect_thread: Optional[threading.Thread] = None
+    
+    def _instrument_engine(self, engine: Engine):
+        """Mesure les requêtes des clients Docker synchrone et asynchrone d'un moteur"""
+        engine.aclient.on_request = functools.partial(self._observe_docker_request, engine.name)
+        api = engine.client.api
+        send = api.request
+        
+        # Le SDK Docker n'offre pas de point d'extension: envelopper requests.Session.request
+        def request(method, url, *args, **kwargs):
+            started = time.perf_counter()
+            status = 0
+            try:
+                response = send(method, url, *args, **kwargs)
+                status = response.status_code
+                return response
+            finally:
+                self._observe_docker_request(engine.name, method, urlparse(url).path, status,
+                                             time.perf_counter() - started)
+        
+        api.request = request
+    
+    @staticmethod
+    def _observe_docker_request(engine_name: str, method: str, path: str, status: int, duration: float):
+        """Enregistre la durée d'une requête au démon, le chemin étant réduit à son modèle"""
+        segments = path.strip('/').split('/')
+        if segments and segments[0].startswith('v') and segments[0][1:2].isdigit():
+            segments = segments[1:]
+        if len(segments) > 1 and segments[0] in DOCKER_API_RESOURCES and segments[1] not in DOCKER_API_COLLECTIONS:
+            # Le nom d'une image peut contenir des "/": seul le dernier segment peut être une action
+            action = segments[-1] if len(segments) > 2 and segments[-1].isalpha() else None
+            segments = [segments[0], "{id}"] + ([action] if action else [])
+        endpoint = "/" + "/".join(segments)
+        DOCKER_API_SECONDS.observe(duration, engine_name, method.upper(), endpoint, str(status))
+    
+    async def collect_metrics(self):
+        """Met à jour les jauges exposées par /metrics (appelé à chaque collecte)"""
+        try:
+            MINISHELLS_RUNNING.set(await self._acount_running())
+        except Exception as e:
+            logger.error(f"Erreur lors du comptage des Mini Shell pour les métriques: {e}")
+        admission = self.admission.stats()
+        MINISHELLS_QUEUED.set(admission["depth"])
+        MINISHELLS_PAUSED.set(self.freezer.stats()["paused"])
+        ADMISSION_CAPACITY.set(admission["capacity"])
+        WARM_POOL_IDLE.set(self.warm_pool.stats()["idle"])
+        EXPIRY_TIMERS.set(len(self.expiry.pending()))
+        TERMINALS_ACTIVE.set(self.terminals.stats()["active"])
+        LOG_STREAMS.set(self.log_stream.stats()["streams"])
+        STATS_STREAMS.set(self.resource_stats.stats()["streams"])
+        ENGINES_HEALTHY.set(len(self.engines.eligible()))
+        THREADS.set(threading.active_count())
+        ASYNCIO_TASKS.set(len(asyncio.all_tasks()))
+    
+    def start(self):
+        """Démarre la connexion au démon en tâche de fond (le démarrage de l'API n'attend pas le démon)"""
+        if self._connect_thread and self._connect_thread.is_alive():
+            return
+        self._stopping.clear()
+        self._connect_thread = threading.Thread(target=self._connect, name="docker-connect")
+        self._connect_thread.daemon = True
+        self._connect_thread.start()
+    
+    def _connect(self):
+        """Contacte le démon local (nouvel essai avec un délai croissant) puis démarre les tâches de fond"""
+        delay = 1.0
+        while not self._stopping.is_set():
+            self.connect_attempts += 1
+            try:
+                self.client.ping()
+                break
+            except Exception as e:
+                self.connect_error = str(e)
+                logger.error(f"Démon Docker injoignable (tentative {self.connect_attempts}), "
+                             f"nouvel essai dans {delay:.0f} s: {e}")
+                self._stopping.wait(delay)
+                delay = min(delay * 2, DOCKER_CONNECT_RETRY_MAX)
+        if self._stopping.is_set():
+            return
+        self.connected = True
+        self.connect_error = None
+        logger.info(f"Connexion au démon Docker établie après {self.connect_attempts} tentative(s)")
+        
+        self.index.start()
+        self.engines.start()
+        # Avec plusieurs workers, seul le leader exécute les tâches de fond (voir _start_leader_tasks)
+        if self.coordinator is not None:
+            self.coordinator.start()
+        else:
+            self._start_leader_tasks()
+    
+    def _start_leader_tasks(self):
+        """Démarre les tâches de fond uniques (arrêt automatique, pause, suivi des Mini Shell, nettoyage, pool)"""
+        self.expiry.start()
+        # Avant la reconstruction des échéances, qui reprend le suivi des Mini Shell en cours d'exécution
+        self.log_archive.start()
+        self.resource_stats.start()
+        self._rebuild_expirations()
+        self.freezer.start()
+        self.gc.start()
+        if MINISHELL_PREBUILD and os.path.isdir(MINISHELL_PROJECT_PATH):
+            self.build_mini_shell_image()
+        self.warm_pool.start()
+        if self.stats_relay is not None:
+            try:
+                self.stats_relay.start()
+                self.coordinator.publish_endpoint("stats", self.stats_relay.path)
+            except Exception as e:
+                logger.error(f"Erreur lors de l'ouverture du relais des statistiques: {e}")
+    
+    def _stop_leader_tasks(self):
+        """Cède les tâches de fond uniques au nouveau leader (les échéances restent dans le registre)"""
+        self.warm_pool.stop()
+        self.gc.stop()
+        self.freezer.stop()
+        self.log_archive.stop()
+        self.resource_stats.stop()
+        if self.stats_relay is not None:
+            self.coordinator.publish_endpoint("stats", None)
+            self.stats_relay.stop()
+        for entry in self.expiry.pending():
+            self.expiry.cancel(entry["container_id"])
+            self.freezer.forget(entry["container_id"])
+    
+    @property
+    def is_leader(self) -> bool:
+        """Indique si ce worker exécute les tâches de fond uniques (toujours vrai avec un seul worker)"""
+        return self.coordinator is None or self.coordinator.is_leader
+    
+    def _sync_workers(self, leader: bool):
+        """
+        Applique les sessions et activités enregistrées par les autres workers (appelé par WorkerCoordinator)
+        
+        Args:
+            leader (bool): True si ce worker est le leader
+        """
+        sessions = self.sessions.active()
+        for session in sessions:
+            engine = self.engines.engines.get(session["engine"])
+            if engine is not None and not engine.local:
+                self.engines.assign(engine, session["container_id"], session["container_name"])
+        if not leader:
+            return
+        
+        # Échéances des Mini Shell lancés ou arrêtés par les autres workers
+        armed = {entry["container_id"] for entry in self.expiry.pending()}
+        active = {session["container_id"] for session in sessions}
+        for session in sessions:
+            if session["container_id"] not in armed:
+                self.expiry.arm(session["container_id"], MINISHELL_AUTO_STOP, idle_ttl=session["idle_ttl"],
+                                name=session["container_name"], expires_at=session["expires_at"])
+                self.freezer.track(session["container_id"], session["container_name"],
+                                   paused=session["state"] == PAUSED)
+                self._follow_container(session["container_id"], session["container_name"], session["session_id"])
+                if session["state"] == PAUSED:
+                    self.expiry.suspend(session["container_id"], MINISHELL_PAUSED_TTL)
+        for container_id in armed - active:
+            self.expiry.cancel(container_id)
+            self.freezer.forget(container_id)
+        
+        # Activités signalées par les autres workers (prolongation du délai d'inactivité)
+        for container_id, at in self.coordinator.activity_since(self._activity_synced):
+            self._activity_synced = max(self._activity_synced, at)
+            self._on_activity(container_id)
+    
+    def health(self) -> Dict:
+        """
+        État du processus pour les sondes de disponibilité
+        
+        Returns:
+            Dict: Connexion au démon, index, leader et workers
+        """
+        return {
+            "ready": self.connected and self.index.ready,
+            "connected": self.connected,
+            "connect_attempts": self.connect_attempts,
+            "connect_error": self.connect_error,
+            "index_ready": self.index.ready,
+            "leader": self.is_leader,
+            "workers": self.coordinator.stats() if self.coordinator is not None else None,
+            "pid": os.getpid(),
+            "uptime": time.time() - self.started_at,
+        }
+    
+    def shutdown(self):
+        """Arrête les tâches de fond"""
+        self._stopping.set()
+        self.warm_pool.stop()
+        self.gc.stop()
+        self.freezer.stop()
+        self.expiry.stop()
+        self.log_archive.stop()
+        self.resource_stats.stop()
+        self.index.stop()
+        self.engines.stop()
+        self.builds.shutdown()
+        if self.stats_relay is not None:
+            self.stats_relay.stop()
+        if self.coordinator is not None:
+            self.coordinator.stop()
+        self.sessions.close()
     
     def list_images(self) -> List[Dict]:
         """
@@ -34,6 +523,9 @@ class DockerManager:
         Returns:
             List[Dict]: Liste des images Docker avec leurs attributs
         """
+        if self.index.ready:
+            return self.index.images()
+        
         try:
             images = self.client.images.list()
             return [
@@ -49,32 +541,49 @@ class DockerManager:
             logger.error(f"Erreur lors de la récupération des images: {e}")
             return []
     
-    def list_containers(self, all_containers: bool = True) -> List[Dict]:
+    def list_containers(self, all_containers: bool = True, minishell_only: bool = False) -> List[Dict]:
         """
         Liste tous les containers Docker
         
         Args:
             all_containers (bool): Si True, inclut les containers arrêtés
+            minishell_only (bool): Si True, ne liste que les containers Mini Shell (filtrage côté démon)
             
         Returns:
             List[Dict]: Liste des containers avec leurs attributs
         """
+        if self.index.ready:
+            labels = {APP_LABEL: MINISHELL_APP} if minishell_only else None
+            return [
+                {key: entry[key] for key in ("id", "name", "image", "status", "created")}
+                for entry in self.index.containers(all_containers, labels)
+            ] + self._remote_containers(all_containers)
+        
         try:
-            containers = self.client.containers.list(all=all_containers)
+            filters = {"label": f"{APP_LABEL}={MINISHELL_APP}"} if minishell_only else None
+            containers = self.client.containers.list(all=all_containers, filters=filters)
             return [
                 {
                     "id": container.id,
                     "name": container.name,
-                    "image": container.image.tags[0] if container.image.tags else container.image.id,
+                    # Nom de l'image tel que fourni à la création (évite un appel par container)
+                    "image": container.attrs.get('Config', {}).get('Image') or container.attrs.get('Image'),
                     "status": container.status,
                     "created": container.attrs['Created']
                 }
                 for container in containers
-            ]
+            ] + self._remote_containers(all_containers)
         except Exception as e:
             logger.error(f"Erreur lors de la récupération des containers: {e}")
             return []
     
+    def _remote_containers(self, all_containers: bool = True) -> List[Dict]:
+        """Mini Shell des moteurs distants, d'après leur dernière vérification"""
+        return [
+            {key: entry[key] for key in ("id", "name", "image", "status", "created")}
+            for entry in self.engines.containers(all_containers)
+        ]
+    
     def run_container(self, 
                      image_name: str, 
                      container_name: Optional[str] = None,
@@ -83,7 +592,10 @@ class DockerManager:
                      environment: Optional[Dict[str, str]] = None,
                      detach: bool = True,
                      auto_remove: bool = False,
-                     auto_stop_after: Optional[int] = 600) -> Tuple[bool, str, Optional[str]]:
+                     auto_stop_after: Optional[int] = 600,
+                     idle_ttl: Optional[int] = None,
+                     labels: Optional[Dict[str, str]] = None,
+                     resources: Optional[Dict] = None) -> Tuple[bool, str, Optional[str]]:
         """
         Lance un container Docker à partir d'une image
         
@@ -97,6 +609,9 @@ class DockerManager:
             auto_remove (bool): Si True, le container est supprimé à son arrêt
             auto_stop_after (int, optional): Nombre de secondes après lesquelles le container s'arrête 
                                             automatiquement (600 = 10 minutes)
+            idle_ttl (int, optional): Délai d'inactivité avant l'arrêt automatique
+            labels (Dict[str, str], optional): Labels à poser sur le container
+            resources (Dict, optional): Limites de ressources (voir ResourceProfile.create_kwargs)
             
         Returns:
             Tuple[bool, str, Optional[str]]: (succès, message, container_id si succès)
@@ -117,6 +632,9 @@ class DockerManager:
                 except docker.errors.NotFound:
                     pass
             
+            # Enregistrer l'échéance dans les labels pour la retrouver au redémarrage
+            labels, expires_at = self._expiry_labels(labels, auto_stop_after, idle_ttl)
+            
             # Lancer le container avec les options appropriées
             container = self.client.containers.run(
                 image=image_name,
@@ -125,26 +643,16 @@ class DockerManager:
                 volumes=volumes,
                 environment=environment,
                 detach=detach,
-                auto_remove=auto_remove
+                auto_remove=auto_remove,
+                labels=labels,
+                **(resources or {})
             )
+            self.responses.invalidate()
             
             # Si auto_stop_after est spécifié, planifier l'arrêt automatique
-            if auto_stop_after and auto_stop_after > 0:
-                import threading
-                import time
-                
-                def auto_stop():
-                    time.sleep(auto_stop_after)
-                    try:
-                        container.stop()
-                        logger.info(f"Container {container.name} arrêté automatiquement après {auto_stop_after} secondes")
-                    except Exception as e:
-                        logger.error(f"Erreur lors de l'arrêt automatique du container {container.name}: {e}")
-                
-                # Démarrer un thread pour l'arrêt automatique
-                stop_thread = threading.Thread(target=auto_stop)
-                stop_thread.daemon = True
-                stop_thread.start()
+            if expires_at:
+                self._schedule_auto_stop(container.id, container.name, auto_stop_after, idle_ttl, expires_at,
+                                         session_id=labels.get(SESSION_LABEL))
             
             logger.info(f"Container {container.name} créé avec succès (ID: {container.id})")
             return True, f"Container {container.name} démarré avec succès", container.id
@@ -154,6 +662,359 @@ class DockerManager:
             logger.error(error_msg)
             return False, error_msg, None
     
+    def _expiry_labels(self,
+                       labels: Optional[Dict[str, str]],
+                       auto_stop_after: Optional[int],
+                       idle_ttl: Optional[int]) -> Tuple[Dict[str, str], Optional[float]]:
+        """
+        Ajoute aux labels l'échéance d'arrêt automatique d'un futur container
+        
+        Args:
+            labels (Dict[str, str], optional): Labels demandés
+            auto_stop_after (int, optional): Nombre de secondes avant l'arrêt
+            idle_ttl (int, optional): Délai d'inactivité avant l'arrêt
+            
+        Returns:
+            Tuple[Dict[str, str], Optional[float]]: (labels complétés, échéance si arrêt automatique)
+        """
+        labels = dict(labels or {})
+        expires_at = None
+        if auto_stop_after and auto_stop_after > 0:
+            expires_at = time.time() + auto_stop_after
+            labels[EXPIRES_AT_LABEL] = f"{expires_at:.0f}"
+            if idle_ttl:
+                labels[IDLE_TTL_LABEL] = str(idle_ttl)
+        return labels, expires_at
+    
+    def _schedule_auto_stop(self,
+                            container_id: str,
+                            name: str,
+                            auto_stop_after: int,
+                            idle_ttl: Optional[int] = None,
+                            expires_at: Optional[float] = None,
+                            session_id: Optional[str] = None):
+        """
+        Planifie l'arrêt automatique d'un container et enregistre sa session
+        
+        Args:
+            container_id (str): ID du container à arrêter
+            name (str): Nom du container
+            auto_stop_after (int): Nombre de secondes avant l'arrêt
+            idle_ttl (int, optional): Délai d'inactivité avant l'arrêt
+            expires_at (float, optional): Échéance absolue déjà enregistrée dans les labels
+            session_id (str, optional): Identifiant de session (conservé s'il est déjà enregistré)
+        """
+        expires_at = expires_at or time.time() + auto_stop_after
+        # Session enregistrée avant l'échéance: le leader replanifie d'après le registre (voir _sync_workers)
+        self.sessions.record(container_id, name, self.engines.owner(container_id).name,
+                             session_id=session_id, expires_at=expires_at, idle_ttl=idle_ttl)
+        if self.is_leader:
+            self.expiry.arm(container_id, auto_stop_after, idle_ttl=idle_ttl,
+                            name=name, expires_at=expires_at)
+            self.freezer.track(container_id, name)
+            session = self.sessions.get(container_id)
+            self._follow_container(container_id, name, session["session_id"] if session else session_id)
+    
+    def _follow_container(self, container_id: str, name: str, session_id: Optional[str]):
+        """Suit les logs (archive) et les statistiques d'un Mini Shell démarré, jusqu'à son arrêt (leader)"""
+        self.log_archive.follow(container_id, name, session_id)
+        self.resource_stats.follow(container_id, name)
+    
+    def _expire_container(self, container_id: str):
+        """
+        Arrête un container arrivé à échéance (appelé par le planificateur)
+        
+        Args:
+            container_id (str): ID du container
+        """
+        self.freezer.forget(container_id)
+        try:
+            container = self.engines.owner(container_id).client.containers.get(container_id)
+        except docker.errors.NotFound:
+            return
+        # Un container en pause est arrêté de la même façon (le démon le dégèle pour l'arrêter)
+        if container.status in ('running', 'paused'):
+            container.stop()
+            self.sessions.update(container_id, state=EXITED)
+            self.responses.invalidate()
+            self.admission.release()
+    
+    def _on_container_event(self, action: str, container_id: str):
+        """Réveille la file d'attente d'admission quand un container s'arrête ou disparaît et met à jour sa session"""
+        self.responses.invalidate()
+        if action == "destroy":
+            self.sessions.remove(container_id)
+        elif action in SESSION_EVENT_STATES:
+            self.sessions.update(container_id, state=SESSION_EVENT_STATES[action])
+        if action in ("die", "stop", "kill", "destroy"):
+            self.freezer.forget(container_id)
+            self.admission.release()
+    
+    def _on_pruned(self, engine: Engine, container_ids: List[str]):
+        """Oublie les containers supprimés par le nettoyage périodique (appelé par ContainerGC)"""
+        for container_id in container_ids:
+            self.sessions.remove(container_id)
+            self.engines.forget(container_id)
+            self.log_buffers.discard(container_id)
+        MINISHELLS_PRUNED.inc(engine.name, amount=len(container_ids))
+        self.responses.invalidate()
+    
+    def _pause_container(self, container_id: str):
+        """Met en pause un Mini Shell inactif et suspend son échéance (appelé par IdleFreezer)"""
+        self.engines.owner(container_id).client.api.pause(container_id)
+        self.expiry.suspend(container_id, MINISHELL_PAUSED_TTL)
+        self.sessions.update(container_id, state=PAUSED)
+        self.responses.invalidate()
+        # Un container en pause ne compte plus parmi les Mini Shell en cours d'exécution
+        self.admission.release()
+    
+    def _unpause_container(self, container_id: str):
+        """Reprend un Mini Shell en pause et rétablit son échéance (appelé par IdleFreezer)"""
+        try:
+            self.engines.owner(container_id).client.api.unpause(container_id)
+        except docker.errors.APIError as e:
+            # Container déjà repris par un autre worker
+            if e.status_code != 409:
+                raise
+        self.expiry.resume(container_id)
+        # L'échéance est décalée de la durée de la pause
+        self.sessions.update(container_id, state=RUNNING, expires_at=self.expiry.hard_deadline(container_id))
+        self.responses.invalidate()
+    
+    def _on_activity(self, container_id: str) -> bool:
+        """
+        Enregistre une activité sur un Mini Shell: le reprend s'il est en pause et prolonge son délai d'inactivité
+        
+        Args:
+            container_id (str): ID du container
+            
+        Returns:
+            bool: True si le container était en pause et a été repris
+        """
+        if not self.is_leader:
+            return self._forward_activity(container_id)
+        resumed = self.freezer.touch(container_id)
+        self.expiry.touch(container_id)
+        return resumed
+    
+    def _forward_activity(self, container_id: str) -> bool:
+        """Worker non leader: reprend lui-même un Mini Shell en pause et signale l'activité au leader"""
+        self.coordinator.touch(container_id)
+        session = self.sessions.get(container_id)
+        if session is None or session["state"] != PAUSED:
+            return False
+        try:
+            self.engines.owner(container_id).client.api.unpause(container_id)
+        except docker.errors.APIError as e:
+            if e.status_code != 409:
+                logger.error(f"Erreur lors de la reprise du container {session['container_name']}: {e}")
+                return False
+        self.sessions.update(container_id, state=RUNNING)
+        self.responses.invalidate()
+        logger.info(f"Container {session['container_name']} repris")
+        return True
+    
+    def _is_paused(self, container_id: str) -> bool:
+        """Indique si un Mini Shell est en pause (d'après le registre partagé pour un worker non leader)"""
+        if self.is_leader:
+            return self.freezer.is_paused(container_id)
+        session = self.sessions.get(container_id)
+        return session is not None and session["state"] == PAUSED
+    
+    async def _ais_running(self, container_id: str) -> bool:
+        """Vérifie auprès du démon qu'un container est en cours d'exécution (l'index suit les événements avec retard)"""
+        attrs = await self.engines.owner(container_id).aclient.inspect_container(container_id)
+        return attrs["State"]["Status"] == "running"
+    
+    async def _aon_activity(self, container_id: str) -> bool:
+        """Variante asynchrone de _on_activity (la reprise, bloquante, est exécutée dans un thread)"""
+        if self._is_paused(container_id):
+            return await asyncio.get_running_loop().run_in_executor(None, self._on_activity, container_id)
+        return self._on_activity(container_id)
+    
+    def _on_terminal_input(self, container_id: str):
+        """Saisie dans un terminal: la reprise éventuelle ne bloque pas la boucle du terminal"""
+        if self._is_paused(container_id):
+            asyncio.get_running_loop().run_in_executor(None, self._on_activity, container_id)
+        else:
+            self._on_activity(container_id)
+    
+    def _resume_paused(self, container_id: str, container_id_or_name: str) -> Tuple[bool, str]:
+        """
+        Reprend un container en pause (démarrage demandé ou lancement d'un Mini Shell existant)
+        
+        Args:
+            container_id (str): ID du container
+            container_id_or_name (str): ID ou nom demandé, pour les messages
+            
+        Returns:
+            Tuple[bool, str]: (succès, message)
+        """
+        if not self._on_activity(container_id):
+            # Container mis en pause hors du gestionnaire (ou reprise en échec: l'erreur est remontée)
+            self.engines.owner(container_id).client.api.unpause(container_id)
+            self.responses.invalidate()
+        logger.info(f"Container {container_id_or_name} repris")
+        return True, f"Container {container_id_or_name} repris"
+    
+    async def _acount_running(self) -> int:
+        """Compte les Mini Shell attribués en cours d'exécution (index ou un appel filtré)"""
+        if self.index.ready:
+            names = [entry["name"] for entry in self.index.containers(False, {APP_LABEL: MINISHELL_APP})]
+        else:
+            names = [container_entry(summary)["name"] for summary in await self.aclient.containers(
+                filters={"label": [f"{APP_LABEL}={MINISHELL_APP}"], "status": ["running"]}
+            )]
+        return self._running_minishells(names) + self.engines.running_remote()
+    
+    def _is_counted(self, container_name: str) -> bool:
+        """
+        Indique si _acount_running compte déjà un Mini Shell qui vient d'être lancé
+        
+        Args:
+            container_name (str): Nom du container lancé
+            
+        Returns:
+            bool: True si l'index (ou la dernière vérification d'un moteur distant) le montre en cours d'exécution
+        """
+        if not self.index.ready:
+            # Comptage direct auprès du démon: le container lancé y figure déjà
+            return True
+        entry = self.index.get(container_name)
+        if entry is not None:
+            return entry["status"] == "running"
+        return any(entry["name"] == container_name for entry in self.engines.containers(False))
+    
+    def listing_version(self) -> Tuple:
+        """
+        Version de l'état servi par les listes de containers et d'images
+        
+        Returns:
+            Tuple: Génération de l'index (None s'il n'est pas prêt) et dernière vérification de chaque moteur distant
+        """
+        generation = self.index.generation if self.index.ready else None
+        return (generation,) + tuple(engine.checked_at for engine in self.engines.remotes)
+    
+    def _on_engines_update(self):
+        """Ajuste la capacité d'admission au nombre de moteurs disponibles après leur vérification"""
+        capacity = MINISHELL_MAX_RUNNING * max(1, len(self.engines.eligible()))
+        if capacity != self.admission.capacity:
+            logger.info(f"Capacité d'admission des Mini Shell portée à {capacity}")
+            self.admission.capacity = capacity
+        self.admission.release()
+    
+    def _reserved_memory(self, labels: Dict[str, str]) -> int:
+        """Limite mémoire d'un Mini Shell d'après le profil enregistré dans ses labels (0 si inconnue)"""
+        profile = self.profiles.get(labels.get(PROFILE_LABEL))
+        return parse_bytes(profile.memory) if profile and profile.memory else 0
+    
+    def list_engines(self) -> Dict:
+        """
+        Liste les moteurs Docker et leur charge
+        
+        Returns:
+            Dict: État de chaque moteur, nombre de placements et de moteurs écartés
+        """
+        return dict(self.engines.stats(), max_running=MINISHELL_MAX_RUNNING)
+    
+    def _estimate_wait(self, position: int) -> Optional[float]:
+        """
+        Estime l'attente d'une position de la file à partir des prochaines échéances d'arrêt
+        
+        Args:
+            position (int): Position dans la file (1 pour la tête)
+            
+        Returns:
+            float ou None: Secondes avant la libération de la place correspondante, None si inconnue
+        """
+        # Un container en pause a déjà libéré sa place
+        if self.is_leader:
+            remaining = sorted(entry["remaining"] for entry in self.expiry.pending() if not entry["paused"])
+        else:
+            now = time.time()
+            remaining = sorted(
+                session["expires_at"] - now for session in self.sessions.active()
+                if session["state"] == RUNNING and session["expires_at"]
+            )
+        return max(0.0, remaining[position - 1]) if position <= len(remaining) else None
+    
+    def _rebuild_expirations(self):
+        """Réconcilie le registre des sessions avec les moteurs puis replanifie l'arrêt des Mini Shell actifs"""
+        for engine in self.engines.engines.values():
+            try:
+                # Une seule liste de containers par moteur
+                summaries = engine.client.api.containers(all=True, filters={"label": f"{APP_LABEL}={MINISHELL_APP}"})
+                counts = self.sessions.reconcile(engine.name, [
+                    self._observed_session(engine, summary) for summary in summaries
+                    if not self.warm_pool.is_pool_container(container_entry(summary)["name"])
+                ])
+                logger.info(f"Sessions du moteur {engine.name} réconciliées: {counts['added']} ajoutées, "
+                            f"{counts['updated']} mises à jour, {counts['removed']} supprimées")
+            except Exception as e:
+                logger.error(f"Erreur lors de la réconciliation des sessions du moteur {engine.name}: {e}")
+        self.sessions.reconciled = True
+        
+        sessions = self.sessions.active()
+        self.expiry.rebuild(sessions, MINISHELL_AUTO_STOP)
+        for session in sessions:
+            engine = self.engines.engines.get(session["engine"])
+            if engine is not None:
+                self.engines.assign(engine, session["container_id"], session["container_name"])
+            self.freezer.track(session["container_id"], session["container_name"], paused=session["state"] == PAUSED)
+            self._follow_container(session["container_id"], session["container_name"], session["session_id"])
+            if session["state"] == PAUSED:
+                self.expiry.suspend(session["container_id"], MINISHELL_PAUSED_TTL)
+    
+    @staticmethod
+    def _observed_session(engine: Engine, summary: Dict) -> Dict:
+        """
+        Session correspondant à un container listé, pour compléter le registre
+        
+        Les labels ne servent qu'aux containers absents du registre: un container du pool attribué
+        à une session ne porte ni le label de session ni celui d'échéance (durée par défaut appliquée)
+        """
+        entry = container_entry(summary)
+        labels = entry["labels"]
+        state = {"running": RUNNING, "paused": PAUSED}.get(entry["status"], EXITED)
+        expires_at = float(labels[EXPIRES_AT_LABEL]) if labels.get(EXPIRES_AT_LABEL) else None
+        if expires_at is None and state != EXITED:
+            expires_at = time.time() + MINISHELL_AUTO_STOP
+        return {
+            "container_id": entry["id"],
+            "container_name": entry["name"],
+            "session_id": labels.get(SESSION_LABEL),
+            "engine": engine.name,
+            "created_at": summary.get("Created") or time.time(),
+            "expires_at": expires_at,
+            "idle_ttl": int(labels[IDLE_TTL_LABEL]) if labels.get(IDLE_TTL_LABEL) else None,
+            "state": state,
+        }
+    
+    def get_session(self, session_id: str) -> List[Dict]:
+        """
+        Retrouve les Mini Shell d'une session depuis le registre, sans appel au démon
+        
+        Args:
+            session_id (str): Identifiant de session
+            
+        Returns:
+            List[Dict]: Containers de la session, du plus récent au plus ancien
+        """
+        now = time.time()
+        return [
+            dict(session, remaining=max(0.0, session["expires_at"] - now) if session["expires_at"] else None)
+            for session in self.sessions.by_session(session_id)
+        ]
+    
+    def list_expirations(self) -> List[Dict]:
+        """
+        Liste les arrêts automatiques planifiés
+        
+        Returns:
+            List[Dict]: Échéances en attente, de la plus proche à la plus lointaine
+        """
+        return self.expiry.pending()
+    
     def stop_container(self, container_id_or_name: str) -> Tuple[bool, str]:
         """
         Arrête un container Docker
@@ -166,13 +1027,18 @@ class DockerManager:
         """
         try:
             # Vérifier si c'est un conteneur Mini Shell autorisé
-            if not self.is_minishell_container(container_id_or_name):
+            container = self._get_minishell_container(container_id_or_name)
+            if not container:
                 error_msg = f"Container {container_id_or_name} n'est pas un conteneur Mini Shell autorisé"
                 logger.warning(error_msg)
                 return False, error_msg
                 
-            container = self.client.containers.get(container_id_or_name)
             container.stop()
+            self.responses.invalidate()
+            self.expiry.cancel(container.id)
+            self.freezer.forget(container.id)
+            self.sessions.update(container.id, state=EXITED)
+            self.admission.release()
             logger.info(f"Container {container_id_or_name} arrêté avec succès")
             return True, f"Container {container_id_or_name} arrêté avec succès"
         except docker.errors.NotFound:
@@ -184,6 +1050,43 @@ class DockerManager:
             logger.error(error_msg)
             return False, error_msg
     
+    def start_container(self, container_id_or_name: str) -> Tuple[bool, str]:
+        """
+        Démarre un container Mini Shell arrêté et replanifie son arrêt automatique
+        
+        Args:
+            container_id_or_name (str): ID ou nom du container
+            
+        Returns:
+            Tuple[bool, str]: (succès, message)
+        """
+        try:
+            # Vérifier si c'est un conteneur Mini Shell autorisé
+            container = self._get_minishell_container(container_id_or_name)
+            if not container:
+                error_msg = f"Container {container_id_or_name} n'est pas un conteneur Mini Shell autorisé"
+                logger.warning(error_msg)
+                return False, error_msg
+            
+            if container.status == "running":
+                return True, f"Container {container_id_or_name} déjà en cours d'exécution"
+            if container.status == "paused":
+                return self._resume_paused(container.id, container_id_or_name)
+            
+            container.start()
+            self.responses.invalidate()
+            self._schedule_auto_stop(container.id, container.name, MINISHELL_AUTO_STOP, MINISHELL_IDLE_TTL or None)
+            logger.info(f"Container {container_id_or_name} démarré avec succès")
+            return True, f"Container {container_id_or_name} démarré avec succès"
+        except docker.errors.NotFound:
+            error_msg = f"Container {container_id_or_name} non trouvé"
+            logger.error(error_msg)
+            return False, error_msg
+        except Exception as e:
+            error_msg = f"Erreur lors du démarrage du container {container_id_or_name}: {e}"
+            logger.error(error_msg)
+            return False, error_msg
+    
     def remove_container(self, container_id_or_name: str, force: bool = False) -> Tuple[bool, str]:
         """
         Supprime un container Docker
@@ -197,13 +1100,20 @@ class DockerManager:
         """
         try:
             # Vérifier si c'est un conteneur Mini Shell autorisé
-            if not self.is_minishell_container(container_id_or_name):
+            container = self._get_minishell_container(container_id_or_name)
+            if not container:
                 error_msg = f"Container {container_id_or_name} n'est pas un conteneur Mini Shell autorisé"
                 logger.warning(error_msg)
                 return False, error_msg
                 
-            container = self.client.containers.get(container_id_or_name)
             container.remove(force=force)
+            self.responses.invalidate()
+            self.engines.forget(container.id, container.name)
+            self.expiry.cancel(container.id)
+            self.freezer.forget(container.id)
+            self.sessions.remove(container.id)
+            self.admission.release()
+            self.log_buffers.discard(container.id)
             logger.info(f"Container {container_id_or_name} supprimé avec succès")
             return True, f"Container {container_id_or_name} supprimé avec succès"
         except docker.errors.NotFound:
@@ -219,39 +1129,51 @@ class DockerManager:
                    path: str, 
                    tag: str, 
                    dockerfile: str = 'Dockerfile',
-                   buildargs: Optional[Dict[str, str]] = None) -> Tuple[bool, str]:
+                   buildargs: Optional[Dict[str, str]] = None,
+                   force: bool = False) -> Tuple[bool, str]:
         """
-        Construit une image Docker à partir d'un Dockerfile
+        Construit une image Docker à partir d'un Dockerfile et attend la fin de la construction
+        (une construction déjà en cours pour ce tag est partagée)
         
         Args:
             path (str): Chemin vers le répertoire contenant le Dockerfile
             tag (str): Tag à donner à l'image
             dockerfile (str): Nom du fichier Dockerfile (par défaut 'Dockerfile')
             buildargs (Dict[str, str], optional): Arguments de construction
+            force (bool): Reconstruire même si le contexte est inchangé
             
         Returns:
             Tuple[bool, str]: (succès, message)
         """
-        try:
-            # Vérifier si le Dockerfile existe
-            dockerfile_path = os.path.join(path, dockerfile)
-            if not os.path.exists(dockerfile_path):
-                return False, f"Le Dockerfile {dockerfile_path} n'existe pas"
-            
-            logger.info(f"Construction de l'image {tag} à partir de {dockerfile_path}...")
-            self.client.images.build(
-                path=path,
-                tag=tag,
-                dockerfile=dockerfile,
-                buildargs=buildargs
-            )
+        job = self.builds.submit(path, tag, dockerfile, buildargs, force)
+        job.wait()
+        return job.succeeded, job.message
+    
+    async def abuild_image(self,
+                           path: str,
+                           tag: str,
+                           dockerfile: str = 'Dockerfile',
+                           buildargs: Optional[Dict[str, str]] = None,
+                           force: bool = False) -> Tuple[bool, str]:
+        """Variante asynchrone de build_image, sans occuper de thread pendant l'attente"""
+        job = self.builds.submit(path, tag, dockerfile, buildargs, force)
+        cursor = 0
+        while True:
+            _, cursor, finished = await job.wait_async(cursor, timeout=30)
+            if finished:
+                return job.succeeded, job.message
+    
+    def build_mini_shell_image(self, force: bool = False) -> BuildJob:
+        """
+        Lance en tâche de fond la construction de l'image Mini Shell
+        
+        Args:
+            force (bool): Reconstruire même si le contexte est inchangé
             
-            logger.info(f"Image {tag} construite avec succès")
-            return True, f"Image {tag} construite avec succès"
-        except Exception as e:
-            error_msg = f"Erreur lors de la construction de l'image {tag}: {e}"
-            logger.error(error_msg)
-            return False, error_msg
+        Returns:
+            BuildJob: Job de construction à suivre
+        """
+        return self.builds.submit(MINISHELL_PROJECT_PATH, MINISHELL_IMAGE, force=force)
     
     def get_container_logs(self, container_id_or_name: str, tail: int = 100) -> Tuple[bool, str]:
         """
@@ -264,60 +1186,334 @@ class DockerManager:
         Returns:
             Tuple[bool, str]: (succès, logs ou message d'erreur)
         """
+        success, message, data = self.read_container_logs(container_id_or_name, tail)
+        return (True, data["logs"]) if success else (False, message)
+    
+    def read_container_logs(self,
+                            container_id_or_name: str,
+                            tail: int = 100,
+                            cursor: Optional[int] = None,
+                            since: Optional[float] = None,
+                            structured: bool = False) -> Tuple[bool, str, Optional[Dict]]:
+        """
+        Récupère les logs d'un container à partir de son tampon, de façon incrémentale
+        
+        Args:
+            container_id_or_name (str): ID ou nom du container
+            tail (int): Nombre de lignes à récupérer depuis la fin (sans curseur)
+            cursor (int, optional): Numéro de séquence de la dernière ligne déjà reçue
+            since (float, optional): Timestamp après lequel renvoyer les lignes
+            structured (bool): Retourner les enregistrements (seq, timestamp, stream, kind, text)
+                au lieu du texte
+            
+        Returns:
+            Tuple[bool, str, Optional[Dict]]: (succès, message, {"logs" ou "records", "cursor", "reset"} si succès)
+        """
         try:
             # Vérifier si c'est un conteneur Mini Shell autorisé
-            if not self.is_minishell_container(container_id_or_name):
+            container = self._get_minishell_container(container_id_or_name)
+            if not container:
                 error_msg = f"Container {container_id_or_name} n'est pas un conteneur Mini Shell autorisé"
                 logger.warning(error_msg)
-                return False, error_msg
+                return False, error_msg, None
                 
-            container = self.client.containers.get(container_id_or_name)
-            try:
-                logs = container.logs(tail=tail, timestamps=False).decode('utf-8')
-                # Formater les logs pour une meilleure lisibilité
-                logs = self._format_logs(logs)
-                return True, logs
-            except UnicodeDecodeError:
-                # Gérer les erreurs de décodage
-                logs = container.logs(tail=tail, timestamps=False).decode('utf-8', errors='replace')
-                return True, logs
+            self._on_activity(container.id)
+            records, next_cursor, reset = self.log_buffers.read(container.id, cursor, since, tail)
+            data = self._logs_payload(records, cursor is None and since is None, structured)
+            return True, "Logs récupérés avec succès", dict(data, cursor=next_cursor, reset=reset)
         
         except docker.errors.NotFound:
             error_msg = f"Container {container_id_or_name} non trouvé"
             logger.error(error_msg)
-            return False, error_msg
+            return False, error_msg, None
         except Exception as e:
             error_msg = f"Erreur lors de la récupération des logs du container {container_id_or_name}: {e}"
             logger.error(error_msg)
-            return False, error_msg
+            return False, error_msg, None
     
-    def get_mini_shell_container(self, 
-                               container_name: str = "mini_shell_container",
-                               expose_port: bool = False,
-                               port_mapping: Dict[str, str] = None,
-                               session_id: str = None,
-                               reuse_existing: bool = True) -> Tuple[bool, str, Optional[str]]:
+    def _logs_payload(self, records: List[LogRecord], initial: bool, structured: bool) -> Dict:
+        """Met en forme des lignes de log: enregistrements, ou texte avec message d'aide si vide"""
+        if structured:
+            return {"records": [record.to_dict() for record in records]}
+        logs = '\n'.join(record.format() for record in records)
+        if not logs and initial:
+            # Retourner un message d'aide si aucun log n'est disponible
+            logs = LOGS_HELP_MESSAGE
+        return {"logs": logs}
+    
+    def _fetch_logs(self, container_id: str, since: Optional[float], tail: int) -> bytes:
+        """Récupère les logs horodatés d'un container, uniquement après since si fourni"""
+        api = self.engines.owner(container_id).client.api
+        if since is None:
+            return api.logs(container_id, timestamps=True, tail=tail)
+        return api.logs(container_id, timestamps=True, since=since)
+    
+    def open_log_stream(self,
+                        container_id_or_name: str,
+                        loop,
+                        tail: int = 50) -> Tuple[bool, str, Optional[LogSubscriber]]:
         """
-        Méthode spécifique pour lancer un container du Mini Shell
+        Abonne un client au flux continu des logs d'un container Mini Shell
         
         Args:
-            container_name (str): Nom du container
-            expose_port (bool): Si True, expose un port pour le shell
-            port_mapping (Dict[str, str]): Mapping de ports personnalisé
-            session_id (str): Identifiant de session de l'utilisateur pour la réutilisation
-            reuse_existing (bool): Si True, réutilise un container existant s'il est en cours d'exécution
+            container_id_or_name (str): ID ou nom du container
+            loop: Boucle asyncio du client
+            tail (int): Nombre de lignes récentes à envoyer immédiatement
             
         Returns:
-            Tuple[bool, str, Optional[str]]: (succès, message, container_id si succès)
+            Tuple[bool, str, Optional[LogSubscriber]]: (succès, message, abonné si succès)
         """
-        # Vérifier si un container du même nom existe déjà
         try:
-            existing_container = self.client.containers.get(container_name)
+            container = self._get_minishell_container(container_id_or_name)
+            if not container:
+                error_msg = f"Container {container_id_or_name} n'est pas un conteneur Mini Shell autorisé"
+                logger.warning(error_msg)
+                return False, error_msg, None
+            
+            self._on_activity(container.id)
+            subscriber = self.log_stream.subscribe(container.id, loop, tail)
+            return True, f"Flux de logs du container {container_id_or_name} ouvert", subscriber
+        except docker.errors.NotFound:
+            error_msg = f"Container {container_id_or_name} non trouvé"
+            logger.error(error_msg)
+            return False, error_msg, None
+        except Exception as e:
+            error_msg = f"Erreur lors de l'ouverture du flux de logs du container {container_id_or_name}: {e}"
+            logger.error(error_msg)
+            return False, error_msg, None
+    
+    async def aopen_log_stream(self, container_id_or_name: str, tail: int = 50) -> Tuple[bool, str, Optional[LogSubscriber]]:
+        """Variante asynchrone de open_log_stream (abonné rattaché à la boucle asyncio courante)"""
+        try:
+            entry = await self._aget_minishell_entry(container_id_or_name)
+            if not entry:
+                error_msg = f"Container {container_id_or_name} n'est pas un conteneur Mini Shell autorisé"
+                logger.warning(error_msg)
+                return False, error_msg, None
+            
+            await self._aon_activity(entry["id"])
+            subscriber = self.log_stream.subscribe(entry["id"], asyncio.get_running_loop(), tail)
+            return True, f"Flux de logs du container {container_id_or_name} ouvert", subscriber
+        except docker.errors.NotFound:
+            error_msg = f"Container {container_id_or_name} non trouvé"
+            logger.error(error_msg)
+            return False, error_msg, None
+        except Exception as e:
+            error_msg = f"Erreur lors de l'ouverture du flux de logs du container {container_id_or_name}: {e}"
+            logger.error(error_msg)
+            return False, error_msg, None
+    
+    def close_log_stream(self, subscriber: LogSubscriber):
+        """
+        Désabonne un client du flux de logs
+        
+        Args:
+            subscriber (LogSubscriber): Abonné retourné par open_log_stream
+        """
+        self.log_stream.unsubscribe(subscriber)
+    
+    async def _afetch_logs(self, container_id: str, since: Optional[float], tail: int) -> bytes:
+        """Variante asynchrone de _fetch_logs"""
+        aclient = self.engines.owner(container_id).aclient
+        # Trames conservées: le traitement des logs distingue stdout et stderr
+        return await aclient.logs(container_id, tail=tail, since=since, timestamps=True, demux=False)
+    
+    def _open_log_stream(self, container_id: str, tail: int):
+        """Ouvre un flux Docker horodaté suivant les logs d'un container (un seul par container)"""
+        api = self.engines.owner(container_id).client.api
+        return api.logs(container_id, stream=True, follow=True, tail=tail, timestamps=True)
+    
+    def _open_archive_stream(self, container_id: str, since: Optional[float]):
+        """Ouvre le flux Docker horodaté archivé d'un container, depuis le début ou après since"""
+        api = self.engines.owner(container_id).client.api
+        return api.logs(container_id, stream=True, follow=True, timestamps=True, since=since)
+    
+    def _open_stats_stream(self, container_id: str):
+        """Ouvre le flux Docker des statistiques d'un container (un échantillon décodé par seconde)"""
+        api = self.engines.owner(container_id).client.api
+        return api.stats(container_id, stream=True, decode=True)
+    
+    def read_container_stats(self,
+                             container_id_or_name: Optional[str] = None,
+                             resolution: Optional[int] = None,
+                             points: int = 60) -> Tuple[bool, str, Optional[Dict]]:
+        """
+        Lit la série de consommation d'un Mini Shell, ou la série agrégée de tous les Mini Shell
+        
+        Args:
+            container_id_or_name (str, optional): ID ou nom du container (None pour l'agrégat)
+            resolution (int, optional): Pas en secondes (la résolution la plus fine si None)
+            points (int): Nombre d'intervalles, se terminant à l'intervalle en cours
+            
+        Returns:
+            Tuple[bool, str, Optional[Dict]]: (succès, message, série si succès)
+        """
+        if not self.resource_stats.enabled:
+            return False, "Collecte des statistiques désactivée (MINISHELL_STATS_RESOLUTIONS)", None
+        if not self.is_leader:
+            return False, "Statistiques collectées par le worker leader uniquement, réessayez", None
+        try:
+            if container_id_or_name is None:
+                data = self.resource_stats.series(None, resolution, points)
+                data["latest"] = self.resource_stats.latest()
+                return True, "Statistiques agrégées des Mini Shell", data
+            
+            container_id = self.resource_stats.find(container_id_or_name)
+            data = self.resource_stats.series(container_id, resolution, points) if container_id else None
+            if data is None:
+                error_msg = f"Aucune statistique pour le container {container_id_or_name}"
+                logger.warning(error_msg)
+                return False, error_msg, None
+            return True, f"Statistiques du container {container_id_or_name}", data
+        except ValueError as e:
+            return False, str(e), None
+        except Exception as e:
+            error_msg = f"Erreur lors de la lecture des statistiques: {e}"
+            logger.error(error_msg)
+            return False, error_msg, None
+    
+    async def aread_container_stats(self,
+                                    container_id_or_name: Optional[str] = None,
+                                    resolution: Optional[int] = None,
+                                    points: int = 60) -> Tuple[bool, str, Optional[Dict]]:
+        """
+        Variante asynchrone de read_container_stats: un worker non leader transmet la lecture au leader
+        
+        Raises:
+            LeaderUnavailable: Si le leader n'a pas publié son relais ou ne répond pas
+        """
+        if self.is_leader or not self.resource_stats.enabled:
+            return self.read_container_stats(container_id_or_name, resolution, points)
+        
+        retry_after = max(1, int(self.coordinator.interval))
+        path = self.coordinator.leader_endpoint("stats")
+        if path is None:
+            raise LeaderUnavailable("Statistiques indisponibles pendant l'élection du leader, réessayez", retry_after)
+        try:
+            return await aquery(path, container_id_or_name, resolution, points, timeout=DOCKER_ASYNC_TIMEOUT)
+        except Exception as e:
+            logger.error(f"Erreur lors de la lecture des statistiques auprès du leader: {e}")
+            raise LeaderUnavailable("Leader injoignable pour la lecture des statistiques, réessayez", retry_after)
+    
+    def read_session_logs(self,
+                          session_id: str,
+                          offset: int = 0,
+                          limit: int = 100,
+                          container_id_or_name: Optional[str] = None,
+                          structured: bool = False) -> Tuple[bool, str, Optional[Dict]]:
+        """
+        Lit une page des logs archivés d'une session, y compris après l'arrêt et la suppression du container
+        
+        Args:
+            session_id (str): Identifiant de session
+            offset (int): Numéro de la première ligne (négatif: compté depuis la fin)
+            limit (int): Nombre maximum de lignes (borné par MINISHELL_LOG_ARCHIVE_MAX_PAGE)
+            container_id_or_name (str, optional): Container de la session (le plus récent par défaut)
+            structured (bool): Retourner les enregistrements (seq, timestamp, stream, kind, text)
+                au lieu du texte
+            
+        Returns:
+            Tuple[bool, str, Optional[Dict]]: (succès, message, page et position de la suivante si succès)
+        """
+        try:
+            session_archives = self.log_archive.containers(session_id)
+            archives = session_archives
+            if container_id_or_name:
+                key = container_id_or_name.lstrip('/')
+                archives = [
+                    archive for archive in session_archives
+                    if archive["container_name"] == key or (len(key) >= 12 and archive["container_id"].startswith(key))
+                ]
+            if not archives:
+                error_msg = f"Aucun log archivé pour la session {session_id}"
+                logger.warning(error_msg)
+                return False, error_msg, None
+            
+            archive = archives[0]
+            limit = max(0, min(limit, MINISHELL_LOG_ARCHIVE_MAX_PAGE))
+            records, total = self.log_archive.read(archive["container_id"], offset, limit)
+            start = records[0].seq if records else (max(0, total + offset) if offset < 0 else min(offset, total))
+            end = start + len(records)
+            data = self._logs_payload(records, False, structured)
+            return True, "Logs archivés récupérés avec succès", dict(
+                data,
+                session_id=session_id,
+                container_id=archive["container_id"],
+                container_name=archive["container_name"],
+                following=archive["following"],
+                offset=start,
+                limit=limit,
+                total=total,
+                next_offset=end if end < total else None,
+                containers=[item["container_id"] for item in session_archives]
+            )
+        except Exception as e:
+            error_msg = f"Erreur lors de la lecture des logs archivés de la session {session_id}: {e}"
+            logger.error(error_msg)
+            return False, error_msg, None
+    
+    def get_mini_shell_container(self, 
+                               container_name: str = "mini_shell_container",
+                               expose_port: bool = False,
+                               port_mapping: Dict[str, str] = None,
+                               session_id: str = None,
+                               reuse_existing: bool = True,
+                               profile: Optional[str] = None) -> Tuple[bool, str, Optional[str]]:
+        """
+        Méthode spécifique pour lancer un container du Mini Shell
+        
+        Args:
+            container_name (str): Nom du container
+            expose_port (bool): Si True, expose un port pour le shell
+            port_mapping (Dict[str, str]): Mapping de ports personnalisé
+            session_id (str): Identifiant de session de l'utilisateur pour la réutilisation
+            reuse_existing (bool): Si True, réutilise un container existant s'il est en cours d'exécution
+            profile (str, optional): Profil de ressources (MINISHELL_DEFAULT_PROFILE par défaut)
+            
+        Returns:
+            Tuple[bool, str, Optional[str]]: (succès, message, container_id si succès)
+        """
+        resources = self.profiles.get(profile or MINISHELL_DEFAULT_PROFILE)
+        if resources is None:
+            return False, f"Profil de ressources inconnu: {profile}", None
+        
+        # Les lancements simultanés d'un même container (double clic, nouvel essai) partagent un seul appel
+        return self.launches.run(container_name, lambda: self._launch_mini_shell_locked(
+            container_name, expose_port, port_mapping, session_id, reuse_existing, resources
+        ))
+    
+    def _launch_mini_shell_locked(self, container_name: str, *args) -> Tuple[bool, str, Optional[str]]:
+        """Lance un Mini Shell sous le verrou partagé de son nom (un seul worker à la fois)"""
+        if self.coordinator is None:
+            return self._launch_mini_shell(container_name, *args)
+        try:
+            with self.coordinator.lock(f"launch:{container_name}"):
+                return self._launch_mini_shell(container_name, *args)
+        except LockTimeout as e:
+            logger.error(str(e))
+            return False, f"Lancement de {container_name} déjà en cours sur un autre worker", None
+    
+    def _launch_mini_shell(self,
+                           container_name: str,
+                           expose_port: bool,
+                           port_mapping: Optional[Dict[str, str]],
+                           session_id: Optional[str],
+                           reuse_existing: bool,
+                           resources: ResourceProfile) -> Tuple[bool, str, Optional[str]]:
+        """Lance ou réutilise un container Mini Shell (voir get_mini_shell_container)"""
+        # Vérifier si un container du même nom existe déjà
+        try:
+            # Nom absent du registre réconcilié: le container n'existe pas, inutile d'interroger le démon
+            if self.sessions.reconciled and self.sessions.get(container_name) is None:
+                raise docker.errors.NotFound(f"Aucune session enregistrée pour {container_name}")
+            existing_container = self.client.containers.get(container_name)
             
             # Si le container existe mais n'est pas en cours d'exécution, le démarrer
             if existing_container.status == 'exited':
                 try:
                     existing_container.start()
+                    self._schedule_auto_stop(existing_container.id, existing_container.name,
+                                             MINISHELL_AUTO_STOP, MINISHELL_IDLE_TTL or None, session_id=session_id)
                     logger.info(f"Container {container_name} redémarré avec succès")
                     return True, f"Container {container_name} redémarré", existing_container.id
                 except Exception as e:
@@ -325,9 +1521,11 @@ class DockerManager:
                     logger.error(error_msg)
                     return False, error_msg, None
             
-            # Si le container est déjà en cours d'exécution, l'utiliser si reuse_existing est True
-            elif existing_container.status == 'running':
+            # Si le container est déjà en cours d'exécution (ou en pause), l'utiliser si reuse_existing est True
+            elif existing_container.status in ('running', 'paused'):
                 if reuse_existing:
+                    if existing_container.status == 'paused':
+                        self._resume_paused(existing_container.id, container_name)
                     logger.info(f"Container {container_name} déjà en cours d'exécution et réutilisé")
                     return True, f"Container {container_name} déjà en cours d'exécution", existing_container.id
                 else:
@@ -347,17 +1545,20 @@ class DockerManager:
             logger.error(error_msg)
             return False, error_msg, None
             
-        # Vérifier le nombre de conteneurs Mini Shell en cours d'exécution
+        # Vérifier le nombre de conteneurs Mini Shell en cours d'exécution (un seul appel filtré)
         try:
-            containers = self.client.containers.list(all=True)
-            running_minishell_containers = [
-                c for c in containers 
-                if self.is_minishell_container(c.id) and c.status == 'running'
-            ]
+            if self.index.ready:
+                names = [
+                    entry["name"] for entry in self.index.containers(False, {APP_LABEL: MINISHELL_APP})
+                ]
+            else:
+                names = [c.name for c in self.client.containers.list(
+                    filters={"label": f"{APP_LABEL}={MINISHELL_APP}", "status": "running"}
+                )]
             
-            # Si 10 conteneurs sont déjà en cours d'exécution, retourner une erreur
-            if len(running_minishell_containers) >= 10:
-                error_msg = "Nombre maximum de conteneurs Mini Shell atteint (10). Veuillez réessayer plus tard."
+            # Si le maximum de conteneurs est déjà atteint, retourner une erreur
+            if self._running_minishells(names) >= MINISHELL_MAX_RUNNING:
+                error_msg = f"Nombre maximum de conteneurs Mini Shell atteint ({MINISHELL_MAX_RUNNING}). Veuillez réessayer plus tard."
                 logger.warning(error_msg)
                 return False, error_msg, None
                 
@@ -365,9 +1566,18 @@ class DockerManager:
             error_msg = f"Erreur lors de la vérification du nombre de conteneurs: {e}"
             logger.error(error_msg)
             
+        # Utiliser un container pré-démarré du pool si possible (créés avec le profil par défaut)
+        if not expose_port and resources.name == MINISHELL_DEFAULT_PROFILE:
+            pooled = self.warm_pool.acquire(container_name)
+            if pooled:
+                self.responses.invalidate()
+                self._schedule_auto_stop(pooled.id, container_name, MINISHELL_AUTO_STOP, MINISHELL_IDLE_TTL or None,
+                                         session_id=session_id)
+                return True, f"Container {container_name} démarré avec succès", pooled.id
+        
         # Image name, basée sur le contexte et le répertoire du Mini_shell
-        image_name = "mishu_minishell:latest"
-        project_path = "/home/mishu/mishu/projects/Mini_shell"
+        image_name = MINISHELL_IMAGE
+        project_path = MINISHELL_PROJECT_PATH
         
         # Essayer de construire l'image si elle n'existe pas
         try:
@@ -384,15 +1594,177 @@ class DockerManager:
         if expose_port:
             ports = port_mapping if port_mapping else {'8080': '8080'}
         
+        # Répartir la session sur les cœurs les moins chargés
+        cpuset = self.placer.place(container_name, resources.cpuset_cores, self._running_cpusets())
+        
         # Lancer le container avec auto-stop après 10 minutes (600 secondes)
         return self.run_container(
             image_name=image_name,
             container_name=container_name,
             ports=ports,
             detach=True,
-            auto_stop_after=600  # 10 minutes
+            auto_stop_after=MINISHELL_AUTO_STOP,
+            idle_ttl=MINISHELL_IDLE_TTL or None,
+            labels=self._minishell_labels(session_id, resources, cpuset),
+            resources=resources.create_kwargs(cpuset)
+        )
+    
+    def _running_minishells(self, names: List[str]) -> int:
+        """
+        Compte les Mini Shell attribués à une session parmi des noms de containers en cours d'exécution
+        
+        Args:
+            names (List[str]): Noms des containers Mini Shell en cours d'exécution
+            
+        Returns:
+            int: Nombre de containers hors pool
+        """
+        return sum(1 for name in names if not self.warm_pool.is_pool_container(name))
+    
+    def _minishell_labels(self,
+                          session_id: Optional[str] = None,
+                          resources: Optional[ResourceProfile] = None,
+                          cpuset: Optional[str] = None) -> Dict[str, str]:
+        """
+        Construit les labels d'appartenance d'un container Mini Shell
+        
+        Args:
+            session_id (str, optional): Identifiant de session de l'utilisateur
+            resources (ResourceProfile, optional): Profil de ressources appliqué
+            cpuset (str, optional): Cœurs attribués par le placement
+            
+        Returns:
+            Dict[str, str]: Labels à poser à la création du container
+        """
+        labels = {APP_LABEL: MINISHELL_APP}
+        if session_id:
+            labels[SESSION_LABEL] = session_id
+        if resources:
+            labels[PROFILE_LABEL] = resources.name
+        if cpuset:
+            labels[CPUSET_LABEL] = cpuset
+        return labels
+    
+    def _running_cpusets(self) -> Dict[str, str]:
+        """Retourne le cpuset de chaque Mini Shell en cours d'exécution {nom: cpuset}"""
+        if self.index.ready:
+            entries = [(e["name"], e["labels"]) for e in self.index.containers(False, {APP_LABEL: MINISHELL_APP})]
+        else:
+            entries = [(c.name, c.labels) for c in self.client.containers.list(
+                filters={"label": [f"{APP_LABEL}={MINISHELL_APP}", CPUSET_LABEL]}
+            )]
+        return {name: labels[CPUSET_LABEL] for name, labels in entries if labels.get(CPUSET_LABEL)}
+    
+    async def _arunning_cpusets(self) -> Dict[str, str]:
+        """Variante asynchrone de _running_cpusets"""
+        if self.index.ready:
+            return self._running_cpusets()
+        entries = map(container_entry, await self.aclient.containers(
+            filters={"label": [f"{APP_LABEL}={MINISHELL_APP}", CPUSET_LABEL], "status": ["running"]}
+        ))
+        return {entry["name"]: entry["labels"][CPUSET_LABEL] for entry in entries}
+    
+    def _pool_run_options(self, name: str) -> Dict:
+        """
+        Options de création d'un container du pool: profil par défaut et placement sur les cœurs
+        
+        Args:
+            name (str): Nom du container du pool
+            
+        Returns:
+            Dict: Arguments supplémentaires de containers.run(), labels compris
+        """
+        resources = self.profiles[MINISHELL_DEFAULT_PROFILE]
+        cpuset = self.placer.place(name, resources.cpuset_cores, self._running_cpusets())
+        options = resources.create_kwargs(cpuset)
+        options["labels"] = self._minishell_labels(resources=resources, cpuset=cpuset)
+        return options
+    
+    def list_profiles(self) -> Dict:
+        """
+        Liste les profils de ressources et la charge des cœurs
+        
+        Returns:
+            Dict: Profils, profil par défaut et nombre de sessions épinglées par cœur
+        """
+        try:
+            placement = self.placer.stats(self._running_cpusets())
+        except Exception as e:
+            logger.error(f"Erreur lors du calcul de la charge des cœurs: {e}")
+            placement = None
+        return {
+            "default": MINISHELL_DEFAULT_PROFILE,
+            "profiles": [profile.to_dict() for profile in self.profiles.values()],
+            "placement": placement,
+            "max_running": MINISHELL_MAX_RUNNING,
+        }
+    
+    @staticmethod
+    def _is_minishell(container) -> bool:
+        """
+        Vérifie à partir des attributs déjà chargés si un container est un Mini Shell
+        
+        Args:
+            container: Container Docker
+            
+        Returns:
+            bool: True si c'est un conteneur Mini Shell, False sinon
+        """
+        return DockerManager._is_minishell_entry(
+            container.labels, container.attrs.get('Config', {}).get('Image')
         )
     
+    @staticmethod
+    def _is_minishell_entry(labels: Optional[Dict[str, str]], image: Optional[str]) -> bool:
+        """
+        Vérifie à partir de ses labels et de son image si un container est un Mini Shell
+        
+        Args:
+            labels (Dict[str, str], optional): Labels du container
+            image (str, optional): Nom de l'image de création
+            
+        Returns:
+            bool: True si c'est un conteneur Mini Shell, False sinon
+        """
+        if (labels or {}).get(APP_LABEL) == MINISHELL_APP:
+            return True
+        
+        # Containers créés avant la pose des labels: nom de l'image de création
+        image = image or ''
+        return "mishu_minishell" in image or "hmenkor/mini-shell" in image
+    
+    def _get_minishell_container(self, container_id_or_name: str):
+        """
+        Récupère un container s'il s'agit d'un conteneur Mini Shell autorisé
+        
+        Args:
+            container_id_or_name (str): ID ou nom du container
+            
+        Returns:
+            Container ou None si ce n'est pas un Mini Shell
+            
+        Raises:
+            docker.errors.NotFound: Si le container n'existe pas
+        """
+        # Containers des moteurs distants: interroger le moteur propriétaire
+        engine = self.engines.owner(container_id_or_name)
+        if not engine.local:
+            container = engine.client.containers.get(container_id_or_name)
+            return container if self._is_minishell(container) else None
+        
+        # Servir la vérification depuis l'index sans appel au démon
+        entry = self.index.get(container_id_or_name) if self.index.ready else None
+        if entry:
+            container = self.client.containers.prepare_model({
+                "Id": entry["id"],
+                "Name": entry["name"],
+                "State": {"Status": entry["status"]},
+                "Config": {"Labels": entry["labels"], "Image": entry["image"]},
+            })
+        else:
+            container = self.client.containers.get(container_id_or_name)
+        return container if self._is_minishell(container) else None
+    
     def is_minishell_container(self, container_id_or_name: str) -> bool:
         """
         Vérifie si un container est un conteneur Mini Shell autorisé
@@ -404,59 +1776,612 @@ class DockerManager:
             bool: True si c'est un conteneur Mini Shell, False sinon
         """
         try:
-            container = self.client.containers.get(container_id_or_name)
+            is_minishell = self._get_minishell_container(container_id_or_name) is not None
+            logger.debug(f"Container {container_id_or_name} est un Mini Shell: {is_minishell}")
+            return is_minishell
+        except Exception as e:
+            logger.error(f"Erreur lors de la vérification du container: {e}")
+            return False
+    
+    # ------------------------------------------------------------------
+    # Variantes asynchrones utilisées directement par les routes de l'API
+    # ------------------------------------------------------------------
+    
+    async def ais_minishell_container(self, container_id_or_name: str) -> bool:
+        """Variante asynchrone de is_minishell_container"""
+        try:
+            return await self._aget_minishell_entry(container_id_or_name) is not None
+        except Exception as e:
+            logger.error(f"Erreur lors de la vérification du container: {e}")
+            return False
+    
+    async def alist_images(self) -> List[Dict]:
+        """Variante asynchrone de list_images"""
+        if self.index.ready:
+            return self.index.images()
+        
+        try:
+            return [image_entry(summary) for summary in await self.aclient.images()]
+        except Exception as e:
+            logger.error(f"Erreur lors de la récupération des images: {e}")
+            return []
+    
+    async def alist_containers(self, all_containers: bool = True, minishell_only: bool = False) -> List[Dict]:
+        """Variante asynchrone de list_containers"""
+        if self.index.ready:
+            return self.list_containers(all_containers, minishell_only)
+        
+        try:
+            filters = {"label": [f"{APP_LABEL}={MINISHELL_APP}"]} if minishell_only else None
+            return [
+                {key: entry[key] for key in ("id", "name", "image", "status", "created")}
+                for entry in map(container_entry, await self.aclient.containers(all_containers, filters))
+            ] + self._remote_containers(all_containers)
+        except Exception as e:
+            logger.error(f"Erreur lors de la récupération des containers: {e}")
+            return []
+    
+    async def _aget_minishell_entry(self, container_id_or_name: str) -> Optional[Dict]:
+        """
+        Variante asynchrone de _get_minishell_container
+        
+        Args:
+            container_id_or_name (str): ID ou nom du container
             
-            # Vérifier si l'image est bien mishu_minishell ou hmenkor/mini-shell
-            if not container.image.tags:
-                return False
-                
-            is_minishell = any("mishu_minishell" in tag or "hmenkor/mini-shell" in tag 
-                              for tag in container.image.tags)
+        Returns:
+            Dict ou None: {"id", "name", "status", "labels", "image"} si c'est un Mini Shell
             
-            # Vérifier les options de sécurité du container
-            security_opts = container.attrs.get('HostConfig', {}).get('SecurityOpt', [])
+        Raises:
+            docker.errors.NotFound: Si le container n'existe pas
+        """
+        engine = self.engines.owner(container_id_or_name)
+        entry = self.index.get(container_id_or_name) if engine.local and self.index.ready else None
+        if entry is None:
+            attrs = await engine.aclient.inspect_container(container_id_or_name)
+            entry = {
+                "id": attrs["Id"],
+                "name": attrs["Name"].lstrip('/'),
+                "status": attrs["State"]["Status"],
+                "labels": attrs["Config"].get("Labels") or {},
+                "image": attrs["Config"].get("Image"),
+            }
+        return entry if self._is_minishell_entry(entry["labels"], entry["image"]) else None
+    
+    async def astop_container(self, container_id_or_name: str) -> Tuple[bool, str]:
+        """Variante asynchrone de stop_container"""
+        try:
+            # Vérifier si c'est un conteneur Mini Shell autorisé
+            entry = await self._aget_minishell_entry(container_id_or_name)
+            if not entry:
+                error_msg = f"Container {container_id_or_name} n'est pas un conteneur Mini Shell autorisé"
+                logger.warning(error_msg)
+                return False, error_msg
             
-            # Logs pour le débogage
-            logger.info(f"Container {container_id_or_name} est un Mini Shell: {is_minishell}")
-            logger.info(f"Security options: {security_opts}")
+            await self.engines.owner(entry["id"]).aclient.stop(entry["id"])
+            self.responses.invalidate()
+            self.expiry.cancel(entry["id"])
+            self.freezer.forget(entry["id"])
+            self.sessions.update(entry["id"], state=EXITED)
+            self.admission.release()
+            logger.info(f"Container {container_id_or_name} arrêté avec succès")
+            return True, f"Container {container_id_or_name} arrêté avec succès"
+        except docker.errors.NotFound:
+            error_msg = f"Container {container_id_or_name} non trouvé"
+            logger.error(error_msg)
+            return False, error_msg
+        except Exception as e:
+            error_msg = f"Erreur lors de l'arrêt du container {container_id_or_name}: {e}"
+            logger.error(error_msg)
+            return False, error_msg
+    
+    async def astart_container(self, container_id_or_name: str) -> Tuple[bool, str]:
+        """Variante asynchrone de start_container"""
+        try:
+            # Vérifier si c'est un conteneur Mini Shell autorisé
+            entry = await self._aget_minishell_entry(container_id_or_name)
+            if not entry:
+                error_msg = f"Container {container_id_or_name} n'est pas un conteneur Mini Shell autorisé"
+                logger.warning(error_msg)
+                return False, error_msg
             
-            return is_minishell
+            if entry["status"] == "running":
+                return True, f"Container {container_id_or_name} déjà en cours d'exécution"
+            if entry["status"] == "paused":
+                return await asyncio.get_running_loop().run_in_executor(
+                    None, self._resume_paused, entry["id"], container_id_or_name
+                )
+            
+            await self.engines.owner(entry["id"]).aclient.start(entry["id"])
+            self.responses.invalidate()
+            self._schedule_auto_stop(entry["id"], entry["name"], MINISHELL_AUTO_STOP, MINISHELL_IDLE_TTL or None)
+            logger.info(f"Container {container_id_or_name} démarré avec succès")
+            return True, f"Container {container_id_or_name} démarré avec succès"
+        except docker.errors.NotFound:
+            error_msg = f"Container {container_id_or_name} non trouvé"
+            logger.error(error_msg)
+            return False, error_msg
         except Exception as e:
-            logger.error(f"Erreur lors de la vérification du container: {e}")
-            return False
+            error_msg = f"Erreur lors du démarrage du container {container_id_or_name}: {e}"
+            logger.error(error_msg)
+            return False, error_msg
     
-    def _format_logs(self, logs: str) -> str:
+    async def aremove_container(self, container_id_or_name: str, force: bool = False) -> Tuple[bool, str]:
+        """Variante asynchrone de remove_container"""
+        try:
+            # Vérifier si c'est un conteneur Mini Shell autorisé
+            entry = await self._aget_minishell_entry(container_id_or_name)
+            if not entry:
+                error_msg = f"Container {container_id_or_name} n'est pas un conteneur Mini Shell autorisé"
+                logger.warning(error_msg)
+                return False, error_msg
+            
+            await self.engines.owner(entry["id"]).aclient.remove(entry["id"], force=force)
+            self.responses.invalidate()
+            self.engines.forget(entry["id"], entry["name"])
+            self.expiry.cancel(entry["id"])
+            self.freezer.forget(entry["id"])
+            self.sessions.remove(entry["id"])
+            self.admission.release()
+            self.log_buffers.discard(entry["id"])
+            logger.info(f"Container {container_id_or_name} supprimé avec succès")
+            return True, f"Container {container_id_or_name} supprimé avec succès"
+        except docker.errors.NotFound:
+            error_msg = f"Container {container_id_or_name} non trouvé"
+            logger.error(error_msg)
+            return False, error_msg
+        except Exception as e:
+            error_msg = f"Erreur lors de la suppression du container {container_id_or_name}: {e}"
+            logger.error(error_msg)
+            return False, error_msg
+    
+    async def abulk_action(self,
+                           action: str,
+                           container_ids: Optional[List[str]] = None,
+                           session_id: Optional[str] = None,
+                           labels: Optional[Dict[str, str]] = None,
+                           force: bool = False) -> Tuple[bool, str, Dict]:
         """
-        Formater les logs pour une meilleure lisibilité
+        Arrête ou supprime plusieurs Mini Shell en parallèle
         
         Args:
-            logs (str): Logs bruts
+            action (str): "stop" ou "remove"
+            container_ids (List[str], optional): IDs ou noms des containers
+            session_id (str, optional): Sélectionne les containers de cette session (registre)
+            labels (Dict[str, str], optional): Sélectionne les Mini Shell portant ces labels
+            force (bool): Supprime même les containers en cours d'exécution (action "remove")
             
         Returns:
-            str: Logs formatés
+            Tuple[bool, str, Dict]: (succès de toutes les actions, message, {"results", "succeeded", "failed"})
         """
-        if not logs:
-            # Retourner un message d'aide si aucun log n'est disponible
-            return "En attente des logs...\n\nVous pouvez interagir avec le Mini Shell en utilisant ces commandes:\n- ls (lister les fichiers)\n- cd (changer de répertoire)\n- echo (afficher un texte)\n- cat (afficher un fichier)\n- exit (quitter le shell)"
+        if action not in ("stop", "remove"):
+            return False, f"Action {action} inconnue (stop ou remove)", {"results": [], "succeeded": 0, "failed": 0}
+        
+        targets = await self._aselect_minishells(container_ids, session_id, labels)
+        semaphore = asyncio.Semaphore(MINISHELL_BULK_CONCURRENCY)
+        
+        async def run(container_id: str) -> Dict:
+            async with semaphore:
+                if action == "stop":
+                    success, message = await self.astop_container(container_id)
+                else:
+                    success, message = await self.aremove_container(container_id, force=force)
+            return {"container_id": container_id, "success": success, "message": message}
+        
+        results = await asyncio.gather(*(run(container_id) for container_id in targets))
+        succeeded = sum(1 for result in results if result["success"])
+        failed = len(results) - succeeded
+        verb = "arrêtés" if action == "stop" else "supprimés"
+        message = f"{succeeded} containers {verb} sur {len(results)}" if results else "Aucun container sélectionné"
+        logger.info(message)
+        return failed == 0, message, {"results": list(results), "succeeded": succeeded, "failed": failed}
+    
+    async def _aselect_minishells(self,
+                                  container_ids: Optional[List[str]],
+                                  session_id: Optional[str],
+                                  labels: Optional[Dict[str, str]]) -> List[str]:
+        """IDs désignés directement, par session et par labels (sans doublon, pool exclu)"""
+        targets = list(container_ids or [])
+        if session_id:
+            targets += [session["container_id"] for session in self.sessions.by_session(session_id)]
+        if labels:
+            selector = dict(labels, **{APP_LABEL: MINISHELL_APP})
+            # Les containers du pool attribués à une session n'ont pas le label de session: le registre fait foi
+            members = None
+            if SESSION_LABEL in selector:
+                members = {session["container_id"] for session in self.sessions.by_session(selector.pop(SESSION_LABEL))}
+            if self.index.ready:
+                entries = self.index.containers(True, selector)
+            else:
+                entries = [container_entry(summary) for summary in await self.aclient.containers(
+                    True, {"label": [f"{key}={value}" for key, value in selector.items()]}
+                )]
+            entries += [
+                entry for entry in self.engines.containers(True)
+                if all(entry["labels"].get(key) == value for key, value in selector.items())
+            ]
+            targets += [
+                entry["id"] for entry in entries
+                if not self.warm_pool.is_pool_container(entry["name"]) and (members is None or entry["id"] in members)
+            ]
+        return list(dict.fromkeys(targets))
+    
+    def collect_garbage(self, max_age: Optional[int] = None) -> Tuple[bool, str, Dict]:
+        """
+        Supprime immédiatement les Mini Shell arrêtés (appel prune filtré sur chaque moteur)
+        
+        Args:
+            max_age (int, optional): Ancienneté minimale en secondes (MINISHELL_GC_MAX_AGE par défaut)
+            
+        Returns:
+            Tuple[bool, str, Dict]: (succès, message, IDs supprimés par moteur, espace libéré et erreurs)
+        """
+        result = self.gc.collect(max_age)
+        count = sum(len(ids) for ids in result["deleted"].values())
+        if result["errors"]:
+            return False, f"{count} containers supprimés, erreurs sur {', '.join(result['errors'])}", result
+        return True, f"{count} containers arrêtés supprimés", result
+    
+    async def aread_container_logs(self,
+                                   container_id_or_name: str,
+                                   tail: int = 100,
+                                   cursor: Optional[int] = None,
+                                   since: Optional[float] = None,
+                                   structured: bool = False) -> Tuple[bool, str, Optional[Dict]]:
+        """Variante asynchrone de read_container_logs"""
+        try:
+            # Vérifier si c'est un conteneur Mini Shell autorisé
+            entry = await self._aget_minishell_entry(container_id_or_name)
+            if not entry:
+                error_msg = f"Container {container_id_or_name} n'est pas un conteneur Mini Shell autorisé"
+                logger.warning(error_msg)
+                return False, error_msg, None
             
-        # Supprimer les caractères de contrôle inutiles
-        import re
-        logs = re.sub(r'\x1b\[[0-9;]*[mK]', '', logs)
+            await self._aon_activity(entry["id"])
+            records, next_cursor, reset = await self.log_buffers.aread(entry["id"], cursor, since, tail)
+            data = self._logs_payload(records, cursor is None and since is None, structured)
+            return True, "Logs récupérés avec succès", dict(data, cursor=next_cursor, reset=reset)
         
-        # Ajouter des préfixes pour les commandes
-        lines = logs.split('\n')
-        formatted_lines = []
+        except docker.errors.NotFound:
+            error_msg = f"Container {container_id_or_name} non trouvé"
+            logger.error(error_msg)
+            return False, error_msg, None
+        except Exception as e:
+            error_msg = f"Erreur lors de la récupération des logs du container {container_id_or_name}: {e}"
+            logger.error(error_msg)
+            return False, error_msg, None
+    
+    def terminal_token(self, container_id: str) -> Optional[str]:
+        """
+        Jeton d'accès au terminal d'un Mini Shell, remis à la session qui l'a lancé
         
-        command_pattern = re.compile(r'^(\$|#|>|minishell|bash).*')
+        Le jeton est dérivé de la session enregistrée dans le registre (containers du pool compris)
+        et n'apparaît dans aucune liste: connaître l'identifiant de session ne suffit pas.
         
-        for line in lines:
-            if command_pattern.match(line):
-                # C'est probablement une commande
-                formatted_lines.append(f"> {line}")
+        Args:
+            container_id (str): ID du container
+            
+        Returns:
+            str ou None: Jeton, None si le container n'est attribué à aucune session
+        """
+        session = self.sessions.get(container_id)
+        if session is None or not session["session_id"]:
+            return None
+        return sign(self.terminal_secret, session["container_id"], session["session_id"])
+    
+    async def aopen_terminal(self,
+                             container_id_or_name: str,
+                             token: Optional[str] = None,
+                             authorized: bool = False,
+                             cols: int = 80,
+                             rows: int = 24) -> Tuple[bool, str, Optional[TerminalSession]]:
+        """
+        Ouvre un terminal interactif (exec avec TTY) dans un container Mini Shell
+        
+        Args:
+            container_id_or_name (str): ID ou nom du container
+            token (str, optional): Jeton remis par /mini-shell/run (voir terminal_token)
+            authorized (bool): True si le client est authentifié (clé API ou administrateur)
+            cols (int): Largeur initiale du terminal
+            rows (int): Hauteur initiale du terminal
+            
+        Returns:
+            Tuple[bool, str, Optional[TerminalSession]]: (succès, message, session si succès)
+        """
+        try:
+            entry = await self._aget_minishell_entry(container_id_or_name)
+            if not entry:
+                error_msg = f"Container {container_id_or_name} n'est pas un conteneur Mini Shell autorisé"
+                logger.warning(error_msg)
+                return False, error_msg, None
+            
+            # Sans authentification, seule la session qui a lancé le container (jeton du lancement) peut s'y connecter
+            if not authorized:
+                expected = self.terminal_token(entry["id"])
+                if not token or expected is None or not hmac.compare_digest(token, expected):
+                    error_msg = f"Session non autorisée pour le container {container_id_or_name}"
+                    logger.warning(error_msg)
+                    return False, error_msg, None
+            
+            # Un container en pause est repris avant d'y ouvrir un terminal
+            if entry["status"] == "paused" or self._is_paused(entry["id"]):
+                if not await self._aon_activity(entry["id"]):
+                    return False, f"Container {container_id_or_name} en pause et impossible à reprendre", None
+            elif entry["status"] != "running" and not await self._ais_running(entry["id"]):
+                return False, f"Container {container_id_or_name} n'est pas en cours d'exécution", None
+            if self.terminals.full:
+                return False, "Nombre maximum de terminaux ouverts atteint", None
+            
+            aclient = self.engines.owner(entry["id"]).aclient
+            if MINISHELL_TERMINAL_CMD:
+                cmd = shlex.split(MINISHELL_TERMINAL_CMD)
+            else:
+                # Relancer la commande de l'image (le Mini Shell) dans un nouveau TTY
+                config = (await aclient.inspect_container(entry["id"]))["Config"]
+                cmd = (config.get("Entrypoint") or []) + (config.get("Cmd") or []) or ["/bin/sh"]
+            
+            session = await self.terminals.open(aclient, entry["id"], cmd, cols, rows)
+            self._on_activity(entry["id"])
+            return True, f"Terminal du container {container_id_or_name} ouvert", session
+        except docker.errors.NotFound:
+            error_msg = f"Container {container_id_or_name} non trouvé"
+            logger.error(error_msg)
+            return False, error_msg, None
+        except Exception as e:
+            error_msg = f"Erreur lors de l'ouverture du terminal du container {container_id_or_name}: {e}"
+            logger.error(error_msg)
+            return False, error_msg, None
+    
+    async def arun_container(self,
+                             image_name: str,
+                             container_name: Optional[str] = None,
+                             ports: Optional[Dict[str, str]] = None,
+                             volumes: Optional[Dict[str, Dict[str, str]]] = None,
+                             environment: Optional[Dict[str, str]] = None,
+                             auto_remove: bool = False,
+                             auto_stop_after: Optional[int] = 600,
+                             idle_ttl: Optional[int] = None,
+                             labels: Optional[Dict[str, str]] = None,
+                             host_config: Optional[Dict] = None,
+                             engine: Optional[Engine] = None) -> Tuple[bool, str, Optional[str]]:
+        """
+        Variante asynchrone de run_container (le container est toujours détaché)
+        
+        Les limites de ressources sont transmises dans host_config (voir ResourceProfile.host_config),
+        et engine désigne le moteur Docker sur lequel créer le container (moteur local par défaut).
+        """
+        engine = engine or self.engines.local
+        aclient = engine.aclient
+        try:
+            # Vérifier si l'image existe
+            try:
+                await aclient.inspect_image(image_name)
+            except docker.errors.NotFound:
+                logger.warning(f"Image {image_name} non trouvée, tentative de téléchargement...")
+                await aclient.pull(image_name)
+            
+            # Enregistrer l'échéance dans les labels pour la retrouver au redémarrage
+            labels, expires_at = self._expiry_labels(labels, auto_stop_after, idle_ttl)
+            
+            config = {"Image": image_name, "Labels": labels, "HostConfig": dict(host_config or {}, AutoRemove=auto_remove)}
+            if environment:
+                config["Env"] = [f"{key}={value}" for key, value in environment.items()]
+            if ports:
+                # Même convention que le SDK docker: {port_container: port_hôte}
+                bindings = {
+                    (port if '/' in str(port) else f"{port}/tcp"): [{"HostPort": str(host_port)}]
+                    for port, host_port in ports.items()
+                }
+                config["ExposedPorts"] = {port: {} for port in bindings}
+                config["HostConfig"]["PortBindings"] = bindings
+            if volumes:
+                config["HostConfig"]["Binds"] = [
+                    f"{host_path}:{volume['bind']}:{volume.get('mode', 'rw')}"
+                    for host_path, volume in volumes.items()
+                ]
+            
+            try:
+                container_id = await aclient.create_container(config, name=container_name)
+            except docker.errors.APIError as e:
+                if e.status_code == 409:
+                    return False, f"Un container nommé {container_name} existe déjà", None
+                raise
+            self.engines.assign(engine, container_id, container_name)
+            await aclient.start(container_id)
+            self.responses.invalidate()
+            name = container_name or container_id[:12]
+            
+            # Si auto_stop_after est spécifié, planifier l'arrêt automatique
+            if expires_at:
+                self._schedule_auto_stop(container_id, name, auto_stop_after, idle_ttl, expires_at,
+                                         session_id=labels.get(SESSION_LABEL))
+            
+            logger.info(f"Container {name} créé avec succès sur le moteur {engine.name} (ID: {container_id})")
+            return True, f"Container {name} démarré avec succès", container_id
+            
+        except Exception as e:
+            error_msg = f"Erreur lors du lancement du container depuis l'image {image_name}: {e}"
+            logger.error(error_msg)
+            return False, error_msg, None
+    
+    async def aget_mini_shell_container(self,
+                                        container_name: str = "mini_shell_container",
+                                        expose_port: bool = False,
+                                        port_mapping: Dict[str, str] = None,
+                                        session_id: str = None,
+                                        reuse_existing: bool = True,
+                                        profile: Optional[str] = None) -> Tuple[bool, str, Optional[str]]:
+        """Variante asynchrone de get_mini_shell_container"""
+        resources = self.profiles.get(profile or MINISHELL_DEFAULT_PROFILE)
+        if resources is None:
+            return False, f"Profil de ressources inconnu: {profile}", None
+        
+        return await self.alaunches.run(container_name, lambda: self._alaunch_mini_shell_locked(
+            container_name, expose_port, port_mapping, session_id, reuse_existing, resources
+        ))
+    
+    async def _alaunch_mini_shell_locked(self, container_name: str, *args) -> Tuple[bool, str, Optional[str]]:
+        """Variante asynchrone de _launch_mini_shell_locked"""
+        if self.coordinator is None:
+            return await self._alaunch_mini_shell(container_name, *args)
+        try:
+            async with self.coordinator.alock(f"launch:{container_name}"):
+                return await self._alaunch_mini_shell(container_name, *args)
+        except LockTimeout as e:
+            logger.error(str(e))
+            return False, f"Lancement de {container_name} déjà en cours sur un autre worker", None
+    
+    async def _alaunch_mini_shell(self,
+                                  container_name: str,
+                                  expose_port: bool,
+                                  port_mapping: Optional[Dict[str, str]],
+                                  session_id: Optional[str],
+                                  reuse_existing: bool,
+                                  resources: ResourceProfile) -> Tuple[bool, str, Optional[str]]:
+        """Variante asynchrone de _launch_mini_shell"""
+        # Vérifier si un container du même nom existe déjà (sur le moteur qui le possède)
+        aclient = self.engines.owner(container_name).aclient
+        try:
+            # Nom absent du registre réconcilié: le container n'existe pas, inutile d'interroger le démon
+            if self.sessions.reconciled and self.sessions.get(container_name) is None:
+                raise docker.errors.NotFound(f"Aucune session enregistrée pour {container_name}")
+            attrs = await aclient.inspect_container(container_name)
+            status = attrs["State"]["Status"]
+            
+            # Si le container existe mais n'est pas en cours d'exécution, le démarrer
+            if status == 'exited':
+                try:
+                    await aclient.start(attrs["Id"])
+                    self._schedule_auto_stop(attrs["Id"], container_name, MINISHELL_AUTO_STOP,
+                                             MINISHELL_IDLE_TTL or None, session_id=session_id)
+                    logger.info(f"Container {container_name} redémarré avec succès")
+                    return True, f"Container {container_name} redémarré", attrs["Id"]
+                except Exception as e:
+                    error_msg = f"Erreur lors du redémarrage du container {container_name}: {e}"
+                    logger.error(error_msg)
+                    return False, error_msg, None
+            
+            # Si le container est déjà en cours d'exécution (ou en pause), l'utiliser si reuse_existing est True
+            elif status in ('running', 'paused'):
+                if reuse_existing:
+                    if status == 'paused':
+                        await asyncio.get_running_loop().run_in_executor(
+                            None, self._resume_paused, attrs["Id"], container_name
+                        )
+                    logger.info(f"Container {container_name} déjà en cours d'exécution et réutilisé")
+                    return True, f"Container {container_name} déjà en cours d'exécution", attrs["Id"]
+                else:
+                    logger.warning(f"Container {container_name} déjà en cours d'exécution et non réutilisé")
+                    return False, f"Un container nommé {container_name} existe déjà (statut: {status})", None
+            
+            # Autres cas (création, redémarrage, etc.)
             else:
-                formatted_lines.append(line)
+                logger.warning(f"Un container nommé {container_name} existe déjà (statut: {status})")
+                return False, f"Un container nommé {container_name} existe déjà (statut: {status})", None
                 
-        return '\n'.join(formatted_lines)
+        except docker.errors.NotFound:
+            # Le container n'existe pas, on continue avec la création
+            pass
+        except Exception as e:
+            error_msg = f"Erreur lors de la vérification du container existant: {e}"
+            logger.error(error_msg)
+            return False, error_msg, None
+        
+        # Réserver une place, ou une position dans la file d'attente si la capacité est atteinte
+        ticket = await self.admission.enter(container_name)
+        if not ticket.admitted:
+            message = (f"Nombre maximum de conteneurs Mini Shell atteint ({MINISHELL_MAX_RUNNING}). "
+                       f"Demande placée en file d'attente (position {ticket.position})")
+            logger.warning(message)
+            return False, message, None
+        
+        success = False
+        try:
+            success, message, container_id = await self._acreate_mini_shell(
+                container_name, expose_port, port_mapping, session_id, resources
+            )
+        finally:
+            # Place libérée même si le lancement est interrompu (annulation, exception)
+            self.admission.complete(container_name, launched=success)
+        return success, message, container_id
+    
+    async def _acreate_mini_shell(self,
+                                  container_name: str,
+                                  expose_port: bool,
+                                  port_mapping: Optional[Dict[str, str]],
+                                  session_id: Optional[str],
+                                  resources: ResourceProfile) -> Tuple[bool, str, Optional[str]]:
+        """Attribue un container du pool ou crée un nouveau Mini Shell, une place ayant été réservée"""
+        # Choisir le moteur le moins chargé (nombre de sessions puis mémoire réservée)
+        engine = self.engines.choose(self._reserved_memory({PROFILE_LABEL: resources.name}))
+        if engine is None:
+            error_msg = "Aucun moteur Docker disponible pour lancer le Mini Shell"
+            logger.error(error_msg)
+            return False, error_msg, None
+        if not engine.local:
+            return await self._acreate_remote_mini_shell(engine, container_name, expose_port, port_mapping,
+                                                         session_id, resources)
+        
+        # Utiliser un container pré-démarré du pool si possible (créés avec le profil par défaut)
+        if not expose_port and resources.name == MINISHELL_DEFAULT_PROFILE:
+            pooled_id = await self.warm_pool.aacquire(container_name, self.aclient)
+            if pooled_id:
+                self.responses.invalidate()
+                self._schedule_auto_stop(pooled_id, container_name, MINISHELL_AUTO_STOP, MINISHELL_IDLE_TTL or None,
+                                         session_id=session_id)
+                return True, f"Container {container_name} démarré avec succès", pooled_id
+        
+        # Essayer de construire l'image si elle n'existe pas
+        try:
+            await self.aclient.inspect_image(MINISHELL_IMAGE)
+        except docker.errors.NotFound:
+            logger.info(f"L'image {MINISHELL_IMAGE} n'existe pas, construction...")
+            success, message = await self.abuild_image(MINISHELL_PROJECT_PATH, MINISHELL_IMAGE)
+            if not success:
+                return False, message, None
+        
+        # Configuration du mapping des ports
+        ports = None
+        if expose_port:
+            ports = port_mapping if port_mapping else {'8080': '8080'}
+        
+        # Répartir la session sur les cœurs les moins chargés
+        cpuset = self.placer.place(container_name, resources.cpuset_cores, await self._arunning_cpusets())
+        
+        # Lancer le container avec auto-stop après 10 minutes (600 secondes)
+        return await self.arun_container(
+            image_name=MINISHELL_IMAGE,
+            container_name=container_name,
+            ports=ports,
+            auto_stop_after=MINISHELL_AUTO_STOP,
+            idle_ttl=MINISHELL_IDLE_TTL or None,
+            labels=self._minishell_labels(session_id, resources, cpuset),
+            host_config=resources.host_config(cpuset)
+        )
+    
+    async def _acreate_remote_mini_shell(self,
+                                         engine: Engine,
+                                         container_name: str,
+                                         expose_port: bool,
+                                         port_mapping: Optional[Dict[str, str]],
+                                         session_id: Optional[str],
+                                         resources: ResourceProfile) -> Tuple[bool, str, Optional[str]]:
+        """Crée un Mini Shell sur un moteur distant (l'image y est présente, vérifiée par le suivi des moteurs)"""
+        ports = (port_mapping if port_mapping else {'8080': '8080'}) if expose_port else None
+        running = {
+            entry["name"]: entry["labels"][CPUSET_LABEL] for entry in engine.containers
+            if entry["status"] == "running" and entry["labels"].get(CPUSET_LABEL)
+        }
+        cpuset = engine.placer.place(container_name, resources.cpuset_cores, running) if engine.placer else None
+        return await self.arun_container(
+            image_name=MINISHELL_IMAGE,
+            container_name=container_name,
+            ports=ports,
+            auto_stop_after=MINISHELL_AUTO_STOP,
+            idle_ttl=MINISHELL_IDLE_TTL or None,
+            labels=self._minishell_labels(session_id, resources, cpuset),
+            host_config=resources.host_config(cpuset),
+            engine=engine
+        )
 
 # Instance par défaut
 docker_manager = DockerManager()
\ No newline at end of file
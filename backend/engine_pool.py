@@ -0,0 +1,337 @@
+"""
+Module de gestion d'un ensemble de moteurs Docker
+Les nouveaux Mini Shell sont placés sur le moteur le moins chargé; chaque container est ensuite
+routé vers le moteur qui le possède, et les moteurs qui ne répondent plus sont écartés
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import docker
+
+from async_docker import AsyncDockerClient
+from container_index import container_entry
+from resource_profiles import CpusetPlacer
+
+logger = logging.getLogger(__name__)
+
+# Nom du moteur local (docker.from_env)
+LOCAL_ENGINE = "local"
+
+
+def parse_engines(value: Optional[str]) -> Dict[str, str]:
+    """
+    Lit la liste des moteurs distants
+
+    Args:
+        value (str, optional): Liste "nom=unix:///chemin/docker.sock,nom2=..."
+
+    Returns:
+        Dict[str, str]: Chemin du socket de chaque moteur {nom: chemin}
+    """
+    engines = {}
+    for item in filter(None, (part.strip() for part in (value or "").split(','))):
+        name, _, url = item.partition('=')
+        if not url.startswith("unix://"):
+            logger.error(f"Moteur Docker {name} ignoré: seuls les sockets unix:// sont pris en charge")
+            continue
+        engines[name.strip()] = url[len("unix://"):]
+    return engines
+
+
+class Engine:
+    """Moteur Docker et son dernier état connu"""
+
+    def __init__(self,
+                 name: str,
+                 client: docker.DockerClient,
+                 aclient: AsyncDockerClient,
+                 local: bool = False,
+                 placer: Optional[CpusetPlacer] = None):
+        """
+        Initialise le moteur
+
+        Args:
+            name (str): Nom du moteur
+            client (docker.DockerClient): Client Docker synchrone
+            aclient (AsyncDockerClient): Client Docker asynchrone
+            local (bool): True pour le moteur local (index, pool et constructions)
+            placer (CpusetPlacer, optional): Placement sur les cœurs (déduit du nombre de CPU sinon)
+        """
+        self.name = name
+        self.client = client
+        self.aclient = aclient
+        self.local = local
+        self.placer = placer
+        self.healthy = local
+        self.failures = 0
+        self.has_image = local
+        self.running = 0
+        self.mem_total = 0
+        self.reserved_memory = 0
+        self.containers: List[Dict] = []
+        self.checked_at: Optional[float] = None
+        self.error: Optional[str] = None
+
+    @classmethod
+    def from_socket(cls, name: str, socket_path: str, pool_size: int = 16, timeout: float = 10.0) -> "Engine":
+        """
+        Crée un moteur distant joignable par un socket unix
+
+        Args:
+            name (str): Nom du moteur
+            socket_path (str): Chemin du socket du démon Docker
+            pool_size (int): Connexions simultanées du client asynchrone
+            timeout (float): Délai maximum d'un appel en secondes
+
+        Returns:
+            Engine: Moteur non vérifié (écarté jusqu'à sa première vérification réussie)
+        """
+        # Version de l'API fixée: le client ne contacte pas le démon à la création
+        client = docker.DockerClient(base_url=f"unix://{socket_path}", version="1.41", timeout=int(timeout))
+        return cls(name, client, AsyncDockerClient(socket_path, pool_size=pool_size, timeout=timeout))
+
+    @property
+    def free_memory(self) -> int:
+        """Mémoire non réservée par les limites des Mini Shell en cours d'exécution"""
+        return max(0, self.mem_total - self.reserved_memory)
+
+    def to_dict(self) -> Dict:
+        """Retourne l'état du moteur"""
+        return {
+            "name": self.name,
+            "local": self.local,
+            "healthy": self.healthy,
+            "failures": self.failures,
+            "has_image": self.has_image,
+            "running": self.running,
+            "mem_total": self.mem_total,
+            "free_memory": self.free_memory,
+            "checked_at": self.checked_at,
+            "error": self.error,
+        }
+
+
+class EnginePool:
+    """Classe de placement et de routage des Mini Shell sur plusieurs moteurs Docker"""
+
+    def __init__(self,
+                 local: Engine,
+                 remotes: List[Engine],
+                 image_name: str,
+                 labels: Dict[str, str],
+                 max_running: int,
+                 memory_of: Callable[[Dict[str, str]], int],
+                 interval: float = 10.0,
+                 max_failures: int = 3,
+                 on_update: Optional[Callable[[], None]] = None,
+                 is_session: Optional[Callable[[str], bool]] = None):
+        """
+        Initialise l'ensemble de moteurs
+
+        Args:
+            local (Engine): Moteur local, propriétaire par défaut des containers
+            remotes (List[Engine]): Moteurs distants
+            image_name (str): Image des Mini Shell (un moteur sans l'image n'est pas choisi)
+            labels (Dict[str, str]): Labels identifiant les Mini Shell
+            max_running (int): Nombre maximum de Mini Shell en cours d'exécution par moteur
+            memory_of (Callable[[Dict[str, str]], int]): Mémoire réservée par un container d'après ses labels
+            interval (float): Intervalle des vérifications de santé en secondes
+            max_failures (int): Nombre d'échecs consécutifs avant d'écarter un moteur
+            on_update (Callable[[], None], optional): Appelé après chaque tour de vérification
+            is_session (Callable[[str], bool], optional): Indique si un container compte dans la charge
+                d'après son nom (les containers du pool n'y comptent pas)
+        """
+        self.local = local
+        self.engines: Dict[str, Engine] = {local.name: local, **{e.name: e for e in remotes}}
+        self.image_name = image_name
+        self.labels = labels
+        self.max_running = max_running
+        self.memory_of = memory_of
+        self.interval = interval
+        self.max_failures = max_failures
+        self.on_update = on_update
+        self.is_session = is_session or (lambda name: True)
+
+        self._owners: Dict[str, Engine] = {}
+        self._assigned: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.placements = 0
+        self.ejections = 0
+
+    @property
+    def remotes(self) -> List[Engine]:
+        """Moteurs distants"""
+        return [engine for engine in self.engines.values() if not engine.local]
+
+    def start(self):
+        """Démarre le thread de vérification de santé (si des moteurs distants sont configurés)"""
+        if not self.remotes or (self._thread and self._thread.is_alive()):
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="engine-health")
+        self._thread.daemon = True
+        self._thread.start()
+        logger.info(f"Suivi de {len(self.engines)} moteurs Docker démarré")
+
+    def stop(self):
+        """Arrête les vérifications de santé"""
+        self._stopping.set()
+
+    def eligible(self) -> List[Engine]:
+        """Moteurs pouvant recevoir un nouveau Mini Shell"""
+        return [e for e in self.engines.values() if e.healthy and e.has_image]
+
+    def choose(self, required_memory: int = 0) -> Optional[Engine]:
+        """
+        Choisit le moteur le moins chargé pour un nouveau Mini Shell
+
+        Args:
+            required_memory (int): Limite mémoire du container à placer (octets)
+
+        Returns:
+            Engine ou None si aucun moteur n'a de place
+        """
+        if not self.remotes:
+            return self.local
+
+        with self._lock:
+            candidates = [
+                engine for engine in self.eligible()
+                if engine.running < self.max_running
+                and (not engine.mem_total or engine.free_memory >= required_memory)
+            ]
+            if not candidates:
+                return None
+            engine = min(candidates, key=self._load)
+            # Compter le placement sans attendre la prochaine vérification
+            engine.running += 1
+            engine.reserved_memory += required_memory
+            self.placements += 1
+            return engine
+
+    def _load(self, engine: Engine) -> tuple:
+        """Charge d'un moteur: part de la capacité occupée, puis part de la mémoire réservée"""
+        memory = engine.reserved_memory / engine.mem_total if engine.mem_total else 0.0
+        return (max(engine.running / self.max_running, memory), not engine.local)
+
+    def assign(self, engine: Engine, container_id: str, name: Optional[str] = None):
+        """Enregistre le moteur propriétaire d'un container distant"""
+        if engine.local:
+            return
+        now = time.monotonic()
+        with self._lock:
+            for key in filter(None, (container_id, name)):
+                self._owners[key] = engine
+                self._assigned[key] = now
+
+    def forget(self, container_id: str, name: Optional[str] = None):
+        """Oublie le propriétaire d'un container supprimé"""
+        with self._lock:
+            for key in filter(None, (container_id, name)):
+                self._owners.pop(key, None)
+                self._assigned.pop(key, None)
+
+    def owner(self, container_id_or_name: str) -> Engine:
+        """
+        Retourne le moteur propriétaire d'un container (le moteur local s'il est inconnu)
+
+        Args:
+            container_id_or_name (str): ID complet, préfixe d'ID ou nom
+
+        Returns:
+            Engine: Moteur à interroger
+        """
+        key = container_id_or_name.lstrip('/')
+        with self._lock:
+            engine = self._owners.get(key)
+            if engine is None and len(key) >= 12:
+                engine = next((e for k, e in self._owners.items() if k.startswith(key)), None)
+        return engine or self.local
+
+    def containers(self, all_containers: bool = True) -> List[Dict]:
+        """Mini Shell des moteurs distants, d'après la dernière vérification"""
+        return [
+            entry for engine in self.remotes for entry in engine.containers
+            if all_containers or entry["status"] == "running"
+        ]
+
+    def running_remote(self) -> int:
+        """Nombre de Mini Shell en cours d'exécution sur les moteurs distants"""
+        return sum(engine.running for engine in self.remotes)
+
+    def stats(self) -> Dict:
+        """Retourne l'état de chaque moteur et les compteurs de placement"""
+        return {
+            "engines": [engine.to_dict() for engine in self.engines.values()],
+            "placements": self.placements,
+            "ejections": self.ejections,
+        }
+
+    def _run(self):
+        """Boucle de vérification de santé des moteurs"""
+        while not self._stopping.is_set():
+            for engine in list(self.engines.values()):
+                self._check(engine)
+            if self.on_update:
+                try:
+                    self.on_update()
+                except Exception as e:
+                    logger.error(f"Erreur lors de la mise à jour après vérification des moteurs: {e}")
+            self._stopping.wait(self.interval)
+
+    def _check(self, engine: Engine):
+        """Met à jour l'état d'un moteur (capacité, image, containers) ou comptabilise un échec"""
+        started = time.monotonic()
+        try:
+            info = engine.client.info()
+            summaries = engine.client.api.containers(
+                all=True, filters={"label": [f"{k}={v}" for k, v in self.labels.items()]}
+            )
+            try:
+                engine.client.api.inspect_image(self.image_name)
+                has_image = True
+            except docker.errors.NotFound:
+                has_image = False
+        except Exception as e:
+            engine.failures += 1
+            engine.error = str(e)
+            if engine.healthy and engine.failures >= self.max_failures:
+                engine.healthy = False
+                self.ejections += 1
+                logger.error(f"Moteur Docker {engine.name} écarté après {engine.failures} échecs: {e}")
+            return
+
+        entries = [dict(container_entry(summary), engine=engine.name) for summary in summaries]
+        running = [entry for entry in entries if entry["status"] == "running" and self.is_session(entry["name"])]
+        if engine.placer is None:
+            engine.placer = CpusetPlacer(list(range(info.get("NCPU") or 1)))
+
+        with self._lock:
+            if not engine.healthy:
+                logger.info(f"Moteur Docker {engine.name} de nouveau disponible")
+            engine.healthy = True
+            engine.failures = 0
+            engine.error = None
+            # Le moteur local construit l'image à la demande
+            engine.has_image = has_image or engine.local
+            engine.mem_total = info.get("MemTotal") or 0
+            engine.running = len(running)
+            engine.reserved_memory = sum(self.memory_of(entry["labels"]) for entry in running)
+            engine.containers = entries
+            engine.checked_at = time.time()
+            if engine.local:
+                return
+            # Oublier les containers disparus, sauf ceux attribués pendant la vérification
+            for key in [k for k, e in self._owners.items()
+                        if e is engine and self._assigned.get(k, 0) < started]:
+                del self._owners[key]
+                self._assigned.pop(key, None)
+            for entry in entries:
+                self._owners[entry["id"]] = engine
+                self._owners[entry["name"]] = engine
@@ -0,0 +1,274 @@
+"""
+Module de planification de l'arrêt automatique des containers
+Un seul thread gère toutes les échéances à l'aide d'un tas (heap)
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Labels portant l'échéance d'un container (repris par le registre des sessions s'il ne le connaît pas)
+EXPIRES_AT_LABEL = "mishu.expires_at"
+IDLE_TTL_LABEL = "mishu.idle_ttl"
+
+
+class _Entry:
+    """Échéance d'un container (invalidée plutôt que retirée du tas)"""
+
+    __slots__ = ("key", "deadline", "hard_deadline", "idle_ttl", "name", "active",
+                 "suspended", "paused_used")
+
+    def __init__(self, key: str, deadline: float, hard_deadline: float,
+                 idle_ttl: Optional[int], name: Optional[str]):
+        self.key = key
+        self.deadline = deadline
+        self.hard_deadline = hard_deadline
+        self.idle_ttl = idle_ttl
+        self.name = name
+        self.active = True
+        # Pendant une pause: (temps restant, temps restant avant l'échéance fixe, début de la pause)
+        self.suspended: Optional[Tuple[float, float, float]] = None
+        # Temps déjà passé en pause, décompté de la durée de pause maximale
+        self.paused_used = 0.0
+
+
+class ExpiryScheduler:
+    """Classe pour planifier l'expiration des containers sur un thread unique"""
+
+    def __init__(self, on_expire: Callable[[str], None], max_workers: int = 4):
+        """
+        Initialise le planificateur
+
+        Args:
+            on_expire (Callable[[str], None]): Fonction appelée avec l'ID du container expiré
+            max_workers (int): Nombre de threads exécutant les arrêts en parallèle
+        """
+        self.on_expire = on_expire
+        self._heap: List = []
+        self._entries: Dict[str, _Entry] = {}
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def start(self):
+        """Démarre le thread du planificateur (de nouveau après stop(), par exemple au retour du bail de leader)"""
+        if self._thread and self._thread.is_alive() and not self._stopping:
+            return
+        self._stopping = False
+        # stop() arrête définitivement l'exécuteur: un nouveau est créé à chaque démarrage
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="expiry-stop")
+        self._thread = threading.Thread(target=self._run, args=(self._executor,), name="expiry-scheduler")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Arrête le thread du planificateur (les échéances restent dans les labels)"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    def arm(self, key: str, ttl: int, idle_ttl: Optional[int] = None,
+            name: Optional[str] = None, expires_at: Optional[float] = None):
+        """
+        Planifie (ou replanifie) l'expiration d'un container
+
+        Args:
+            key (str): ID du container
+            ttl (int): Durée de vie maximale en secondes
+            idle_ttl (int, optional): Délai d'inactivité avant expiration, prolongé par touch()
+            name (str, optional): Nom du container, pour l'affichage
+            expires_at (float, optional): Échéance absolue (timestamp) remplaçant ttl
+        """
+        now = time.time()
+        hard_deadline = expires_at if expires_at is not None else now + ttl
+        deadline = hard_deadline
+        if idle_ttl:
+            deadline = min(hard_deadline, now + idle_ttl)
+
+        with self._cond:
+            self._push(_Entry(key, deadline, hard_deadline, idle_ttl, name))
+
+    def touch(self, key: str) -> bool:
+        """
+        Prolonge l'échéance d'un container soumis à un délai d'inactivité
+
+        Args:
+            key (str): ID du container
+
+        Returns:
+            bool: True si l'échéance a été prolongée
+        """
+        with self._cond:
+            entry = self._entries.get(key)
+            if not entry or not entry.idle_ttl or entry.suspended:
+                return False
+            deadline = min(entry.hard_deadline, time.time() + entry.idle_ttl)
+            if deadline <= entry.deadline:
+                return False
+            touched = _Entry(key, deadline, entry.hard_deadline, entry.idle_ttl, entry.name)
+            touched.paused_used = entry.paused_used
+            self._push(touched)
+            return True
+
+    def suspend(self, key: str, paused_ttl: int) -> bool:
+        """
+        Suspend l'échéance d'un container mis en pause: seule la durée de pause maximale s'applique
+
+        Args:
+            key (str): ID du container
+            paused_ttl (int): Durée cumulée maximale des pauses en secondes
+
+        Returns:
+            bool: True si l'échéance a été suspendue
+        """
+        now = time.time()
+        with self._cond:
+            entry = self._entries.get(key)
+            if not entry or entry.suspended:
+                return False
+            deadline = now + max(0.0, paused_ttl - entry.paused_used)
+            paused = _Entry(key, deadline, deadline, entry.idle_ttl, entry.name)
+            paused.suspended = (entry.deadline - now, entry.hard_deadline - now, now)
+            paused.paused_used = entry.paused_used
+            self._push(paused)
+            return True
+
+    def resume(self, key: str) -> bool:
+        """
+        Rétablit l'échéance d'un container repris, décalée de la durée de la pause
+
+        Args:
+            key (str): ID du container
+
+        Returns:
+            bool: True si l'échéance a été rétablie
+        """
+        now = time.time()
+        with self._cond:
+            entry = self._entries.get(key)
+            if not entry or not entry.suspended:
+                return False
+            remaining, hard_remaining, paused_since = entry.suspended
+            resumed = _Entry(key, now + remaining, now + hard_remaining, entry.idle_ttl, entry.name)
+            resumed.paused_used = entry.paused_used + (now - paused_since)
+            self._push(resumed)
+            return True
+
+    def hard_deadline(self, key: str) -> Optional[float]:
+        """Échéance fixe d'un container (None s'il n'a pas d'échéance ou s'il est en pause)"""
+        with self._cond:
+            entry = self._entries.get(key)
+            return entry.hard_deadline if entry and not entry.suspended else None
+
+    def cancel(self, key: str) -> bool:
+        """
+        Annule l'expiration planifiée d'un container
+
+        Args:
+            key (str): ID du container
+
+        Returns:
+            bool: True si une échéance a été annulée
+        """
+        with self._cond:
+            entry = self._entries.pop(key, None)
+            if not entry:
+                return False
+            entry.active = False
+            return True
+
+    def pending(self) -> List[Dict]:
+        """
+        Liste les expirations en attente, de la plus proche à la plus lointaine
+
+        Returns:
+            List[Dict]: Échéances avec le temps restant en secondes
+        """
+        now = time.time()
+        with self._cond:
+            entries = sorted(self._entries.values(), key=lambda e: e.deadline)
+        return [
+            {
+                "container_id": entry.key,
+                "name": entry.name,
+                "expires_at": entry.deadline,
+                "remaining": max(0.0, entry.deadline - now),
+                "hard_expires_at": entry.hard_deadline,
+                "idle_ttl": entry.idle_ttl,
+                "paused": entry.suspended is not None,
+            }
+            for entry in entries
+        ]
+
+    def rebuild(self, sessions: List[Dict], default_ttl: int):
+        """
+        Reconstruit les échéances à partir du registre des sessions
+
+        Args:
+            sessions (List[Dict]): Sessions actives (container_id, container_name, expires_at, idle_ttl)
+            default_ttl (int): Durée appliquée aux sessions sans échéance
+        """
+        for session in sessions:
+            self.arm(session["container_id"], default_ttl, idle_ttl=session.get("idle_ttl"),
+                     name=session.get("container_name"), expires_at=session.get("expires_at"))
+        logger.info(f"{len(sessions)} échéances d'arrêt automatique reconstruites")
+
+    def _push(self, entry: _Entry):
+        """Ajoute une échéance dans le tas (appelé avec le verrou)"""
+        previous = self._entries.get(entry.key)
+        if previous:
+            previous.active = False
+        self._entries[entry.key] = entry
+        heapq.heappush(self._heap, (entry.deadline, next(self._counter), entry))
+
+        # Purger le tas si les entrées invalidées dominent
+        if len(self._heap) > 64 and len(self._heap) > 2 * len(self._entries):
+            self._heap = [item for item in self._heap if item[2].active]
+            heapq.heapify(self._heap)
+
+        if self._heap[0][2] is entry:
+            self._cond.notify()
+
+    def _run(self, executor: ThreadPoolExecutor):
+        """Boucle principale: attend la prochaine échéance puis déclenche l'arrêt"""
+        while True:
+            with self._cond:
+                while not self._stopping and executor is self._executor:
+                    while self._heap and not self._heap[0][2].active:
+                        heapq.heappop(self._heap)
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    delay = self._heap[0][0] - time.time()
+                    if delay <= 0:
+                        break
+                    self._cond.wait(delay)
+                if self._stopping or executor is not self._executor:
+                    return
+                _, _, entry = heapq.heappop(self._heap)
+                entry.active = False
+                self._entries.pop(entry.key, None)
+
+            try:
+                executor.submit(self._expire, entry)
+            except RuntimeError:
+                return
+
+    def _expire(self, entry: _Entry):
+        """Exécute l'arrêt d'un container expiré"""
+        try:
+            self.on_expire(entry.key)
+            logger.info(f"Container {entry.name or entry.key} arrêté automatiquement")
+        except Exception as e:
+            logger.error(f"Erreur lors de l'arrêt automatique du container {entry.name or entry.key}: {e}")
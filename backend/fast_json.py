@@ -0,0 +1,53 @@
+"""
+Module de sérialisation rapide des réponses de l'API
+Utilise orjson s'il est installé (json de la bibliothèque standard sinon) et construit les réponses
+directement en dictionnaires, sans la validation pydantic faite par response_model
+"""
+
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # dépendance facultative
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Sérialise un contenu en JSON compact (UTF-8)
+
+    Args:
+        content (Any): Dictionnaires, listes et valeurs simples (les autres types sont convertis en texte)
+
+    Returns:
+        bytes: Document JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def api_payload(success: bool, message: str, data: Optional[Union[Dict, List]] = None) -> Dict:
+    """
+    Construit le contenu d'une réponse, identique à ApiResponse, sans passer par pydantic
+
+    Args:
+        success (bool): Succès de l'opération
+        message (str): Message
+        data (Dict ou List, optional): Données
+
+    Returns:
+        Dict: {"success", "message", "data", "timestamp"}
+    """
+    return {"success": success, "message": message, "data": data, "timestamp": datetime.now().isoformat()}
+
+
+class FastJSONResponse(JSONResponse):
+    """Réponse JSON sérialisée par dumps"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,221 @@
+"""
+Module de mise en pause des containers inactifs
+Un container sans activité (lecture des logs, saisie, démarrage) pendant un délai configurable est gelé
+par le freezer des cgroups (docker pause): il ne consomme plus de temps processeur mais conserve son état,
+et reprend en quelques millisecondes (docker unpause) à la prochaine activité
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# États d'un container suivi
+ACTIVE = "active"
+PAUSING = "pausing"
+PAUSED = "paused"
+RESUMING = "resuming"
+
+
+class _Tracked:
+    """Activité d'un container suivi"""
+
+    __slots__ = ("key", "name", "state", "last_activity", "paused_at")
+
+    def __init__(self, key: str, name: Optional[str], state: str = ACTIVE):
+        self.key = key
+        self.name = name
+        self.state = state
+        self.last_activity = time.monotonic()
+        self.paused_at: Optional[float] = time.time() if state == PAUSED else None
+
+
+class IdleFreezer:
+    """Classe mettant en pause les containers inactifs et les reprenant à la demande"""
+
+    def __init__(self,
+                 pause: Callable[[str], None],
+                 unpause: Callable[[str], None],
+                 idle_after: float,
+                 interval: Optional[float] = None):
+        """
+        Initialise le gestionnaire
+
+        Args:
+            pause (Callable[[str], None]): Met en pause le container dont l'ID est donné
+            unpause (Callable[[str], None]): Reprend le container dont l'ID est donné
+            idle_after (float): Délai d'inactivité avant la mise en pause en secondes (0 pour désactiver)
+            interval (float, optional): Intervalle de vérification (un quart du délai par défaut, 5 s au plus)
+        """
+        self.pause = pause
+        self.unpause = unpause
+        self.idle_after = idle_after
+        self.interval = interval or min(5.0, max(0.5, idle_after / 4))
+        self._tracked: Dict[str, _Tracked] = {}
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.pauses = 0
+        self.resumes = 0
+        self.failures = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.idle_after > 0
+
+    def start(self):
+        """Démarre le thread de vérification (de nouveau après stop(), sans effet si la pause est désactivée)"""
+        if not self.enabled:
+            return
+        with self._cond:
+            if self._thread and self._thread.is_alive() and not self._stopping:
+                return
+            self._stopping = False
+            # Un thread encore en cours d'arrêt se termine de lui-même: il n'est plus le thread courant
+            self._thread = threading.Thread(target=self._run, name="idle-freezer")
+            self._thread.daemon = True
+            self._thread.start()
+
+    def stop(self):
+        """Arrête le thread de vérification (les containers en pause le restent)"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+
+    def track(self, key: str, name: Optional[str] = None, paused: bool = False):
+        """
+        Suit l'activité d'un container
+
+        Args:
+            key (str): ID du container
+            name (str, optional): Nom du container, pour l'affichage
+            paused (bool): True si le container est déjà en pause (reconstruction au redémarrage)
+        """
+        if not self.enabled:
+            return
+        with self._cond:
+            self._tracked[key] = _Tracked(key, name, PAUSED if paused else ACTIVE)
+
+    def forget(self, key: str):
+        """Cesse de suivre un container (arrêté ou supprimé)"""
+        with self._cond:
+            self._tracked.pop(key, None)
+            self._cond.notify_all()
+
+    def is_paused(self, key: str) -> bool:
+        """Indique si un container est en pause (ou en cours de mise en pause)"""
+        entry = self._tracked.get(key)
+        return entry is not None and entry.state in (PAUSING, PAUSED)
+
+    def touch(self, key: str) -> bool:
+        """
+        Enregistre une activité et reprend le container s'il est en pause
+
+        Args:
+            key (str): ID du container
+
+        Returns:
+            bool: True si le container a été repris
+        """
+        with self._cond:
+            entry = self._tracked.get(key)
+            if entry is None:
+                return False
+            entry.last_activity = time.monotonic()
+            # Attendre la fin d'une mise en pause ou d'une reprise en cours
+            while entry.state in (PAUSING, RESUMING) and self._tracked.get(key) is entry:
+                self._cond.wait()
+            if entry.state != PAUSED or self._tracked.get(key) is not entry:
+                return False
+            entry.state = RESUMING
+
+        resumed = False
+        try:
+            self.unpause(key)
+            resumed = True
+            logger.info(f"Container {entry.name or key} repris après "
+                        f"{time.time() - entry.paused_at:.0f} s de pause")
+        except Exception as e:
+            logger.error(f"Erreur lors de la reprise du container {entry.name or key}: {e}")
+        finally:
+            with self._cond:
+                # En cas d'échec, le container est considéré comme actif pour ne pas bloquer les requêtes
+                entry.state = ACTIVE
+                entry.paused_at = None
+                entry.last_activity = time.monotonic()
+                if resumed:
+                    self.resumes += 1
+                else:
+                    self.failures += 1
+                self._cond.notify_all()
+        return resumed
+
+    def paused(self) -> List[Dict]:
+        """
+        Liste les containers en pause
+
+        Returns:
+            List[Dict]: ID, nom et durée de la pause en secondes
+        """
+        now = time.time()
+        with self._cond:
+            entries = [entry for entry in self._tracked.values() if entry.state == PAUSED]
+        return [
+            {"container_id": entry.key, "name": entry.name, "paused_for": now - entry.paused_at}
+            for entry in entries
+        ]
+
+    def stats(self) -> Dict:
+        """Retourne le nombre de containers suivis et en pause, et les compteurs"""
+        with self._cond:
+            paused = sum(1 for entry in self._tracked.values() if entry.state == PAUSED)
+            return {
+                "enabled": self.enabled,
+                "idle_after": self.idle_after,
+                "tracked": len(self._tracked),
+                "paused": paused,
+                "pauses": self.pauses,
+                "resumes": self.resumes,
+                "failures": self.failures,
+            }
+
+    def _run(self):
+        """Boucle principale: met en pause les containers inactifs depuis idle_after secondes"""
+        while True:
+            with self._cond:
+                self._cond.wait(self.interval)
+                if self._stopping or self._thread is not threading.current_thread():
+                    return
+                threshold = time.monotonic() - self.idle_after
+                idle = [entry for entry in self._tracked.values()
+                        if entry.state == ACTIVE and entry.last_activity <= threshold]
+                for entry in idle:
+                    entry.state = PAUSING
+
+            for entry in idle:
+                self._pause(entry)
+
+    def _pause(self, entry: _Tracked):
+        """Met en pause un container inactif"""
+        paused = False
+        try:
+            self.pause(entry.key)
+            paused = True
+            logger.info(f"Container {entry.name or entry.key} mis en pause après "
+                        f"{self.idle_after:.0f} s d'inactivité")
+        except Exception as e:
+            logger.error(f"Erreur lors de la mise en pause du container {entry.name or entry.key}: {e}")
+        finally:
+            with self._cond:
+                if paused:
+                    entry.state = PAUSED
+                    entry.paused_at = time.time()
+                    self.pauses += 1
+                else:
+                    entry.state = ACTIVE
+                    entry.last_activity = time.monotonic()
+                    self.failures += 1
+                self._cond.notify_all()
@@ -0,0 +1,558 @@
+"""
+Module d'archivage des logs des Mini Shell
+Les logs de chaque container sont suivis pendant toute sa vie et écrits au fil de l'eau dans une archive
+sur disque, en ajout seul: des segments faits de blocs compressés indépendamment (zlib) et un index
+clairsemé (une entrée par bloc). Une page de logs ne décompresse que les blocs qui la contiennent, lus dans
+les segments projetés en mémoire: les logs restent consultables après l'arrêt et la suppression du
+container, sans jamais être chargés en entier
+"""
+
+import bisect
+import hashlib
+import json
+import logging
+import math
+import mmap
+import os
+import shutil
+import struct
+import threading
+import time
+import zlib
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from log_pipeline import STDERR, STDOUT, LogProcessor, LogRecord
+
+logger = logging.getLogger(__name__)
+
+# Entrée de l'index: première ligne, nombre de lignes, segment, position et taille du bloc, dernier horodatage
+INDEX_ENTRY = struct.Struct("<QIIQId")
+INDEX_FILE = "index"
+META_FILE = "meta.json"
+CONTAINERS_DIR = "containers"
+SESSIONS_DIR = "sessions"
+
+# Flux d'origine d'une ligne dans un bloc
+STREAM_CODES = {STDOUT: "o", STDERR: "e"}
+CODE_STREAMS = {"o": STDOUT, "e": STDERR}
+
+
+def _encode(record: LogRecord) -> str:
+    """Ligne d'un bloc: horodatage, flux et texte séparés par des tabulations"""
+    timestamp = "" if record.timestamp is None else repr(record.timestamp)
+    return f"{timestamp}\t{STREAM_CODES.get(record.stream, 'o')}\t{record.text}"
+
+
+def _decode(line: str, seq: int) -> LogRecord:
+    """Enregistrement correspondant à une ligne d'un bloc (seq: position de la ligne dans l'archive)"""
+    timestamp, stream, text = line.split("\t", 2)
+    return LogRecord(float(timestamp) if timestamp else None, CODE_STREAMS.get(stream, STDOUT), text, seq)
+
+
+class _Index:
+    """Index clairsemé d'une archive projeté en mémoire (lecture seule)"""
+
+    def __init__(self, path: str, entries: Optional[int] = None):
+        """
+        Projette les entrées complètes de l'index
+
+        Args:
+            path (str): Chemin du fichier d'index
+            entries (int, optional): Nombre d'entrées à lire (toutes les entrées complètes si None)
+        """
+        self._file = None
+        self._map = None
+        try:
+            self._file = open(path, "rb")
+        except FileNotFoundError:
+            self.entries = 0
+            return
+        size = os.fstat(self._file.fileno()).st_size // INDEX_ENTRY.size
+        self.entries = size if entries is None else min(entries, size)
+        if self.entries:
+            self._map = mmap.mmap(self._file.fileno(), self.entries * INDEX_ENTRY.size, access=mmap.ACCESS_READ)
+
+    def __getitem__(self, position: int) -> Tuple[int, int, int, int, int, float]:
+        return INDEX_ENTRY.unpack_from(self._map, position * INDEX_ENTRY.size)
+
+    def __len__(self) -> int:
+        return self.entries
+
+    def lines(self) -> int:
+        """Nombre de lignes des blocs indexés"""
+        if not self.entries:
+            return 0
+        first_line, count = self[self.entries - 1][:2]
+        return first_line + count
+
+    def find(self, line: int) -> int:
+        """Position de l'entrée du bloc contenant une ligne (recherche dichotomique)"""
+        first_lines = _FirstLines(self)
+        return max(0, bisect.bisect_right(first_lines, line) - 1)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+        if self._file is not None:
+            self._file.close()
+
+
+class _FirstLines:
+    """Vue des premières lignes des blocs d'un index, pour bisect"""
+
+    def __init__(self, index: _Index):
+        self.index = index
+
+    def __getitem__(self, position: int) -> int:
+        return self.index[position][0]
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+
+class _ArchiveWriter:
+    """Archive des logs d'un container ouverte en écriture (un seul écrivain par container)"""
+
+    def __init__(self, path: str, segment_size: int, block_lines: int, flush_interval: float, level: int):
+        """
+        Ouvre l'archive et reprend après le dernier bloc indexé
+
+        Args:
+            path (str): Dossier de l'archive
+            segment_size (int): Taille au-delà de laquelle un nouveau segment est commencé
+            block_lines (int): Nombre de lignes d'un bloc compressé
+            flush_interval (float): Délai maximum en secondes avant l'écriture d'un bloc incomplet
+            level (int): Niveau de compression zlib
+        """
+        self.path = path
+        self.segment_size = segment_size
+        self.block_lines = block_lines
+        self.flush_interval = flush_interval
+        self.level = level
+        self.lock = threading.Lock()
+        self.pending: List[LogRecord] = []
+        self.pending_since = 0.0
+        self.appended = 0
+        self.raw_bytes = 0
+        self.written_bytes = 0
+
+        index = _Index(os.path.join(path, INDEX_FILE))
+        try:
+            self.entries = len(index)
+            self.lines = index.lines()
+            if self.entries:
+                _, _, self.segment, position, length, last_timestamp = index[self.entries - 1]
+                self.position = position + length
+                self.last_timestamp: Optional[float] = None if math.isnan(last_timestamp) else last_timestamp
+            else:
+                self.segment, self.position, self.last_timestamp = 0, 0, None
+        finally:
+            index.close()
+
+        # Données écrites après la dernière entrée complète (arrêt brutal): ignorées
+        self._index_file = open(os.path.join(path, INDEX_FILE), "ab")
+        self._index_file.truncate(self.entries * INDEX_ENTRY.size)
+        self._segment_file = self._open_segment()
+        self._segment_file.truncate(self.position)
+
+    def _open_segment(self):
+        return open(os.path.join(self.path, f"{self.segment:06d}.seg"), "ab")
+
+    def append(self, records: Iterable[LogRecord]):
+        """
+        Ajoute des lignes à l'archive (les lignes déjà archivées sont ignorées)
+
+        Args:
+            records (Iterable[LogRecord]): Lignes dans l'ordre du flux
+        """
+        with self.lock:
+            for record in records:
+                # Le paramètre since de Docker est inclusif: ignorer les lignes déjà archivées à la reprise
+                if (record.timestamp is not None and self.last_timestamp is not None
+                        and record.timestamp <= self.last_timestamp):
+                    continue
+                if not self.pending:
+                    self.pending_since = time.monotonic()
+                self.pending.append(record)
+                if record.timestamp is not None:
+                    self.last_timestamp = record.timestamp
+                if len(self.pending) >= self.block_lines:
+                    self._flush_locked()
+            if self.pending and time.monotonic() - self.pending_since >= self.flush_interval:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        """Compresse les lignes en attente en un bloc, l'écrit puis l'indexe (verrou détenu)"""
+        if not self.pending:
+            return
+        payload = "\n".join(_encode(record) for record in self.pending).encode("utf-8")
+        block = zlib.compress(payload, self.level)
+        if self.position and self.position + len(block) > self.segment_size:
+            self._segment_file.close()
+            self.segment += 1
+            self.position = 0
+            self._segment_file = self._open_segment()
+
+        # Le bloc est écrit avant son entrée: un lecteur ne voit jamais une entrée sans données
+        self._segment_file.write(block)
+        self._segment_file.flush()
+        last_timestamp = self.last_timestamp if self.last_timestamp is not None else math.nan
+        self._index_file.write(INDEX_ENTRY.pack(
+            self.lines, len(self.pending), self.segment, self.position, len(block), last_timestamp
+        ))
+        self._index_file.flush()
+
+        self.entries += 1
+        self.lines += len(self.pending)
+        self.appended += len(self.pending)
+        self.position += len(block)
+        self.raw_bytes += len(payload)
+        self.written_bytes += len(block)
+        self.pending = []
+
+    def flush(self):
+        """Écrit les lignes en attente"""
+        with self.lock:
+            self._flush_locked()
+
+    def close(self):
+        """Écrit les lignes en attente et ferme l'archive"""
+        with self.lock:
+            self._flush_locked()
+            for f in (self._segment_file, self._index_file):
+                os.fsync(f.fileno())
+                f.close()
+
+
+class _Follower:
+    """Suivi du flux de logs d'un container pour l'archivage"""
+
+    def __init__(self, container_id: str):
+        self.container_id = container_id
+        self.stream = None
+        self.thread: Optional[threading.Thread] = None
+        self.stopped = False
+
+
+class LogArchive:
+    """Classe d'archivage des logs des Mini Shell, consultables par pages après leur arrêt"""
+
+    def __init__(self,
+                 root: str,
+                 open_stream: Callable[[str, Optional[float]], Iterable[bytes]],
+                 segment_size: int = 4 * 1024 * 1024,
+                 block_lines: int = 256,
+                 flush_interval: float = 2.0,
+                 max_age: float = 7 * 86400,
+                 level: int = 6,
+                 on_activity: Optional[Callable[[str], None]] = None):
+        """
+        Initialise l'archive
+
+        Args:
+            root (str): Dossier des archives
+            open_stream (Callable[[str, Optional[float]], Iterable[bytes]]): Ouvre le flux Docker horodaté
+                suivant les logs d'un container (container_id, since)
+            segment_size (int): Taille maximum d'un segment en octets
+            block_lines (int): Nombre de lignes d'un bloc compressé (granularité de l'index)
+            flush_interval (float): Délai maximum en secondes avant l'écriture d'un bloc incomplet
+            max_age (float): Ancienneté en secondes au-delà de laquelle une archive fermée est supprimée
+                (0 pour tout conserver)
+            level (int): Niveau de compression zlib
+            on_activity (Callable[[str], None], optional): Appelé quand un container produit des logs
+        """
+        self.root = root
+        self.open_stream = open_stream
+        self.segment_size = segment_size
+        self.block_lines = block_lines
+        self.flush_interval = flush_interval
+        self.max_age = max_age
+        self.level = level
+        self.on_activity = on_activity
+        self._followers: Dict[str, _Follower] = {}
+        self._writers: Dict[str, _ArchiveWriter] = {}
+        self._lock = threading.Lock()
+        self._stopped = False
+        self._pruned_at = 0.0
+
+        self.lines_written = 0
+        self.raw_bytes = 0
+        self.written_bytes = 0
+        self.pruned = 0
+
+        os.makedirs(os.path.join(root, CONTAINERS_DIR), exist_ok=True)
+        os.makedirs(os.path.join(root, SESSIONS_DIR), exist_ok=True)
+
+    def _path(self, container_id: str) -> str:
+        return os.path.join(self.root, CONTAINERS_DIR, os.path.basename(container_id))
+
+    def _session_path(self, session_id: str) -> str:
+        # Identifiant de session fourni par le client: haché pour former un nom de fichier sûr
+        return os.path.join(self.root, SESSIONS_DIR, hashlib.sha1(session_id.encode("utf-8")).hexdigest())
+
+    def start(self):
+        """Accepte de nouveau des containers à suivre (après stop(), au retour du bail de leader)"""
+        with self._lock:
+            self._stopped = False
+
+    def follow(self, container_id: str, name: str, session_id: Optional[str] = None):
+        """
+        Archive les logs d'un container jusqu'à son arrêt (sans effet s'il est déjà suivi ou après stop())
+
+        Args:
+            container_id (str): ID complet du container
+            name (str): Nom du container
+            session_id (str, optional): Identifiant de session
+        """
+        with self._lock:
+            if self._stopped or container_id in self._followers:
+                return
+            follower = _Follower(container_id)
+            self._followers[container_id] = follower
+        try:
+            self._register(container_id, name, session_id)
+        except Exception as e:
+            logger.error(f"Erreur lors de la création de l'archive des logs du container {container_id}: {e}")
+            with self._lock:
+                self._followers.pop(container_id, None)
+            return
+        follower.thread = threading.Thread(target=self._follow, args=(follower,), name=f"archive-{container_id[:12]}")
+        follower.thread.daemon = True
+        follower.thread.start()
+
+    def _register(self, container_id: str, name: str, session_id: Optional[str]):
+        """Crée ou met à jour les métadonnées d'une archive et l'ajoute à sa session"""
+        path = self._path(container_id)
+        os.makedirs(path, exist_ok=True)
+        meta = self._meta(container_id) or {"container_id": container_id, "created_at": time.time()}
+        known_session = meta.get("session_id")
+        meta.update(container_name=name, session_id=session_id or known_session, updated_at=time.time())
+        self._write_meta(container_id, meta)
+        if session_id and session_id != known_session:
+            with open(self._session_path(session_id), "a") as f:
+                f.write(container_id + "\n")
+
+    def _meta(self, container_id: str) -> Optional[Dict]:
+        try:
+            with open(os.path.join(self._path(container_id), META_FILE)) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write_meta(self, container_id: str, meta: Dict):
+        path = os.path.join(self._path(container_id), META_FILE)
+        with open(path + ".tmp", "w") as f:
+            json.dump(meta, f)
+        os.replace(path + ".tmp", path)
+
+    def _follow(self, follower: _Follower):
+        """Lit le flux Docker horodaté et archive chaque ligne jusqu'à la fin du flux"""
+        container_id = follower.container_id
+        self.prune()
+        writer = None
+        processor = LogProcessor(timestamps=True, multiplexed=False)
+        try:
+            writer = _ArchiveWriter(self._path(container_id), self.segment_size, self.block_lines,
+                                    self.flush_interval, self.level)
+            with self._lock:
+                self._writers[container_id] = writer
+            # Reprise après le dernier horodatage archivé (redémarrage du container ou du backend)
+            follower.stream = self.open_stream(container_id, writer.last_timestamp)
+            for chunk in follower.stream:
+                if follower.stopped:
+                    break
+                records = processor.feed(chunk)
+                writer.append(records)
+                if records and self.on_activity:
+                    self.on_activity(container_id)
+        except Exception as e:
+            if not follower.stopped:
+                logger.error(f"Archivage des logs du container {container_id} interrompu: {e}")
+
+        try:
+            if writer is not None:
+                writer.append(processor.flush())
+                writer.close()
+                self.lines_written += writer.appended
+                self.raw_bytes += writer.raw_bytes
+                self.written_bytes += writer.written_bytes
+                meta = self._meta(container_id)
+                if meta is not None:
+                    self._write_meta(container_id, dict(meta, updated_at=time.time(), lines=writer.lines))
+        except Exception as e:
+            logger.error(f"Erreur lors de la fermeture de l'archive des logs du container {container_id}: {e}")
+        finally:
+            with self._lock:
+                if self._writers.get(container_id) is writer:
+                    del self._writers[container_id]
+                if self._followers.get(container_id) is follower:
+                    del self._followers[container_id]
+
+    def stop(self, timeout: float = 5.0):
+        """
+        Arrête le suivi de tous les containers et ferme leurs archives (jusqu'au prochain start())
+
+        Args:
+            timeout (float): Délai maximum d'attente de chaque fermeture en secondes
+        """
+        with self._lock:
+            self._stopped = True
+            followers = list(self._followers.values())
+        for follower in followers:
+            follower.stopped = True
+            if follower.stream is not None:
+                try:
+                    follower.stream.close()
+                except Exception:
+                    pass
+        for follower in followers:
+            if follower.thread is not None:
+                follower.thread.join(timeout)
+
+    def read(self, container_id: str, offset: int = 0, limit: int = 100) -> Tuple[List[LogRecord], int]:
+        """
+        Lit une page de l'archive d'un container
+
+        Args:
+            container_id (str): ID complet du container
+            offset (int): Numéro de la première ligne (négatif: compté depuis la fin)
+            limit (int): Nombre maximum de lignes
+
+        Returns:
+            Tuple[List[LogRecord], int]: (lignes de la page, nombre total de lignes archivées)
+        """
+        path = self._path(container_id)
+        with self._lock:
+            writer = self._writers.get(container_id)
+
+        # Instantané cohérent: blocs indexés et lignes en attente de l'écrivain de ce processus
+        pending: List[LogRecord] = []
+        if writer is not None:
+            with writer.lock:
+                index = _Index(os.path.join(path, INDEX_FILE), writer.entries)
+                pending = list(writer.pending)
+        else:
+            index = _Index(os.path.join(path, INDEX_FILE))
+
+        segments: Dict[int, Tuple] = {}
+        try:
+            indexed = index.lines()
+            total = indexed + len(pending)
+            if offset < 0:
+                offset = max(0, total + offset)
+            end = min(total, offset + max(0, limit))
+            records: List[LogRecord] = []
+
+            position = index.find(offset) if offset < indexed else len(index)
+            while position < len(index) and offset + len(records) < end:
+                first_line, count, segment, start, length, _ = index[position]
+                if segment not in segments:
+                    f = open(os.path.join(path, f"{segment:06d}.seg"), "rb")
+                    segments[segment] = (f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+                lines = zlib.decompress(segments[segment][1][start:start + length]).decode("utf-8").split("\n")
+                skip = max(0, offset + len(records) - first_line)
+                for i in range(skip, min(count, end - first_line)):
+                    records.append(_decode(lines[i], first_line + i))
+                position += 1
+
+            for i in range(max(0, offset + len(records) - indexed), max(0, end - indexed)):
+                record = pending[i]
+                records.append(LogRecord(record.timestamp, record.stream, record.text, indexed + i))
+            return records, total
+        finally:
+            for f, segment_map in segments.values():
+                segment_map.close()
+                f.close()
+            index.close()
+
+    def containers(self, session_id: str) -> List[Dict]:
+        """
+        Liste les archives d'une session
+
+        Args:
+            session_id (str): Identifiant de session
+
+        Returns:
+            List[Dict]: Métadonnées des archives (nombre de lignes compris), de la plus récente à la plus ancienne
+        """
+        try:
+            with open(self._session_path(session_id)) as f:
+                container_ids = list(dict.fromkeys(filter(None, f.read().split("\n"))))
+        except FileNotFoundError:
+            return []
+        archives = [self.info(container_id) for container_id in container_ids]
+        return sorted(filter(None, archives), key=lambda meta: meta["created_at"], reverse=True)
+
+    def info(self, container_id: str) -> Optional[Dict]:
+        """
+        Métadonnées de l'archive d'un container
+
+        Args:
+            container_id (str): ID complet du container
+
+        Returns:
+            Optional[Dict]: Métadonnées, nombre de lignes et suivi en cours, None si l'archive n'existe pas
+        """
+        meta = self._meta(container_id)
+        if meta is None:
+            return None
+        with self._lock:
+            writer = self._writers.get(container_id)
+            following = container_id in self._followers
+        if writer is not None:
+            with writer.lock:
+                lines = writer.lines + len(writer.pending)
+        else:
+            index = _Index(os.path.join(self._path(container_id), INDEX_FILE))
+            lines = index.lines()
+            index.close()
+        return dict(meta, lines=lines, following=following)
+
+    def prune(self):
+        """Supprime les archives fermées plus anciennes que max_age (au plus une fois par heure)"""
+        now = time.time()
+        if not self.max_age or now - self._pruned_at < min(3600, self.max_age):
+            return
+        self._pruned_at = now
+        with self._lock:
+            following = set(self._followers)
+        removed: Dict[Optional[str], List[str]] = {}
+        for container_id in os.listdir(os.path.join(self.root, CONTAINERS_DIR)):
+            meta = self._meta(container_id)
+            if container_id in following or (meta is not None and now - meta.get("updated_at", 0) < self.max_age):
+                continue
+            shutil.rmtree(self._path(container_id), ignore_errors=True)
+            removed.setdefault(meta and meta.get("session_id"), []).append(container_id)
+            self.pruned += 1
+
+        # Retirer les archives supprimées de leur session
+        for session_id, container_ids in removed.items():
+            if not session_id:
+                continue
+            path = self._session_path(session_id)
+            try:
+                with open(path) as f:
+                    kept = [line for line in f.read().split("\n") if line and line not in container_ids]
+            except FileNotFoundError:
+                continue
+            if kept:
+                with open(path + ".tmp", "w") as f:
+                    f.write("".join(line + "\n" for line in kept))
+                os.replace(path + ".tmp", path)
+            else:
+                os.remove(path)
+        if removed:
+            logger.info(f"{sum(len(ids) for ids in removed.values())} archive(s) de logs supprimée(s)")
+
+    def stats(self) -> Dict:
+        """Retourne le suivi en cours et les volumes archivés (archives fermées par ce processus)"""
+        with self._lock:
+            following = len(self._followers)
+        return {
+            "following": following,
+            "lines": self.lines_written,
+            "raw_bytes": self.raw_bytes,
+            "written_bytes": self.written_bytes,
+            "compression_ratio": round(self.raw_bytes / self.written_bytes, 2) if self.written_bytes else None,
+            "pruned": self.pruned,
+        }
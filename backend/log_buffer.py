@@ -0,0 +1,263 @@
+"""
+Module de mise en tampon des logs des containers
+Chaque container dispose d'un tampon circulaire rempli de façon incrémentale: chaque ligne
+est récupérée, décodée et classée une seule fois, puis servie aux clients à partir d'un curseur.
+Tant qu'un flux Docker suivi (LogBroadcaster) est ouvert pour un container, le tampon est
+alimenté par ce flux et les lectures n'interrogent plus le démon
+"""
+
+import collections
+import itertools
+import logging
+import threading
+import time
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from log_pipeline import LogProcessor, LogRecord
+
+logger = logging.getLogger(__name__)
+
+
+class ContainerLogBuffer:
+    """Tampon circulaire des lignes de log d'un container"""
+
+    def __init__(self, capacity: int):
+        """
+        Initialise le tampon
+
+        Args:
+            capacity (int): Nombre maximum de lignes conservées
+        """
+        self.lines: Deque[LogRecord] = collections.deque(maxlen=capacity)
+        self.last_seq = 0
+        self.last_timestamp: Optional[float] = None
+        # Nombre de lignes reçues portant le dernier horodatage (plusieurs lignes peuvent le partager)
+        self.last_timestamp_lines = 0
+        self.refreshed_at = 0.0
+        # Tampon alimenté par le flux Docker suivi: pas d'appel au démon
+        self.followed = False
+        self.lock = threading.Lock()
+
+    def append(self, record: LogRecord):
+        """Ajoute une ligne avec le prochain numéro de séquence (horodatage précédent si absent)"""
+        self.last_seq += 1
+        record.seq = self.last_seq
+        if record.timestamp is None:
+            record.timestamp = self.last_timestamp or 0.0
+        if record.timestamp == self.last_timestamp:
+            self.last_timestamp_lines += 1
+        else:
+            self.last_timestamp_lines = 1
+        self.lines.append(record)
+        self.last_timestamp = record.timestamp
+
+    def extend(self, records: List[LogRecord], origin: Tuple[Optional[float], int]):
+        """
+        Ajoute les lignes absentes du tampon, chaque ligne étant identifiée par
+        (horodatage, rang parmi les lignes de même horodatage)
+
+        Args:
+            records (List[LogRecord]): Lignes reçues, dans l'ordre
+            origin (Tuple[Optional[float], int]): (horodatage, nombre de lignes de cet horodatage)
+                déjà transmises par la source avant la première ligne reçue
+        """
+        end, held = self.last_timestamp, self.last_timestamp_lines
+        timestamp, rank = origin[0], origin[1] - 1
+        for record in records:
+            if record.timestamp is not None:
+                if record.timestamp == timestamp:
+                    rank += 1
+                else:
+                    timestamp, rank = record.timestamp, 0
+                # Ligne déjà reçue: antérieure à la dernière, ou de même horodatage et de rang inférieur
+                if end is not None and (timestamp < end or (timestamp == end and rank < held)):
+                    continue
+            self.append(record)
+
+    def covers(self, origin: Tuple[Optional[float], int]) -> bool:
+        """Indique si le tampon contient déjà toutes les lignes transmises avant origin"""
+        timestamp, count = origin
+        if self.last_timestamp is None or timestamp is None:
+            return False
+        return timestamp < self.last_timestamp or (timestamp == self.last_timestamp
+                                                   and count <= self.last_timestamp_lines)
+
+    def read(self, cursor: Optional[int] = None, since: Optional[float] = None,
+             tail: int = 100) -> Tuple[List[LogRecord], int, bool]:
+        """
+        Lit les lignes postérieures à un curseur
+
+        Args:
+            cursor (int, optional): Dernier numéro de séquence déjà reçu par le client
+            since (float, optional): Timestamp après lequel renvoyer les lignes
+            tail (int): Nombre maximum de lignes renvoyées sans curseur ou après une réinitialisation
+
+        Returns:
+            Tuple[List[LogRecord], int, bool]: (lignes, prochain curseur, True si le client doit repartir de zéro)
+        """
+        first_seq = self.lines[0].seq if self.lines else self.last_seq + 1
+        reset = cursor is not None and (cursor > self.last_seq or cursor < first_seq - 1)
+
+        if cursor is not None and not reset:
+            # Les numéros de séquence sont contigus: accès direct à la position du curseur
+            start = cursor - first_seq + 1
+            selected = list(itertools.islice(self.lines, start, None))
+        elif since is not None:
+            selected = [record for record in self.lines if record.timestamp > since]
+        else:
+            start = max(0, len(self.lines) - tail)
+            selected = list(itertools.islice(self.lines, start, None)) if tail > 0 else []
+
+        if reset:
+            selected = selected[-tail:] if tail > 0 else []
+        return selected, self.last_seq, reset
+
+
+class LogBufferStore:
+    """Classe gérant les tampons de logs de tous les containers"""
+
+    def __init__(self,
+                 fetch_logs: Callable[[str, Optional[float], int], bytes],
+                 afetch_logs: Optional[Callable[[str, Optional[float], int], Awaitable[bytes]]] = None,
+                 capacity: int = 1000,
+                 max_containers: int = 256,
+                 min_refresh_interval: float = 1.0):
+        """
+        Initialise le magasin de tampons
+
+        Args:
+            fetch_logs (Callable[[str, Optional[float], int], bytes]): Récupère les logs horodatés
+                d'un container (container_id, since, tail)
+            afetch_logs (Callable, optional): Variante asynchrone de fetch_logs utilisée par aread()
+            capacity (int): Nombre de lignes conservées par container
+            max_containers (int): Nombre de containers suivis avant d'évincer le moins récent
+            min_refresh_interval (float): Délai minimum entre deux appels au démon pour un container
+                (sans flux Docker suivi ouvert)
+        """
+        self.fetch_logs = fetch_logs
+        self.afetch_logs = afetch_logs
+        self.capacity = capacity
+        self.max_containers = max_containers
+        self.min_refresh_interval = min_refresh_interval
+        self._buffers: "collections.OrderedDict[str, ContainerLogBuffer]" = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+        self.fetches = 0
+        self.cached_reads = 0
+
+    def read(self, container_id: str, cursor: Optional[int] = None, since: Optional[float] = None,
+             tail: int = 100) -> Tuple[List[LogRecord], int, bool]:
+        """
+        Lit les lignes d'un container après un curseur, en rafraîchissant le tampon si nécessaire
+
+        Args:
+            container_id (str): ID complet du container
+            cursor (int, optional): Dernier numéro de séquence reçu
+            since (float, optional): Timestamp après lequel renvoyer les lignes
+            tail (int): Nombre maximum de lignes sans curseur
+
+        Returns:
+            Tuple[List[LogRecord], int, bool]: (lignes, prochain curseur, réinitialisation)
+        """
+        buffer = self._buffer(container_id)
+        refresh, last_timestamp = self._claim_refresh(buffer)
+        if refresh:
+            self._ingest(buffer, self.fetch_logs(container_id, last_timestamp, self.capacity))
+        with buffer.lock:
+            return buffer.read(cursor, since, tail)
+
+    async def aread(self, container_id: str, cursor: Optional[int] = None, since: Optional[float] = None,
+                    tail: int = 100) -> Tuple[List[LogRecord], int, bool]:
+        """Variante asynchrone de read(), le démon étant interrogé via afetch_logs"""
+        buffer = self._buffer(container_id)
+        refresh, last_timestamp = self._claim_refresh(buffer)
+        if refresh:
+            self._ingest(buffer, await self.afetch_logs(container_id, last_timestamp, self.capacity))
+        with buffer.lock:
+            return buffer.read(cursor, since, tail)
+
+    def follow(self, container_id: str, records: List[LogRecord], origin: Tuple[Optional[float], int], ended: bool):
+        """
+        Alimente le tampon d'un container depuis le flux Docker suivi (rappel de LogBroadcaster)
+
+        Les lignes ne sont retenues que si le tampon contient déjà tout ce que le flux a transmis
+        avant elles; sinon le tampon continue d'être rafraîchi par le démon jusqu'à le rattraper
+
+        Args:
+            container_id (str): ID complet du container
+            records (List[LogRecord]): Nouvelles lignes horodatées du flux
+            origin (Tuple[Optional[float], int]): (horodatage, nombre de lignes de cet horodatage)
+                transmises par le flux avant ces lignes; horodatage None au début du flux
+            ended (bool): True si le flux est fermé
+        """
+        with self._lock:
+            buffer = self._buffers.get(container_id)
+        if buffer is None:
+            return
+
+        with buffer.lock:
+            if origin[0] is None and records:
+                # Début du flux: l'historique renvoyé (tail) doit chevaucher le tampon
+                origin = (records[0].timestamp, 0)
+            if not buffer.covers(origin):
+                buffer.followed = False
+                return
+            # Copies: les enregistrements du flux sont partagés avec les abonnés
+            buffer.extend([LogRecord(r.timestamp, r.stream, r.text) for r in records], origin)
+            buffer.followed = not ended
+
+    def discard(self, container_id: str):
+        """Oublie le tampon d'un container supprimé"""
+        with self._lock:
+            self._buffers.pop(container_id, None)
+
+    def stats(self) -> Dict:
+        """Retourne le nombre de tampons et la répartition appels au démon / lectures en cache"""
+        with self._lock:
+            return {
+                "containers": len(self._buffers),
+                "fetches": self.fetches,
+                "cached_reads": self.cached_reads,
+            }
+
+    def _buffer(self, container_id: str) -> ContainerLogBuffer:
+        """Retourne (ou crée) le tampon d'un container en tenant l'ordre LRU à jour"""
+        with self._lock:
+            buffer = self._buffers.get(container_id)
+            if buffer is None:
+                buffer = ContainerLogBuffer(self.capacity)
+                self._buffers[container_id] = buffer
+                while len(self._buffers) > self.max_containers:
+                    self._buffers.popitem(last=False)
+            else:
+                self._buffers.move_to_end(container_id)
+            return buffer
+
+    def _claim_refresh(self, buffer: ContainerLogBuffer) -> Tuple[bool, Optional[float]]:
+        """
+        Réserve le rafraîchissement d'un tampon: un seul appel au démon par intervalle,
+        les lectures concurrentes étant servies depuis le tampon pendant l'appel
+
+        Returns:
+            Tuple[bool, Optional[float]]: (rafraîchir, dernier horodatage connu)
+        """
+        with buffer.lock:
+            now = time.monotonic()
+            if buffer.followed or now - buffer.refreshed_at < self.min_refresh_interval:
+                self.cached_reads += 1
+                return False, None
+            buffer.refreshed_at = now
+            self.fetches += 1
+            return True, buffer.last_timestamp
+
+    def _ingest(self, buffer: ContainerLogBuffer, raw: bytes):
+        """Décode et classe une seule fois les lignes postérieures aux dernières lignes reçues"""
+        if not raw:
+            return
+
+        processor = LogProcessor(timestamps=True)
+        records = processor.feed(raw) + processor.flush()
+        with buffer.lock:
+            # Le paramètre since de Docker est inclusif: les lignes de même horodatage déjà reçues
+            # sont renvoyées et ignorées selon leur rang
+            buffer.extend(records, (None, 0))
@@ -0,0 +1,258 @@
+"""
+Module de traitement incrémental des logs des containers
+Le flux d'octets Docker est démultiplexé, décodé et nettoyé des séquences ANSI au fil de l'eau
+(y compris à cheval sur deux blocs), puis découpé en enregistrements classés une seule fois côté serveur
+"""
+
+import codecs
+import re
+import struct
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+# Flux d'origine d'une ligne (numéros des trames multiplexées Docker)
+STDOUT = "stdout"
+STDERR = "stderr"
+STREAMS = {0: STDOUT, 1: STDOUT, 2: STDERR}
+
+# Nature d'une ligne
+KIND_COMMAND = "command"
+KIND_ERROR = "error"
+KIND_SUCCESS = "success"
+KIND_OUTPUT = "output"
+
+COMMAND_PATTERN = re.compile(r'^(\$|#|>|minishell|bash)')
+ERROR_PATTERN = re.compile(r'error|erreur', re.IGNORECASE)
+SUCCESS_PATTERN = re.compile(r'success|réussi', re.IGNORECASE)
+
+# États de l'automate de suppression des séquences ANSI (_INTERMEDIATE: ESC suivi d'octets 0x20-0x2F,
+# par exemple ESC ( B pour le choix du jeu de caractères, terminé par un octet final)
+_TEXT, _ESCAPE, _CSI, _OSC, _OSC_ESCAPE, _INTERMEDIATE = range(6)
+
+
+def parse_docker_timestamp(value: str) -> float:
+    """
+    Convertit un horodatage Docker RFC 3339 (précision nanoseconde) en timestamp
+
+    Args:
+        value (str): Horodatage, par exemple 2024-01-01T12:00:00.123456789Z
+
+    Returns:
+        float: Secondes depuis l'epoch
+    """
+    value = value.rstrip('Z')
+    seconds, _, fraction = value.partition('.')
+    moment = datetime.strptime(seconds, "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc)
+    return moment.timestamp() + (float(f"0.{fraction}") if fraction else 0.0)
+
+
+def classify(text: str, stream: str = STDOUT) -> str:
+    """
+    Détermine la nature d'une ligne (commande, erreur, succès ou sortie)
+
+    Args:
+        text (str): Ligne sans séquences ANSI
+        stream (str): Flux d'origine (une ligne de stderr est une erreur)
+
+    Returns:
+        str: KIND_COMMAND, KIND_ERROR, KIND_SUCCESS ou KIND_OUTPUT
+    """
+    if COMMAND_PATTERN.match(text):
+        return KIND_COMMAND
+    if stream == STDERR or ERROR_PATTERN.search(text):
+        return KIND_ERROR
+    if SUCCESS_PATTERN.search(text):
+        return KIND_SUCCESS
+    return KIND_OUTPUT
+
+
+class LogRecord:
+    """Ligne de log structurée"""
+
+    __slots__ = ("seq", "timestamp", "stream", "kind", "text")
+
+    def __init__(self, timestamp: Optional[float], stream: str, text: str, seq: int = 0):
+        """
+        Initialise l'enregistrement
+
+        Args:
+            timestamp (float, optional): Horodatage Docker de la ligne (None si absent)
+            stream (str): Flux d'origine (STDOUT ou STDERR)
+            text (str): Ligne sans séquences ANSI ni fin de ligne
+            seq (int): Numéro de séquence attribué par le tampon
+        """
+        self.seq = seq
+        self.timestamp = timestamp
+        self.stream = stream
+        self.kind = classify(text, stream)
+        self.text = text
+
+    def format(self) -> str:
+        """Ligne affichée en mode texte (commandes préfixées par "> ")"""
+        return f"> {self.text}" if self.kind == KIND_COMMAND else self.text
+
+    def to_dict(self) -> Dict:
+        """Retourne l'enregistrement pour la réponse JSON"""
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+class _StreamState:
+    """Décodage en cours d'un flux (stdout ou stderr)"""
+
+    __slots__ = ("decoder", "state", "partial", "size")
+
+    def __init__(self):
+        self.decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.state = _TEXT
+        self.partial: List[str] = []
+        self.size = 0
+
+
+class LogProcessor:
+    """Classe transformant un flux d'octets Docker en enregistrements, avec une mémoire bornée"""
+
+    def __init__(self, timestamps: bool = False, multiplexed: Optional[bool] = None, max_line: int = 8192):
+        """
+        Initialise le traitement
+
+        Args:
+            timestamps (bool): True si chaque ligne commence par l'horodatage Docker
+            multiplexed (bool, optional): Flux en trames stdout/stderr (détecté sur les premiers octets si None)
+            max_line (int): Longueur au-delà de laquelle une ligne sans fin est émise en plusieurs morceaux
+        """
+        self.timestamps = timestamps
+        self.multiplexed = multiplexed
+        self.max_line = max_line
+        self._streams: Dict[str, _StreamState] = {}
+        self._header = b""
+        self._frame_stream = STDOUT
+        self._frame_remaining = 0
+
+    def feed(self, chunk: bytes) -> List[LogRecord]:
+        """
+        Traite un bloc d'octets
+
+        Args:
+            chunk (bytes): Bloc reçu du démon (découpage quelconque)
+
+        Returns:
+            List[LogRecord]: Lignes complètes contenues dans ce bloc et les précédents
+        """
+        if self.multiplexed is None:
+            self._header += chunk
+            if len(self._header) < 4:
+                return []
+            chunk, self._header = self._header, b""
+            self.multiplexed = chunk[0] in STREAMS and chunk[1:4] == b"\x00\x00\x00"
+
+        if not self.multiplexed:
+            return self._process(STDOUT, chunk)
+
+        records = []
+        view = memoryview(chunk)
+        while view:
+            if self._frame_remaining == 0:
+                # En-tête de trame [flux, 0, 0, 0, taille sur 4 octets], éventuellement coupé entre deux blocs
+                missing = 8 - len(self._header)
+                self._header += bytes(view[:missing])
+                view = view[missing:]
+                if len(self._header) < 8:
+                    break
+                self._frame_stream = STREAMS.get(self._header[0], STDOUT)
+                self._frame_remaining = struct.unpack_from(">L", self._header, 4)[0]
+                self._header = b""
+                continue
+            payload = view[:self._frame_remaining]
+            view = view[len(payload):]
+            self._frame_remaining -= len(payload)
+            records += self._process(self._frame_stream, bytes(payload))
+        return records
+
+    def flush(self) -> List[LogRecord]:
+        """Émet les lignes incomplètes en fin de flux"""
+        records = self._process(STDOUT, self._header) if self.multiplexed is None and self._header else []
+        self._header = b""
+        for stream, state in self._streams.items():
+            text = state.decoder.decode(b"", final=True)
+            if text:
+                self._strip(state, text)
+            if state.size:
+                records.append(self._record(stream, state))
+        return records
+
+    def _process(self, stream: str, data: bytes) -> List[LogRecord]:
+        """Décode les octets d'un flux et découpe les lignes complètes"""
+        state = self._streams.get(stream)
+        if state is None:
+            state = self._streams[stream] = _StreamState()
+        text = state.decoder.decode(data)
+        records = []
+        while text:
+            line, newline, text = text.partition('\n')
+            while line:
+                # Une ligne trop longue est émise par morceaux de max_line caractères
+                room = self.max_line - state.size
+                self._strip(state, line[:room])
+                line = line[room:]
+                if state.size >= self.max_line:
+                    records.append(self._record(stream, state))
+            if newline:
+                records.append(self._record(stream, state))
+        return records
+
+    def _strip(self, state: _StreamState, text: str):
+        """Ajoute du texte à la ligne en cours en supprimant les séquences ANSI (automate par caractère)"""
+        if state.state == _TEXT and '\x1b' not in text:
+            state.partial.append(text)
+            state.size += len(text)
+            return
+
+        kept = []
+        current = state.state
+        for char in text:
+            if current == _TEXT:
+                if char == '\x1b':
+                    current = _ESCAPE
+                else:
+                    kept.append(char)
+            elif current == _ESCAPE:
+                if char == '[':
+                    current = _CSI
+                elif char == ']':
+                    current = _OSC
+                elif '\x20' <= char <= '\x2f':
+                    current = _INTERMEDIATE
+                else:
+                    current = _TEXT
+            elif current == _INTERMEDIATE:
+                if not '\x20' <= char <= '\x2f':
+                    current = _TEXT
+            elif current == _CSI:
+                if '\x40' <= char <= '\x7e':
+                    current = _TEXT
+            elif current == _OSC:
+                if char == '\x07':
+                    current = _TEXT
+                elif char == '\x1b':
+                    current = _OSC_ESCAPE
+            else:
+                current = _TEXT if char == '\\' else _OSC
+        state.state = current
+        state.partial.append("".join(kept))
+        state.size += len(kept)
+
+    def _record(self, stream: str, state: _StreamState) -> LogRecord:
+        """Termine la ligne en cours d'un flux"""
+        line = "".join(state.partial).rstrip('\r')
+        state.partial = []
+        state.size = 0
+        timestamp = None
+        if self.timestamps:
+            stamp, _, rest = line.partition(' ')
+            try:
+                timestamp = parse_docker_timestamp(stamp)
+                line = rest
+            except ValueError:
+                pass
+        return LogRecord(timestamp if self.timestamps else time.time(), stream, line)
@@ -0,0 +1,220 @@
+"""
+Module de diffusion en continu des logs des containers
+Un seul flux Docker (follow) par container est partagé entre tous les clients connectés
+"""
+
+import asyncio
+import collections
+import logging
+import threading
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from log_pipeline import LogProcessor, LogRecord
+
+logger = logging.getLogger(__name__)
+
+
+class LogSubscriber:
+    """Client abonné au flux de logs d'un container, avec un tampon borné"""
+
+    def __init__(self, container_id: str, loop: asyncio.AbstractEventLoop, max_buffer: int):
+        """
+        Initialise l'abonné
+
+        Args:
+            container_id (str): ID complet du container suivi
+            loop (asyncio.AbstractEventLoop): Boucle asyncio du client
+            max_buffer (int): Nombre maximum de lignes en attente avant d'abandonner les plus anciennes
+        """
+        self.container_id = container_id
+        self.loop = loop
+        self.buffer: Deque[LogRecord] = collections.deque(maxlen=max_buffer)
+        self.dropped = 0
+        self.ended = False
+        self.seq = 0
+        self._event = asyncio.Event()
+
+    def publish(self, lines: List[LogRecord], ended: bool = False):
+        """Transmet des lignes depuis le thread de lecture (thread-safe)"""
+        self.loop.call_soon_threadsafe(self._push, lines, ended)
+
+    def _push(self, lines: List[LogRecord], ended: bool):
+        """Ajoute des lignes au tampon dans la boucle du client"""
+        overflow = len(self.buffer) + len(lines) - self.buffer.maxlen
+        if overflow > 0:
+            self.dropped += overflow
+        self.buffer.extend(lines)
+        self.ended = self.ended or ended
+        self._event.set()
+
+    async def next_batch(self, timeout: float) -> Tuple[List[LogRecord], int, bool]:
+        """
+        Attend de nouvelles lignes
+
+        Args:
+            timeout (float): Délai maximum d'attente en secondes
+
+        Returns:
+            Tuple[List[LogRecord], int, bool]: (lignes, lignes abandonnées, fin du flux)
+        """
+        if not self.buffer and not self.ended:
+            try:
+                await asyncio.wait_for(self._event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        self._event.clear()
+
+        lines = list(self.buffer)
+        self.buffer.clear()
+        dropped, self.dropped = self.dropped, 0
+        self.seq += len(lines) + dropped
+        return lines, dropped, self.ended and not lines
+
+
+class _Follower:
+    """Lecture d'un flux de logs Docker pour un container"""
+
+    def __init__(self, container_id: str, backlog: int, tail: int):
+        self.container_id = container_id
+        # Lignes antérieures demandées au démon à l'ouverture du flux (tail du premier client)
+        self.tail = max(0, min(tail, backlog))
+        self.subscribers: Set[LogSubscriber] = set()
+        self.recent: Deque[LogRecord] = collections.deque(maxlen=backlog)
+        # (horodatage, nombre de lignes de cet horodatage) de la dernière ligne transmise
+        self.position: Tuple[Optional[float], int] = (None, 0)
+        self.stream = None
+        self.thread: Optional[threading.Thread] = None
+
+
+class LogBroadcaster:
+    """Classe pour partager un flux de logs par container entre plusieurs clients"""
+
+    def __init__(self,
+                 open_stream: Callable[[str, int], Iterable[bytes]],
+                 on_activity: Optional[Callable[[str], None]] = None,
+                 on_lines: Optional[Callable[[str, List[LogRecord], Tuple[Optional[float], int], bool], None]] = None,
+                 backlog: int = 200,
+                 max_buffer: int = 1000):
+        """
+        Initialise le diffuseur
+
+        Args:
+            open_stream (Callable[[str, int], Iterable[bytes]]): Ouvre le flux Docker horodaté (container_id, tail)
+            on_activity (Callable[[str], None], optional): Appelé quand un container produit des logs
+            on_lines (Callable, optional): Reçoit les lignes diffusées (container_id, lignes, position du
+                flux avant ces lignes, fin du flux), par exemple pour alimenter LogBufferStore
+            backlog (int): Nombre de lignes récentes conservées pour les nouveaux clients
+            max_buffer (int): Taille maximum du tampon de chaque client
+        """
+        self.open_stream = open_stream
+        self.on_activity = on_activity
+        self.on_lines = on_lines
+        self.backlog = backlog
+        self.max_buffer = max_buffer
+        self._followers: Dict[str, _Follower] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, container_id: str, loop: asyncio.AbstractEventLoop, tail: int = 50) -> LogSubscriber:
+        """
+        Abonne un client au flux de logs d'un container
+
+        Args:
+            container_id (str): ID complet du container
+            loop (asyncio.AbstractEventLoop): Boucle asyncio du client
+            tail (int): Nombre de lignes récentes à envoyer immédiatement (au plus backlog); le
+                premier client ouvre le flux Docker avec ce tail, les suivants reçoivent au plus
+                les lignes conservées depuis cette ouverture
+
+        Returns:
+            LogSubscriber: Abonné à lire avec next_batch()
+        """
+        subscriber = LogSubscriber(container_id, loop, self.max_buffer)
+        with self._lock:
+            follower = self._followers.get(container_id)
+            if follower is None:
+                follower = _Follower(container_id, self.backlog, tail)
+                self._followers[container_id] = follower
+                follower.subscribers.add(subscriber)
+                follower.thread = threading.Thread(
+                    target=self._follow, args=(follower,), name=f"logs-{container_id[:12]}"
+                )
+                follower.thread.daemon = True
+                follower.thread.start()
+            else:
+                follower.subscribers.add(subscriber)
+                if tail > 0 and follower.recent:
+                    subscriber.publish(list(follower.recent)[-tail:])
+        return subscriber
+
+    def unsubscribe(self, subscriber: LogSubscriber):
+        """
+        Désabonne un client; le flux Docker est fermé après le départ du dernier client
+
+        Args:
+            subscriber (LogSubscriber): Abonné à retirer
+        """
+        with self._lock:
+            follower = self._followers.get(subscriber.container_id)
+            if not follower:
+                return
+            follower.subscribers.discard(subscriber)
+            if follower.subscribers:
+                return
+            del self._followers[subscriber.container_id]
+            stream = follower.stream
+
+        if stream is not None:
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+    def stats(self) -> Dict:
+        """Retourne le nombre de flux Docker ouverts et de clients connectés"""
+        with self._lock:
+            return {
+                "streams": len(self._followers),
+                "subscribers": sum(len(f.subscribers) for f in self._followers.values()),
+            }
+
+    def _follow(self, follower: _Follower):
+        """Lit le flux Docker et diffuse chaque nouvelle ligne aux abonnés"""
+        # Le SDK Docker retire déjà les en-têtes de trames du flux suivi
+        processor = LogProcessor(timestamps=True, multiplexed=False)
+        try:
+            follower.stream = self.open_stream(follower.container_id, follower.tail)
+            for chunk in follower.stream:
+                # Tous les clients sont partis pendant l'ouverture du flux
+                if not follower.subscribers:
+                    follower.stream.close()
+                    break
+                lines = processor.feed(chunk)
+                if lines:
+                    self._broadcast(follower, lines)
+        except Exception as e:
+            with self._lock:
+                active = self._followers.get(follower.container_id) is follower
+            if active:
+                logger.error(f"Flux de logs du container {follower.container_id} interrompu: {e}")
+
+        self._broadcast(follower, processor.flush(), ended=True)
+        with self._lock:
+            if self._followers.get(follower.container_id) is follower:
+                del self._followers[follower.container_id]
+
+    def _broadcast(self, follower: _Follower, lines: List[LogRecord], ended: bool = False):
+        """Transmet des lignes à tous les abonnés d'un container"""
+        with self._lock:
+            follower.recent.extend(lines)
+            for subscriber in follower.subscribers:
+                subscriber.publish(lines, ended)
+            origin = follower.position
+            timestamp, count = origin
+            for line in lines:
+                if line.timestamp is not None:
+                    timestamp, count = line.timestamp, (count + 1 if line.timestamp == timestamp else 1)
+            follower.position = (timestamp, count)
+        if self.on_lines:
+            self.on_lines(follower.container_id, lines, origin, ended)
+        if lines and self.on_activity:
+            self.on_activity(follower.container_id)
@@ -2,24 +2,40 @@
 API Backend pour gérer les containers Docker et spécifiquement le Mini Shell
 """
 
-from fastapi import FastAPI, HTTPException, Depends, status, Security
+from fastapi import FastAPI, HTTPException, Depends, Request, status, Security, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import Response, StreamingResponse
 from fastapi.security import HTTPBasic, HTTPBasicCredentials, APIKeyHeader
 import uvicorn
+import base64
+import binascii
+import json
 import logging
 import secrets
 import os
-from typing import List
+import re
+import time
+from typing import Awaitable, Callable, List, Optional
+from urllib.parse import parse_qsl
 
 from models import (
     DockerImageModel,
     DockerContainerModel,
     ContainerActionRequest,
+    BulkContainerActionRequest,
+    GarbageCollectionRequest,
     ContainerCreationRequest,
     MiniShellContainerRequest,
+    ImageBuildRequest,
     ApiResponse
 )
 from docker_control import docker_manager
+from fast_json import FastJSONResponse, api_payload, dumps
+from metrics import registry, timed
+from rate_limiter import RateLimiter, parse_rules
+from response_cache import etag_matches, make_etag
+from stats_relay import LeaderUnavailable
 
 # Middleware pour masquer les en-têtes de version
 class RemoveHeadersMiddleware:
@@ -40,6 +56,136 @@ class RemoveHeadersMiddleware:
 
         await self.app(scope, receive, send_wrapper)
 
+# Middleware compressant (gzip négocié) les réponses au-delà d'une taille minimale
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = 1024):
+        self.app = app
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size)
+
+    async def __call__(self, scope, receive, send):
+        # Les flux Server-Sent Events doivent parvenir au client sans être retenus par le compresseur
+        if scope["type"] == "http" and not scope["path"].endswith("/stream"):
+            return await self.gzip(scope, receive, send)
+        await self.app(scope, receive, send)
+
+# Middleware limitant le débit des routes coûteuses (seaux à jetons par session, clé d'API et adresse IP)
+class RateLimitMiddleware:
+    def __init__(self, app, limiter: RateLimiter, routes, ip_factor: float = 5.0,
+                 api_key: Optional[str] = None, trusted_proxies=(),
+                 is_session: Optional[Callable[[str], bool]] = None):
+        self.app = app
+        self.limiter = limiter
+        self.api_key = api_key
+        self.is_session = is_session
+        self.trusted_proxies = set(trusted_proxies)
+        # Règle de chaque famille de routes, et règle élargie du seau commun à une adresse IP
+        self.routes = [(limiter.rules[name], method, pattern) for name, method, pattern in routes
+                       if name in limiter.rules]
+        self.ip_rules = {rule.name: rule.scaled(ip_factor) for rule, _, _ in self.routes}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        rule = match = None
+        for candidate, method, pattern in self.routes:
+            match = pattern.match(scope["path"]) if method == scope["method"] else None
+            if match:
+                rule = candidate
+                break
+        if rule is None:
+            return await self.app(scope, receive, send)
+
+        headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope["headers"]}
+        ip = scope["client"][0] if scope.get("client") else "unknown"
+        if ip in self.trusted_proxies and headers.get("x-forwarded-for"):
+            # Derrière le proxy Apache: adresse ajoutée par le dernier proxy de confiance (les entrées
+            # précédentes sont fournies par le client et ne sont pas fiables)
+            for forwarded in reversed(headers["x-forwarded-for"].split(",")):
+                ip = forwarded.strip()
+                if ip not in self.trusted_proxies:
+                    break
+        
+        # Identité vérifiée uniquement: session enregistrée, sinon clé d'API valide (un identifiant
+        # de session inventé ne donne pas de seau propre, sans quoi le changer contournerait la limite)
+        session = headers.get("x-session-id")
+        if session is None and b"session_id=" in scope["query_string"]:
+            session = dict(parse_qsl(scope["query_string"].decode("latin-1"))).get("session_id")
+        identity = None
+        if session and self.is_session is not None and self.is_session(session):
+            identity = f"session:{session}"
+        elif self.api_key and headers.get("x-api-key") == self.api_key:
+            identity = "key"
+        if identity:
+            limits = [(rule, identity), (self.ip_rules[rule.name], f"ip:{ip}")]
+        else:
+            limits = [(rule, f"client:{ip}")]
+
+        decision = self.limiter.check(limits)
+        if not decision.allowed:
+            RATE_LIMITED.inc(rule.name)
+            response = FastJSONResponse(
+                api_payload(False, f"Trop de requêtes, réessayez dans {decision.retry_after} s"),
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                headers=decision.headers()
+            )
+            return await response(scope, receive, send)
+
+        extra = [(k.encode(), v.encode()) for k, v in decision.headers().items()]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + extra
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+# Métriques des requêtes HTTP et des dépendances d'authentification
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "mishu_http_request_seconds", "Durée des requêtes HTTP par route, méthode et statut", ["route", "method", "status"]
+)
+AUTH_SECONDS = registry.histogram(
+    "mishu_auth_seconds", "Durée des dépendances d'authentification", ["dependency"],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+)
+RATE_LIMITED = registry.counter("mishu_rate_limited_total", "Requêtes refusées par la limitation du débit", ["rule"])
+
+# Middleware mesurant la durée de chaque requête HTTP
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+        self.routes = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - started, self.route(scope), scope["method"], str(status_code)
+            )
+
+    def route(self, scope) -> str:
+        # Modèle de chemin de la route (les identifiants ne créent pas de nouvelles séries)
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        path = self.routes.get(endpoint)
+        if path is None:
+            path = next((r.path for r in scope["app"].routes if getattr(r, "endpoint", None) is endpoint), "unmatched")
+            self.routes[endpoint] = path
+        return path
+
 # Configuration du logging
 logging.basicConfig(
     level=logging.INFO,
@@ -47,6 +193,27 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Mode de réponse rapide des routes de lecture fréquentes (sérialisation orjson sans validation pydantic)
+FAST_RESPONSES = os.getenv("FAST_RESPONSES", "false").lower() == "true"
+
+# Taille minimale d'une réponse compressée avec gzip (0 pour désactiver la compression)
+GZIP_MINIMUM_SIZE = int(os.getenv("GZIP_MINIMUM_SIZE", "1024"))
+
+# Limitation du débit: budgets par famille de routes ("règle=requêtes/secondes", vide pour désactiver),
+# capacité du seau commun à une adresse IP (multiple du budget) et nombre maximum de seaux en mémoire
+RATE_LIMITS = os.getenv("RATE_LIMITS", "run=10/60,logs=60/60,list=120/60")
+RATE_LIMIT_IP_FACTOR = float(os.getenv("RATE_LIMIT_IP_FACTOR", "5"))
+RATE_LIMIT_MAX_BUCKETS = int(os.getenv("RATE_LIMIT_MAX_BUCKETS", "10000"))
+RATE_LIMIT_TRUSTED_PROXIES = os.getenv("RATE_LIMIT_TRUSTED_PROXIES", "127.0.0.1,::1").split(",")
+
+# Familles de routes limitées: (règle, méthode, chemin)
+RATE_LIMITED_ROUTES = (
+    ("run", "POST", re.compile(r"^/(mini-shell|containers)/run$")),
+    ("logs", "GET", re.compile(r"^/(?:containers|sessions)/([^/]+)/logs(?:/stream)?$")),
+    ("list", "GET", re.compile(r"^/(containers|images)$")),
+)
+rate_limiter = RateLimiter(parse_rules(RATE_LIMITS), max_buckets=RATE_LIMIT_MAX_BUCKETS)
+
 # Configuration de l'authentification
 security = HTTPBasic()
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
@@ -57,6 +224,7 @@ ADMIN_USERNAME = os.getenv("ADMIN_USERNAME", "admin")
 ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD", "adminpassword")
 API_KEY = os.getenv("API_KEY", "your-secret-api-key")
 
+@timed(AUTH_SECONDS, "verify_api_key")
 def verify_api_key(api_key: str = Security(api_key_header)) -> bool:
     if api_key == API_KEY:
         return True
@@ -66,6 +234,7 @@ def verify_api_key(api_key: str = Security(api_key_header)) -> bool:
         headers={"WWW-Authenticate": "APIKey"},
     )
 
+@timed(AUTH_SECONDS, "verify_admin_user")
 def verify_admin_user(credentials: HTTPBasicCredentials = Depends(security)):
     correct_username = secrets.compare_digest(credentials.username, ADMIN_USERNAME)
     correct_password = secrets.compare_digest(credentials.password, ADMIN_PASSWORD)
@@ -78,6 +247,40 @@ def verify_admin_user(credentials: HTTPBasicCredentials = Depends(security)):
         )
     return True
 
+@timed(AUTH_SECONDS, "verify_api_key_or_admin")
+def verify_api_key_or_admin(api_key: str = Security(api_key_header), credentials: HTTPBasicCredentials = Depends(security)):
+    # Vérifier soit l'API key soit les credentials basiques
+    api_key_valid = api_key == API_KEY if api_key else False
+    basic_auth_valid = False
+    
+    if credentials:
+        correct_username = secrets.compare_digest(credentials.username, ADMIN_USERNAME)
+        correct_password = secrets.compare_digest(credentials.password, ADMIN_PASSWORD)
+        basic_auth_valid = correct_username and correct_password
+    
+    if not (api_key_valid or basic_auth_valid):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentification invalide",
+            headers={"WWW-Authenticate": "Basic"},
+        )
+    return True
+
+def is_websocket_authorized(websocket: WebSocket) -> bool:
+    # Les navigateurs ne peuvent pas poser d'en-têtes sur un WebSocket: la clé API est aussi acceptée en paramètre
+    api_key = websocket.headers.get("x-api-key") or websocket.query_params.get("api_key")
+    if api_key and secrets.compare_digest(api_key, API_KEY):
+        return True
+    
+    scheme, _, encoded = websocket.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "basic":
+        return False
+    try:
+        username, _, password = base64.b64decode(encoded).decode().partition(":")
+    except (binascii.Error, UnicodeDecodeError):
+        return False
+    return secrets.compare_digest(username, ADMIN_USERNAME) and secrets.compare_digest(password, ADMIN_PASSWORD)
+
 # Création de l'application FastAPI
 app = FastAPI(
     title="API Docker Manager",
@@ -89,8 +292,25 @@ app = FastAPI(
     redoc_url=None if os.getenv("PRODUCTION", "false").lower() == "true" else "/redoc"
 )
 
+# Compression des réponses volumineuses (au plus près de l'application)
+if GZIP_MINIMUM_SIZE > 0:
+    app.add_middleware(CompressionMiddleware, minimum_size=GZIP_MINIMUM_SIZE)
+
+# Limitation du débit avant tout appel au démon Docker
+if rate_limiter.rules:
+    app.add_middleware(
+        RateLimitMiddleware,
+        limiter=rate_limiter,
+        routes=RATE_LIMITED_ROUTES,
+        ip_factor=RATE_LIMIT_IP_FACTOR,
+        api_key=API_KEY,
+        trusted_proxies=RATE_LIMIT_TRUSTED_PROXIES,
+        is_session=docker_manager.sessions.exists
+    )
+
 # Ajout du middleware pour masquer les en-têtes de version
 app.add_middleware(RemoveHeadersMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 # Configuration CORS pour permettre les requêtes depuis le frontend
 app.add_middleware(
@@ -99,36 +319,119 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+# Démarrage des tâches de fond au lancement de l'application
+@app.on_event("startup")
+def start_background_tasks():
+    docker_manager.start()
+
+# Arrêt des tâches de fond à l'arrêt de l'application
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    docker_manager.shutdown()
+    for engine in docker_manager.engines.engines.values():
+        await engine.aclient.close()
+
 # Point de terminaison pour vérifier si l'API est en cours d'exécution
 @app.get("/", response_model=ApiResponse)
 def read_root():
     return ApiResponse(
         success=True,
         message="API Docker Manager en cours d'exécution",
-        data={"status": "online"}
+        data={
+            "status": "online",
+            "index": docker_manager.index.stats(),
+            "launches": docker_manager.alaunches.stats(),
+            "cache": docker_manager.responses.stats(),
+            "freezer": docker_manager.freezer.stats(),
+            "sessions": docker_manager.sessions.stats(),
+            "gc": docker_manager.gc.stats(),
+            "log_archive": docker_manager.log_archive.stats(),
+            "stats": docker_manager.resource_stats.stats(),
+            "workers": docker_manager.coordinator.stats() if docker_manager.coordinator else None,
+            "rate_limit": rate_limiter.stats()
+        }
+    )
+
+# Point de terminaison de la sonde de vivacité (le processus répond, sans appel au démon)
+@app.get("/health/live", response_model=ApiResponse)
+def liveness_probe():
+    return reply(True, "Processus en vie", {"pid": os.getpid(), "uptime": time.time() - docker_manager.started_at})
+
+# Point de terminaison de la sonde de disponibilité (503 tant que le démon Docker n'est pas joignable)
+@app.get("/health/ready", response_model=ApiResponse)
+def readiness_probe():
+    health = docker_manager.health()
+    message = "Prêt à servir les requêtes" if health["ready"] else "Démon Docker non joignable ou index en cours de synchronisation"
+    return FastJSONResponse(
+        api_payload(health["ready"], message, health),
+        status_code=status.HTTP_200_OK if health["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE
     )
 
+def reply(success: bool, message: str, data=None):
+    """
+    Réponse d'une route de lecture fréquente
+    
+    Args:
+        success (bool): Succès de l'opération
+        message (str): Message
+        data (Dict ou List, optional): Données
+        
+    Returns:
+        FastJSONResponse en mode rapide (sans validation par response_model), ApiResponse sinon
+    """
+    if FAST_RESPONSES:
+        return FastJSONResponse(api_payload(success, message, data))
+    return ApiResponse(success=success, message=message, data=data)
+
+async def cached_response(request: Request, compute: Callable[[], Awaitable[dict]]) -> Response:
+    """
+    Sert une réponse de lecture depuis le cache, avec son ETag
+    
+    Args:
+        request (Request): Requête (le chemin et les paramètres forment la clé du cache)
+        compute (Callable[[], Awaitable[dict]]): Produit le contenu (api_payload) s'il n'est pas en cache
+        
+    Returns:
+        Response: Réponse JSON, ou 304 Not Modified si le client possède déjà cette version
+    """
+    key = request.url.path + "?" + "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    
+    async def serialize():
+        payload = await compute()
+        # L'ETag ne dépend que du contenu: l'horodatage de la réponse change à chaque appel
+        if FAST_RESPONSES:
+            timestamp = payload.pop("timestamp")
+            etag = make_etag(dumps(payload))
+            return dumps(dict(payload, timestamp=timestamp)), etag
+        response = ApiResponse(**payload)
+        return response.json().encode(), make_etag(response.json(exclude={"timestamp"}).encode())
+    
+    entry = await docker_manager.responses.aget(key, docker_manager.listing_version(), serialize)
+    # no-cache: le navigateur conserve la réponse mais la revalide à chaque fois avec If-None-Match
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        docker_manager.responses.record_not_modified()
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
 # Point de terminaison pour lister les images Docker
 @app.get("/images", response_model=ApiResponse)
-def list_images():
-    images = docker_manager.list_images()
-    return ApiResponse(
-        success=True,
-        message=f"{len(images)} images trouvées",
-        data=images
-    )
+async def list_images(request: Request):
+    async def compute():
+        images = await docker_manager.alist_images()
+        return api_payload(True, f"{len(images)} images trouvées", images)
+    return await cached_response(request, compute)
 
 # Point de terminaison pour lister les containers Docker
 @app.get("/containers", response_model=ApiResponse)
-def list_containers(all_containers: bool = True):
-    containers = docker_manager.list_containers(all_containers)
-    return ApiResponse(
-        success=True,
-        message=f"{len(containers)} containers trouvés",
-        data=containers
-    )
+async def list_containers(request: Request, all_containers: bool = True, minishell_only: bool = False):
+    async def compute():
+        containers = await docker_manager.alist_containers(all_containers, minishell_only)
+        return api_payload(True, f"{len(containers)} containers trouvés", containers)
+    return await cached_response(request, compute)
 
 # Point de terminaison pour lancer un container générique
 @app.post("/containers/run", response_model=ApiResponse, dependencies=[Depends(verify_admin_user)])
@@ -150,8 +453,8 @@ def run_container(request: ContainerCreationRequest):
 
 # Point de terminaison pour arrêter un container
 @app.post("/containers/stop", response_model=ApiResponse, dependencies=[Depends(verify_admin_user)])
-def stop_container(request: ContainerActionRequest):
-    success, message = docker_manager.stop_container(request.container_id)
+async def stop_container(request: ContainerActionRequest):
+    success, message = await docker_manager.astop_container(request.container_id)
     return ApiResponse(
         success=success,
         message=message
@@ -159,8 +462,8 @@ def stop_container(request: ContainerActionRequest):
 
 # Point de terminaison pour supprimer un container
 @app.post("/containers/remove", response_model=ApiResponse, dependencies=[Depends(verify_admin_user)])
-def remove_container(request: ContainerActionRequest):
-    success, message = docker_manager.remove_container(
+async def remove_container(request: ContainerActionRequest):
+    success, message = await docker_manager.aremove_container(
         request.container_id,
         force=request.force
     )
@@ -169,121 +472,362 @@ def remove_container(request: ContainerActionRequest):
         message=message
     )
 
-# Point de terminaison pour obtenir les logs d'un container
-@app.get("/containers/{container_id}/logs", response_model=ApiResponse)
-def get_container_logs(container_id: str, tail: int = 100, api_key: str = Security(api_key_header), credentials: HTTPBasicCredentials = Depends(security)):
-    # Vérifier soit l'API key soit les credentials basiques
-    api_key_valid = api_key == API_KEY if api_key else False
-    basic_auth_valid = False
-    
-    if credentials:
-        correct_username = secrets.compare_digest(credentials.username, ADMIN_USERNAME)
-        correct_password = secrets.compare_digest(credentials.password, ADMIN_PASSWORD)
-        basic_auth_valid = correct_username and correct_password
-    
-    if not (api_key_valid or basic_auth_valid):
+# Point de terminaison pour arrêter plusieurs containers (liste d'IDs, session ou labels)
+@app.post("/containers/bulk/stop", response_model=ApiResponse, dependencies=[Depends(verify_admin_user)])
+async def bulk_stop_containers(request: BulkContainerActionRequest):
+    success, message, data = await docker_manager.abulk_action(
+        "stop", request.container_ids, request.session_id, request.labels
+    )
+    return ApiResponse(
+        success=success,
+        message=message,
+        data=data
+    )
+
+# Point de terminaison pour supprimer plusieurs containers (liste d'IDs, session ou labels)
+@app.post("/containers/bulk/remove", response_model=ApiResponse, dependencies=[Depends(verify_admin_user)])
+async def bulk_remove_containers(request: BulkContainerActionRequest):
+    success, message, data = await docker_manager.abulk_action(
+        "remove", request.container_ids, request.session_id, request.labels, force=request.force
+    )
+    return ApiResponse(
+        success=success,
+        message=message,
+        data=data
+    )
+
+# Point de terminaison pour supprimer immédiatement les Mini Shell arrêtés
+@app.post("/containers/prune", response_model=ApiResponse, dependencies=[Depends(verify_admin_user)])
+def prune_containers(request: GarbageCollectionRequest):
+    success, message, data = docker_manager.collect_garbage(request.max_age)
+    return ApiResponse(
+        success=success,
+        message=message,
+        data=data
+    )
+
+# Point de terminaison pour obtenir les logs d'un container (format=json pour les enregistrements structurés)
+@app.get("/containers/{container_id}/logs", response_model=ApiResponse, dependencies=[Depends(verify_api_key_or_admin)])
+async def get_container_logs(container_id: str, tail: int = 100, cursor: Optional[int] = None,
+                             since: Optional[float] = None, format: str = "text"):
+    success, message, data = await docker_manager.aread_container_logs(
+        container_id, tail, cursor, since, structured=format == "json"
+    )
+    return reply(success, message, data)
+
+# Point de terminaison pour suivre les logs d'un container en continu (Server-Sent Events)
+@app.get("/containers/{container_id}/logs/stream", dependencies=[Depends(verify_api_key_or_admin)])
+async def stream_container_logs(container_id: str, request: Request, tail: int = 50, format: str = "text"):
+    # Erreurs signalées par le code HTTP avant l'ouverture du flux: un client EventSource ignore le corps
+    if not await docker_manager.ais_minishell_container(container_id):
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Authentification invalide",
-            headers={"WWW-Authenticate": "Basic"},
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Container {container_id} n'est pas un conteneur Mini Shell autorisé",
         )
-        
-    # Si l'authentification est valide, continuer
-    success, logs = docker_manager.get_container_logs(container_id, tail)
+    success, message, subscriber = await docker_manager.aopen_log_stream(container_id, tail)
+    if not success:
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=message)
+    structured = format == "json"
+    
+    async def event_stream():
+        try:
+            while not await request.is_disconnected():
+                lines, dropped, ended = await subscriber.next_batch(timeout=15)
+                if dropped:
+                    # Le client ne lit pas assez vite: signaler les lignes abandonnées
+                    yield f"event: dropped\ndata: {dropped}\n\n"
+                if lines:
+                    # Un enregistrement JSON par ligne data en mode structuré
+                    data = "".join(
+                        f"data: {json.dumps(line.to_dict()) if structured else line.format()}\n" for line in lines
+                    )
+                    yield f"id: {subscriber.seq}\n{data}\n"
+                elif ended:
+                    yield "event: end\ndata: \n\n"
+                    break
+                else:
+                    yield ": keepalive\n\n"
+        finally:
+            docker_manager.close_log_stream(subscriber)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# Point de terminaison pour ouvrir un terminal interactif dans un container Mini Shell (WebSocket)
+@app.websocket("/containers/{container_id}/terminal")
+async def container_terminal(websocket: WebSocket, container_id: str, token: Optional[str] = None,
+                             cols: int = 80, rows: int = 24):
+    success, message, session = await docker_manager.aopen_terminal(
+        container_id,
+        token=token,
+        authorized=is_websocket_authorized(websocket),
+        cols=cols,
+        rows=rows
+    )
+    await websocket.accept()
+    if not success:
+        await websocket.send_text(json.dumps({"type": "error", "message": message}))
+        await websocket.close(code=1008)
+        return
+    await docker_manager.terminals.serve(session, websocket)
+
+# Point de terminaison pour consulter les terminaux interactifs ouverts
+@app.get("/terminals", response_model=ApiResponse, dependencies=[Depends(verify_api_key_or_admin)])
+def list_terminals():
     return ApiResponse(
-        success=success,
-        message="Logs récupérés avec succès" if success else logs,
-        data={"logs": logs} if success else None
+        success=True,
+        message="Terminaux interactifs ouverts",
+        data=docker_manager.terminals.stats()
     )
 
 # Point de terminaison pour démarrer un container arrêté
 @app.post("/containers/start", response_model=ApiResponse, dependencies=[Depends(verify_admin_user)])
-def start_container(request: ContainerActionRequest):
-    try:
-        container = docker_manager.client.containers.get(request.container_id)
-        
-        # Vérifier si c'est un conteneur Mini Shell autorisé
-        if not docker_manager.is_minishell_container(request.container_id):
-            error_msg = f"Container {request.container_id} n'est pas un conteneur Mini Shell autorisé"
-            logger.warning(error_msg)
-            return ApiResponse(
-                success=False,
-                message=error_msg
-            )
-        
-        # Démarrer le conteneur s'il est arrêté
-        if container.status != "running":
-            container.start()
-            logger.info(f"Container {request.container_id} démarré avec succès")
-            
-            # Si un arrêt automatique était configuré, le reconfigurer
-            import threading
-            import time
-            
-            def auto_stop():
-                time.sleep(600)  # 10 minutes
-                try:
-                    container = docker_manager.client.containers.get(request.container_id)
-                    if container.status == "running":
-                        container.stop()
-                        logger.info(f"Container {request.container_id} arrêté automatiquement après 10 minutes")
-                except Exception as e:
-                    logger.error(f"Erreur lors de l'arrêt automatique du container {request.container_id}: {e}")
-            
-            # Démarrer un thread pour l'arrêt automatique
-            stop_thread = threading.Thread(target=auto_stop)
-            stop_thread.daemon = True
-            stop_thread.start()
-            
-            return ApiResponse(
-                success=True,
-                message=f"Container {request.container_id} démarré avec succès"
-            )
-        else:
-            return ApiResponse(
-                success=True,
-                message=f"Container {request.container_id} déjà en cours d'exécution"
-            )
-    except docker.errors.NotFound:
-        error_msg = f"Container {request.container_id} non trouvé"
-        logger.error(error_msg)
-        return ApiResponse(
-            success=False,
-            message=error_msg
-        )
-    except Exception as e:
-        error_msg = f"Erreur lors du démarrage du container {request.container_id}: {e}"
-        logger.error(error_msg)
-        return ApiResponse(
-            success=False,
-            message=error_msg
-        )
+async def start_container(request: ContainerActionRequest):
+    success, message = await docker_manager.astart_container(request.container_id)
+    return ApiResponse(
+        success=success,
+        message=message
+    )
+
+# Point de terminaison pour lister les arrêts automatiques planifiés
+@app.get("/containers/expirations", response_model=ApiResponse, dependencies=[Depends(verify_api_key_or_admin)])
+def list_expirations():
+    expirations = docker_manager.list_expirations()
+    return ApiResponse(
+        success=True,
+        message=f"{len(expirations)} arrêts automatiques planifiés",
+        data=expirations
+    )
 
 # Point de terminaison spécifique pour créer un container Mini Shell
 @app.post("/mini-shell/run", response_model=ApiResponse, dependencies=[Depends(verify_admin_user)])
-def run_mini_shell_container(request: MiniShellContainerRequest):
+async def run_mini_shell_container(request: MiniShellContainerRequest):
     # Si un identifiant de session est fourni, l'utiliser pour créer un nom de conteneur unique
     container_name = request.container_name
     if request.session_id:
         container_name = f"{request.container_name}_{request.session_id}"
         
-    success, message, container_id = docker_manager.get_mini_shell_container(
+    success, message, container_id = await docker_manager.aget_mini_shell_container(
         container_name=container_name,
         expose_port=request.expose_port,
         port_mapping=request.port_mapping,
         session_id=request.session_id,
-        reuse_existing=request.reuse_existing
+        reuse_existing=request.reuse_existing,
+        profile=request.profile
     )
     
+    # Capacité atteinte: renvoyer le ticket de la file d'attente à suivre
+    ticket = docker_manager.admission.ticket_for(container_name) if not success else None
+    if ticket is not None:
+        return ApiResponse(success=False, message=message, data={"queued": True, **ticket.to_dict()})
+    
     return ApiResponse(
         success=success,
         message=message,
         data={
             "container_id": container_id,
-            "container_name": container_name
+            "container_name": container_name,
+            # Jeton du terminal interactif de cette session (jamais listé par ailleurs)
+            "terminal_token": docker_manager.terminal_token(container_id)
         } if container_id else None
     )
 
+# Point de terminaison pour lister les profils de ressources et la charge des cœurs
+@app.get("/mini-shell/profiles", response_model=ApiResponse)
+def list_mini_shell_profiles():
+    return ApiResponse(
+        success=True,
+        message="Profils de ressources des Mini Shell",
+        data=docker_manager.list_profiles()
+    )
+
+# Point de terminaison pour exposer les métriques au format Prometheus
+@app.get("/metrics", dependencies=[Depends(verify_api_key)])
+async def get_metrics():
+    await docker_manager.collect_metrics()
+    return Response(content=registry.render(), media_type="text/plain; version=0.0.4")
+
+# Point de terminaison pour retrouver les Mini Shell d'une session (registre local)
+@app.get("/sessions/{session_id}", response_model=ApiResponse, dependencies=[Depends(verify_api_key_or_admin)])
+def get_session(session_id: str):
+    sessions = docker_manager.get_session(session_id)
+    return ApiResponse(
+        success=bool(sessions),
+        message=f"{len(sessions)} container(s) pour la session {session_id}" if sessions else f"Session {session_id} inconnue",
+        data=sessions
+    )
+
+# Point de terminaison pour lire une page des logs archivés d'une session (après l'arrêt du container compris)
+@app.get("/sessions/{session_id}/logs", response_model=ApiResponse, dependencies=[Depends(verify_api_key_or_admin)])
+def get_session_logs(session_id: str, offset: int = 0, limit: int = 100, container_id: Optional[str] = None,
+                     format: str = "text"):
+    success, message, data = docker_manager.read_session_logs(
+        session_id, offset, limit, container_id, structured=format == "json"
+    )
+    return reply(success, message, data)
+
+def leader_unavailable(error: LeaderUnavailable) -> Response:
+    """Réponse 503 d'une lecture réservée au leader pendant qu'il est injoignable (avec Retry-After)"""
+    return FastJSONResponse(
+        api_payload(False, str(error)),
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": str(error.retry_after)}
+    )
+
+# Point de terminaison pour lire la série de consommation d'un Mini Shell (moyennes par intervalle de resolution secondes)
+@app.get("/containers/{container_id}/stats", response_model=ApiResponse, dependencies=[Depends(verify_api_key_or_admin)])
+async def get_container_stats(container_id: str, resolution: Optional[int] = None, points: int = 60):
+    try:
+        success, message, data = await docker_manager.aread_container_stats(container_id, resolution, points)
+    except LeaderUnavailable as e:
+        return leader_unavailable(e)
+    return reply(success, message, data)
+
+# Point de terminaison pour lire la consommation agrégée des Mini Shell et le dernier échantillon de chacun
+@app.get("/mini-shell/stats", response_model=ApiResponse, dependencies=[Depends(verify_api_key_or_admin)])
+async def get_mini_shell_stats(resolution: Optional[int] = None, points: int = 60):
+    try:
+        success, message, data = await docker_manager.aread_container_stats(None, resolution, points)
+    except LeaderUnavailable as e:
+        return leader_unavailable(e)
+    return reply(success, message, data)
+
+# Point de terminaison pour lister les moteurs Docker et leur charge
+@app.get("/engines", response_model=ApiResponse)
+def list_engines():
+    return ApiResponse(
+        success=True,
+        message="État des moteurs Docker",
+        data=docker_manager.list_engines()
+    )
+
+# Point de terminaison pour consulter la file d'attente d'admission des Mini Shell
+@app.get("/mini-shell/queue", response_model=ApiResponse)
+def get_mini_shell_queue():
+    return ApiResponse(
+        success=True,
+        message="État de la file d'attente des Mini Shell",
+        data=docker_manager.admission.stats()
+    )
+
+# Point de terminaison pour suivre un ticket de la file d'attente (long polling)
+@app.get("/mini-shell/queue/{ticket_id}", response_model=ApiResponse, dependencies=[Depends(verify_admin_user)])
+async def get_mini_shell_ticket(ticket_id: str, wait: float = 0):
+    ticket = docker_manager.admission.get(ticket_id)
+    if ticket is None:
+        # Ticket attribué par un autre worker: état publié dans le registre partagé
+        shared = await docker_manager.admission.remote(ticket_id, min(wait, 30))
+        if shared is None:
+            return ApiResponse(success=False, message=f"Ticket {ticket_id} inconnu ou expiré")
+        admitted = shared["state"] == "admitted"
+        return reply(
+            True,
+            "Lancement admis, relancez la demande" if admitted else f"Position {shared['position']} dans la file d'attente",
+            shared
+        )
+    if wait > 0:
+        ticket = await docker_manager.admission.wait(ticket, min(wait, 30))
+    return reply(
+        True,
+        "Lancement admis, relancez la demande" if ticket.admitted else f"Position {ticket.position} dans la file d'attente",
+        ticket.to_dict()
+    )
+
+# Point de terminaison pour suivre la position d'un ticket en continu (Server-Sent Events)
+@app.get("/mini-shell/queue/{ticket_id}/stream", dependencies=[Depends(verify_admin_user)])
+async def stream_mini_shell_ticket(ticket_id: str, request: Request):
+    ticket = docker_manager.admission.get(ticket_id)
+    if ticket is None and await docker_manager.admission.remote(ticket_id) is None:
+        return ApiResponse(success=False, message=f"Ticket {ticket_id} inconnu ou expiré")
+    
+    async def event_stream():
+        while not await request.is_disconnected():
+            if ticket is not None:
+                current = (await docker_manager.admission.wait(ticket, 15)).to_dict()
+            else:
+                # Ticket d'un autre worker: suivi par le registre partagé
+                current = await docker_manager.admission.remote(ticket_id, 15) or {"ticket_id": ticket_id, "state": "expired"}
+            yield f"data: {json.dumps(current)}\n\n"
+            if current["state"] != "queued":
+                break
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# Point de terminaison pour consulter l'état du pool de containers Mini Shell
+@app.get("/mini-shell/pool", response_model=ApiResponse)
+def get_mini_shell_pool():
+    return ApiResponse(
+        success=True,
+        message="État du pool de containers Mini Shell",
+        data=docker_manager.warm_pool.stats()
+    )
+
+# Point de terminaison pour lancer la construction de l'image Mini Shell en tâche de fond
+@app.post("/mini-shell/build", response_model=ApiResponse, dependencies=[Depends(verify_admin_user)])
+def build_mini_shell_image(request: ImageBuildRequest):
+    job = docker_manager.build_mini_shell_image(force=request.force)
+    return ApiResponse(
+        success=True,
+        message=f"Construction de l'image {job.tag} lancée (job {job.id})",
+        data=job.to_dict()
+    )
+
+# Point de terminaison pour lister les constructions d'images
+@app.get("/builds", response_model=ApiResponse, dependencies=[Depends(verify_api_key_or_admin)])
+def list_builds():
+    jobs = docker_manager.builds.jobs()
+    return ApiResponse(
+        success=True,
+        message=f"{len(jobs)} constructions trouvées",
+        data=jobs
+    )
+
+# Point de terminaison pour consulter l'état d'une construction
+@app.get("/builds/{job_id}", response_model=ApiResponse, dependencies=[Depends(verify_api_key_or_admin)])
+def get_build(job_id: str, cursor: int = 0):
+    job = docker_manager.builds.get(job_id)
+    if job is None:
+        return ApiResponse(success=False, message=f"Construction {job_id} non trouvée")
+    lines, next_cursor = job.read(cursor)
+    return ApiResponse(
+        success=True,
+        message=job.message or f"Construction {job.status}",
+        data={**job.to_dict(), "output": lines, "cursor": next_cursor}
+    )
+
+# Point de terminaison pour suivre la progression d'une construction (Server-Sent Events)
+@app.get("/builds/{job_id}/stream", dependencies=[Depends(verify_api_key_or_admin)])
+async def stream_build(job_id: str, request: Request, cursor: int = 0):
+    job = docker_manager.builds.get(job_id)
+    if job is None:
+        return ApiResponse(success=False, message=f"Construction {job_id} non trouvée")
+    
+    async def event_stream():
+        position = cursor
+        while not await request.is_disconnected():
+            lines, position, finished = await job.wait_async(position, timeout=15)
+            if lines:
+                data = "".join(f"data: {line}\n" for line in lines)
+                yield f"id: {position}\n{data}\n"
+            elif finished:
+                yield f"event: end\ndata: {job.status}\n\n"
+                break
+            else:
+                yield ": keepalive\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # Lancement du serveur si exécuté directement
 if __name__ == "__main__":
     logger.info("Démarrage du serveur API Docker Manager...")
@@ -0,0 +1,289 @@
+"""
+Module de métriques au format texte Prometheus
+Compteurs, jauges et histogrammes sans dépendance externe: une observation ne coûte qu'une recherche
+dichotomique et quelques additions sous un verrou propre à la métrique, ce qui permet de les laisser
+actifs en production
+"""
+
+import asyncio
+import bisect
+import functools
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Bornes des histogrammes de durée (secondes)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_INF_BOUND = 'le="+Inf"'
+
+
+def _escape(value: str) -> str:
+    """Échappe une valeur de label (barre oblique inverse, guillemet, fin de ligne)"""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """Formate les labels d'une série: {nom="valeur",...}"""
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    """Formate un nombre (entier sans décimale)"""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    """Famille de séries partageant un nom et des noms de labels"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def render(self) -> List[str]:
+        """Retourne les lignes de l'exposition texte"""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines += self._samples()
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Compteur croissant"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        """Incrémente la série correspondant aux valeurs de labels"""
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+                for labels, value in values]
+
+
+class Gauge(_Metric):
+    """Valeur instantanée, en général mise à jour juste avant l'exposition"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, *labels: str):
+        """Fixe la valeur de la série correspondant aux valeurs de labels"""
+        with self._lock:
+            self._values[labels] = value
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+                for labels, value in values]
+
+
+class Histogram(_Metric):
+    """Histogramme à bornes fixes (compte par borne, somme et nombre d'observations)"""
+
+    kind = "histogram"
+
+    def __init__(self,
+                 name: str,
+                 documentation: str,
+                 labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Par série: [compte de chaque borne (non cumulé) + dépassement, somme]
+        self._series: Dict[Tuple[str, ...], List] = {}
+
+    def observe(self, value: float, *labels: str):
+        """Enregistre une observation pour la série correspondant aux valeurs de labels"""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def time(self, *labels: str) -> "_Timer":
+        """Mesure la durée d'un bloc: with histogram.time("label"): ..."""
+        return _Timer(self, labels)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            series = [(labels, list(counts), total) for labels, (counts, total) in self._series.items()]
+        lines = []
+        for labels, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                bucket = _format_labels(self.labelnames, labels, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{bucket} {cumulative}")
+            cumulative += counts[-1]
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, _INF_BOUND)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class _Timer:
+    """Gestionnaire de contexte mesurant une durée dans un histogramme"""
+
+    def __init__(self, histogram: Histogram, labels: Tuple[str, ...]):
+        self.histogram = histogram
+        self.labels = labels
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.started, *self.labels)
+        return False
+
+
+class MetricsRegistry:
+    """Classe regroupant les métriques exposées par /metrics"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Crée (ou retourne) un compteur"""
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Crée (ou retourne) une jauge"""
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self,
+                  name: str,
+                  documentation: str,
+                  labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Crée (ou retourne) un histogramme"""
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        """Retourne l'exposition au format texte Prometheus (version 0.0.4)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = [line for metric in metrics for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+    def _register(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            return metric
+
+
+# Registre de l'application
+registry = MetricsRegistry()
+
+
+def _outcome(result) -> str:
+    """Résultat d'un appel: "error" pour un tuple (False, message, ...), "ok" sinon"""
+    if isinstance(result, tuple) and result and result[0] is False:
+        return "error"
+    return "ok"
+
+
+def instrument(func: Callable, name: str, histogram: Histogram, counter: Counter) -> Callable:
+    """
+    Enveloppe une fonction (synchrone ou coroutine) pour mesurer sa durée et compter ses appels
+
+    Args:
+        func (Callable): Fonction à mesurer
+        name (str): Valeur du label identifiant la fonction
+        histogram (Histogram): Histogramme des durées (label: nom)
+        counter (Counter): Compteur des appels (labels: nom, résultat ok, error ou exception)
+
+    Returns:
+        Callable: Fonction enveloppée, de même signature
+    """
+    if asyncio.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            outcome = "exception"
+            try:
+                result = await func(*args, **kwargs)
+                outcome = _outcome(result)
+                return result
+            finally:
+                histogram.observe(time.perf_counter() - started, name)
+                counter.inc(name, outcome)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        outcome = "exception"
+        try:
+            result = func(*args, **kwargs)
+            outcome = _outcome(result)
+            return result
+        finally:
+            histogram.observe(time.perf_counter() - started, name)
+            counter.inc(name, outcome)
+    return wrapper
+
+
+def instrument_methods(obj, names: Iterable[str], histogram: Histogram, counter: Counter):
+    """
+    Remplace des méthodes d'une instance par leur version mesurée
+
+    Args:
+        obj: Instance dont les méthodes sont mesurées
+        names (Iterable[str]): Noms des méthodes
+        histogram (Histogram): Histogramme des durées
+        counter (Counter): Compteur des appels
+    """
+    for name in names:
+        method = getattr(obj, name, None)
+        if callable(method):
+            setattr(obj, name, instrument(method, name, histogram, counter))
+
+
+def timed(histogram: Histogram, *labels: str) -> Callable[[Callable], Callable]:
+    """
+    Décorateur mesurant la durée d'une fonction synchrone (la signature est conservée pour FastAPI)
+
+    Args:
+        histogram (Histogram): Histogramme des durées
+        labels (str): Valeurs des labels de la série
+
+    Returns:
+        Callable: Décorateur
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with histogram.time(*labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
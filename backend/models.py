@@ -30,6 +30,19 @@ class ContainerActionRequest(BaseModel):
     force: Optional[bool] = Field(False, description="Force l'opération même si le container est en cours d'exécution")
 
 
+class BulkContainerActionRequest(BaseModel):
+    """Modèle pour les actions groupées sur des containers Mini Shell"""
+    container_ids: Optional[List[str]] = Field(None, description="IDs ou noms des containers")
+    session_id: Optional[str] = Field(None, description="Sélectionne les containers de cette session")
+    labels: Optional[Dict[str, str]] = Field(None, description="Sélectionne les Mini Shell portant ces labels")
+    force: Optional[bool] = Field(False, description="Supprime même les containers en cours d'exécution")
+
+
+class GarbageCollectionRequest(BaseModel):
+    """Modèle pour les demandes de suppression des Mini Shell arrêtés"""
+    max_age: Optional[int] = Field(None, description="Ancienneté minimale en secondes (valeur configurée par défaut)")
+
+
 class ContainerCreationRequest(BaseModel):
     """Modèle pour les requêtes de création de container"""
     image_name: str = Field(..., description="Nom de l'image Docker")
@@ -47,6 +60,12 @@ class MiniShellContainerRequest(BaseModel):
     port_mapping: Optional[Dict[str, str]] = Field(None, description="Mapping de ports personnalisé")
     session_id: Optional[str] = Field(None, description="Identifiant de session de l'utilisateur")
     reuse_existing: Optional[bool] = Field(True, description="Réutiliser un container existant pour cet utilisateur")
+    profile: Optional[str] = Field(None, description="Profil de ressources (nano, small, standard...)")
+
+
+class ImageBuildRequest(BaseModel):
+    """Modèle pour les requêtes de construction de l'image Mini Shell"""
+    force: Optional[bool] = Field(False, description="Reconstruire même si le contexte de construction est inchangé")
 
 
 class ApiResponse(BaseModel):
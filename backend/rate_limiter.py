@@ -0,0 +1,163 @@
+"""
+Module de limitation du débit des requêtes (seaux à jetons)
+Chaque client (session, clé d'API ou adresse IP) dispose d'un seau par règle: un jeton par requête,
+rechargé en continu au rythme de la règle. Les seaux inactifs sont évincés dans l'ordre LRU, ce qui borne
+la mémoire; la vérification d'une requête est en O(1)
+"""
+
+import collections
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class RateRule:
+    """Budget d'une famille de routes: capacity requêtes par période de period secondes"""
+
+    __slots__ = ("name", "capacity", "period", "rate")
+
+    def __init__(self, name: str, capacity: int, period: float):
+        self.name = name
+        self.capacity = capacity
+        self.period = period
+        self.rate = capacity / period
+
+    def scaled(self, factor: float) -> "RateRule":
+        """Règle de même période dont la capacité est multipliée par factor"""
+        return RateRule(self.name, max(1, int(self.capacity * factor)), self.period)
+
+
+class _Bucket:
+    """Seau à jetons d'un client pour une règle"""
+
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+
+
+class Decision:
+    """Résultat de la vérification d'une requête (valeurs des en-têtes RateLimit-*)"""
+
+    __slots__ = ("allowed", "limit", "remaining", "reset", "retry_after")
+
+    def __init__(self, allowed: bool, limit: int, remaining: int, reset: int, retry_after: int):
+        self.allowed = allowed
+        self.limit = limit
+        self.remaining = remaining
+        self.reset = reset
+        self.retry_after = retry_after
+
+    def headers(self) -> Dict[str, str]:
+        """En-têtes RateLimit-* (et Retry-After si la requête est refusée)"""
+        headers = {
+            "ratelimit-limit": str(self.limit),
+            "ratelimit-remaining": str(self.remaining),
+            "ratelimit-reset": str(self.reset),
+        }
+        if not self.allowed:
+            headers["retry-after"] = str(self.retry_after)
+        return headers
+
+
+def parse_rules(value: Optional[str]) -> Dict[str, RateRule]:
+    """
+    Lit les budgets "règle=requêtes/secondes,..."
+
+    Args:
+        value (str, optional): Budgets, par exemple "run=10/60,logs=60/60"
+
+    Returns:
+        Dict[str, RateRule]: Règle de chaque famille de routes
+
+    Raises:
+        ValueError: Si un budget est mal formé
+    """
+    rules = {}
+    for item in filter(None, (part.strip() for part in (value or "").split(','))):
+        name, _, budget = item.partition('=')
+        capacity, _, period = budget.partition('/')
+        try:
+            rules[name.strip()] = RateRule(name.strip(), int(capacity), float(period or 1))
+        except ValueError:
+            raise ValueError(f"Budget de limitation invalide: {item} (attendu règle=requêtes/secondes)")
+    return rules
+
+
+class RateLimiter:
+    """Classe de limitation du débit par client et par règle"""
+
+    def __init__(self, rules: Dict[str, RateRule], max_buckets: int = 10000):
+        """
+        Initialise le limiteur
+
+        Args:
+            rules (Dict[str, RateRule]): Règles par nom
+            max_buckets (int): Nombre maximum de seaux conservés (les moins récemment utilisés sont évincés)
+        """
+        self.rules = rules
+        self.max_buckets = max_buckets
+        self._buckets: "collections.OrderedDict[Tuple[str, str], _Bucket]" = collections.OrderedDict()
+
+        self.allowed = 0
+        self.rejected = 0
+        self.evicted = 0
+
+    def check(self, limits: List[Tuple[RateRule, str]]) -> Decision:
+        """
+        Prélève un jeton dans le seau de chaque clé, ou refuse la requête si l'un d'eux est vide
+
+        Args:
+            limits (List[Tuple[RateRule, str]]): Règle et clé de chaque seau concerné
+                (par exemple la session et l'adresse IP du client)
+
+        Returns:
+            Decision: Décision et valeurs des en-têtes, pour le seau le plus contraint
+        """
+        now = time.monotonic()
+        buckets = [(rule, self._bucket(rule, key, now)) for rule, key in limits]
+
+        # Un jeton n'est prélevé que si tous les seaux en ont un
+        allowed = all(bucket.tokens >= 1 for _, bucket in buckets)
+        if allowed:
+            for _, bucket in buckets:
+                bucket.tokens -= 1
+            self.allowed += 1
+        else:
+            self.rejected += 1
+
+        rule, bucket = min(buckets, key=lambda item: item[1].tokens / item[0].capacity)
+        return Decision(
+            allowed,
+            rule.capacity,
+            int(bucket.tokens),
+            math.ceil((rule.capacity - bucket.tokens) / rule.rate),
+            max(1, math.ceil((1 - bucket.tokens) / rule.rate)),
+        )
+
+    def _bucket(self, rule: RateRule, key: str, now: float) -> _Bucket:
+        """Seau rechargé d'une clé (créé plein s'il est inconnu ou a été évincé)"""
+        bucket = self._buckets.get((rule.name, key))
+        if bucket is None:
+            bucket = _Bucket(float(rule.capacity), now)
+            self._buckets[(rule.name, key)] = bucket
+            if len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+                self.evicted += 1
+        else:
+            self._buckets.move_to_end((rule.name, key))
+            bucket.tokens = min(rule.capacity, bucket.tokens + (now - bucket.updated) * rule.rate)
+            bucket.updated = now
+        return bucket
+
+    def stats(self) -> Dict:
+        """Retourne les règles, le nombre de seaux et les compteurs"""
+        return {
+            "rules": {name: f"{rule.capacity}/{rule.period:g}s" for name, rule in self.rules.items()},
+            "buckets": len(self._buckets),
+            "max_buckets": self.max_buckets,
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "evicted": self.evicted,
+        }
@@ -0,0 +1,219 @@
+"""
+Module des profils de ressources des containers Mini Shell
+Un profil fixe les limites cgroup (CPU, mémoire, processus, tmpfs) appliquées à la création,
+et le placement répartit les sessions sur les cœurs de l'hôte à l'aide des cpusets
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from docker.utils import parse_bytes
+
+logger = logging.getLogger(__name__)
+
+# Labels posés sur les containers pour retrouver leur profil et leur placement
+PROFILE_LABEL = "mishu.profile"
+CPUSET_LABEL = "mishu.cpuset"
+
+# Période CFS utilisée pour exprimer les quotas CPU (100 ms)
+CPU_PERIOD = 100000
+
+# Profils par défaut: une session Mini Shell est interactive et peu gourmande
+DEFAULT_PROFILES = {
+    "nano": {"cpus": 0.25, "cpuset_cores": 1, "memory": "64m", "memory_swap": "64m",
+             "pids_limit": 64, "tmpfs": {"/tmp": "16m"}},
+    "small": {"cpus": 0.5, "cpuset_cores": 1, "memory": "128m", "memory_swap": "128m",
+              "pids_limit": 128, "tmpfs": {"/tmp": "32m"}},
+    "standard": {"cpus": 1.0, "cpuset_cores": 2, "memory": "256m", "memory_swap": "256m",
+                 "pids_limit": 256, "tmpfs": {"/tmp": "64m"}},
+}
+
+
+class ResourceProfile:
+    """Limites de ressources appliquées à un container"""
+
+    __slots__ = ("name", "cpus", "cpuset_cores", "memory", "memory_swap", "pids_limit", "tmpfs")
+
+    def __init__(self,
+                 name: str,
+                 cpus: Optional[float] = None,
+                 cpuset_cores: int = 0,
+                 memory: Optional[str] = None,
+                 memory_swap: Optional[str] = None,
+                 pids_limit: Optional[int] = None,
+                 tmpfs: Optional[Dict[str, str]] = None):
+        """
+        Initialise le profil
+
+        Args:
+            name (str): Nom du profil
+            cpus (float, optional): Quota CPU en nombre de cœurs (0.5 = un demi-cœur)
+            cpuset_cores (int): Nombre de cœurs sur lesquels épingler le container (0 = pas d'épinglage)
+            memory (str, optional): Limite mémoire (ex: 128m)
+            memory_swap (str, optional): Limite mémoire + swap (égale à memory pour interdire le swap)
+            pids_limit (int, optional): Nombre maximum de processus
+            tmpfs (Dict[str, str], optional): Points de montage tmpfs et leur taille {chemin: taille}
+        """
+        self.name = name
+        self.cpus = cpus
+        self.cpuset_cores = cpuset_cores
+        self.memory = memory
+        self.memory_swap = memory_swap
+        self.pids_limit = pids_limit
+        self.tmpfs = tmpfs or {}
+
+    def create_kwargs(self, cpuset: Optional[str] = None) -> Dict:
+        """
+        Options de containers.run() du SDK docker correspondant au profil
+
+        Args:
+            cpuset (str, optional): Cœurs attribués par le placement (ex: "2,3")
+
+        Returns:
+            Dict: Arguments nommés à transmettre à containers.run()
+        """
+        kwargs = {}
+        if self.cpus:
+            kwargs["cpu_period"] = CPU_PERIOD
+            kwargs["cpu_quota"] = int(self.cpus * CPU_PERIOD)
+        if cpuset:
+            kwargs["cpuset_cpus"] = cpuset
+        if self.memory:
+            kwargs["mem_limit"] = self.memory
+        if self.memory_swap:
+            kwargs["memswap_limit"] = self.memory_swap
+        if self.pids_limit:
+            kwargs["pids_limit"] = self.pids_limit
+        if self.tmpfs:
+            kwargs["tmpfs"] = {path: f"size={size}" for path, size in self.tmpfs.items()}
+        return kwargs
+
+    def host_config(self, cpuset: Optional[str] = None) -> Dict:
+        """
+        Champs HostConfig de l'API Docker correspondant au profil
+
+        Args:
+            cpuset (str, optional): Cœurs attribués par le placement
+
+        Returns:
+            Dict: Champs à fusionner dans HostConfig lors de la création
+        """
+        config = {}
+        if self.cpus:
+            config["CpuPeriod"] = CPU_PERIOD
+            config["CpuQuota"] = int(self.cpus * CPU_PERIOD)
+        if cpuset:
+            config["CpusetCpus"] = cpuset
+        if self.memory:
+            config["Memory"] = parse_bytes(self.memory)
+        if self.memory_swap:
+            config["MemorySwap"] = parse_bytes(self.memory_swap)
+        if self.pids_limit:
+            config["PidsLimit"] = self.pids_limit
+        if self.tmpfs:
+            config["Tmpfs"] = {path: f"size={size}" for path, size in self.tmpfs.items()}
+        return config
+
+    def to_dict(self) -> Dict:
+        """Retourne la description du profil"""
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+def load_profiles(overrides: Optional[str] = None) -> Dict[str, ResourceProfile]:
+    """
+    Construit les profils à partir des valeurs par défaut et d'une surcharge JSON
+
+    Args:
+        overrides (str, optional): JSON {nom: {champ: valeur}} fusionné avec les profils par défaut
+
+    Returns:
+        Dict[str, ResourceProfile]: Profils par nom
+    """
+    definitions = {name: dict(values) for name, values in DEFAULT_PROFILES.items()}
+    if overrides:
+        try:
+            for name, values in json.loads(overrides).items():
+                definitions.setdefault(name, {}).update(values)
+        except (ValueError, AttributeError) as e:
+            logger.error(f"Profils de ressources invalides, valeurs par défaut utilisées: {e}")
+    return {name: ResourceProfile(name, **values) for name, values in definitions.items()}
+
+
+def parse_cpuset(value: str) -> List[int]:
+    """
+    Convertit une liste de cœurs au format cpuset ("0-3,6") en liste d'entiers
+
+    Args:
+        value (str): Liste de cœurs
+
+    Returns:
+        List[int]: Cœurs, dans l'ordre croissant
+    """
+    cores = set()
+    for part in filter(None, (p.strip() for p in value.split(','))):
+        first, _, last = part.partition('-')
+        cores.update(range(int(first), int(last or first) + 1))
+    return sorted(cores)
+
+
+class CpusetPlacer:
+    """Classe répartissant les sessions sur les cœurs les moins chargés de l'hôte"""
+
+    def __init__(self, cores: Optional[List[int]] = None, pending_ttl: float = 10.0):
+        """
+        Initialise le placement
+
+        Args:
+            cores (List[int], optional): Cœurs utilisables (affinité du processus par défaut)
+            pending_ttl (float): Durée pendant laquelle un placement récent est compté
+                avant d'apparaître dans la liste des containers
+        """
+        self.cores = cores or sorted(os.sched_getaffinity(0))
+        self.pending_ttl = pending_ttl
+        self._pending: Dict[str, Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def place(self, key: str, count: int, running: Dict[str, str]) -> Optional[str]:
+        """
+        Choisit les cœurs d'une nouvelle session
+
+        Args:
+            key (str): Nom du container placé
+            count (int): Nombre de cœurs à attribuer (0 = pas d'épinglage)
+            running (Dict[str, str]): Cpuset de chaque session en cours d'exécution {nom: cpuset}
+
+        Returns:
+            str ou None: Cpuset attribué (ex: "2,3"), None si pas d'épinglage
+        """
+        if count <= 0:
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            # Les placements récents ne figurent pas encore dans la liste des containers
+            self._pending = {
+                name: placement for name, placement in self._pending.items()
+                if now - placement[0] < self.pending_ttl and name not in running and name != key
+            }
+            load = self._load(list(running.values()) + [cpuset for _, cpuset in self._pending.values()])
+            chosen = sorted(sorted(load, key=lambda core: (load[core], core))[:count])
+            cpuset = ",".join(str(core) for core in chosen)
+            self._pending[key] = (now, cpuset)
+        return cpuset
+
+    def stats(self, running: Dict[str, str]) -> Dict:
+        """Retourne le nombre de sessions épinglées par cœur"""
+        return {"cores": self.cores, "load": self._load(running.values())}
+
+    def _load(self, cpusets: Iterable[str]) -> Dict[int, int]:
+        """Compte les sessions épinglées sur chaque cœur utilisable"""
+        load = {core: 0 for core in self.cores}
+        for cpuset in cpusets:
+            for core in parse_cpuset(cpuset):
+                if core in load:
+                    load[core] += 1
+        return load
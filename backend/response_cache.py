@@ -0,0 +1,145 @@
+"""
+Module de cache des réponses des points de terminaison de lecture
+Une réponse sérialisée est réutilisée tant que son délai de validité n'est pas écoulé et que l'état
+dont elle dépend n'a pas changé; son ETag fort permet aux clients de revalider sans la retélécharger
+"""
+
+import hashlib
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from single_flight import AsyncSingleFlight
+
+
+def make_etag(state: bytes) -> str:
+    """
+    Calcule l'ETag fort d'une réponse à partir de l'état qu'elle représente
+
+    Args:
+        state (bytes): Contenu sérialisé de la réponse, hors éléments variables comme l'horodatage
+
+    Returns:
+        str: ETag entre guillemets
+    """
+    return f'"{hashlib.blake2b(state, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Indique si l'en-tête If-None-Match du client correspond à l'ETag courant
+
+    Args:
+        if_none_match (str, optional): Valeur de l'en-tête (liste séparée par des virgules ou "*")
+        etag (str): ETag courant
+
+    Returns:
+        bool: True si la réponse 304 Not Modified peut être envoyée
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        # Comparaison faible (RFC 7232): le préfixe W/ est ignoré pour If-None-Match
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class CachedResponse:
+    """Corps sérialisé d'une réponse et son ETag"""
+
+    __slots__ = ("body", "etag", "version", "expires_at")
+
+    def __init__(self, body: bytes, etag: str, version: Hashable, expires_at: float):
+        self.body = body
+        self.etag = etag
+        self.version = version
+        self.expires_at = expires_at
+
+
+class ResponseCache:
+    """Classe de cache des réponses, invalidé par délai, par version de l'état ou explicitement"""
+
+    def __init__(self, ttl: float = 2.0, max_entries: int = 128):
+        """
+        Initialise le cache
+
+        Args:
+            ttl (float): Durée de validité d'une réponse en secondes (0 pour désactiver le cache)
+            max_entries (int): Nombre maximum de réponses conservées
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[str, CachedResponse] = {}
+        self._lock = threading.Lock()
+        self._flights = AsyncSingleFlight()
+
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.invalidations = 0
+
+    async def aget(self,
+                   key: str,
+                   version: Hashable,
+                   compute: Callable[[], Awaitable[Tuple[bytes, str]]]) -> CachedResponse:
+        """
+        Retourne la réponse en cache, ou la calcule (un seul calcul pour des requêtes simultanées)
+
+        Args:
+            key (str): Clé de la réponse (chemin et paramètres)
+            version (Hashable): Version de l'état dont dépend la réponse (une autre version l'invalide)
+            compute (Callable[[], Awaitable[Tuple[bytes, str]]]): Produit le corps sérialisé et son ETag
+
+        Returns:
+            CachedResponse: Réponse et son ETag
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.version == version and entry.expires_at > now:
+                self.hits += 1
+                return entry
+            self.misses += 1
+        return await self._flights.run(key, lambda: self._compute(key, version, compute))
+
+    async def _compute(self, key: str, version: Hashable,
+                       compute: Callable[[], Awaitable[Tuple[bytes, str]]]) -> CachedResponse:
+        """Calcule et enregistre une réponse"""
+        with self._lock:
+            generation = self.invalidations
+        body, etag = await compute()
+        entry = CachedResponse(body, etag, version, time.monotonic() + self.ttl)
+        with self._lock:
+            # Ne pas conserver un résultat calculé avant une invalidation
+            if self.ttl > 0 and generation == self.invalidations:
+                if key not in self._entries and len(self._entries) >= self.max_entries:
+                    self._entries.pop(next(iter(self._entries)))
+                self._entries[key] = entry
+        return entry
+
+    def invalidate(self):
+        """Oublie toutes les réponses (appelé après une modification faite par le backend)"""
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def record_not_modified(self):
+        """Comptabilise une réponse 304 Not Modified"""
+        with self._lock:
+            self.not_modified += 1
+
+    def stats(self) -> Dict:
+        """Retourne le taux de succès du cache et les compteurs"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "ttl": self.ttl,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "not_modified": self.not_modified,
+                "invalidations": self.invalidations,
+            }
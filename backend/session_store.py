@@ -0,0 +1,242 @@
+"""
+Module de registre persistant des sessions Mini Shell
+Chaque session (container, moteur, création, échéance, état) est enregistrée dans une base SQLite
+en mode WAL: les recherches par session ou par échéance sont locales, et un redémarrage du backend
+se limite à une réconciliation avec une seule liste de containers par moteur. Le registre fait foi
+pour la session et l'échéance: un container du pool attribué à une session ne porte pas ces labels
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+# États d'une session
+RUNNING = "running"
+PAUSED = "paused"
+EXITED = "exited"
+
+# Colonnes d'une session, dans l'ordre de la table
+COLUMNS = ("container_id", "container_name", "session_id", "engine", "created_at", "expires_at", "idle_ttl", "state")
+
+# Colonnes dont le registre fait foi: une réconciliation ne fait que les compléter
+FILLED = ("session_id", "expires_at", "idle_ttl")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    container_id TEXT PRIMARY KEY,
+    container_name TEXT NOT NULL,
+    session_id TEXT,
+    engine TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL,
+    idle_ttl INTEGER,
+    state TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS sessions_by_name ON sessions (container_name);
+CREATE INDEX IF NOT EXISTS sessions_by_session ON sessions (session_id);
+CREATE INDEX IF NOT EXISTS sessions_by_expiry ON sessions (state, expires_at);
+"""
+
+
+class SessionStore:
+    """Classe d'accès au registre des sessions (une connexion partagée, protégée par un verrou)"""
+
+    def __init__(self, path: str):
+        """
+        Ouvre (ou crée) le registre
+
+        Args:
+            path (str): Chemin du fichier SQLite (":memory:" pour un registre non persistant)
+        """
+        self.path = path
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        # WAL: les lectures ne bloquent pas les écritures; synchronous=NORMAL suffit avec le WAL
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self.reconciled = False
+
+    def close(self):
+        """Ferme la connexion"""
+        with self._lock:
+            self._conn.close()
+
+    def record(self,
+               container_id: str,
+               container_name: str,
+               engine: str,
+               session_id: Optional[str] = None,
+               expires_at: Optional[float] = None,
+               idle_ttl: Optional[int] = None,
+               state: str = RUNNING):
+        """
+        Enregistre (ou met à jour) une session
+
+        Args:
+            container_id (str): ID du container
+            container_name (str): Nom du container
+            engine (str): Nom du moteur Docker propriétaire
+            session_id (str, optional): Identifiant de session (conservé s'il est déjà connu)
+            expires_at (float, optional): Échéance d'arrêt automatique (timestamp)
+            idle_ttl (int, optional): Délai d'inactivité avant l'arrêt
+            state (str): État du container
+        """
+        with self._lock:
+            # Le nom peut avoir appartenu à un container supprimé entre-temps
+            self._conn.execute(
+                "DELETE FROM sessions WHERE container_name = ? AND container_id != ?", (container_name, container_id)
+            )
+            self._conn.execute(
+                """
+                INSERT INTO sessions (container_id, container_name, session_id, engine, created_at,
+                                      expires_at, idle_ttl, state)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (container_id) DO UPDATE SET
+                    container_name = excluded.container_name,
+                    session_id = COALESCE(excluded.session_id, session_id),
+                    engine = excluded.engine,
+                    expires_at = excluded.expires_at,
+                    idle_ttl = excluded.idle_ttl,
+                    state = excluded.state
+                """,
+                (container_id, container_name, session_id, engine, time.time(), expires_at, idle_ttl, state)
+            )
+
+    def update(self, container_id: str, state: Optional[str] = None, expires_at: Optional[float] = None) -> bool:
+        """
+        Met à jour l'état ou l'échéance d'une session
+
+        Args:
+            container_id (str): ID du container
+            state (str, optional): Nouvel état
+            expires_at (float, optional): Nouvelle échéance
+
+        Returns:
+            bool: True si la session est connue
+        """
+        fields = {key: value for key, value in (("state", state), ("expires_at", expires_at)) if value is not None}
+        if not fields:
+            return False
+        assignments = ", ".join(f"{key} = ?" for key in fields)
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE sessions SET {assignments} WHERE container_id = ?", (*fields.values(), container_id)
+            )
+        return cursor.rowcount > 0
+
+    def remove(self, container_id: str) -> bool:
+        """Supprime la session d'un container supprimé"""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM sessions WHERE container_id = ?", (container_id,))
+        return cursor.rowcount > 0
+
+    def get(self, container_id_or_name: str) -> Optional[Dict]:
+        """
+        Retrouve une session par ID de container (complet ou préfixe d'au moins 12 caractères) ou par nom
+
+        Args:
+            container_id_or_name (str): ID ou nom du container
+
+        Returns:
+            Dict ou None: Session enregistrée
+        """
+        key = container_id_or_name.lstrip('/')
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM sessions WHERE container_id = ? OR container_name = ?", (key, key)
+            ).fetchone()
+            if row is None and len(key) >= 12:
+                row = self._conn.execute(
+                    "SELECT * FROM sessions WHERE container_id >= ? AND container_id < ? LIMIT 1",
+                    (key, key + "\uffff")
+                ).fetchone()
+        return dict(row) if row else None
+
+    def by_session(self, session_id: str) -> List[Dict]:
+        """Sessions (containers) d'un identifiant de session, de la plus récente à la plus ancienne"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM sessions WHERE session_id = ? ORDER BY created_at DESC", (session_id,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def exists(self, session_id: str) -> bool:
+        """Indique si un identifiant de session a été attribué à au moins un container"""
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM sessions WHERE session_id = ? LIMIT 1", (session_id,)).fetchone()
+        return row is not None
+
+    def active(self) -> List[Dict]:
+        """Sessions en cours d'exécution ou en pause, de la plus proche échéance à la plus lointaine"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM sessions WHERE state IN (?, ?) ORDER BY expires_at", (RUNNING, PAUSED)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def reconcile(self, engine: str, observed: Iterable[Dict]) -> Dict[str, int]:
+        """
+        Aligne les sessions d'un moteur sur la liste de ses containers (une seule transaction)
+
+        Args:
+            engine (str): Nom du moteur
+            observed (Iterable[Dict]): Sessions observées (colonnes de COLUMNS); l'échéance et
+                l'identifiant de session déjà enregistrés sont conservés, les valeurs observées ne
+                complétant que les colonnes vides
+
+        Returns:
+            Dict[str, int]: Nombre de sessions ajoutées, mises à jour et supprimées
+        """
+        observed = {session["container_id"]: session for session in observed}
+        counts = {"added": 0, "updated": 0, "removed": 0}
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                known = {
+                    row["container_id"]: row for row in
+                    self._conn.execute("SELECT * FROM sessions WHERE engine = ?", (engine,)).fetchall()
+                }
+                gone = [container_id for container_id in known if container_id not in observed]
+                self._conn.executemany("DELETE FROM sessions WHERE container_id = ?", [(cid,) for cid in gone])
+                counts["removed"] = len(gone)
+
+                for container_id, session in observed.items():
+                    row = known.get(container_id)
+                    if row is None:
+                        self._conn.execute(
+                            "DELETE FROM sessions WHERE container_name = ?", (session["container_name"],)
+                        )
+                        self._conn.execute(
+                            f"INSERT INTO sessions ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                            tuple(session.get(column) for column in COLUMNS)
+                        )
+                        counts["added"] += 1
+                    elif (row["state"] != session["state"] or row["container_name"] != session["container_name"]
+                          or any(row[column] is None and session.get(column) is not None for column in FILLED)):
+                        self._conn.execute(
+                            """
+                            UPDATE sessions SET state = ?, container_name = ?, session_id = COALESCE(session_id, ?),
+                                                expires_at = COALESCE(expires_at, ?), idle_ttl = COALESCE(idle_ttl, ?)
+                            WHERE container_id = ?
+                            """,
+                            (session["state"], session["container_name"], *(session.get(c) for c in FILLED),
+                             container_id)
+                        )
+                        counts["updated"] += 1
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return counts
+
+    def stats(self) -> Dict:
+        """Retourne le nombre de sessions par état"""
+        with self._lock:
+            rows = self._conn.execute("SELECT state, COUNT(*) FROM sessions GROUP BY state").fetchall()
+        return {"path": self.path, "reconciled": self.reconciled, "states": {state: count for state, count in rows}}
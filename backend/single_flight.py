@@ -0,0 +1,106 @@
+"""
+Module de regroupement des opérations concurrentes identiques (single-flight)
+Les appels simultanés portant sur une même clé partagent une seule exécution et reçoivent
+le même résultat, sans sérialiser les appels portant sur des clés différentes
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """Regroupement des appels concurrents depuis des threads"""
+
+    def __init__(self):
+        """Initialise la table des appels en cours"""
+        self._calls: Dict[str, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+
+        self.calls = 0
+        self.shared = 0
+
+    def run(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Exécute fn, ou attend le résultat de l'exécution déjà en cours pour cette clé
+
+        Args:
+            key (str): Clé de regroupement
+            fn (Callable[[], Any]): Opération à exécuter
+
+        Returns:
+            Any: Résultat de l'opération (l'exception éventuelle est relancée chez tous les appelants)
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = concurrent.futures.Future()
+                self._calls[key] = future
+                self.calls += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def stats(self) -> Dict:
+        """Retourne le nombre d'exécutions et d'appels ayant partagé une exécution"""
+        with self._lock:
+            return {"in_flight": len(self._calls), "calls": self.calls, "shared": self.shared}
+
+
+class AsyncSingleFlight:
+    """Regroupement des appels concurrents dans une boucle asyncio"""
+
+    def __init__(self):
+        """Initialise la table des tâches en cours"""
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+        self.calls = 0
+        self.shared = 0
+
+    async def run(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Exécute factory(), ou attend la tâche déjà en cours pour cette clé
+
+        L'annulation d'un appelant (client déconnecté) n'annule pas la tâche partagée.
+
+        Args:
+            key (str): Clé de regroupement
+            factory (Callable[[], Awaitable[Any]]): Crée la coroutine à exécuter
+
+        Returns:
+            Any: Résultat de la tâche
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._tasks[key] = task
+            self.calls += 1
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task):
+        """Retire une tâche terminée de la table"""
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+
+    def stats(self) -> Dict:
+        """Retourne le nombre d'exécutions et d'appels ayant partagé une exécution"""
+        return {"in_flight": len(self._tasks), "calls": self.calls, "shared": self.shared}
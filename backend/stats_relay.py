@@ -0,0 +1,123 @@
+"""
+Module de relais des statistiques vers le worker leader
+Seul le leader collecte les statistiques des Mini Shell (un flux Docker par container): il les sert
+aux autres workers sur un socket unix dont le chemin est publié dans la base de coordination.
+Une requête et sa réponse tiennent chacune sur une ligne JSON
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socketserver
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Taille maximum d'une réponse (séries de plusieurs centaines de Mini Shell)
+MAX_RESPONSE = 64 << 20
+
+
+class LeaderUnavailable(Exception):
+    """Leader injoignable: la lecture doit être réessayée après retry_after secondes"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class StatsRelay:
+    """Classe servant les lectures de statistiques du leader sur un socket unix"""
+
+    def __init__(self, path: str, read: Callable[[Optional[str], Optional[int], int], Tuple[bool, str, Optional[Dict]]]):
+        """
+        Initialise le relais
+
+        Args:
+            path (str): Chemin du socket unix
+            read (Callable): Lecture locale (container ou None pour l'agrégat, résolution, points)
+        """
+        self.path = path
+        self.read = read
+        self.requests = 0
+        self._server: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Ouvre le socket et sert les requêtes dans un thread dédié"""
+        if self._server is not None:
+            return
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        relay = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                relay._handle(self.rfile, self.wfile)
+
+        self._server = _Server(self.path, Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stats-relay")
+        self._thread.daemon = True
+        self._thread.start()
+        logger.info(f"Relais des statistiques ouvert sur {self.path}")
+
+    def stop(self):
+        """Ferme le socket"""
+        server, self._server = self._server, None
+        if server is None:
+            return
+        server.shutdown()
+        server.server_close()
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _handle(self, rfile, wfile):
+        """Répond à une requête {"container", "resolution", "points"}"""
+        self.requests += 1
+        try:
+            query = json.loads(rfile.readline())
+            result = self.read(query.get("container"), query.get("resolution"), int(query.get("points", 60)))
+        except Exception as e:
+            logger.error(f"Erreur lors du relais des statistiques: {e}")
+            result = (False, f"Erreur lors de la lecture des statistiques: {e}", None)
+        wfile.write(json.dumps(result).encode() + b"\n")
+
+
+async def aquery(path: str,
+                 container_id_or_name: Optional[str],
+                 resolution: Optional[int],
+                 points: int,
+                 timeout: float = 5.0) -> Tuple[bool, str, Optional[Dict]]:
+    """
+    Lit les statistiques auprès du relais du leader
+
+    Args:
+        path (str): Chemin du socket publié par le leader
+        container_id_or_name (str, optional): ID ou nom du container (None pour l'agrégat)
+        resolution (int, optional): Pas en secondes
+        points (int): Nombre d'intervalles
+        timeout (float): Délai maximum de la requête en secondes
+
+    Returns:
+        Tuple[bool, str, Optional[Dict]]: Réponse du leader (succès, message, série)
+
+    Raises:
+        OSError, asyncio.TimeoutError, ValueError: Si le leader ne répond pas correctement
+    """
+    query = {"container": container_id_or_name, "resolution": resolution, "points": points}
+    reader, writer = await asyncio.wait_for(asyncio.open_unix_connection(path, limit=MAX_RESPONSE), timeout)
+    try:
+        writer.write(json.dumps(query).encode() + b"\n")
+        await writer.drain()
+        line = await asyncio.wait_for(reader.readline(), timeout)
+    finally:
+        writer.close()
+    success, message, data = json.loads(line)
+    return success, message, data
@@ -0,0 +1,333 @@
+"""
+Module de terminal interactif des containers Mini Shell
+Une commande exec avec TTY est relayée octet par octet vers un WebSocket, dans les deux sens,
+sans découpage en lignes: les frappes atteignent le shell et son écho revient en quelques millisecondes.
+Sans authentification, l'accès exige le jeton remis à la session au lancement du container
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+
+from async_docker import AsyncDockerClient
+
+logger = logging.getLogger(__name__)
+
+# Code de fermeture WebSocket envoyé quand la session est inactive ou que le shell se termine
+CLOSE_NORMAL = 1000
+
+
+def load_secret(path: str) -> bytes:
+    """
+    Lit la clé des jetons de terminal, ou la crée si elle n'existe pas encore
+
+    La création est exclusive: avec plusieurs workers, un seul génère la clé et tous la partagent.
+
+    Args:
+        path (str): Chemin du fichier de la clé
+
+    Returns:
+        bytes: Clé secrète
+    """
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        # Clé créée par un autre worker, éventuellement en cours d'écriture
+        deadline = time.monotonic() + 5
+        while True:
+            with open(path, "rb") as f:
+                key = f.read()
+            if key or time.monotonic() > deadline:
+                break
+            time.sleep(0.05)
+        if not key:
+            raise RuntimeError(f"Clé des jetons de terminal vide: {path}")
+        return key
+    key = secrets.token_bytes(32)
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    return key
+
+
+def sign(secret: bytes, container_id: str, session_id: str) -> str:
+    """
+    Calcule le jeton de terminal d'un container attribué à une session
+
+    Args:
+        secret (bytes): Clé des jetons
+        container_id (str): ID complet du container
+        session_id (str): Identifiant de session enregistré pour ce container
+
+    Returns:
+        str: Jeton (HMAC-SHA256 en hexadécimal)
+    """
+    return hmac.new(secret, f"{container_id}:{session_id}".encode(), hashlib.sha256).hexdigest()
+
+
+class TerminalSession:
+    """Session de terminal: une commande exec attachée et ses compteurs"""
+
+    def __init__(self,
+                 container_id: str,
+                 exec_id: str,
+                 aclient: AsyncDockerClient,
+                 reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter):
+        """
+        Initialise la session
+
+        Args:
+            container_id (str): ID du container
+            exec_id (str): ID de la commande exec
+            aclient (AsyncDockerClient): Client du moteur Docker qui exécute la commande
+            reader (asyncio.StreamReader): Sortie du TTY
+            writer (asyncio.StreamWriter): Entrée du TTY
+        """
+        self.id = uuid.uuid4().hex[:12]
+        self.container_id = container_id
+        self.exec_id = exec_id
+        self.aclient = aclient
+        self.reader = reader
+        self.writer = writer
+        self.started_at = time.time()
+        self.last_input = time.monotonic()
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.frames_out = 0
+        self.resizes = 0
+
+    def to_dict(self) -> Dict:
+        """Retourne l'état de la session"""
+        return {
+            "id": self.id,
+            "container_id": self.container_id,
+            "started_at": self.started_at,
+            "idle": time.monotonic() - self.last_input,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "frames_out": self.frames_out,
+        }
+
+
+class TerminalBridge:
+    """Classe reliant des WebSockets aux TTY des containers"""
+
+    def __init__(self,
+                 max_sessions: int = 20,
+                 idle_timeout: float = 300.0,
+                 max_buffer: int = 64,
+                 max_frame: int = 65536,
+                 on_input: Optional[Callable[[str], None]] = None):
+        """
+        Initialise le pont
+
+        Args:
+            max_sessions (int): Nombre maximum de terminaux ouverts simultanément
+            idle_timeout (float): Fermeture d'un terminal sans frappe pendant ce délai (secondes)
+            max_buffer (int): Nombre de blocs de sortie en attente d'envoi avant de suspendre la lecture
+            max_frame (int): Taille maximum d'un bloc lu ou d'un message envoyé (octets)
+            on_input (Callable[[str], None], optional): Appelé avec l'ID du container à chaque frappe
+        """
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.max_buffer = max_buffer
+        self.max_frame = max_frame
+        self.on_input = on_input
+        self._sessions: Dict[str, TerminalSession] = {}
+
+        self.opened = 0
+        self.idle_closed = 0
+
+    @property
+    def full(self) -> bool:
+        """Indique si le nombre maximum de terminaux est atteint"""
+        return len(self._sessions) >= self.max_sessions
+
+    async def open(self,
+                   aclient: AsyncDockerClient,
+                   container_id: str,
+                   cmd: List[str],
+                   cols: int = 80,
+                   rows: int = 24,
+                   environment: Optional[Dict[str, str]] = None) -> TerminalSession:
+        """
+        Lance une commande avec TTY dans un container et s'y attache
+
+        Args:
+            aclient (AsyncDockerClient): Client du moteur Docker qui possède le container
+            container_id (str): ID du container
+            cmd (List[str]): Commande à exécuter
+            cols (int): Largeur initiale du terminal
+            rows (int): Hauteur initiale du terminal
+            environment (Dict[str, str], optional): Variables d'environnement de la commande
+
+        Returns:
+            TerminalSession: Session attachée
+
+        Raises:
+            docker.errors.APIError: Si le démon refuse la commande
+        """
+        env = dict(environment or {}, TERM="xterm-256color", COLUMNS=str(cols), LINES=str(rows))
+        exec_id = await aclient.exec_create(container_id, cmd, tty=True, environment=env)
+        reader, writer = await aclient.exec_attach(exec_id)
+        # Borne les octets de stdin en attente côté processus: drain() suspend la lecture du WebSocket
+        writer.transport.set_write_buffer_limits(high=self.max_frame)
+        session = TerminalSession(container_id, exec_id, aclient, reader, writer)
+        try:
+            await aclient.exec_resize(exec_id, rows, cols)
+        except Exception as e:
+            logger.warning(f"Redimensionnement initial du terminal {session.id} impossible: {e}")
+        self._sessions[session.id] = session
+        self.opened += 1
+        logger.info(f"Terminal {session.id} ouvert sur le container {container_id}")
+        return session
+
+    async def serve(self, session: TerminalSession, websocket):
+        """
+        Relaie les octets entre le WebSocket et le TTY jusqu'à la fin de l'un des deux
+
+        Les messages binaires sont écrits tels quels sur stdin; les messages texte sont des
+        commandes JSON ({"type": "resize", "cols", "rows"} ou {"type": "input", "data"}),
+        un texte non JSON étant transmis comme saisie.
+
+        Args:
+            session (TerminalSession): Session ouverte par open()
+            websocket: WebSocket accepté (starlette)
+        """
+        output: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue(maxsize=self.max_buffer)
+        reader = asyncio.ensure_future(self._read_output(session, output))
+        relays = [
+            asyncio.ensure_future(self._send_output(session, websocket, output)),
+            asyncio.ensure_future(self._relay_input(session, websocket)),
+            asyncio.ensure_future(self._watch_idle(session)),
+        ]
+        tasks = [reader] + relays
+        try:
+            # La fin de la sortie est signalée par l'envoi, une fois la file vidée
+            done, _ = await asyncio.wait(relays, return_when=asyncio.FIRST_COMPLETED)
+            reason = next(iter(done)).result() if done else None
+        except Exception as e:
+            logger.error(f"Erreur du terminal {session.id}: {e}")
+            reason = None
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            session.writer.close()
+            self._sessions.pop(session.id, None)
+
+        try:
+            if reason == "exit":
+                await websocket.send_text(json.dumps({"type": "exit", "exit_code": await self._exit_code(session)}))
+                await websocket.close(code=CLOSE_NORMAL)
+            elif reason == "idle":
+                await websocket.send_text(json.dumps({"type": "idle", "timeout": self.idle_timeout}))
+                await websocket.close(code=CLOSE_NORMAL)
+        except Exception:
+            # Client déjà déconnecté
+            pass
+        logger.info(f"Terminal {session.id} fermé ({reason or 'déconnexion'}, "
+                    f"{session.bytes_in} octets reçus, {session.bytes_out} octets envoyés)")
+
+    def stats(self) -> Dict:
+        """Retourne les terminaux ouverts et les compteurs"""
+        return {
+            "active": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "opened": self.opened,
+            "idle_closed": self.idle_closed,
+            "sessions": [session.to_dict() for session in self._sessions.values()],
+        }
+
+    async def _read_output(self, session: TerminalSession, output: asyncio.Queue):
+        """Lit la sortie du TTY; la file bornée suspend la lecture si le client ne suit pas"""
+        while True:
+            data = await session.reader.read(self.max_frame)
+            await output.put(data or None)
+            if not data:
+                return
+
+    async def _send_output(self, session: TerminalSession, websocket, output: asyncio.Queue) -> str:
+        """Envoie la sortie au client, en regroupant les blocs déjà en attente"""
+        while True:
+            data = await output.get()
+            if data is None:
+                return "exit"
+            ended = False
+            while not output.empty() and len(data) < self.max_frame:
+                following = output.get_nowait()
+                if following is None:
+                    ended = True
+                    break
+                data += following
+            await websocket.send_bytes(data)
+            session.bytes_out += len(data)
+            session.frames_out += 1
+            if ended:
+                return "exit"
+
+    async def _relay_input(self, session: TerminalSession, websocket) -> str:
+        """Écrit les frappes du client sur stdin et applique les redimensionnements"""
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return "disconnect"
+
+            data = message.get("bytes")
+            if data is None and message.get("text") is not None:
+                data = await self._control(session, message["text"])
+            if not data:
+                continue
+
+            session.writer.write(data)
+            await session.writer.drain()
+            session.bytes_in += len(data)
+            session.last_input = time.monotonic()
+            if self.on_input:
+                self.on_input(session.container_id)
+
+    async def _control(self, session: TerminalSession, text: str) -> Optional[bytes]:
+        """Interprète un message texte: commande JSON, ou saisie à transmettre"""
+        try:
+            command = json.loads(text)
+        except ValueError:
+            return text.encode()
+        if not isinstance(command, dict):
+            return text.encode()
+
+        if command.get("type") == "resize":
+            try:
+                cols, rows = int(command["cols"]), int(command["rows"])
+                await session.aclient.exec_resize(session.exec_id, max(1, rows), max(1, cols))
+                session.resizes += 1
+            except Exception as e:
+                logger.warning(f"Redimensionnement du terminal {session.id} impossible: {e}")
+            return None
+        if command.get("type") == "input":
+            return str(command.get("data", "")).encode()
+        return None
+
+    async def _watch_idle(self, session: TerminalSession) -> str:
+        """Termine la session quand aucune frappe n'a été reçue pendant idle_timeout"""
+        while True:
+            remaining = self.idle_timeout - (time.monotonic() - session.last_input)
+            if remaining <= 0:
+                self.idle_closed += 1
+                return "idle"
+            await asyncio.sleep(remaining)
+
+    async def _exit_code(self, session: TerminalSession) -> Optional[int]:
+        """Code de sortie de la commande (None si inconnu)"""
+        try:
+            return (await session.aclient.exec_inspect(session.exec_id)).get("ExitCode")
+        except Exception:
+            return None
@@ -0,0 +1,143 @@
+"""
+Fixtures communes des tests: moteurs Docker simulés (bench/fake_docker.py) et backend complet
+Le backend lit sa configuration à l'import: l'environnement est fixé une fois pour toute la session
+de tests, avant le premier import de main
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from bench.loadtest import API_KEY, ADMIN_AUTH, _start_engine, data_env  # noqa: E402
+
+# Configuration du backend testé (capacité réduite, pool d'un container, sans limitation de débit)
+BACKEND_ENV = {
+    "MINISHELL_PREBUILD": "0",
+    "MINISHELL_MAX_RUNNING": "3",
+    "MINISHELL_POOL_SIZE": "1",
+    "MINISHELL_POOL_REFILL_INTERVAL": "0.2",
+    "MINISHELL_AUTO_STOP": "600",
+    "RESPONSE_CACHE_TTL": "0",
+    "RATE_LIMITS": "",
+}
+
+
+class FakeEngine:
+    """Moteur simulé servi dans sa propre boucle asyncio (thread dédié)"""
+
+    def __init__(self, socket_path: str, latency=None, jitter: float = 0.0, log_interval: float = 0.05):
+        self.socket_path = socket_path
+        self.url = f"unix://{socket_path}"
+        self.engine, self.loop, self.thread = _start_engine(socket_path, argparse.Namespace(
+            latency=latency, jitter=jitter, log_interval=log_interval
+        ))
+
+    def call(self, coroutine, timeout: float = 5):
+        """Exécute une coroutine dans la boucle du moteur"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(timeout)
+
+    def stop(self):
+        if self.loop.is_closed():
+            return
+        self.call(self.engine.stop())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=5)
+        self.loop.close()
+
+
+def wait_until(predicate, timeout: float = 5.0, interval: float = 0.05):
+    """Attend qu'une condition soit vraie; retourne sa dernière valeur"""
+    deadline = time.monotonic() + timeout
+    while True:
+        value = predicate()
+        if value or time.monotonic() > deadline:
+            return value
+        time.sleep(interval)
+
+
+@pytest.fixture
+def fake_engine(tmp_path):
+    """Moteur simulé sans latence, arrêté à la fin du test"""
+    engine = FakeEngine(str(tmp_path / "docker.sock"))
+    yield engine
+    engine.stop()
+
+
+@pytest.fixture
+def engine_factory(tmp_path):
+    """Démarre autant de moteurs simulés que nécessaire, arrêtés à la fin du test"""
+    engines = []
+
+    def start(name: str, **options) -> FakeEngine:
+        engine = FakeEngine(str(tmp_path / f"{name}.sock"), **options)
+        engines.append(engine)
+        return engine
+
+    yield start
+    for engine in engines:
+        engine.stop()
+
+
+@pytest.fixture(scope="session")
+def backend():
+    """
+    Backend complet (TestClient) branché sur un moteur simulé, partagé par la session de tests
+
+    Les données (registre des sessions, archive des logs, coordination) sont écrites dans un
+    répertoire temporaire
+    """
+    root = tempfile.mkdtemp(prefix="mishu-tests-")
+    engine = FakeEngine(os.path.join(root, "docker.sock"))
+    os.environ.update(BACKEND_ENV, DOCKER_HOST=engine.url, **data_env(root))
+
+    from fastapi.testclient import TestClient
+    import main
+
+    with TestClient(main.app) as client:
+        ready = wait_until(lambda: client.get("/health/ready").status_code == 200, timeout=10)
+        assert ready, "Le backend n'est pas prêt"
+        client.engine = engine
+        client.manager = main.docker_manager
+        yield client
+    engine.stop()
+
+
+@pytest.fixture
+def minishell(backend):
+    """Lance des Mini Shell (POST /mini-shell/run) et les supprime à la fin du test"""
+    launched = []
+
+    def launch(session_id: str, **options):
+        response = backend.post("/mini-shell/run", auth=ADMIN_AUTH, json=dict(options, session_id=session_id))
+        body = response.json()
+        if body["success"]:
+            launched.append(body["data"]["container_id"])
+        return body
+
+    yield launch
+    for container_id in launched:
+        backend.post("/containers/remove", auth=ADMIN_AUTH, json={"container_id": container_id, "force": True})
+    wait_until(lambda: backend.manager.index.ready and not any(
+        entry["id"] in launched for entry in backend.manager.index.containers(True)
+    ))
+
+
+@pytest.fixture
+def admin():
+    """Authentification administrateur du backend de test"""
+    return ADMIN_AUTH
+
+
+@pytest.fixture
+def api_headers():
+    """En-tête de clé API du backend de test"""
+    return {"X-API-Key": API_KEY}
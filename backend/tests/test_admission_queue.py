@@ -0,0 +1,170 @@
+"""File d'attente d'admission: ordre d'arrivée, seule et derrière le backend complet"""
+
+import asyncio
+import sqlite3
+import time
+
+from admission_queue import ADMITTED, AdmissionQueue, QUEUED
+from conftest import wait_until
+from worker_coordination import WorkerCoordinator
+
+
+def test_tickets_are_admitted_in_arrival_order():
+    running = {"count": 0}
+
+    async def count_running():
+        return running["count"]
+
+    async def scenario():
+        queue = AdmissionQueue(2, count_running, recheck_interval=0.05)
+        order = []
+        for name in ("a", "b"):
+            ticket = await queue.enter(name)
+            assert ticket.admitted
+            running["count"] += 1
+            queue.complete(name)
+        waiting = [await queue.enter(name) for name in ("c", "d", "e")]
+        assert [(t.state, t.position) for t in waiting] == [(QUEUED, 1), (QUEUED, 2), (QUEUED, 3)]
+
+        # Un client qui relance sa demande conserve sa place
+        assert await queue.enter("d") is waiting[1]
+
+        for _ in waiting:
+            running["count"] -= 1
+            queue.release()
+            admitted = await _next_admitted(waiting, order)
+            order.append(admitted)
+            running["count"] += 1
+            queue.complete(admitted.key)
+        return [ticket.key for ticket in order], queue.stats()
+
+    order, stats = asyncio.run(scenario())
+    assert order == ["c", "d", "e"]
+    assert stats["depth"] == 0 and stats["admitted"] == 5 and stats["enqueued"] == 3
+
+
+def test_reservation_held_until_launch_is_counted():
+    indexed = set()
+
+    async def count_running():
+        return len(indexed)
+
+    async def scenario():
+        queue = AdmissionQueue(1, count_running, is_counted=lambda key: key in indexed, recheck_interval=0.05)
+        assert (await queue.enter("a")).admitted
+        # Lancement terminé, mais l'index ne montre pas encore le container
+        queue.complete("a")
+        waiting = await queue.enter("b")
+        states = [waiting.state]
+        indexed.add("a")
+        queue.release()
+        await asyncio.sleep(0.1)
+        states.append(waiting.state)
+        indexed.discard("a")
+        queue.release()
+        await asyncio.sleep(0.1)
+        states.append(waiting.state)
+        return states, queue.stats()["reserved"]
+
+    states, reserved = asyncio.run(scenario())
+    assert states == [QUEUED, QUEUED, ADMITTED]
+    assert reserved == 1
+
+
+def test_shared_registry_does_not_block_event_loop(tmp_path):
+    path = str(tmp_path / "workers.db")
+    coordinator = WorkerCoordinator(path)
+
+    async def count_running():
+        return 0
+
+    async def scenario():
+        queue = AdmissionQueue(1, count_running, recheck_interval=0.05, shared=coordinator)
+        # Un autre worker détient le verrou d'écriture de la base pendant 0,3 s
+        other = sqlite3.connect(path, isolation_level=None)
+        other.execute("BEGIN IMMEDIATE")
+        asyncio.get_running_loop().call_later(0.3, other.execute, "COMMIT")
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker = asyncio.ensure_future(tick())
+        started = time.perf_counter()
+        ticket = await queue.enter("a")
+        waited = time.perf_counter() - started
+        ticker.cancel()
+        other.close()
+        return ticket, waited, ticks
+
+    try:
+        ticket, waited, ticks = asyncio.run(scenario())
+    finally:
+        coordinator.stop()
+    assert ticket.admitted and waited >= 0.25
+    # La boucle a continué de tourner pendant l'attente du verrou SQLite
+    assert ticks >= 10
+
+
+async def _next_admitted(tickets, already):
+    for _ in range(100):
+        admitted = [t for t in tickets if t.state == ADMITTED and t not in already]
+        if admitted:
+            assert len(admitted) == 1
+            return admitted[0]
+        await asyncio.sleep(0.01)
+    raise AssertionError("Aucun ticket admis")
+
+
+def test_backend_queue_follows_arrival_order(backend, minishell, admin):
+    capacity = backend.manager.admission.capacity
+    running = [minishell(f"fill{i}") for i in range(capacity)]
+    assert all(launched["success"] for launched in running), running
+
+    queued = [minishell(f"queued{i}") for i in range(3)]
+    assert [body["data"]["position"] for body in queued] == [1, 2, 3]
+    tickets = [body["data"]["ticket_id"] for body in queued]
+
+    admitted = []
+    for launched in running:
+        backend.post("/containers/stop", auth=admin, json={"container_id": launched["data"]["container_id"]})
+        states = wait_until(lambda: [
+            ticket for ticket in tickets if ticket not in admitted
+            and backend.get(f"/mini-shell/queue/{ticket}", auth=admin).json()["data"]["state"] == ADMITTED
+        ])
+        assert len(states) == 1, states
+        admitted.append(states[0])
+        # Le ticket admis autorise le lancement: le client relance sa demande
+        index = tickets.index(states[0])
+        relaunched = minishell(f"queued{index}")
+        assert relaunched["success"], relaunched
+
+    assert admitted == tickets
+
+
+def test_failed_launch_frees_reservation_and_records_wait(backend, api_headers, monkeypatch):
+    import docker_control
+
+    manager = backend.manager
+    observed = sum(sum(counts) for counts, _ in docker_control.ADMISSION_WAIT_SECONDS._series.values())
+
+    async def failing_create(*args):
+        raise RuntimeError("moteur indisponible")
+
+    monkeypatch.setattr(manager, "_acreate_mini_shell", failing_create)
+
+    async def scenario():
+        try:
+            await manager._alaunch_mini_shell("echec", False, None, None, True, None)
+        except RuntimeError:
+            pass
+        return manager.admission.stats()["reserved"], manager.admission.ticket_for("echec")
+
+    reserved, ticket = backend.portal.call(scenario)
+    # Exception pendant le lancement: la place réservée est rendue
+    assert reserved == 0 and ticket is None
+    assert sum(sum(counts) for counts, _ in docker_control.ADMISSION_WAIT_SECONDS._series.values()) == observed + 1
+    assert "mishu_admission_wait_seconds_count" in backend.get("/metrics", headers=api_headers).text
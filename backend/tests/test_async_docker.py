@@ -0,0 +1,142 @@
+"""Client asyncio de l'API Docker contre le moteur simulé: pool, délai maximum, annulation et exec"""
+
+import asyncio
+import time
+
+import docker
+import pytest
+
+from async_docker import AsyncDockerClient
+
+IMAGE = "mishu_minishell:latest"
+
+
+async def _running_container(client: AsyncDockerClient, name: str = "shell") -> str:
+    container_id = await client.create_container({"Image": IMAGE, "Tty": True}, name=name)
+    await client.start(container_id)
+    return container_id
+
+
+def test_pool_bounds_and_reuses_connections(engine_factory):
+    fake = engine_factory("slow", latency="inspect=0.1")
+
+    async def scenario():
+        client = AsyncDockerClient(fake.socket_path, pool_size=2)
+        container_id = await _running_container(client)
+        connections = fake.engine.connections
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(client.inspect_container(container_id) for _ in range(6)))
+        elapsed = time.perf_counter() - started
+        opened = fake.engine.connections - connections
+        await client.inspect_container(container_id)
+        reopened = fake.engine.connections - connections - opened
+        await client.close()
+        return results, elapsed, opened, reopened, client.stats()
+
+    results, elapsed, opened, reopened, stats = asyncio.run(scenario())
+    assert all(result["State"]["Running"] for result in results)
+    # Six appels de 100 ms sur deux connexions: trois vagues
+    assert elapsed >= 0.28
+    assert opened <= 1
+    assert reopened == 0
+    assert stats["in_use"] == 0
+
+
+def test_timeout_closes_connection_and_frees_slot(engine_factory):
+    fake = engine_factory("stuck", latency="inspect=2")
+
+    async def scenario():
+        # Délai normal pour la préparation: seul l'appel lent est soumis au délai de 0,1 s
+        setup = AsyncDockerClient(fake.socket_path)
+        container_id = await _running_container(setup)
+        await setup.close()
+        client = AsyncDockerClient(fake.socket_path, pool_size=1, timeout=0.1)
+        started = time.perf_counter()
+        with pytest.raises(asyncio.TimeoutError):
+            await client.inspect_container(container_id)
+        elapsed = time.perf_counter() - started
+        idle_after_timeout = client.stats()["idle"]
+        # La seule place du pool est de nouveau disponible
+        listed = await client.containers(all_containers=True)
+        await client.close()
+        return elapsed, idle_after_timeout, listed
+
+    elapsed, idle, listed = asyncio.run(scenario())
+    assert elapsed < 1
+    assert idle == 0
+    assert [summary["Names"] for summary in listed] == [["/shell"]]
+
+
+def test_cancel_releases_pool_slot(engine_factory):
+    fake = engine_factory("cancel", latency="inspect=1")
+
+    async def scenario():
+        client = AsyncDockerClient(fake.socket_path, pool_size=1)
+        container_id = await _running_container(client)
+        pending = asyncio.ensure_future(client.inspect_container(container_id))
+        await asyncio.sleep(0.05)
+        assert client.stats()["in_use"] == 1
+        pending.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await pending
+        stats = client.stats()
+        pong = await asyncio.wait_for(client.ping(), 0.5)
+        await client.close()
+        return stats, pong
+
+    stats, pong = asyncio.run(scenario())
+    assert stats == {"pool_size": 1, "idle": 0, "in_use": 0}
+    assert pong
+
+
+def test_not_found_raises_docker_error(fake_engine):
+    async def scenario():
+        client = AsyncDockerClient(fake_engine.socket_path)
+        try:
+            await client.inspect_container("absent")
+        finally:
+            await client.close()
+
+    with pytest.raises(docker.errors.NotFound):
+        asyncio.run(scenario())
+
+
+def test_name_conflict_carries_status_code(fake_engine):
+    async def scenario():
+        client = AsyncDockerClient(fake_engine.socket_path)
+        try:
+            await client.create_container({"Image": IMAGE}, name="doublon")
+            await client.create_container({"Image": IMAGE}, name="doublon")
+        finally:
+            await client.close()
+
+    # Même code HTTP que les erreurs du client docker synchrone
+    with pytest.raises(docker.errors.APIError) as error:
+        asyncio.run(scenario())
+    assert error.value.status_code == 409 and "already in use" in error.value.explanation
+
+
+def test_exec_attach_relays_tty(fake_engine):
+    async def scenario():
+        client = AsyncDockerClient(fake_engine.socket_path)
+        container_id = await _running_container(client)
+        exec_id = await client.exec_create(container_id, ["/bin/sh"])
+        await client.exec_resize(exec_id, 40, 120)
+        reader, writer = await client.exec_attach(exec_id)
+        assert await reader.readexactly(2) == b"$ "
+        writer.write(b"echo bonjour\r")
+        output = b""
+        while b"bonjour\r\n$ " not in output:
+            output += await asyncio.wait_for(reader.read(1024), 1)
+        writer.write(b"exit\r")
+        while await asyncio.wait_for(reader.read(1024), 1):
+            pass
+        writer.close()
+        state = await client.exec_inspect(exec_id)
+        await client.close()
+        return output, state
+
+    output, state = asyncio.run(scenario())
+    assert output.startswith(b"echo bonjour\r\n")
+    assert state["ExitCode"] == 0 and not state["Running"]
@@ -0,0 +1,19 @@
+"""Latence sous concurrence: client asyncio contre SDK Docker dans le pool de threads (bench/client_latency.py)"""
+
+import asyncio
+
+from bench.client_latency import compare, start_engine_process
+
+
+def test_async_client_p99_beats_threadpool(tmp_path):
+    socket_path = str(tmp_path / "docker.sock")
+    # Moteur simulé dans un processus séparé: il ne partage pas le GIL avec la mesure
+    engine = start_engine_process(socket_path, "inspect=0.002", jitter=0.2)
+    try:
+        report = asyncio.run(compare(socket_path, requests=1000, concurrency=100, pool_size=32))
+    finally:
+        engine.terminate()
+        engine.wait(timeout=5)
+
+    assert report["async"]["requests"] == report["threadpool"]["requests"] == 1000
+    assert report["async"]["p99_ms"] < report["threadpool"]["p99_ms"], report
@@ -0,0 +1,97 @@
+"""Ensemble de moteurs Docker: placement, éviction des moteurs défaillants et routage vers le propriétaire"""
+
+import pytest
+
+from conftest import wait_until
+from engine_pool import LOCAL_ENGINE, Engine, EnginePool
+
+LABELS = {"app": "mishu-minishell"}
+IMAGE = "mishu_minishell:latest"
+
+
+def _pool(local, remotes, max_running=2, max_failures=3):
+    return EnginePool(local, remotes, IMAGE, LABELS, max_running=max_running,
+                      memory_of=lambda labels: 0, max_failures=max_failures)
+
+
+def test_placement_prefers_least_loaded_engine(engine_factory):
+    fakes = {name: engine_factory(name) for name in (LOCAL_ENGINE, "a", "b", "sans-image")}
+    fakes["sans-image"].engine.images.clear()
+    local = Engine.from_socket(LOCAL_ENGINE, fakes[LOCAL_ENGINE].socket_path)
+    local.local = True
+    remotes = [Engine.from_socket(name, fakes[name].socket_path) for name in ("a", "b", "sans-image")]
+    pool = _pool(local, remotes)
+    for engine in pool.engines.values():
+        pool._check(engine)
+
+    assert [engine.name for engine in pool.eligible()] == [LOCAL_ENGINE, "a", "b"]
+    # À charge égale le moteur local passe en premier; au-delà de max_running un moteur n'est plus choisi
+    placed = [pool.choose() for _ in range(7)]
+    assert [engine and engine.name for engine in placed] == [LOCAL_ENGINE, "a", "b", LOCAL_ENGINE, "a", "b", None]
+    assert pool.placements == 6
+
+
+def test_engine_ejected_after_max_failures(backend, engine_factory):
+    pool = backend.manager.engines
+    fake = engine_factory("defaillant")
+    engine = Engine.from_socket("defaillant", fake.socket_path, timeout=1)
+    pool._check(engine)
+    assert engine.healthy
+    ejections = pool.ejections
+
+    fake.stop()
+    for failure in range(1, pool.max_failures + 1):
+        # Encore disponible tant que le nombre d'échecs consécutifs n'atteint pas le seuil
+        assert engine.healthy
+        pool._check(engine)
+        assert engine.failures == failure
+    assert not engine.healthy and engine.error
+    assert pool.ejections == ejections + 1
+
+
+@pytest.fixture
+def remote_engines(backend, engine_factory):
+    """Deux moteurs simulés ajoutés aux moteurs du backend, retirés à la fin du test"""
+    manager = backend.manager
+    pool = manager.engines
+    fakes = {name: engine_factory(name) for name in ("a", "b")}
+    engines = [Engine.from_socket(name, fake.socket_path) for name, fake in fakes.items()]
+    for engine in engines:
+        pool.engines[engine.name] = engine
+    pool._check(pool.local)
+    for engine in engines:
+        pool._check(engine)
+    manager._on_engines_update()
+
+    yield fakes
+    for engine in engines:
+        del pool.engines[engine.name]
+        backend.portal.call(engine.aclient.close)
+        engine.client.close()
+    manager._on_engines_update()
+
+
+def test_stop_and_logs_routed_to_owning_engine(backend, remote_engines, minishell, admin):
+    # remote_engines avant minishell: les containers sont supprimés avant le retrait des moteurs
+    pool = backend.manager.engines
+    assert pool.local.running == 0
+    launched = [minishell(f"moteur{i}") for i in range(3)]
+    assert all(body["success"] for body in launched), launched
+    # Vérification des moteurs distants (thread de santé): les lancements y sont comptés
+    for engine in pool.remotes:
+        pool._check(engine)
+    owners = {pool.owner(body["data"]["container_id"]).name: body["data"]["container_id"] for body in launched}
+    assert set(owners) == {LOCAL_ENGINE, "a", "b"}
+
+    local_fake = backend.engine.engine
+    for name, fake in remote_engines.items():
+        container_id = owners[name]
+        assert container_id in fake.engine.containers and container_id not in local_fake.containers
+        assert wait_until(lambda: fake.engine.containers[container_id].log_lines(fake.engine.log_interval, 10))
+
+        logs = backend.get(f"/containers/{container_id}/logs", auth=admin).json()
+        assert logs["success"] and "$ ls" in logs["data"]["logs"], logs
+
+        stopped = backend.post("/containers/stop", auth=admin, json={"container_id": container_id}).json()
+        assert stopped["success"], stopped
+        assert fake.engine.containers[container_id].status == "exited"
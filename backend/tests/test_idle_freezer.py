@@ -0,0 +1,83 @@
+"""Mise en pause des Mini Shell inactifs: reprise à l'activité, redémarrage et activité des logs archivés"""
+
+import time
+
+from conftest import wait_until
+from idle_freezer import IdleFreezer
+from log_archive import LogArchive
+
+
+def _freezer(paused, idle_after=0.2):
+    return IdleFreezer(lambda key: paused.add(key), lambda key: paused.discard(key), idle_after, interval=0.02)
+
+
+def test_idle_container_paused_then_resumed_on_activity():
+    paused = set()
+    freezer = _freezer(paused)
+    freezer.track("c1", "shell")
+    freezer.start()
+    try:
+        assert wait_until(lambda: freezer.is_paused("c1"), timeout=2)
+        assert paused == {"c1"} and freezer.paused()[0]["name"] == "shell"
+        assert freezer.touch("c1")
+        assert paused == set() and not freezer.is_paused("c1")
+        # Activité sur un container actif: rien à reprendre
+        assert not freezer.touch("c1")
+        assert freezer.stats()["pauses"] == 1 and freezer.stats()["resumes"] == 1
+    finally:
+        freezer.stop()
+
+
+def test_restart_right_after_stop_keeps_freezing():
+    paused = set()
+    freezer = _freezer(paused)
+    freezer.start()
+    old = freezer._thread
+    # Perte puis reprise du bail de leader: start() avant la fin de l'ancien thread
+    freezer.stop()
+    freezer.start()
+    try:
+        old.join(timeout=1)
+        assert not old.is_alive() and freezer._thread.is_alive()
+        freezer.track("c1")
+        assert wait_until(lambda: freezer.is_paused("c1"), timeout=2)
+    finally:
+        freezer.stop()
+
+
+class _Stream:
+    """Flux Docker simulé: une ligne horodatée toutes les interval secondes"""
+
+    def __init__(self, lines, interval):
+        self.lines = lines
+        self.interval = interval
+        self.closed = False
+
+    def __iter__(self):
+        for i in range(self.lines):
+            if self.closed:
+                return
+            time.sleep(self.interval)
+            yield f"2024-01-01T12:00:{i:02d}.000000000Z ligne {i}\n".encode()
+
+    def close(self):
+        self.closed = True
+
+
+def test_archived_output_counts_as_activity(tmp_path):
+    paused = set()
+    freezer = _freezer(paused)
+    archive = LogArchive(str(tmp_path / "archive"), lambda container_id, since: _Stream(20, 0.05),
+                         on_activity=freezer.touch)
+    freezer.track("c1")
+    freezer.start()
+    try:
+        archive.follow("c1", "shell")
+        # Le container écrit plus longtemps que le délai d'inactivité: il n'est pas mis en pause
+        time.sleep(0.6)
+        assert not freezer.is_paused("c1") and freezer.stats()["pauses"] == 0
+        # Plus de sortie à la fin du flux: mise en pause après le délai
+        assert wait_until(lambda: freezer.is_paused("c1"), timeout=3)
+    finally:
+        archive.stop()
+        freezer.stop()
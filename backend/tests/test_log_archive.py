@@ -0,0 +1,98 @@
+"""Archive des logs: pages d'une session, reprise du suivi après stop() et route de lecture"""
+
+import time
+
+from conftest import wait_until
+from container_stats import StatsCollector
+from log_archive import LogArchive
+
+
+def _lines(prefix, count):
+    return b"".join(f"2024-01-01T12:00:{i:02d}.000000000Z {prefix} {i}\n".encode() for i in range(count))
+
+
+def _archive(tmp_path, streams, **options):
+    return LogArchive(str(tmp_path / "archive"), lambda container_id, since: [streams[container_id]],
+                      block_lines=4, flush_interval=0, **options)
+
+
+def test_session_pages_span_blocks_and_containers(tmp_path):
+    archive = _archive(tmp_path, {"ancien": _lines("ancien", 3), "recent": _lines("recent", 10)})
+    archive.follow("ancien", "shell_ancien", "s1")
+    time.sleep(0.01)
+    archive.follow("recent", "shell_recent", "s1")
+    assert wait_until(lambda: not archive._followers)
+
+    # Plus récent en premier
+    assert [meta["container_id"] for meta in archive.containers("s1")] == ["recent", "ancien"]
+    assert archive.containers("inconnue") == []
+
+    texts, offset = [], 0
+    while offset is not None:
+        records, total = archive.read("recent", offset, 3)
+        assert [record.seq for record in records] == list(range(offset, offset + len(records)))
+        texts += [record.text for record in records]
+        offset = offset + len(records) if offset + len(records) < total else None
+    assert texts == [f"recent {i}" for i in range(10)]
+    # Offset négatif: compté depuis la fin
+    records, total = archive.read("recent", -2, 5)
+    assert total == 10 and [record.text for record in records] == ["recent 8", "recent 9"]
+    records, _ = archive.read("ancien", 0, 100)
+    assert [record.text for record in records] == ["ancien 0", "ancien 1", "ancien 2"]
+
+
+def test_followers_refused_after_stop_until_start(tmp_path):
+    archive = _archive(tmp_path, {"c1": _lines("ligne", 2)})
+    archive.stop()
+    archive.follow("c1", "shell", "s1")
+    assert archive.containers("s1") == [] and not archive._followers
+    archive.start()
+    archive.follow("c1", "shell", "s1")
+    assert wait_until(lambda: not archive._followers)
+    assert archive.read("c1", 0, 10)[1] == 2
+
+    opened = []
+
+    def open_stats(container_id):
+        opened.append(container_id)
+        return []
+
+    collector = StatsCollector(open_stats, [(1, 10)])
+    collector.stop()
+    collector.follow("c1", "shell")
+    collector.start()
+    collector.follow("c2", "shell")
+    assert wait_until(lambda: opened == ["c2"])
+
+
+def test_session_logs_route_pages_archived_lines(backend, minishell, admin):
+    launched = minishell("archive-pages")
+    assert launched["success"], launched
+    container_id = launched["data"]["container_id"]
+    engine = backend.engine.engine
+    fake = engine.containers[container_id]
+
+    def page(offset):
+        body = backend.get(f"/sessions/archive-pages/logs?offset={offset}&limit=5&format=json", auth=admin).json()
+        assert body["success"], body
+        return body["data"]
+
+    # Trois pages complètes archivées
+    assert wait_until(lambda: page(0)["total"] >= 15)
+    data = page(0)
+    assert data["container_id"] == container_id and data["containers"] == [container_id]
+    seqs, texts = [], []
+    offset = 0
+    for _ in range(3):
+        data = page(offset)
+        assert data["offset"] == offset and len(data["records"]) == 5
+        seqs += [record["seq"] for record in data["records"]]
+        texts += [record["text"] for record in data["records"]]
+        offset = data["next_offset"]
+    # Pages contiguës: ni ligne perdue ni doublon
+    assert seqs == list(range(15))
+    produced = [text for _, text in fake.log_lines(engine.log_interval, 5000)]
+    assert texts == produced[:15]
+
+    unknown = backend.get("/sessions/inconnue/logs", auth=admin).json()
+    assert not unknown["success"]
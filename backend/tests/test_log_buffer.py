@@ -0,0 +1,122 @@
+"""Tampons de logs: lignes de même horodatage et alimentation par le flux suivi"""
+
+import asyncio
+
+from conftest import wait_until
+from log_buffer import LogBufferStore
+from log_pipeline import LogRecord
+
+T1 = "2024-01-01T12:00:00.000000000Z"
+T2 = "2024-01-01T12:00:01.000000000Z"
+
+
+def _raw(*lines):
+    return "".join(f"{stamp} {text}\n" for stamp, text in lines).encode()
+
+
+def test_refresh_keeps_lines_sharing_a_timestamp():
+    # since est inclusif: le démon renvoie les lignes de l'horodatage déjà reçu
+    responses = [
+        _raw((T1, "a"), (T1, "b")),
+        _raw((T1, "a"), (T1, "b"), (T1, "c"), (T2, "d")),
+        _raw((T2, "d"), (T2, "e")),
+    ]
+    requested = []
+
+    def fetch_logs(container_id, since, tail):
+        requested.append(since)
+        return responses[len(requested) - 1]
+
+    store = LogBufferStore(fetch_logs, min_refresh_interval=0)
+    texts = []
+    cursor = None
+    for _ in responses:
+        records, cursor, reset = store.read("c1", cursor)
+        assert not reset
+        texts.extend(record.text for record in records)
+    assert texts == ["a", "b", "c", "d", "e"]
+    assert requested[0] is None and requested[1] == requested[2] - 1
+
+
+def test_follow_stream_replaces_daemon_polls():
+    fetches = []
+
+    def fetch_logs(container_id, since, tail):
+        fetches.append(since)
+        return _raw((T1, "a"), (T1, "b"))
+
+    store = LogBufferStore(fetch_logs, min_refresh_interval=0)
+    store.read("c1")
+    stamp = store._buffers["c1"].last_timestamp
+
+    # Début du flux (tail): chevauche le tampon, puis de nouvelles lignes dont une de même horodatage
+    store.follow("c1", [LogRecord(stamp, "stdout", "a")], (None, 0), False)
+    store.follow("c1", [LogRecord(stamp, "stdout", "b")], (stamp, 1), False)
+    store.follow("c1", [LogRecord(stamp, "stdout", "c"), LogRecord(stamp + 1, "stdout", "d")], (stamp, 2), False)
+    records, cursor, _ = store.read("c1", 0)
+    assert [record.text for record in records] == ["a", "b", "c", "d"]
+    assert len(fetches) == 1 and store.stats()["cached_reads"] == 1
+
+    # Flux fermé: le démon est de nouveau interrogé à partir de la dernière ligne
+    store.follow("c1", [], (stamp + 1, 1), True)
+    store.read("c1", cursor)
+    assert fetches == [None, stamp + 1]
+
+
+def test_follow_stream_ignored_until_buffer_catches_up():
+    store = LogBufferStore(lambda container_id, since, tail: _raw((T1, "a")), min_refresh_interval=0)
+    store.read("c1")
+    stamp = store._buffers["c1"].last_timestamp
+
+    # Le tail du flux ne remonte pas jusqu'au tampon: des lignes manqueraient
+    store.follow("c1", [LogRecord(stamp + 5, "stdout", "z")], (None, 0), False)
+    records, _, _ = store.read("c1", 0)
+    assert [record.text for record in records] == ["a"]
+    assert store.stats()["fetches"] == 2
+
+
+def test_buffer_follows_open_log_stream(backend, minishell):
+    launched = minishell("buffer-follow")
+    container_id = launched["data"]["container_id"]
+    engine = backend.engine.engine
+    fake = engine.containers[container_id]
+    manager = backend.manager
+    assert wait_until(lambda: len(fake.log_lines(engine.log_interval, 5000)) >= 5)
+
+    async def scenario():
+        success, message, data = await manager.aread_container_logs(container_id, structured=True)
+        assert success, message
+        first = data["records"][0]["timestamp"]
+        texts = [record["text"] for record in data["records"]]
+        cursor = data["cursor"]
+        success, message, subscriber = await manager.aopen_log_stream(container_id, 10)
+        assert success, message
+        try:
+            assert await _wait(lambda: manager.log_buffers._buffers[container_id].followed)
+            fetches = manager.log_buffers.stats()["fetches"]
+            # Plus longtemps que min_refresh_interval: sans le flux, le démon serait interrogé
+            for _ in range(int(manager.log_buffers.min_refresh_interval / engine.log_interval) + 5):
+                await asyncio.sleep(engine.log_interval)
+                success, message, data = await manager.aread_container_logs(container_id, cursor=cursor,
+                                                                            structured=True)
+                assert success, message
+                texts.extend(record["text"] for record in data["records"])
+                cursor = data["cursor"]
+            return manager.log_buffers.stats()["fetches"] - fetches, first, texts
+        finally:
+            manager.close_log_stream(subscriber)
+
+    extra_fetches, first, texts = backend.portal.call(scenario)
+    assert extra_fetches == 0
+    # Lignes lues par le démon puis par le flux: aucune perdue ni dupliquée
+    produced = fake.log_lines(engine.log_interval, 5000)
+    start = next(i for i, (stamp, _) in enumerate(produced) if abs(stamp - first) < 1e-3)
+    assert len(texts) > 20 and texts == [text for _, text in produced[start:start + len(texts)]]
+
+
+async def _wait(predicate, timeout=5):
+    for _ in range(int(timeout / 0.02)):
+        if predicate():
+            return True
+        await asyncio.sleep(0.02)
+    return False
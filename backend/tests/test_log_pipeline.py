@@ -0,0 +1,76 @@
+"""Traitement incrémental des logs: trames, UTF-8 et séquences ANSI coupés entre deux blocs"""
+
+import struct
+
+from log_pipeline import KIND_COMMAND, KIND_ERROR, KIND_OUTPUT, KIND_SUCCESS, STDERR, STDOUT, LogProcessor
+
+
+def _frame(stream: int, data: bytes) -> bytes:
+    return bytes([stream, 0, 0, 0]) + struct.pack(">L", len(data)) + data
+
+
+def _feed_bytewise(processor: LogProcessor, data: bytes):
+    records = []
+    for i in range(len(data)):
+        records += processor.feed(data[i:i + 1])
+    return records + processor.flush()
+
+
+def test_frame_headers_split_across_chunks():
+    data = _frame(1, b"bonjour\n") + _frame(2, b"erreur de lecture\n") + _frame(1, b"$ ls\n")
+    records = _feed_bytewise(LogProcessor(), data)
+    assert [(r.stream, r.text) for r in records] == [
+        (STDOUT, "bonjour"), (STDERR, "erreur de lecture"), (STDOUT, "$ ls")
+    ]
+
+
+def test_multibyte_characters_cut_at_chunk_boundary():
+    text = "réussi: données → ok ✓\n".encode("utf-8")
+    records = _feed_bytewise(LogProcessor(multiplexed=False), text)
+    assert [r.text for r in records] == ["réussi: données → ok ✓"]
+    # Même coupure à l'intérieur d'une trame multiplexée
+    cut = text.index("→".encode("utf-8")) + 1
+    processor = LogProcessor()
+    records = processor.feed(_frame(1, text)[:8 + cut]) + processor.feed(_frame(1, text)[8 + cut:])
+    assert [r.text for r in records] == ["réussi: données → ok ✓"]
+
+
+def test_escape_sequences_spanning_chunks():
+    data = (b"\x1b[1;32mvert\x1b[0m\n"
+            b"\x1b]0;titre du terminal\x07apr\xc3\xa8s OSC\n"
+            b"\x1b]2;titre\x1b\\fin ST\n"
+            b"\x1b(Bjeu\x1b)0 de caract\xc3\xa8res\n")
+    expected = ["vert", "après OSC", "fin ST", "jeu de caractères"]
+    assert [r.text for r in _feed_bytewise(LogProcessor(multiplexed=False), data)] == expected
+    processor = LogProcessor(multiplexed=False)
+    assert [r.text for r in processor.feed(data) + processor.flush()] == expected
+
+
+def test_long_lines_split_at_max_line():
+    processor = LogProcessor(multiplexed=False, max_line=4)
+    records = processor.feed(b"abcdefghij") + processor.feed(b"k\nxy\n")
+    assert [r.text for r in records] == ["abcd", "efgh", "ijk", "xy"]
+    # Les séquences ANSI supprimées ne comptent pas dans la longueur
+    records = processor.feed(b"\x1b[31mabcd\x1b[0me\n")
+    assert [r.text for r in records] == ["abcd", "e"]
+
+
+def test_classification_by_stream_and_content():
+    data = (_frame(1, b"$ make\n") + _frame(1, b"Build success\n") + _frame(1, b"rien\n")
+            + _frame(2, b"warning: rien de grave\n") + _frame(1, b"Erreur: fichier absent\n"))
+    processor = LogProcessor(timestamps=False)
+    records = processor.feed(data)
+    assert [(r.stream, r.kind) for r in records] == [
+        (STDOUT, KIND_COMMAND), (STDOUT, KIND_SUCCESS), (STDOUT, KIND_OUTPUT),
+        (STDERR, KIND_ERROR), (STDOUT, KIND_ERROR),
+    ]
+    assert records[0].format() == "> $ make"
+
+
+def test_timestamps_parsed_and_incomplete_line_flushed():
+    processor = LogProcessor(timestamps=True, multiplexed=False)
+    records = processor.feed(b"2024-01-01T12:00:00.500000000Z premi\xc3")
+    assert records == []
+    records = processor.feed(b"\xa8re\n2024-01-01T12:00:01Z sans fin")
+    assert [(r.timestamp, r.text) for r in records] == [(1704110400.5, "première")]
+    assert [(r.timestamp, r.text) for r in processor.flush()] == [(1704110401.0, "sans fin")]
@@ -0,0 +1,80 @@
+"""Diffusion des logs en continu: tail du premier client et route SSE"""
+
+import asyncio
+import threading
+
+from conftest import wait_until
+from log_stream import LogBroadcaster
+
+
+class _Stream:
+    """Flux Docker simulé: lignes initiales puis attente de la fermeture"""
+
+    def __init__(self, lines):
+        self.lines = lines
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        yield "".join(f"{line}\n" for line in self.lines).encode()
+        self.closed.wait(5)
+
+    def close(self):
+        self.closed.set()
+
+
+def test_first_subscriber_tail_opens_the_stream():
+    requested = []
+
+    def open_stream(container_id, tail):
+        requested.append(tail)
+        return _Stream([f"ligne {i}" for i in range(200)][-tail:] if tail else [])
+
+    async def scenario():
+        broadcaster = LogBroadcaster(open_stream, backlog=200)
+        first = broadcaster.subscribe("c1", asyncio.get_running_loop(), tail=3)
+        lines, _, _ = await first.next_batch(timeout=2)
+        second = broadcaster.subscribe("c1", asyncio.get_running_loop(), tail=2)
+        replay, _, _ = await second.next_batch(timeout=2)
+        broadcaster.unsubscribe(first)
+        broadcaster.unsubscribe(second)
+
+        other = broadcaster.subscribe("c2", asyncio.get_running_loop(), tail=5000)
+        broadcaster.unsubscribe(other)
+        return [line.text for line in lines], [line.text for line in replay]
+
+    lines, replay = asyncio.run(scenario())
+    assert requested == [3, 200]
+    assert lines == ["ligne 197", "ligne 198", "ligne 199"]
+    assert replay == ["ligne 198", "ligne 199"]
+
+
+def test_stream_opened_by_route_honours_tail(backend, minishell):
+    launched = minishell("stream-tail")
+    container_id = launched["data"]["container_id"]
+    engine = backend.engine.engine
+    fake = engine.containers[container_id]
+    assert wait_until(lambda: len(fake.log_lines(engine.log_interval, 5000)) >= 40)
+
+    async def scenario():
+        # Même chemin que la route SSE, dans la boucle de l'application
+        success, message, subscriber = await backend.manager.aopen_log_stream(container_id, 4)
+        assert success, message
+        lines = []
+        try:
+            deadline = asyncio.get_running_loop().time() + 4 * engine.log_interval
+            while not lines or asyncio.get_running_loop().time() < deadline:
+                batch, _, _ = await subscriber.next_batch(timeout=engine.log_interval)
+                lines.extend(batch)
+        finally:
+            backend.manager.close_log_stream(subscriber)
+        return lines
+
+    # 4 lignes d'historique, plus celles produites pendant la lecture (pas le tail par défaut de 50)
+    assert 4 <= len(backend.portal.call(scenario)) <= 10
+
+
+def test_stream_route_reports_errors_with_status(backend, admin):
+    # Refus avant l'ouverture du flux: code HTTP d'erreur et non un corps ApiResponse en 200
+    response = backend.get("/containers/absent/logs/stream", auth=admin)
+    assert response.status_code == 404
+    assert response.headers["content-type"] == "application/json"
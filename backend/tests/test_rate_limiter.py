@@ -0,0 +1,71 @@
+"""Limitation du débit: seaux par identité vérifiée et par adresse IP, réponse 429"""
+
+import re
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from rate_limiter import RateLimiter, parse_rules
+from session_store import SessionStore
+
+API_KEY = "cle-de-test"
+ROUTES = [("logs", "GET", re.compile(r"^/(?:containers|sessions)/([^/]+)/logs(?:/stream)?$"))]
+
+
+@pytest.fixture
+def limited(backend):
+    """Route de logs limitée à 3 requêtes par minute (15 par adresse IP), sessions enregistrées a et b"""
+    # main lit sa configuration à l'import: l'environnement est préparé par le fixture backend
+    from main import RateLimitMiddleware
+
+    sessions = SessionStore(":memory:")
+    sessions.record("c1", "shell_a", "local", session_id="a")
+    sessions.record("c2", "shell_b", "local", session_id="b")
+    app = FastAPI()
+
+    @app.get("/containers/{container_id}/logs")
+    def logs(container_id: str):
+        return {"container_id": container_id}
+
+    limiter = RateLimiter(parse_rules("logs=3/60"))
+    middleware = RateLimitMiddleware(app, limiter, ROUTES, ip_factor=5, api_key=API_KEY,
+                                     trusted_proxies=["testclient"], is_session=sessions.exists)
+    yield TestClient(middleware)
+    sessions.close()
+
+
+def test_rotating_session_ids_does_not_bypass_limit(limited):
+    statuses = [
+        limited.get(f"/containers/c{i}/logs", headers={"X-Session-Id": f"inventee{i}"}).status_code
+        for i in range(5)
+    ]
+    assert statuses == [200, 200, 200, 429, 429]
+    response = limited.get("/containers/c1/logs?session_id=autre")
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert response.headers["RateLimit-Remaining"] == "0"
+    assert not response.json()["success"]
+
+
+def test_verified_identities_get_their_own_bucket(limited):
+    def statuses(**headers):
+        headers["X-Forwarded-For"] = "203.0.113.7"
+        return [limited.get("/containers/c1/logs", headers=headers).status_code for _ in range(4)]
+
+    # Seau propre à chaque session enregistrée et à la clé d'API valide (seau commun de l'adresse IP: 15)
+    assert statuses(**{"X-Session-Id": "a"}) == [200, 200, 200, 429]
+    assert statuses(**{"X-Session-Id": "b"}) == [200, 200, 200, 429]
+    assert statuses(**{"X-API-Key": API_KEY}) == [200, 200, 200, 429]
+    # Clé invalide: seau de l'adresse IP seule
+    assert statuses(**{"X-API-Key": "fausse"}) == [200, 200, 200, 429]
+
+
+def test_forwarded_address_taken_from_trusted_proxy(limited):
+    # Une adresse ajoutée par le client en tête de X-Forwarded-For ne donne pas un nouveau seau
+    statuses = [
+        limited.get("/containers/c1/logs", headers={"X-Forwarded-For": f"198.51.100.{i}, 203.0.113.9"}).status_code
+        for i in range(4)
+    ]
+    assert statuses == [200, 200, 200, 429]
+    assert limited.get("/containers/c1/logs", headers={"X-Forwarded-For": "203.0.113.10"}).status_code == 200
@@ -0,0 +1,77 @@
+"""Cache des réponses de lecture: revalidation par ETag, invalidation après écriture et génération"""
+
+import asyncio
+
+from conftest import wait_until
+from response_cache import ResponseCache, etag_matches, make_etag
+
+
+def test_etag_matching():
+    etag = make_etag(b"contenu")
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"autre", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag) and not etag_matches('"autre"', etag)
+
+
+def test_result_computed_before_invalidation_is_not_kept():
+    async def scenario():
+        cache = ResponseCache(ttl=60)
+        computing = asyncio.Event()
+        release = asyncio.Event()
+        computed = []
+
+        async def compute():
+            computed.append(len(computed))
+            computing.set()
+            await release.wait()
+            return f"corps {len(computed)}".encode(), make_etag(str(len(computed)).encode())
+
+        pending = asyncio.ensure_future(cache.aget("/containers", 1, compute))
+        await computing.wait()
+        # Écriture pendant le calcul: le résultat, antérieur à l'écriture, est servi mais pas conservé
+        cache.invalidate()
+        release.set()
+        first = await pending
+        second = await cache.aget("/containers", 1, compute)
+        third = await cache.aget("/containers", 1, compute)
+        return first, second, third, computed, cache.stats()
+
+    first, second, third, computed, stats = asyncio.run(scenario())
+    assert first.body == b"corps 1" and second.body == b"corps 2"
+    assert third is second and computed == [0, 1]
+    assert stats["hits"] == 1 and stats["misses"] == 2 and stats["entries"] == 1
+
+
+def test_route_revalidation_and_invalidation_after_write(backend, minishell, admin, monkeypatch):
+    responses = backend.manager.responses
+    # Cache désactivé pour les autres tests (RESPONSE_CACHE_TTL=0)
+    monkeypatch.setattr(responses, "ttl", 60)
+    responses.invalidate()
+    first = backend.get("/containers?minishell_only=true", auth=admin)
+    assert first.status_code == 200 and first.headers["Cache-Control"] == "no-cache"
+    etag = first.headers["ETag"]
+
+    not_modified = responses.stats()["not_modified"]
+    revalidated = backend.get("/containers?minishell_only=true", auth=admin, headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304 and revalidated.content == b""
+    assert revalidated.headers["ETag"] == etag
+    assert responses.stats()["not_modified"] == not_modified + 1
+    assert responses.stats()["entries"] == 1
+
+    # Une écriture du backend vide le cache: la réponse suivante est recalculée
+    stats = responses.stats()
+    launched = minishell("cache-write")
+    assert launched["success"], launched
+    assert responses.stats()["invalidations"] > stats["invalidations"]
+    assert responses.stats()["entries"] == 0
+    container_id = launched["data"]["container_id"]
+
+    def listed():
+        response = backend.get("/containers?minishell_only=true", auth=admin, headers={"If-None-Match": etag})
+        return response.status_code == 200 and container_id in response.text and response
+
+    changed = wait_until(listed)
+    assert changed and changed.headers["ETag"] != etag
+    assert responses.stats()["misses"] > stats["misses"]
+    responses.invalidate()
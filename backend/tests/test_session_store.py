@@ -0,0 +1,58 @@
+"""Registre des sessions: le registre fait foi pour la session et l'échéance, y compris des containers du pool"""
+
+import time
+
+from conftest import wait_until
+from session_store import EXITED, RUNNING, SessionStore
+
+
+def _observed(container_id, name, state=RUNNING, session_id=None, expires_at=None):
+    return {"container_id": container_id, "container_name": name, "session_id": session_id, "engine": "local",
+            "created_at": time.time(), "expires_at": expires_at, "idle_ttl": None, "state": state}
+
+
+def test_reconcile_keeps_recorded_session_and_expiry():
+    store = SessionStore(":memory:")
+    store.record("c1", "shell_alice", "local", session_id="alice", expires_at=1000.0)
+    # Container du pool: aucun label de session ni d'échéance, durée par défaut proposée
+    counts = store.reconcile("local", [_observed("c1", "shell_alice", expires_at=5000.0)])
+    assert counts == {"added": 0, "updated": 0, "removed": 0}
+    session = store.get("c1")
+    assert (session["session_id"], session["expires_at"]) == ("alice", 1000.0)
+
+
+def test_reconcile_only_fills_missing_columns():
+    store = SessionStore(":memory:")
+    store.record("c1", "shell_bob", "local", expires_at=1000.0)
+    store.record("c2", "shell_old", "local", session_id="old")
+    counts = store.reconcile("local", [
+        _observed("c1", "shell_bob", session_id="bob", expires_at=5000.0),
+        _observed("c3", "shell_new", state=EXITED, session_id="new"),
+    ])
+    assert counts == {"added": 1, "updated": 1, "removed": 1}
+    assert (store.get("c1")["session_id"], store.get("c1")["expires_at"]) == ("bob", 1000.0)
+    assert store.get("c2") is None
+    assert [session["container_id"] for session in store.by_session("new")] == ["c3"]
+
+
+def test_pooled_session_survives_rebuild(backend, minishell, admin):
+    manager = backend.manager
+    assert wait_until(lambda: manager.warm_pool.stats()["idle"] >= 1)
+    hits = manager.warm_pool.stats()["hits"]
+    launched = minishell("pooled-store")
+    assert launched["success"], launched
+    assert manager.warm_pool.stats()["hits"] == hits + 1
+    container_id = launched["data"]["container_id"]
+    assert "mishu.session" not in backend.engine.engine.containers[container_id].labels
+
+    recorded = manager.sessions.get(container_id)
+    manager._rebuild_expirations()
+    rebuilt = manager.sessions.get(container_id)
+    assert rebuilt["session_id"] == "pooled-store"
+    assert rebuilt["expires_at"] == recorded["expires_at"]
+    pending = {entry["container_id"]: entry for entry in manager.list_expirations()}
+    assert abs(pending[container_id]["hard_expires_at"] - recorded["expires_at"]) < 1
+
+    # Sélection par label de session: résolue par le registre
+    stopped = backend.post("/containers/bulk/stop", auth=admin, json={"labels": {"mishu.session": "pooled-store"}})
+    assert stopped.json()["data"]["succeeded"] == 1
@@ -0,0 +1,86 @@
+"""Statistiques avec plusieurs workers: lectures transmises au relais du leader, 503 sinon"""
+
+import asyncio
+import sqlite3
+
+import pytest
+
+from stats_relay import StatsRelay, aquery
+from worker_coordination import WorkerCoordinator
+
+
+@pytest.fixture
+def workers(tmp_path):
+    """Leader puis worker non leader partageant une base de coordination"""
+    path = str(tmp_path / "workers.db")
+    leader, worker = WorkerCoordinator(path), WorkerCoordinator(path)
+    leader._heartbeat()
+    worker._heartbeat()
+    assert leader.is_leader and not worker.is_leader
+    yield leader, worker
+    for coordinator in (worker, leader):
+        try:
+            coordinator.stop()
+        except sqlite3.ProgrammingError:
+            # Déjà arrêté par le test
+            pass
+
+
+def _relay(tmp_path, reads):
+    def read(container_id_or_name, resolution, points):
+        reads.append((container_id_or_name, resolution, points))
+        return True, "Statistiques du leader", {"points": points}
+
+    relay = StatsRelay(str(tmp_path / "stats.sock"), read)
+    relay.start()
+    return relay
+
+
+def test_worker_reads_through_leader_relay(tmp_path, workers):
+    leader, worker = workers
+    reads = []
+    relay = _relay(tmp_path, reads)
+    try:
+        assert worker.leader_endpoint("stats") is None
+        # Un point d'accès publié par un worker non leader n'est pas retenu
+        worker.publish_endpoint("stats", "/inexistant.sock")
+        assert worker.leader_endpoint("stats") is None
+
+        leader.publish_endpoint("stats", relay.path)
+        path = worker.leader_endpoint("stats")
+        assert path == relay.path
+        assert asyncio.run(aquery(path, "shell_1", 10, 30)) == (True, "Statistiques du leader", {"points": 30})
+        assert reads == [("shell_1", 10, 30)]
+
+        leader.stop()
+        assert worker.leader_endpoint("stats") is None
+    finally:
+        relay.stop()
+
+
+def test_stats_routes_on_non_leader_worker(backend, admin, tmp_path, workers):
+    manager = backend.manager
+    leader, worker = workers
+    assert manager.resource_stats.enabled and manager.coordinator is None
+    reads = []
+    manager.coordinator = worker
+    try:
+        # Aucun relais publié (élection en cours): 503 et délai avant nouvel essai
+        response = backend.get("/mini-shell/stats", auth=admin)
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == str(int(worker.interval))
+        assert not response.json()["success"]
+
+        relay = _relay(tmp_path, reads)
+        leader.publish_endpoint("stats", relay.path)
+        response = backend.get("/containers/shell_1/stats?points=7", auth=admin)
+        assert response.status_code == 200 and response.json()["data"] == {"points": 7}
+        response = backend.get("/mini-shell/stats", auth=admin)
+        assert response.json()["success"] and reads[-1] == (None, None, 60)
+
+        # Relais fermé (leader arrêté brutalement): 503
+        relay.stop()
+        response = backend.get("/mini-shell/stats", auth=admin)
+        assert response.status_code == 503 and "Retry-After" in response.headers
+    finally:
+        manager.coordinator = None
@@ -0,0 +1,78 @@
+"""Lancement d'un Mini Shell puis terminal interactif (WebSocket) contre le moteur simulé"""
+
+import json
+
+from starlette.websockets import WebSocketDisconnect
+
+from conftest import wait_until
+
+
+def _read_until(websocket, marker: bytes) -> bytes:
+    output = b""
+    while marker not in output:
+        output += websocket.receive_bytes()
+    return output
+
+
+def test_launch_then_terminal(backend, minishell, admin, api_headers):
+    launched = minishell("terminal")
+    assert launched["success"], launched["message"]
+    container_id = launched["data"]["container_id"]
+
+    with backend.websocket_connect(f"/containers/{container_id}/terminal?cols=120&rows=40",
+                                   headers=api_headers) as websocket:
+        assert _read_until(websocket, b"$ ").endswith(b"$ ")
+        websocket.send_text(json.dumps({"type": "resize", "cols": 100, "rows": 30}))
+        websocket.send_text(json.dumps({"type": "input", "data": "echo bonjour\r"}))
+        assert b"bonjour\r\n$ " in _read_until(websocket, b"bonjour\r\n$ ")
+        websocket.send_bytes(b"exit\r")
+        message = websocket.receive()
+        while message.get("text") is None:
+            message = websocket.receive()
+        assert json.loads(message["text"]) == {"type": "exit", "exit_code": 0}
+
+    terminals = backend.get("/terminals", auth=admin).json()["data"]
+    assert terminals["active"] == 0 and terminals["opened"] >= 1
+
+
+def _assert_refused(backend, path: str):
+    with backend.websocket_connect(path) as websocket:
+        error = json.loads(websocket.receive_text())
+        assert error["type"] == "error"
+        try:
+            websocket.receive_text()
+        except WebSocketDisconnect as e:
+            assert e.code == 1008
+
+
+def test_terminal_requires_credentials(backend, minishell):
+    launched = minishell("anonymous")
+    container_id = launched["data"]["container_id"]
+    _assert_refused(backend, f"/containers/{container_id}/terminal")
+    # L'identifiant de session, visible dans le nom du container, ne donne pas accès au terminal
+    _assert_refused(backend, f"/containers/{container_id}/terminal?session_id=anonymous")
+
+
+def test_pooled_container_terminal_with_session_token(backend, minishell, admin):
+    manager = backend.manager
+    assert wait_until(lambda: manager.warm_pool.stats()["idle"] >= 1)
+    hits = manager.warm_pool.stats()["hits"]
+    launched = minishell("pooled-terminal")
+    assert launched["success"], launched
+    assert manager.warm_pool.stats()["hits"] == hits + 1
+    container_id, token = launched["data"]["container_id"], launched["data"]["terminal_token"]
+    assert token
+
+    # Le jeton n'apparaît dans aucune liste
+    for listing in ("/containers?all_containers=true", "/sessions/pooled-terminal"):
+        assert token not in backend.get(listing, auth=admin).text
+
+    _assert_refused(backend, f"/containers/{container_id}/terminal?token={'0' * len(token)}")
+    with backend.websocket_connect(f"/containers/{container_id}/terminal?token={token}") as websocket:
+        _read_until(websocket, b"$ ")
+        websocket.send_bytes(b"echo pool\r")
+        assert b"pool\r\n$ " in _read_until(websocket, b"pool\r\n$ ")
+
+    # Jeton lié au container: inutilisable sur un autre Mini Shell
+    other = minishell("other-terminal")
+    _assert_refused(backend, f"/containers/{other['data']['container_id']}/terminal?token={token}")
@@ -0,0 +1,85 @@
+"""Pool de containers pré-démarrés: remplissage, attribution, épuisement et reprise au redémarrage"""
+
+import asyncio
+
+import docker
+import pytest
+
+from async_docker import AsyncDockerClient
+from conftest import wait_until
+from warm_pool import POOL_NAME_PREFIX, WarmPool
+
+IMAGE = "mishu_minishell:latest"
+LABELS = {"app": "mishu-minishell"}
+
+
+@pytest.fixture
+def engine(fake_engine):
+    client = docker.DockerClient(base_url=fake_engine.url)
+    yield fake_engine, client
+    client.close()
+
+
+def test_refill_up_to_size_in_batches(engine):
+    fake, client = engine
+    pool = WarmPool(client, IMAGE, size=3, refill_batch=2, labels=LABELS)
+    pool._refill()
+    assert pool.stats()["idle"] == 2
+    pool._refill()
+    pool._refill()
+    assert pool.stats()["idle"] == 3 and pool.stats()["created"] == 3
+    containers = list(fake.engine.containers.values())
+    assert all(c.name.startswith(POOL_NAME_PREFIX) and c.status == "running" for c in containers)
+
+
+def test_hand_off_leaves_no_pool_marker(engine):
+    fake, client = engine
+    pool = WarmPool(client, IMAGE, size=2, labels=LABELS)
+    pool._refill()
+    pool._refill()
+
+    container = pool.acquire("shell_session1")
+    attrs = client.api.inspect_container(container.id)
+    assert attrs["Name"] == "/shell_session1" and attrs["State"]["Running"]
+    # Plus rien ne désigne le container attribué comme appartenant au pool
+    assert not pool.is_pool_container(attrs["Name"])
+    assert attrs["Config"]["Labels"] == LABELS
+
+    async def aacquire():
+        aclient = AsyncDockerClient(fake.socket_path)
+        try:
+            return await aclient.inspect_container(await pool.aacquire("shell_session2", aclient))
+        finally:
+            await aclient.close()
+
+    attrs = asyncio.run(aacquire())
+    assert attrs["Name"] == "/shell_session2" and attrs["Config"]["Labels"] == LABELS
+    assert pool.stats()["hits"] == 2 and pool.stats()["idle"] == 0
+
+    # Redémarrage du backend: seuls les containers encore en attente sont repris
+    pool._refill()
+    restarted = WarmPool(client, IMAGE, size=2, labels=LABELS)
+    restarted._adopt_existing()
+    assert [c.name for c in restarted._idle] == [c.name for c in pool._idle]
+
+
+def test_exhausted_pool_misses_and_wakes_refill(engine):
+    fake, client = engine
+    pool = WarmPool(client, IMAGE, size=1, refill_interval=60, labels=LABELS)
+    pool._refill()
+    assert pool.acquire("shell_a") is not None
+    assert pool.acquire("shell_b") is None
+    assert pool.stats()["misses"] == 1 and pool.stats()["hit_ratio"] == 0.5
+
+    # Le miss réveille le thread de remplissage sans attendre refill_interval
+    pool.start()
+    try:
+        assert wait_until(lambda: pool.stats()["idle"] == 1, timeout=2)
+    finally:
+        pool.stop()
+
+    # Container du pool arrêté entre-temps: abandonné au profit du suivant, ou miss
+    idle = pool._idle[0]
+    client.api.stop(idle.id)
+    assert pool.acquire("shell_c") is None
+    assert pool.stats()["discarded"] == 1 and idle.id not in fake.engine.containers
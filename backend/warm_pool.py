@@ -0,0 +1,263 @@
+"""
+Module de gestion d'un pool de containers Mini Shell pré-démarrés
+Ce module maintient N containers inactifs prêts à être attribués à une session. Un container du pool
+n'est reconnu qu'à son nom: les labels Docker ne sont plus modifiables après la création, et un label
+propre au pool resterait sur le container une fois attribué et renommé
+"""
+
+import collections
+import logging
+import threading
+import time
+import uuid
+from typing import Callable, Deque, Dict, Optional
+
+import docker
+
+logger = logging.getLogger(__name__)
+
+# Préfixe des noms de containers en attente dans le pool (retiré par le renommage lors de l'attribution)
+POOL_NAME_PREFIX = "mishu_pool_"
+
+
+class WarmPool:
+    """Classe pour maintenir un pool de containers Mini Shell déjà en cours d'exécution"""
+
+    def __init__(self,
+                 client: docker.DockerClient,
+                 image_name: str,
+                 size: int = 2,
+                 refill_interval: float = 5.0,
+                 refill_batch: int = 1,
+                 labels: Optional[Dict[str, str]] = None,
+                 options_factory: Optional[Callable[[str], Dict]] = None):
+        """
+        Initialise le pool
+
+        Args:
+            client (docker.DockerClient): Client Docker utilisé pour créer les containers
+            image_name (str): Image des containers du pool
+            size (int): Nombre de containers inactifs à maintenir (0 désactive le pool)
+            refill_interval (float): Intervalle en secondes entre deux remplissages
+            refill_batch (int): Nombre maximum de containers créés par remplissage
+            labels (Dict[str, str], optional): Labels posés sur les containers (et recherchés lors de l'adoption)
+            options_factory (Callable[[str], Dict], optional): Retourne, pour le nom d'un nouveau
+                container, des options supplémentaires de containers.run() (labels compris)
+        """
+        self.client = client
+        self.image_name = image_name
+        self.size = max(0, size)
+        self.refill_interval = refill_interval
+        self.refill_batch = max(1, refill_batch)
+        self.labels = dict(labels or {})
+        self.options_factory = options_factory
+
+        self._idle: Deque = collections.deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.created = 0
+        self.discarded = 0
+
+    def start(self):
+        """Adopte les containers du pool déjà présents puis démarre le thread de remplissage"""
+        if self.size == 0 or (self._thread and self._thread.is_alive()):
+            return
+
+        self._adopt_existing()
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._refill_loop, name="warm-pool-refill")
+        self._thread.daemon = True
+        self._thread.start()
+        logger.info(f"Pool de containers démarré (taille: {self.size})")
+
+    def stop(self):
+        """Arrête le thread de remplissage (les containers inactifs restent en place)"""
+        self._stopping.set()
+        self._wakeup.set()
+
+    def acquire(self, container_name: str):
+        """
+        Attribue un container inactif du pool à une session
+
+        Args:
+            container_name (str): Nom définitif à donner au container
+
+        Returns:
+            Container ou None si le pool est vide
+        """
+        if self.size == 0:
+            return None
+
+        while True:
+            container = self._take()
+            if container is None:
+                return None
+
+            try:
+                container.reload()
+                if container.status != 'running':
+                    raise RuntimeError(f"statut {container.status}")
+                container.rename(container_name)
+                container.reload()
+            except Exception as e:
+                logger.warning(f"Container du pool {container.name} inutilisable, abandon: {e}")
+                self._discard(container)
+                continue
+
+            self._handed_off(container_name)
+            return container
+
+    async def aacquire(self, container_name: str, aclient) -> Optional[str]:
+        """
+        Variante asynchrone de acquire() utilisant le client asyncio
+
+        Args:
+            container_name (str): Nom définitif à donner au container
+            aclient (AsyncDockerClient): Client Docker asynchrone
+
+        Returns:
+            str ou None: ID du container attribué, None si le pool est vide
+        """
+        if self.size == 0:
+            return None
+
+        while True:
+            container = self._take()
+            if container is None:
+                return None
+
+            try:
+                attrs = await aclient.inspect_container(container.id)
+                if attrs["State"]["Status"] != 'running':
+                    raise RuntimeError(f"statut {attrs['State']['Status']}")
+                await aclient.rename(container.id, container_name)
+            except Exception as e:
+                logger.warning(f"Container du pool {container.name} inutilisable, abandon: {e}")
+                with self._lock:
+                    self.discarded += 1
+                try:
+                    await aclient.remove(container.id, force=True)
+                except Exception as e:
+                    logger.error(f"Erreur lors de la suppression du container du pool {container.name}: {e}")
+                continue
+
+            self._handed_off(container_name)
+            return container.id
+
+    def stats(self) -> Dict:
+        """
+        Retourne l'état et les compteurs du pool
+
+        Returns:
+            Dict: Taille cible, containers disponibles et compteurs hit/miss
+        """
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "size": self.size,
+                "idle": len(self._idle),
+                "refill_interval": self.refill_interval,
+                "refill_batch": self.refill_batch,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / requests if requests else None,
+                "created": self.created,
+                "discarded": self.discarded,
+            }
+
+    def _take(self):
+        """Retire un container inactif du pool (None et un miss comptabilisé si le pool est vide)"""
+        with self._lock:
+            if self._idle:
+                return self._idle.popleft()
+            self.misses += 1
+        self._wakeup.set()
+        return None
+
+    def _handed_off(self, container_name: str):
+        """Comptabilise l'attribution d'un container et déclenche le remplissage"""
+        with self._lock:
+            self.hits += 1
+        logger.info(f"Container du pool attribué sous le nom {container_name}")
+        self._wakeup.set()
+
+    def is_pool_container(self, name: str) -> bool:
+        """Indique si un nom de container correspond à un container en attente dans le pool"""
+        return name.lstrip('/').startswith(POOL_NAME_PREFIX)
+
+    def _adopt_existing(self):
+        """Récupère les containers du pool laissés par une exécution précédente"""
+        try:
+            containers = self.client.containers.list(all=True, filters={
+                "name": POOL_NAME_PREFIX,
+                "label": [f"{key}={value}" for key, value in self.labels.items()]
+            })
+        except Exception as e:
+            logger.error(f"Erreur lors de la récupération des containers du pool: {e}")
+            return
+
+        for container in containers:
+            if not self.is_pool_container(container.name):
+                continue
+            if container.status == 'running' and len(self._idle) < self.size:
+                self._idle.append(container)
+            else:
+                self._discard(container)
+
+        if self._idle:
+            logger.info(f"{len(self._idle)} containers du pool récupérés")
+
+    def _refill_loop(self):
+        """Boucle de remplissage exécutée dans un thread dédié"""
+        while not self._stopping.is_set():
+            try:
+                self._refill()
+            except Exception as e:
+                logger.error(f"Erreur lors du remplissage du pool: {e}")
+            self._wakeup.wait(self.refill_interval)
+            self._wakeup.clear()
+
+    def _refill(self):
+        """Crée au plus refill_batch containers pour revenir à la taille cible"""
+        with self._lock:
+            missing = self.size - len(self._idle)
+        if missing <= 0:
+            return
+
+        try:
+            self.client.images.get(self.image_name)
+        except docker.errors.ImageNotFound:
+            logger.debug(f"Image {self.image_name} absente, remplissage du pool différé")
+            return
+
+        for _ in range(min(missing, self.refill_batch)):
+            if self._stopping.is_set():
+                return
+            name = f"{POOL_NAME_PREFIX}{uuid.uuid4().hex[:12]}"
+            started = time.monotonic()
+            options = self.options_factory(name) if self.options_factory else {}
+            container = self.client.containers.run(
+                image=self.image_name,
+                name=name,
+                detach=True,
+                labels=dict(options.pop("labels", {}), **self.labels),
+                **options
+            )
+            with self._lock:
+                self._idle.append(container)
+                self.created += 1
+            logger.info(f"Container {name} ajouté au pool en {time.monotonic() - started:.2f}s")
+
+    def _discard(self, container):
+        """Supprime un container du pool devenu inutilisable"""
+        with self._lock:
+            self.discarded += 1
+        try:
+            container.remove(force=True)
+        except Exception as e:
+            logger.error(f"Erreur lors de la suppression du container du pool {container.name}: {e}")
@@ -0,0 +1,440 @@
+"""
+Module de coordination des workers du backend (uvicorn --workers)
+Les workers d'une même machine partagent une base SQLite en mode WAL: un bail désigne le leader qui
+exécute seul les tâches de fond (arrêts automatiques, mise en pause, nettoyage, pool), des verrous
+empêchent deux workers de lancer le même container, et les places d'admission réservées, les tickets
+de la file d'attente, les activités des Mini Shell et les points d'accès du leader y sont visibles
+de tous les workers
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS workers (
+    worker_id TEXT PRIMARY KEY,
+    pid INTEGER NOT NULL,
+    started_at REAL NOT NULL,
+    seen_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS locks (
+    key TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS slots (
+    key TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tickets (
+    ticket_id TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    data TEXT NOT NULL,
+    seen_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS activity (
+    container_id TEXT PRIMARY KEY,
+    at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS activity_by_time ON activity (at);
+CREATE TABLE IF NOT EXISTS endpoints (
+    name TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    path TEXT NOT NULL,
+    PRIMARY KEY (name, owner)
+);
+"""
+
+# Bail des tâches de fond
+LEADER_LEASE = "leader"
+
+
+class LockTimeout(TimeoutError):
+    """Verrou détenu par un autre worker au-delà du délai d'attente"""
+
+
+class WorkerCoordinator:
+    """Classe de coordination d'un worker avec les autres workers de la machine"""
+
+    def __init__(self,
+                 path: str,
+                 lease_ttl: float = 15.0,
+                 on_elected: Optional[Callable[[], None]] = None,
+                 on_demoted: Optional[Callable[[], None]] = None,
+                 on_tick: Optional[Callable[[bool], None]] = None):
+        """
+        Ouvre (ou crée) la base partagée
+
+        Args:
+            path (str): Chemin du fichier SQLite, commun à tous les workers
+            lease_ttl (float): Durée du bail du leader en secondes (renouvelé toutes les lease_ttl / 3 secondes)
+            on_elected (Callable[[], None], optional): Appelé quand ce worker devient leader
+            on_demoted (Callable[[], None], optional): Appelé quand ce worker perd le bail
+            on_tick (Callable[[bool], None], optional): Appelé à chaque renouvellement, avec True si leader
+        """
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.lease_ttl = lease_ttl
+        self.interval = lease_ttl / 3
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.on_tick = on_tick
+        self.is_leader = False
+        self.started_at = time.time()
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._touched: Dict[str, float] = {}
+
+        self.elections = 0
+        self.lock_waits = 0
+
+    def start(self):
+        """Enregistre le worker puis démarre le thread de renouvellement du bail"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._heartbeat()
+        self._thread = threading.Thread(target=self._run, name="worker-coordination")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Arrête le renouvellement et libère le bail, les verrous et les places de ce worker"""
+        self._stopping.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.interval)
+        with self._transaction() as conn:
+            for table in ("leases", "locks", "slots", "tickets", "endpoints"):
+                conn.execute(f"DELETE FROM {table} WHERE owner = ?", (self.worker_id,))
+            conn.execute("DELETE FROM workers WHERE worker_id = ?", (self.worker_id,))
+        self.is_leader = False
+        # Sous le verrou: une écriture différée (file d'admission) ne peut utiliser la connexion pendant sa fermeture
+        with self._lock:
+            self._conn.close()
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        """Transaction en écriture (BEGIN IMMEDIATE: les écritures concurrentes des autres workers attendent)"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    # Bail du leader
+
+    def _heartbeat(self):
+        """Signale que le worker est en vie et acquiert ou renouvelle le bail du leader"""
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO workers (worker_id, pid, started_at, seen_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (worker_id) DO UPDATE SET seen_at = excluded.seen_at",
+                (self.worker_id, os.getpid(), self.started_at, now)
+            )
+            conn.execute("DELETE FROM workers WHERE seen_at < ?", (now - 3 * self.lease_ttl,))
+            # Le bail est pris s'il est libre, expiré ou déjà détenu par ce worker
+            cursor = conn.execute(
+                "INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE leases.owner = excluded.owner OR leases.expires_at < ?",
+                (LEADER_LEASE, self.worker_id, now + self.lease_ttl, now)
+            )
+            leader = cursor.rowcount > 0
+            # Les verrous, places, tickets et activités abandonnés (worker arrêté brutalement) expirent
+            conn.execute("DELETE FROM locks WHERE expires_at < ?", (now,))
+            conn.execute("DELETE FROM slots WHERE expires_at < ?", (now,))
+            conn.execute("DELETE FROM tickets WHERE owner NOT IN (SELECT worker_id FROM workers)")
+            conn.execute("DELETE FROM endpoints WHERE owner NOT IN (SELECT worker_id FROM workers)")
+            conn.execute("DELETE FROM activity WHERE at < ?", (now - 3 * self.lease_ttl,))
+
+        if leader and not self.is_leader:
+            self.is_leader = True
+            self.elections += 1
+            logger.info(f"Worker {self.worker_id} élu leader des tâches de fond")
+            if self.on_elected:
+                self.on_elected()
+        elif not leader and self.is_leader:
+            self.is_leader = False
+            logger.warning(f"Worker {self.worker_id} n'est plus leader des tâches de fond")
+            if self.on_demoted:
+                self.on_demoted()
+
+    def _run(self):
+        """Boucle principale: renouvellement du bail et synchronisation toutes les interval secondes"""
+        while not self._stopping.wait(self.interval):
+            try:
+                self._heartbeat()
+                if self.on_tick:
+                    self.on_tick(self.is_leader)
+            except Exception as e:
+                logger.error(f"Erreur lors de la coordination des workers: {e}")
+
+    # Verrous
+
+    def try_lock(self, key: str, ttl: float = 60.0) -> bool:
+        """
+        Prend un verrou partagé sans attendre
+
+        Args:
+            key (str): Nom du verrou
+            ttl (float): Durée après laquelle un verrou abandonné peut être repris
+
+        Returns:
+            bool: True si le verrou est pris par ce worker
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "INSERT INTO locks (key, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE locks.expires_at < ?",
+                (key, self.worker_id, now + ttl, now)
+            )
+        return cursor.rowcount > 0
+
+    def unlock(self, key: str):
+        """Libère un verrou pris par ce worker"""
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM locks WHERE key = ? AND owner = ?", (key, self.worker_id))
+
+    @contextlib.contextmanager
+    def lock(self, key: str, timeout: float = 30.0, ttl: float = 60.0):
+        """
+        Verrou partagé entre workers (attente active courte)
+
+        Args:
+            key (str): Nom du verrou
+            timeout (float): Délai maximum d'attente en secondes
+            ttl (float): Durée après laquelle un verrou abandonné peut être repris
+
+        Raises:
+            LockTimeout: Si le verrou n'a pas pu être pris à temps
+        """
+        deadline = time.monotonic() + timeout
+        delay = 0.01
+        while not self.try_lock(key, ttl):
+            if time.monotonic() >= deadline:
+                raise LockTimeout(f"Verrou {key} détenu par un autre worker")
+            self.lock_waits += 1
+            time.sleep(delay)
+            delay = min(delay * 2, 0.2)
+        try:
+            yield
+        finally:
+            self.unlock(key)
+
+    @contextlib.asynccontextmanager
+    async def alock(self, key: str, timeout: float = 30.0, ttl: float = 60.0):
+        """Variante asynchrone de lock (l'attente et les transactions SQLite ne bloquent pas la boucle asyncio)"""
+        loop = asyncio.get_running_loop()
+        deadline = time.monotonic() + timeout
+        delay = 0.01
+        while not await loop.run_in_executor(None, self.try_lock, key, ttl):
+            if time.monotonic() >= deadline:
+                raise LockTimeout(f"Verrou {key} détenu par un autre worker")
+            self.lock_waits += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.2)
+        try:
+            yield
+        finally:
+            await loop.run_in_executor(None, self.unlock, key)
+
+    # Places d'admission
+
+    def reserve(self, key: str, limit: int, ttl: float) -> bool:
+        """
+        Réserve une place d'admission si moins de limit places sont réservées par l'ensemble des workers
+
+        Une place déjà réservée pour ce nom de container (ticket admis par un autre worker) est reprise.
+
+        Args:
+            key (str): Nom du container
+            limit (int): Places disponibles (capacité moins les containers en cours d'exécution)
+            ttl (float): Durée de la réservation (délai laissé au lancement)
+
+        Returns:
+            bool: True si la place est réservée
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE slots SET owner = ?, expires_at = ? WHERE key = ? AND expires_at >= ?",
+                (self.worker_id, now + ttl, key, now)
+            )
+            if cursor.rowcount > 0:
+                return True
+            reserved = conn.execute("SELECT COUNT(*) FROM slots WHERE expires_at >= ?", (now,)).fetchone()[0]
+            if reserved >= limit:
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO slots (key, owner, expires_at) VALUES (?, ?, ?)",
+                (key, self.worker_id, now + ttl)
+            )
+        return True
+
+    def unreserve(self, key: str):
+        """Libère la place réservée par ce worker pour un nom de container"""
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM slots WHERE key = ? AND owner = ?", (key, self.worker_id))
+
+    def reservations(self) -> int:
+        """Nombre de places réservées par l'ensemble des workers"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM slots WHERE expires_at >= ?", (time.time(),)).fetchone()[0]
+
+    # Tickets de la file d'attente
+
+    def publish_ticket(self, ticket: Dict):
+        """Rend l'état d'un ticket de ce worker consultable par les autres workers"""
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO tickets (ticket_id, owner, data, seen_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (ticket_id) DO UPDATE SET data = excluded.data",
+                (ticket["ticket_id"], self.worker_id, json.dumps(ticket), time.time())
+            )
+
+    def drop_ticket(self, ticket_id: str):
+        """Retire un ticket terminé"""
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM tickets WHERE ticket_id = ?", (ticket_id,))
+
+    def ticket(self, ticket_id: str) -> Optional[Dict]:
+        """
+        Consulte un ticket d'un autre worker et note que son client est toujours là
+
+        Args:
+            ticket_id (str): Identifiant du ticket
+
+        Returns:
+            Dict ou None: Dernier état publié du ticket
+        """
+        with self._transaction() as conn:
+            row = conn.execute("SELECT data FROM tickets WHERE ticket_id = ?", (ticket_id,)).fetchone()
+            if row is not None:
+                conn.execute("UPDATE tickets SET seen_at = ? WHERE ticket_id = ?", (time.time(), ticket_id))
+        return json.loads(row[0]) if row else None
+
+    def ticket_seen(self, ticket_id: str) -> Optional[float]:
+        """Dernière consultation d'un ticket par l'intermédiaire d'un autre worker (timestamp)"""
+        with self._lock:
+            row = self._conn.execute("SELECT seen_at FROM tickets WHERE ticket_id = ?", (ticket_id,)).fetchone()
+        return row[0] if row else None
+
+    # Points d'accès du leader
+
+    def publish_endpoint(self, name: str, path: Optional[str]):
+        """
+        Publie (ou retire si path est None) un point d'accès de ce worker
+
+        Args:
+            name (str): Nom du service, par exemple "stats"
+            path (str, optional): Chemin du socket unix
+        """
+        with self._transaction() as conn:
+            if path is None:
+                conn.execute("DELETE FROM endpoints WHERE name = ? AND owner = ?", (name, self.worker_id))
+            else:
+                conn.execute(
+                    "INSERT INTO endpoints (name, owner, path) VALUES (?, ?, ?) "
+                    "ON CONFLICT (name, owner) DO UPDATE SET path = excluded.path",
+                    (name, self.worker_id, path)
+                )
+
+    def leader_endpoint(self, name: str) -> Optional[str]:
+        """
+        Point d'accès publié par le leader actuel
+
+        Args:
+            name (str): Nom du service
+
+        Returns:
+            str ou None: Chemin du socket, None si le bail a expiré ou si le leader ne l'a pas encore publié
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT endpoints.path FROM endpoints JOIN leases ON leases.owner = endpoints.owner "
+                "WHERE leases.name = ? AND leases.expires_at >= ? AND endpoints.name = ?",
+                (LEADER_LEASE, time.time(), name)
+            ).fetchone()
+        return row[0] if row else None
+
+    # Activité des Mini Shell
+
+    def touch(self, container_id: str):
+        """Signale une activité sur un Mini Shell au leader (au plus une écriture par intervalle)"""
+        now = time.time()
+        if now - self._touched.get(container_id, 0.0) < self.interval:
+            return
+        self._touched[container_id] = now
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO activity (container_id, at) VALUES (?, ?) "
+                "ON CONFLICT (container_id) DO UPDATE SET at = excluded.at",
+                (container_id, now)
+            )
+
+    def activity_since(self, since: float) -> List[Tuple[str, float]]:
+        """
+        Activités signalées depuis un instant donné
+
+        Args:
+            since (float): Timestamp de la dernière lecture
+
+        Returns:
+            List[Tuple[str, float]]: (ID du container, instant de l'activité), de la plus ancienne à la plus récente
+        """
+        with self._lock:
+            return [tuple(row) for row in self._conn.execute(
+                "SELECT container_id, at FROM activity WHERE at > ? ORDER BY at", (since,)
+            ).fetchall()]
+
+    def stats(self) -> Dict:
+        """Retourne l'identité du worker, le leader et les workers actifs"""
+        with self._lock:
+            lease = self._conn.execute(
+                "SELECT owner, expires_at FROM leases WHERE name = ?", (LEADER_LEASE,)
+            ).fetchone()
+            workers = [row[0] for row in self._conn.execute(
+                "SELECT worker_id FROM workers WHERE seen_at >= ? ORDER BY started_at",
+                (time.time() - 2 * self.lease_ttl,)
+            ).fetchall()]
+            locks = self._conn.execute("SELECT COUNT(*) FROM locks").fetchone()[0]
+        return {
+            "worker_id": self.worker_id,
+            "leader": lease[0] if lease and lease[1] >= time.time() else None,
+            "is_leader": self.is_leader,
+            "workers": workers,
+            "locks": locks,
+            "reserved": self.reservations(),
+            "elections": self.elections,
+            "lock_waits": self.lock_waits,
+        }
@@ -90,6 +90,32 @@ class DockerAPI {
         }
     }
 
+    /**
+     * Attend l'évolution d'un ticket de la file d'attente de lancement (long polling)
+     * @param {string} ticketId Identifiant du ticket renvoyé par runMiniShellContainer
+     * @param {number} wait Durée maximum d'attente côté serveur en secondes
+     * @returns {Promise<Object>} État du ticket (position, attente estimée, admission)
+     */
+    async waitForAdmission(ticketId, wait = 25) {
+        try {
+            // Créer des informations d'authentification (base64 de "admin:adminpassword")
+            const authHeader = 'Basic ' + btoa('admin:adminpassword');
+            
+            const response = await fetch(`${API_BASE_URL}/mini-shell/queue/${ticketId}?wait=${wait}`, {
+                headers: {
+                    'Authorization': authHeader
+                }
+            });
+            return await response.json();
+        } catch (error) {
+            console.error('Erreur lors du suivi de la file d\'attente:', error);
+            return { 
+                success: false, 
+                message: 'Erreur de connexion au serveur' 
+            };
+        }
+    }
+
     /**
      * Méthode utilitaire pour générer un identifiant de session unique
      * @returns {string} Identifiant de session
@@ -137,14 +163,17 @@ class DockerAPI {
      * Récupère les logs d'un container
      * @param {string} containerId ID ou nom du container
      * @param {number} tail Nombre de lignes à récupérer
+     * @param {number|null} cursor Curseur renvoyé par l'appel précédent (seules les nouvelles lignes sont renvoyées)
+     * @param {string} format 'text' pour data.logs, 'json' pour data.records (lignes déjà classées par le serveur)
      * @returns {Promise<Object>} Logs du container
      */
-    async getContainerLogs(containerId, tail = 100) {
+    async getContainerLogs(containerId, tail = 100, cursor = null, format = 'text') {
         try {
             // Créer des informations d'authentification (base64 de "admin:adminpassword")
             const authHeader = 'Basic ' + btoa('admin:adminpassword');
             
-            const response = await fetch(`${API_BASE_URL}/containers/${containerId}/logs?tail=${tail}`, {
+            const cursorParam = cursor !== null ? `&cursor=${cursor}` : '';
+            const response = await fetch(`${API_BASE_URL}/containers/${containerId}/logs?tail=${tail}${cursorParam}&format=${format}`, {
                 headers: {
                     'Authorization': authHeader,
                     'X-API-Key': 'your-secret-api-key'
@@ -157,11 +186,97 @@ class DockerAPI {
             return { 
                 success: false, 
                 message: 'Erreur de connexion au serveur',
-                data: { logs: '' }
+                data: { logs: '', records: [] }
             };
         }
     }
 
+    /**
+     * Indique si le navigateur permet de lire une réponse en flux continu
+     * @returns {boolean} true si le streaming des logs est supporté
+     */
+    supportsLogStreaming() {
+        return typeof ReadableStream !== 'undefined' && typeof TextDecoder !== 'undefined' && typeof AbortController !== 'undefined';
+    }
+
+    /**
+     * Suit les logs d'un container en continu (Server-Sent Events lus via fetch pour transmettre l'authentification)
+     * @param {string} containerId ID ou nom du container
+     * @param {number} tail Nombre de lignes récentes à recevoir immédiatement
+     * @param {Function} onLines Fonction appelée avec chaque lot de nouvelles lignes ({seq, timestamp, stream, kind, text})
+     * @param {AbortSignal} signal Signal permettant d'interrompre le flux
+     * @returns {Promise<void>} Résolue à la fin du flux
+     */
+    async streamContainerLogs(containerId, tail, onLines, signal) {
+        // Créer des informations d'authentification (base64 de "admin:adminpassword")
+        const authHeader = 'Basic ' + btoa('admin:adminpassword');
+        
+        const response = await fetch(`${API_BASE_URL}/containers/${containerId}/logs/stream?tail=${tail}&format=json`, {
+            headers: {
+                'Authorization': authHeader,
+                'X-API-Key': 'your-secret-api-key',
+                'Accept': 'text/event-stream'
+            },
+            signal: signal
+        });
+        
+        if (!response.ok || !response.body || !(response.headers.get('Content-Type') || '').includes('text/event-stream')) {
+            throw new Error(`Flux de logs indisponible (HTTP ${response.status})`);
+        }
+        
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) return;
+            
+            buffer += decoder.decode(value, { stream: true });
+            const events = buffer.split('\n\n');
+            buffer = events.pop();
+            
+            for (const event of events) {
+                const lines = [];
+                let type = 'message';
+                for (const field of event.split('\n')) {
+                    if (field.startsWith('event: ')) {
+                        type = field.substring(7);
+                    } else if (field.startsWith('data: ')) {
+                        lines.push(JSON.parse(field.substring(6)));
+                    }
+                }
+                if (type === 'end') return;
+                if (type === 'message' && lines.length > 0) onLines(lines);
+            }
+        }
+    }
+
+    /**
+     * Indique si le navigateur permet d'ouvrir un terminal interactif
+     * @returns {boolean} true si WebSocket et TextDecoder sont disponibles
+     */
+    supportsTerminal() {
+        return typeof WebSocket !== 'undefined' && typeof TextDecoder !== 'undefined' && typeof TextEncoder !== 'undefined';
+    }
+
+    /**
+     * Ouvre un terminal interactif dans un container (WebSocket relayant les octets du TTY)
+     * Messages binaires: saisie et sortie brutes; messages texte: commandes JSON (resize) et événements (exit, idle, error)
+     * @param {string} containerId ID ou nom du container
+     * @param {string} token Jeton du terminal renvoyé au lancement (terminal_token)
+     * @param {number} cols Largeur initiale du terminal
+     * @param {number} rows Hauteur initiale du terminal
+     * @returns {WebSocket} Connexion au terminal
+     */
+    openTerminal(containerId, token, cols = 80, rows = 24) {
+        // Le jeton remis au lancement autorise l'accès au container lancé par ce navigateur
+        const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+        const socket = new WebSocket(`${protocol}//${window.location.host}${API_BASE_URL}/containers/${containerId}/terminal?token=${encodeURIComponent(token || '')}&cols=${cols}&rows=${rows}`);
+        socket.binaryType = 'arraybuffer';
+        return socket;
+    }
+
     /**
      * Supprime un container Docker
      * @param {string} containerId ID ou nom du container
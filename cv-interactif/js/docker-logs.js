@@ -3,13 +3,20 @@
  * Ce fichier contient des fonctions améliorées pour l'affichage des logs Docker
  */
 
+// Classe CSS de chaque nature de ligne (la classification est faite par le serveur)
+const LOG_KIND_CLASSES = {
+    command: 'log-command',
+    error: 'log-error',
+    success: 'log-success'
+};
+
 /**
  * Formatte les logs en mettant en évidence les commandes et les erreurs
- * @param {string} logs Logs bruts
+ * @param {Array<Object>} records Lignes classées par le serveur ({kind, text})
  * @returns {string} Logs formatés avec HTML
  */
-function formatLogsWithHTML(logs) {
-    if (!logs) return '';
+function formatLogsWithHTML(records) {
+    if (!records || records.length === 0) return '';
     
     // Échapper les caractères HTML
     const escapeHTML = (str) => str
@@ -19,70 +26,47 @@ function formatLogsWithHTML(logs) {
         .replace(/"/g, '&quot;')
         .replace(/'/g, '&#039;');
     
-    const escapedLogs = escapeHTML(logs);
-    
-    // Traiter ligne par ligne
-    return escapedLogs.split('\n').map(line => {
-        // Mettre en évidence les commandes
-        if (line.startsWith('&gt;') || line.includes('$') || line.includes('#')) {
-            return `<span class="log-command">${line}</span>`;
-        }
-        // Mettre en évidence les erreurs
-        else if (line.toLowerCase().includes('error') || line.toLowerCase().includes('erreur')) {
-            return `<span class="log-error">${line}</span>`;
-        }
-        // Mettre en évidence les messages de succès
-        else if (line.toLowerCase().includes('success') || line.toLowerCase().includes('réussi')) {
-            return `<span class="log-success">${line}</span>`;
-        }
-        return line;
+    return records.map(record => {
+        const line = escapeHTML(formatLogRecord(record));
+        const cssClass = LOG_KIND_CLASSES[record.kind];
+        return cssClass ? `<span class="${cssClass}">${line}</span>` : line;
     }).join('\n');
 }
 
 /**
- * Intercepte la fonction originale updateContainerLogs pour appliquer le formatage HTML
+ * Intercepte la fonction originale renderContainerLogs pour appliquer le formatage HTML
+ * (utilisée à la fois par le flux continu et par l'interrogation périodique)
  */
-const originalUpdateContainerLogs = updateContainerLogs;
-updateContainerLogs = async function(containerId = activeContainerId) {
-    if (!activeContainerId || containerStatus !== 'running') return;
+const originalRenderContainerLogs = renderContainerLogs;
+renderContainerLogs = function(records) {
+    const terminal = document.getElementById('docker-terminal');
     
-    try {
-        // Récupérer plus de lignes de logs pour une meilleure expérience
-        const response = await dockerClient.getContainerLogs(containerId, 50);
-        
-        if (response.success) {
-            const terminal = document.getElementById('docker-terminal');
-            const logs = response.data.logs;
-            
-            if (logs.trim() === '') {
-                // Si pas de logs, afficher un message d'aide stylisé
-                terminal.innerHTML = `
-                    <div class="terminal-help">
-                        <div class="terminal-help-icon">🔍</div>
-                        <div class="terminal-help-text">
-                            <p>En attente des logs...</p>
-                            <p>Vous pouvez interagir avec le Mini Shell en utilisant ces commandes:</p>
-                            <ul>
-                                <li><code>ls</code> - Lister les fichiers</li>
-                                <li><code>cd</code> - Changer de répertoire</li>
-                                <li><code>echo</code> - Afficher un texte</li>
-                                <li><code>cat</code> - Afficher un fichier</li>
-                                <li><code>exit</code> - Quitter le shell</li>
-                            </ul>
-                        </div>
-                    </div>
-                `;
-            } else {
-                // Formater les logs avec HTML pour la mise en évidence
-                terminal.innerHTML = formatLogsWithHTML(logs);
-            }
-            
-            // Faire défiler vers le bas
-            terminal.scrollTop = terminal.scrollHeight;
-        }
-    } catch (error) {
-        console.error('Erreur lors de la mise à jour des logs:', error);
+    if (!records || records.length === 0) {
+        // Si pas de logs, afficher un message d'aide stylisé
+        if (terminal.querySelector('.terminal-help')) return;
+        terminal.innerHTML = `
+            <div class="terminal-help">
+                <div class="terminal-help-icon">🔍</div>
+                <div class="terminal-help-text">
+                    <p>En attente des logs...</p>
+                    <p>Vous pouvez interagir avec le Mini Shell en utilisant ces commandes:</p>
+                    <ul>
+                        <li><code>ls</code> - Lister les fichiers</li>
+                        <li><code>cd</code> - Changer de répertoire</li>
+                        <li><code>echo</code> - Afficher un texte</li>
+                        <li><code>cat</code> - Afficher un fichier</li>
+                        <li><code>exit</code> - Quitter le shell</li>
+                    </ul>
+                </div>
+            </div>
+        `;
+    } else {
+        // Formater les logs avec HTML pour la mise en évidence
+        terminal.innerHTML = formatLogsWithHTML(records);
     }
+    
+    // Faire défiler vers le bas
+    terminal.scrollTop = terminal.scrollHeight;
 };
 
 /**
@@ -98,12 +82,12 @@ viewContainerLogs = async function() {
     
     try {
         // Récupérer plus de logs (200 lignes) pour une vue détaillée
-        const response = await dockerClient.getContainerLogs(activeContainerId, 200);
+        const response = await dockerClient.getContainerLogs(activeContainerId, 200, null, 'json');
         
         if (response.success) {
-            const logs = response.data.logs;
-            if (logs && logs.trim() !== '') {
-                document.getElementById('modal-logs').innerHTML = formatLogsWithHTML(logs);
+            const records = response.data.records;
+            if (records && records.length > 0) {
+                document.getElementById('modal-logs').innerHTML = formatLogsWithHTML(records);
             } else {
                 document.getElementById('modal-logs').innerHTML = '<div class="terminal-help"><div class="terminal-help-icon">ℹ️</div><div class="terminal-help-text">Aucun log disponible pour le moment.</div></div>';
             }
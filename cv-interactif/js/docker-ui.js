@@ -8,8 +8,36 @@ const dockerClient = dockerApi;
 
 // Variables globales pour suivre l'état des containers
 let activeContainerId = null;
+let terminalToken = null;
 let containerStatus = 'stopped';
 let updateLogsInterval = null;
+let logsStreamController = null;
+let terminalLines = [];
+let logsCursor = null;
+let renderLogsScheduled = false;
+let terminalSocket = null;
+let terminalText = '';
+
+// Nombre maximum de lignes conservées dans le terminal
+const MAX_TERMINAL_LINES = 500;
+
+// Nombre maximum de caractères conservés dans le terminal interactif
+const MAX_TERMINAL_CHARS = 100000;
+
+// Séquences envoyées au TTY pour les touches spéciales
+const TERMINAL_KEYS = {
+    Enter: '\r',
+    Backspace: '\x7f',
+    Tab: '\t',
+    Escape: '\x1b',
+    ArrowUp: '\x1b[A',
+    ArrowDown: '\x1b[B',
+    ArrowRight: '\x1b[C',
+    ArrowLeft: '\x1b[D',
+    Home: '\x1b[H',
+    End: '\x1b[F',
+    Delete: '\x1b[3~'
+};
 
 /**
  * Initialise les fonctionnalités Docker pour le Mini Shell
@@ -24,6 +52,12 @@ function initMiniShellDocker(container) {
     dockerInterface.querySelector('#stop-container').addEventListener('click', stopMiniShellContainer);
     dockerInterface.querySelector('#delete-container').addEventListener('click', deleteMiniShellContainer);
     dockerInterface.querySelector('#view-logs').addEventListener('click', viewContainerLogs);
+    
+    // Relayer les frappes et les collages vers le terminal interactif
+    const terminal = dockerInterface.querySelector('#docker-terminal');
+    terminal.addEventListener('keydown', handleTerminalKey);
+    terminal.addEventListener('paste', handleTerminalPaste);
+    window.addEventListener('resize', sendTerminalSize);
 }
 
 /**
@@ -116,10 +150,25 @@ async function startMiniShellContainer() {
         const containerName = `mini_shell_${sessionId.substring(0, 8)}`;
         
         // Appeler l'API pour démarrer le container
-        const response = await dockerClient.runMiniShellContainer(containerName, sessionId);
+        let response = await dockerClient.runMiniShellContainer(containerName, sessionId);
+        
+        // Capacité atteinte: suivre le ticket de la file d'attente puis relancer la demande une fois admis
+        while (!response.success && response.data && response.data.queued) {
+            const ticket = response.data;
+            const eta = ticket.estimated_wait !== null ? ` (environ ${Math.ceil(ticket.estimated_wait / 60)} min)` : '';
+            updateContainerStatus('loading', `En file d'attente: position ${ticket.position}${eta}`);
+            
+            const update = await dockerClient.waitForAdmission(ticket.ticket_id);
+            if (update.success && update.data.state === 'queued') {
+                response = { success: false, message: update.message, data: { queued: true, ...update.data } };
+            } else {
+                response = await dockerClient.runMiniShellContainer(containerName, sessionId);
+            }
+        }
         
         if (response.success) {
             activeContainerId = response.data.container_id;
+            terminalToken = response.data.terminal_token;
             containerStatus = 'running';
             
             // Mettre à jour l'interface
@@ -235,6 +284,7 @@ async function deleteMiniShellContainer() {
         if (response.success) {
             // Réinitialiser l'état
             activeContainerId = null;
+            terminalToken = null;
             containerStatus = 'stopped';
             
             // Mettre à jour l'interface
@@ -303,9 +353,202 @@ async function viewContainerLogs() {
  * Démarre la mise à jour automatique des logs
  */
 function startLogsUpdater() {
+    stopLogsUpdater();
+    
+    // Terminal interactif en priorité: saisie et sortie relayées sans délai
+    if (dockerClient.supportsTerminal()) {
+        startTerminal();
+        return;
+    }
+    
+    // Recevoir les nouvelles lignes en continu si le navigateur le permet
+    if (dockerClient.supportsLogStreaming()) {
+        startLogsStream();
+        return;
+    }
+    
+    startLogsPolling();
+}
+
+/**
+ * Ouvre le terminal interactif du container, avec repli sur le suivi des logs
+ */
+function startTerminal() {
+    const terminal = document.getElementById('docker-terminal');
+    const { cols, rows } = terminalSize(terminal);
+    const socket = dockerClient.openTerminal(activeContainerId, terminalToken, cols, rows);
+    const decoder = new TextDecoder();
+    let connected = false;
+    terminalSocket = socket;
+    terminalText = '';
+    
+    socket.onmessage = (event) => {
+        if (typeof event.data !== 'string') {
+            connected = true;
+            appendTerminalOutput(decoder.decode(new Uint8Array(event.data), { stream: true }));
+            return;
+        }
+        const message = JSON.parse(event.data);
+        if (message.type === 'exit') {
+            appendTerminalOutput(`\n[Mini Shell terminé (code ${message.exit_code})]\n`);
+        } else if (message.type === 'idle') {
+            appendTerminalOutput('\n[Terminal fermé après inactivité]\n');
+        } else if (message.type === 'error') {
+            console.warn('Terminal indisponible:', message.message);
+        }
+    };
+    
+    socket.onopen = () => {
+        terminal.tabIndex = 0;
+        terminal.focus();
+    };
+    
+    socket.onclose = () => {
+        if (terminalSocket !== socket) return;
+        terminalSocket = null;
+        // Terminal refusé ou indisponible: suivre les logs à la place
+        if (!connected && containerStatus === 'running') {
+            if (dockerClient.supportsLogStreaming()) {
+                startLogsStream();
+            } else {
+                startLogsPolling();
+            }
+        }
+    };
+}
+
+/**
+ * Calcule le nombre de colonnes et de lignes visibles dans le terminal
+ * @param {HTMLElement} terminal Élément du terminal
+ * @returns {Object} { cols, rows }
+ */
+function terminalSize(terminal) {
+    const style = window.getComputedStyle(terminal);
+    const fontSize = parseFloat(style.fontSize) || 14;
+    const lineHeight = parseFloat(style.lineHeight) || fontSize * 1.2;
+    return {
+        cols: Math.max(20, Math.floor(terminal.clientWidth / (fontSize * 0.6))),
+        rows: Math.max(5, Math.floor(terminal.clientHeight / lineHeight))
+    };
+}
+
+/**
+ * Transmet les nouvelles dimensions du terminal au TTY
+ */
+function sendTerminalSize() {
+    if (!terminalSocket || terminalSocket.readyState !== WebSocket.OPEN) return;
+    const { cols, rows } = terminalSize(document.getElementById('docker-terminal'));
+    terminalSocket.send(JSON.stringify({ type: 'resize', cols, rows }));
+}
+
+/**
+ * Envoie une frappe au TTY
+ * @param {KeyboardEvent} event Événement clavier
+ */
+function handleTerminalKey(event) {
+    if (!terminalSocket || terminalSocket.readyState !== WebSocket.OPEN) return;
+    
+    let data = TERMINAL_KEYS[event.key];
+    if (!data && event.ctrlKey && event.key.length === 1) {
+        // Ctrl+lettre: caractère de contrôle (Ctrl+C = \x03, Ctrl+D = \x04)
+        const code = event.key.toUpperCase().charCodeAt(0) - 64;
+        data = code > 0 && code < 32 ? String.fromCharCode(code) : null;
+    } else if (!data && !event.ctrlKey && !event.metaKey && event.key.length === 1) {
+        data = event.key;
+    }
+    if (!data) return;
+    
+    event.preventDefault();
+    terminalSocket.send(new TextEncoder().encode(data));
+}
+
+/**
+ * Envoie un texte collé au TTY
+ * @param {ClipboardEvent} event Événement de collage
+ */
+function handleTerminalPaste(event) {
+    if (!terminalSocket || terminalSocket.readyState !== WebSocket.OPEN) return;
+    event.preventDefault();
+    terminalSocket.send(new TextEncoder().encode(event.clipboardData.getData('text')));
+}
+
+/**
+ * Ajoute la sortie du TTY au terminal (séquences de contrôle ignorées, effacements appliqués)
+ * @param {string} text Sortie décodée
+ */
+function appendTerminalOutput(text) {
+    const clean = text
+        .replace(/\x1b\][^\x07]*\x07/g, '')
+        .replace(/\x1b\[[0-9;?]*[A-Za-z]/g, '')
+        .replace(/\r\n/g, '\n')
+        .replace(/[\r\x07]/g, '');
+    
+    if (clean.includes('\b')) {
+        for (const char of clean) {
+            terminalText = char === '\b' ? terminalText.slice(0, -1) : terminalText + char;
+        }
+    } else {
+        terminalText += clean;
+    }
+    if (terminalText.length > MAX_TERMINAL_CHARS) {
+        terminalText = terminalText.slice(-MAX_TERMINAL_CHARS);
+    }
+    
+    if (renderLogsScheduled) return;
+    renderLogsScheduled = true;
+    requestAnimationFrame(() => {
+        renderLogsScheduled = false;
+        const terminal = document.getElementById('docker-terminal');
+        terminal.textContent = terminalText;
+        terminal.scrollTop = terminal.scrollHeight;
+    });
+}
+
+/**
+ * Suit les logs du container en continu, avec repli sur l'interrogation périodique
+ */
+function startLogsStream() {
+    const controller = new AbortController();
+    logsStreamController = controller;
+    terminalLines = [];
+    
+    dockerClient.streamContainerLogs(activeContainerId, 50, (lines) => {
+        terminalLines.push(...lines);
+        if (terminalLines.length > MAX_TERMINAL_LINES) {
+            terminalLines.splice(0, terminalLines.length - MAX_TERMINAL_LINES);
+        }
+        scheduleLogsRender();
+    }, controller.signal).catch((error) => {
+        if (controller.signal.aborted) return;
+        console.warn('Flux de logs indisponible, interrogation périodique:', error);
+        if (logsStreamController === controller) {
+            logsStreamController = null;
+            startLogsPolling();
+        }
+    });
+}
+
+/**
+ * Regroupe les lots de lignes reçus entre deux rafraîchissements de l'écran
+ */
+function scheduleLogsRender() {
+    if (renderLogsScheduled) return;
+    renderLogsScheduled = true;
+    requestAnimationFrame(() => {
+        renderLogsScheduled = false;
+        renderContainerLogs(terminalLines);
+    });
+}
+
+/**
+ * Interroge périodiquement l'API pour mettre à jour les logs
+ */
+function startLogsPolling() {
     if (updateLogsInterval) {
         clearInterval(updateLogsInterval);
     }
+    terminalLines = [];
+    logsCursor = null;
     
     // Mettre à jour les logs initialement
     updateContainerLogs();
@@ -322,6 +565,15 @@ function stopLogsUpdater() {
         clearInterval(updateLogsInterval);
         updateLogsInterval = null;
     }
+    if (logsStreamController) {
+        logsStreamController.abort();
+        logsStreamController = null;
+    }
+    if (terminalSocket) {
+        const socket = terminalSocket;
+        terminalSocket = null;
+        socket.close();
+    }
 }
 
 /**
@@ -331,30 +583,62 @@ async function updateContainerLogs() {
     if (!activeContainerId || containerStatus !== 'running') return;
     
     try {
-        const response = await dockerClient.getContainerLogs(activeContainerId, 20);
+        // Ne demander que les lignes postérieures au dernier curseur reçu
+        const response = await dockerClient.getContainerLogs(activeContainerId, 50, logsCursor, 'json');
         
         if (response.success) {
-            const terminal = document.getElementById('docker-terminal');
-            const logs = response.data.logs;
+            const firstFetch = logsCursor === null;
+            const lines = response.data.records || [];
             
-            if (logs.trim() === '') {
-                // Si pas de logs, afficher un message d'aide
-                if (!terminal.innerText.includes('En attente des logs...')) {
-                    terminal.innerText = 'En attente des logs...\n\nVous pouvez interagir avec le Mini Shell en utilisant ces commandes:\n- ls (lister les fichiers)\n- cd (changer de répertoire)\n- echo (afficher un texte)\n- cat (afficher un fichier)\n- exit (quitter le shell)\n';
-                }
+            if (firstFetch || response.data.reset) {
+                terminalLines = lines;
             } else {
-                // Sinon, afficher les logs
-                terminal.innerText = logs;
+                terminalLines.push(...lines);
+            }
+            if (terminalLines.length > MAX_TERMINAL_LINES) {
+                terminalLines.splice(0, terminalLines.length - MAX_TERMINAL_LINES);
             }
+            logsCursor = response.data.cursor;
             
-            // Faire défiler vers le bas
-            terminal.scrollTop = terminal.scrollHeight;
+            if (firstFetch || response.data.reset || lines.length > 0) {
+                renderContainerLogs(terminalLines);
+            }
         }
     } catch (error) {
         console.error('Erreur lors de la mise à jour des logs:', error);
     }
 }
 
+/**
+ * Retourne le texte affiché pour une ligne de log (commandes préfixées par "> ")
+ * @param {Object} record Ligne classée par le serveur ({kind, text})
+ * @returns {string} Ligne à afficher
+ */
+function formatLogRecord(record) {
+    return record.kind === 'command' ? `> ${record.text}` : record.text;
+}
+
+/**
+ * Affiche les logs dans le terminal
+ * @param {Array<Object>} records Lignes à afficher ({kind, text})
+ */
+function renderContainerLogs(records) {
+    const terminal = document.getElementById('docker-terminal');
+    
+    if (records.length === 0) {
+        // Si pas de logs, afficher un message d'aide
+        if (!terminal.innerText.includes('En attente des logs...')) {
+            terminal.innerText = 'En attente des logs...\n\nVous pouvez interagir avec le Mini Shell en utilisant ces commandes:\n- ls (lister les fichiers)\n- cd (changer de répertoire)\n- echo (afficher un texte)\n- cat (afficher un fichier)\n- exit (quitter le shell)\n';
+        }
+    } else {
+        // Sinon, afficher les logs
+        terminal.innerText = records.map(formatLogRecord).join('\n');
+    }
+    
+    // Faire défiler vers le bas
+    terminal.scrollTop = terminal.scrollHeight;
+}
+
 /**
  * Met à jour le statut du container dans l'interface
  * @param {string} status Statut du container ('running', 'stopped', 'loading')
@@ -11,6 +11,7 @@ sudo a2enmod deflate
 sudo a2enmod headers
 sudo a2enmod proxy
 sudo a2enmod proxy_http
+sudo a2enmod proxy_wstunnel
 
 # Copier les fichiers de configuration
 echo "Copie des fichiers de configuration..."